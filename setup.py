@@ -11,6 +11,7 @@ setup(
     entry_points={
         'console_scripts': [
             'myhashcat=src.cli:main',
+            'myhashcatd=src.daemon:main',
         ],
     },
     author="Votre Nom",
@@ -0,0 +1,156 @@
+"""
+Module de dimensionnement adaptatif des lots
+
+Un lot trop petit est dominé par le démarrage de Hashcat (initialisation des
+périphériques, self-test, compilation des kernels) ; un lot trop grand fait
+perdre beaucoup de travail en cas d'interruption. La taille de chaque lot est
+donc calculée pour viser une durée d'exécution cible à partir de la vitesse
+et du coût de démarrage mesurés sur les lots précédents du même type de hash.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import yaml
+
+from .session_manager import atomic_write_yaml, store_lock
+
+
+class AdaptiveBatchSizer:
+    """Calcul de la taille des lots à partir des mesures de Hashcat"""
+
+    def __init__(
+        self,
+        calibration_file: Path,
+        target_seconds: float = 600.0,
+        default_batch: int = 1_000_000,
+        min_batch: int = 10_000,
+        max_batch: int = 1_000_000_000,
+        max_growth: float = 4.0,
+        startup_share: float = 0.1,
+        smoothing: float = 0.5
+    ):
+        """
+        Initialise le calculateur
+
+        Args:
+            calibration_file (Path): Fichier YAML des mesures par type de hash
+            target_seconds (float): Durée visée pour un lot (démarrage compris)
+            default_batch (int): Taille utilisée sans mesure disponible
+            min_batch (int): Taille minimale d'un lot
+            max_batch (int): Taille maximale d'un lot
+            max_growth (float): Facteur maximal de variation entre deux lots
+            startup_share (float): Part maximale du démarrage dans la durée
+                d'un lot (allonge la durée visée si le démarrage est lent)
+            smoothing (float): Poids de la nouvelle mesure dans la moyenne
+                exponentielle
+        """
+        self.calibration_file = calibration_file
+        self.target_seconds = target_seconds
+        self.default_batch = default_batch
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.max_growth = max_growth
+        self.startup_share = startup_share
+        self.smoothing = smoothing
+        self.calibration: Dict[str, Dict[str, float]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """Charge les mesures depuis le disque"""
+        if not self.calibration_file.exists():
+            return
+        with self.calibration_file.open("r") as f:
+            data = yaml.safe_load(f) or {}
+        self.calibration = data.get("hash_types", {})
+
+    def save(self) -> None:
+        """Enregistre les mesures"""
+        atomic_write_yaml(self.calibration_file, {
+            "updated_at": datetime.now().isoformat(),
+            "hash_types": self.calibration
+        })
+
+    def _smooth(self, previous: Optional[float], value: float) -> float:
+        """Moyenne exponentielle d'une mesure"""
+        if previous is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * previous
+
+    def record(
+        self,
+        hash_type: Optional[int],
+        words: int,
+        rules_multiplier: int,
+        run_seconds: float,
+        speed: Optional[float]
+    ) -> Dict[str, float]:
+        """
+        Enregistre les mesures d'un lot épuisé
+
+        Le coût de démarrage est la part de la durée du lot non expliquée par
+        le cassage à la vitesse mesurée. Les mesures sont relues sous verrou
+        avant la mise à jour : celles d'autres processus sont conservées.
+
+        Args:
+            hash_type (Optional[int]): Type de hash
+            words (int): Nombre de mots du lot
+            rules_multiplier (int): Nombre de candidats par mot (règles)
+            run_seconds (float): Durée totale du processus Hashcat
+            speed (Optional[float]): Vitesse mesurée (candidats/s), None si
+                le lot s'est terminé avant le premier statut
+
+        Returns:
+            Dict[str, float]: Mesures lissées du type de hash
+        """
+        key = str(hash_type)
+        with store_lock(self.calibration_file):
+            self._load()
+            entry = self.calibration.setdefault(key, {})
+            if speed:
+                cracking = words * rules_multiplier / speed
+                entry["speed"] = self._smooth(entry.get("speed"), speed)
+                entry["startup"] = self._smooth(entry.get("startup"), max(run_seconds - cracking, 0.0))
+            else:
+                # Aucun statut : le lot entier n'a guère duré plus que le démarrage
+                entry["startup"] = self._smooth(entry.get("startup"), run_seconds)
+            entry["batches"] = entry.get("batches", 0) + 1
+            self.save()
+        return entry
+
+    def batch_size(
+        self,
+        hash_type: Optional[int],
+        rules_multiplier: int = 1,
+        previous: Optional[int] = None
+    ) -> int:
+        """
+        Calcule la taille du prochain lot
+
+        Args:
+            hash_type (Optional[int]): Type de hash
+            rules_multiplier (int): Nombre de candidats par mot (règles)
+            previous (Optional[int]): Taille du lot précédent de la session
+
+        Returns:
+            int: Nombre de mots du prochain lot
+        """
+        entry = self.calibration.get(str(hash_type), {})
+        speed = entry.get("speed")
+        if not speed:
+            if previous and entry:
+                # Lot terminé avant tout statut : il était bien trop court
+                return self._clamp(int(previous * self.max_growth))
+            return self._clamp(previous or self.default_batch)
+
+        startup = entry.get("startup", 0.0)
+        target = max(self.target_seconds, startup / self.startup_share)
+        words = (target - startup) * speed / max(rules_multiplier, 1)
+        if previous:
+            words = min(max(words, previous / self.max_growth), previous * self.max_growth)
+        return self._clamp(int(words))
+
+    def _clamp(self, words: int) -> int:
+        """Borne la taille d'un lot et l'arrondit au millier"""
+        words = min(max(words, self.min_batch), self.max_batch)
+        return max(words // 1000 * 1000, self.min_batch)
@@ -0,0 +1,195 @@
+"""
+Module de banc d'essai du pipeline MyHashcat
+
+Chaque lot passe par quatre étapes successives : génération des mots,
+écriture du dictionnaire, lancement de Hashcat (initialisation, self-test,
+kernels) puis cassage. Chaque étape est mesurée isolément sur cet hôte ; la
+durée d'un lot de la taille choisie par MyHashcat en est déduite, ce qui donne
+le débit de bout en bout en candidats/s et l'étape qui le limite.
+"""
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .generator import DictionaryGenerator, GENERATION_CHUNK
+from .hashcat_interface import HashcatInterface
+
+
+STAGE_NAMES = {
+    "generation": "génération des mots",
+    "write": "écriture du dictionnaire",
+    "launch": "lancement de Hashcat",
+    "cracking": "cassage par Hashcat",
+}
+
+
+def measure_generation(generator: DictionaryGenerator, words: int, start_index: int = 0) -> Dict[str, Any]:
+    """
+    Mesure la vitesse du générateur
+
+    Args:
+        generator (DictionaryGenerator): Générateur de la configuration
+        words (int): Nombre de mots générés
+        start_index (int): Index du premier mot
+
+    Returns:
+        Dict[str, Any]: Mots générés, durée, mots/s, taille moyenne d'une
+            ligne et échantillon de mots (pour la mesure d'écriture)
+    """
+    words = min(words, generator.total_combinations - start_index)
+    sample: List[str] = []
+    started = time.perf_counter()
+    index = start_index
+    while index < start_index + words:
+        chunk = generator.generate_sequential(start_index=index, count=min(GENERATION_CHUNK, start_index + words - index))
+        if not sample:
+            sample = chunk
+        index += len(chunk)
+    seconds = time.perf_counter() - started
+    line_bytes = sum(len(word.encode()) + 1 for word in sample) / max(len(sample), 1)
+    return {
+        "words": words,
+        "seconds": seconds,
+        "words_per_second": words / seconds if seconds > 0 else float("inf"),
+        "bytes_per_word": line_bytes,
+        "sample": sample,
+    }
+
+
+def measure_write(directory: Path, sample: List[str], total_bytes: int) -> Dict[str, Any]:
+    """
+    Mesure le débit d'écriture d'un dictionnaire dans un répertoire
+
+    Le fichier est synchronisé sur le disque : au-delà de quelques lots, le
+    cache de pages ne masque plus la vitesse du support.
+
+    Args:
+        directory (Path): Répertoire des dictionnaires
+        sample (List[str]): Mots écrits en boucle
+        total_bytes (int): Volume écrit
+
+    Returns:
+        Dict[str, Any]: Octets écrits, durée et octets/s
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    block = "".join(f"{word}\n" for word in sample) or "\n"
+    bench_file = directory / f".bench_{os.getpid()}.txt"
+    written = 0
+    started = time.perf_counter()
+    try:
+        with bench_file.open("w") as f:
+            while written < total_bytes:
+                written += f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+        seconds = time.perf_counter() - started
+    finally:
+        bench_file.unlink(missing_ok=True)
+    return {
+        "bytes": written,
+        "seconds": seconds,
+        "bytes_per_second": written / seconds if seconds > 0 else float("inf"),
+    }
+
+
+def measure_launch_overhead(
+    interface: HashcatInterface,
+    hash_file: Path,
+    hash_type: Optional[int],
+    directory: Path,
+    runs: int = 3
+) -> Dict[str, Any]:
+    """
+    Mesure le coût fixe d'un lancement de Hashcat
+
+    Hashcat est lancé sur un dictionnaire d'un seul mot : la durée du
+    processus est presque entièrement celle de son démarrage.
+
+    Args:
+        interface (HashcatInterface): Interface Hashcat
+        hash_file (Path): Fichier de hash de la configuration
+        hash_type (Optional[int]): Type de hash
+        directory (Path): Répertoire des fichiers temporaires
+        runs (int): Nombre de lancements (la médiane est retenue)
+
+    Returns:
+        Dict[str, Any]: Durées des lancements et médiane en secondes
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    dictionary = directory / "bench_launch.txt"
+    outfile = directory / "bench_launch.cracked"
+    dictionary.write_text("myhashcat-bench\n")
+    durations = []
+    try:
+        for run in range(max(runs, 1)):
+            started = time.perf_counter()
+            process = interface.start_attack(
+                hash_file=hash_file,
+                hash_type=hash_type,
+                dictionary=dictionary,
+                session=f"bench_{os.getpid()}_{run}",
+                outfile=outfile,
+                options={"potfile-disable": True}
+            )
+            process.communicate()
+            durations.append(time.perf_counter() - started)
+    finally:
+        dictionary.unlink(missing_ok=True)
+        outfile.unlink(missing_ok=True)
+    return {"runs": durations, "seconds": statistics.median(durations)}
+
+
+def summarize(
+    batch_words: int,
+    rules_multiplier: int,
+    words_per_second: float,
+    bytes_per_word: float,
+    write_bytes_per_second: float,
+    launch_seconds: float,
+    hashcat_speed: Optional[float]
+) -> Dict[str, Any]:
+    """
+    Calcule le débit de bout en bout et l'étape limitante
+
+    Les étapes d'un lot s'enchaînent sans recouvrement : le temps d'un lot
+    est la somme des temps de chaque étape.
+
+    Args:
+        batch_words (int): Taille d'un lot (mots)
+        rules_multiplier (int): Candidats par mot (règles)
+        words_per_second (float): Vitesse du générateur
+        bytes_per_word (float): Taille moyenne d'une ligne du dictionnaire
+        write_bytes_per_second (float): Débit d'écriture
+        launch_seconds (float): Coût fixe d'un lancement de Hashcat
+        hashcat_speed (Optional[float]): Vitesse de Hashcat (H/s)
+
+    Returns:
+        Dict[str, Any]: Temps et débit (candidats/s) de chaque étape, débit
+            de bout en bout et étape limitante
+    """
+    candidates = batch_words * max(rules_multiplier, 1)
+    seconds = {
+        "generation": batch_words / words_per_second,
+        "write": batch_words * bytes_per_word / write_bytes_per_second,
+        "launch": launch_seconds,
+        "cracking": candidates / hashcat_speed if hashcat_speed else 0.0,
+    }
+    total = sum(seconds.values())
+    stages = {
+        name: {
+            "seconds_per_batch": value,
+            "share": value / total if total > 0 else 0.0,
+            "candidates_per_second": candidates / value if value > 0 else float("inf"),
+        }
+        for name, value in seconds.items()
+    }
+    bottleneck = max(seconds, key=seconds.get)
+    return {
+        "batch_words": batch_words,
+        "rules_multiplier": rules_multiplier,
+        "stages": stages,
+        "end_to_end": candidates / total if total > 0 else float("inf"),
+        "bottleneck": bottleneck,
+    }
@@ -0,0 +1,271 @@
+"""
+Module de gestion du serveur brain de Hashcat
+
+Les lots aléatoires, les jeux de règles qui se recouvrent et les sessions
+relancées font retester des candidats déjà hachés, ce qui coûte cher sur les
+modes lents comme 22000. Le serveur brain de Hashcat (``--brain-server``)
+mémorise les couples candidat/hash déjà testés ; chaque attaque lancée en
+client (``--brain-client``) lui soumet ses candidats et ceux déjà vus sont
+rejetés avant d'atteindre le noyau. Ce module démarre un serveur local
+(lié à la boucle locale), le retrouve d'une invocation à l'autre et tient le
+compte du travail économisé à partir des lignes ``Rejected`` des statuts.
+"""
+import ipaddress
+import logging
+import secrets
+import socket
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import psutil
+import yaml
+
+from .metrics import REGISTRY
+from .process_watcher import is_same_process, process_start_time
+from .session_manager import atomic_write_yaml, store_lock
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 6863
+
+# Fonctions du client : 1 candidats hachés, 2 positions d'attaque, 3 les deux
+CLIENT_FEATURES = 3
+
+
+def parse_rejected(line: str) -> Optional[Tuple[int, int]]:
+    """
+    Extrait le nombre de candidats rejetés d'une ligne de statut Hashcat
+
+    Args:
+        line (str): Ligne du type ``Rejected.........: 120/4000 (3.00%)``
+
+    Returns:
+        Optional[Tuple[int, int]]: Candidats rejetés et candidats traités,
+            None si la ligne n'est pas reconnue
+    """
+    if not line.startswith("Rejected"):
+        return None
+    try:
+        rejected, done = line.split(":", 1)[1].split()[0].split("/")
+        return int(rejected), int(done)
+    except (ValueError, IndexError):
+        return None
+
+
+class BrainServer:
+    """Cycle de vie d'un serveur brain local et bilan du travail économisé"""
+
+    def __init__(
+        self,
+        hashcat_path: str,
+        state_dir: Path,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT
+    ):
+        """
+        Initialise la gestion du serveur
+
+        Args:
+            hashcat_path (str): Chemin vers l'exécutable hashcat
+            state_dir (Path): Répertoire de l'état du serveur (PID, mot de
+                passe, bilan) et de ses sauvegardes ``brain.*.ldmp``
+            host (str): Adresse d'écoute, obligatoirement locale
+            port (int): Port d'écoute
+        """
+        if not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(f"Le serveur brain doit écouter sur la boucle locale, pas sur {host}")
+        self.hashcat_path = hashcat_path
+        self.state_dir = state_dir
+        self.host = host
+        self.port = port
+        self.state_file = state_dir / "brain.yaml"
+        self.logger = logging.getLogger("myhashcat.brain")
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        """Charge l'état enregistré du serveur"""
+        if not self.state_file.exists():
+            return {}
+        with self.state_file.open("r") as f:
+            return yaml.safe_load(f) or {}
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        """Enregistre l'état (lisible du seul utilisateur : il porte le mot de passe)"""
+        atomic_write_yaml(self.state_file, data, mode=0o600)
+
+    def _password(self, data: Dict[str, Any]) -> str:
+        """Mot de passe du serveur, créé au premier démarrage"""
+        if not data.get("password"):
+            data["password"] = secrets.token_hex(16)
+        return data["password"]
+
+    def _accepts_connections(self) -> bool:
+        """Vérifie que le port du serveur accepte les connexions"""
+        try:
+            with socket.create_connection((self.host, self.port), timeout=0.5):
+                return True
+        except OSError:
+            return False
+
+    def is_running(self) -> bool:
+        """
+        Vérifie que le serveur enregistré tourne toujours
+
+        Returns:
+            bool: True si le processus enregistré est vivant (même date de
+                démarrage) et écoute sur son port
+        """
+        data = self._load()
+        return (
+            is_same_process(data.get("pid"), data.get("started"))
+            and data.get("port") == self.port
+            and self._accepts_connections()
+        )
+
+    def start(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Démarre le serveur s'il ne tourne pas déjà
+
+        Args:
+            timeout (float): Attente maximale de l'ouverture du port
+
+        Returns:
+            Dict[str, Any]: État du serveur (PID, adresse, port)
+        """
+        with self._lock, store_lock(self.state_file):
+            if self.is_running():
+                return self.status()
+            if self._accepts_connections():
+                raise RuntimeError(f"Port {self.port} déjà utilisé par un autre programme")
+            data = self._load()
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            cmd = [
+                self.hashcat_path, "--brain-server",
+                "--brain-host", self.host,
+                "--brain-port", str(self.port),
+                "--brain-password", self._password(data),
+            ]
+            self.logger.info("Démarrage du serveur brain sur %s:%s", self.host, self.port)
+            with (self.state_dir / "brain.log").open("ab") as log:
+                # Les sauvegardes brain.*.ldmp sont écrites dans le répertoire
+                # courant : elles survivent ainsi aux redémarrages
+                process = subprocess.Popen(
+                    cmd, cwd=self.state_dir, stdout=log, stderr=subprocess.STDOUT,
+                    stdin=subprocess.DEVNULL, start_new_session=True
+                )
+            deadline = time.monotonic() + timeout
+            while not self._accepts_connections():
+                if process.poll() is not None:
+                    raise RuntimeError(
+                        f"Le serveur brain s'est arrêté au démarrage (code {process.returncode}), "
+                        f"voir {self.state_dir / 'brain.log'}"
+                    )
+                if time.monotonic() > deadline:
+                    process.kill()
+                    raise RuntimeError(f"Le serveur brain n'écoute pas sur le port {self.port} après {timeout}s")
+                time.sleep(0.05)
+            data.update({
+                "pid": process.pid,
+                "started": process_start_time(process.pid),
+                "host": self.host,
+                "port": self.port,
+                "start_time": datetime.now().isoformat()
+            })
+            self._save(data)
+            self.logger.info("Serveur brain démarré (PID %s)", process.pid)
+            return self.status()
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """
+        Arrête le serveur enregistré
+
+        Args:
+            timeout (float): Attente maximale de l'arrêt avant de le tuer
+
+        Returns:
+            bool: True si un serveur a été arrêté
+        """
+        with self._lock, store_lock(self.state_file):
+            data = self._load()
+            pid = data.pop("pid", None)
+            started = data.pop("started", None)
+            if not is_same_process(pid, started):
+                self._save(data)
+                return False
+            try:
+                process = psutil.Process(pid)
+                process.terminate()
+                try:
+                    process.wait(timeout)
+                except psutil.TimeoutExpired:
+                    process.kill()
+            except psutil.NoSuchProcess:
+                pass
+            self._save(data)
+            self.logger.info("Serveur brain arrêté (PID %s)", pid)
+            return True
+
+    def client_options(self) -> Dict[str, Any]:
+        """
+        Options client à transmettre à Hashcat (voir start_attack)
+
+        Returns:
+            Dict[str, Any]: Adresse, port, mot de passe et fonctions du client
+        """
+        data = self._load()
+        return {
+            "host": self.host,
+            "port": self.port,
+            "password": data.get("password"),
+            "features": CLIENT_FEATURES,
+        }
+
+    def record(self, rejected: int, candidates: int, speed: Optional[float] = None) -> None:
+        """
+        Ajoute au bilan les candidats rejetés par le serveur pour une attaque
+
+        Args:
+            rejected (int): Candidats rejetés (déjà testés)
+            candidates (int): Candidats traités par l'attaque
+            speed (Optional[float]): Vitesse de l'attaque (H/s), pour estimer
+                le temps de calcul économisé
+        """
+        saved_seconds = rejected / speed if speed else 0.0
+        with self._lock, store_lock(self.state_file):
+            data = self._load()
+            totals = data.setdefault("totals", {"attacks": 0, "candidates": 0, "rejected": 0, "saved_seconds": 0.0})
+            totals["attacks"] += 1
+            totals["candidates"] += candidates
+            totals["rejected"] += rejected
+            totals["saved_seconds"] = round(totals["saved_seconds"] + saved_seconds, 3)
+            self._save(data)
+        REGISTRY.inc("brain_rejected_candidates_total", rejected)
+        REGISTRY.inc("brain_saved_seconds_total", saved_seconds)
+        self.logger.info(
+            "Brain: %s candidats sur %s déjà testés (%.1fs économisées)", rejected, candidates, saved_seconds
+        )
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du serveur et le bilan du travail économisé
+
+        Returns:
+            Dict[str, Any]: ``running``, ``pid``, ``host``, ``port`` et
+                ``totals`` (attaques, candidats, rejetés, secondes économisées)
+        """
+        data = self._load()
+        totals = data.get("totals") or {"attacks": 0, "candidates": 0, "rejected": 0, "saved_seconds": 0.0}
+        return {
+            "running": self.is_running(),
+            "pid": data.get("pid"),
+            "host": self.host,
+            "port": self.port,
+            "totals": {
+                **totals,
+                "rejected_ratio": totals["rejected"] / totals["candidates"] if totals["candidates"] else 0.0,
+            },
+        }
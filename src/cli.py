@@ -4,19 +4,56 @@ Interface en ligne de commande pour MyHashcat
 """
 import argparse
 from pathlib import Path
-from typing import Optional, Set
+from typing import Optional, Set, List
 from src.myhashcat import MyHashcat
+from src.generator import DictionaryGenerator
+from src import bench
+from src.metrics import REGISTRY
+from src.daemon import DaemonClient, default_socket_path
+from src.distributed import DEFAULT_PORT, CoordinatorServer, Worker
+from src.brain import DEFAULT_PORT as BRAIN_PORT
 import sys
-import os
 import time
 import logging
 
 
+# Commandes transmises au démon myhashcatd lorsqu'il est actif
+DAEMON_COMMANDS = {"start", "pool", "continue", "status", "stop", "list", "queue", "coverage"}
+
+# Options globales configurant l'instance locale de MyHashcat : le démon
+# utilise sa propre configuration (voir myhashcatd --help)
+INSTANCE_OPTIONS = (
+    "metrics_file", "metrics_port", "profile", "profile_cpu", "profile_memory",
+    "batch_size", "batch_seconds", "cpu_governor", "brain", "brain_port"
+)
+
+
 def parse_charset(charset_str: str) -> Set[str]:
     """Convertit une chaîne de caractères en ensemble"""
     return set(charset_str)
 
 
+def parse_word_mask(word_mask: Optional[str]) -> Optional[List[str]]:
+    """Convertit un masque de génération en caractères par position"""
+    if not word_mask:
+        return None
+    return DictionaryGenerator.from_mask(word_mask).position_charsets
+
+
+def resolve_path(path: Optional[str]) -> Optional[str]:
+    """Chemin absolu (transmissible au démon) ou None"""
+    return str(Path(path).resolve()) if path else None
+
+
+def daemon_ignored_options(parser: argparse.ArgumentParser, args: argparse.Namespace) -> List[str]:
+    """Options globales données qui seraient sans effet sur le démon"""
+    return [
+        "--" + dest.replace("_", "-")
+        for dest in INSTANCE_OPTIONS
+        if getattr(args, dest) != parser.get_default(dest)
+    ]
+
+
 def print_usage():
     """Affiche un message d'usage détaillé"""
     print("""
@@ -30,14 +67,72 @@ COMMANDES:
         options:
             --word-length <n>            Longueur des mots (défaut: 18)
             --charset <chars>            Caractères à utiliser (défaut: A-Z0-9)
+            --word-mask <masque>         Caractères par position, syntaxe Hashcat (ex: ABC?d?d?u)
+            --markov-corpus <fichier>    Énumère les mots par probabilité selon ce corpus
+            --markov-order <0|1>         Ordre du modèle de Markov (défaut: 1)
+            --max-repeat <n>             Répétitions consécutives maximales d'un caractère
+            --require-class <classe>     Classe requise dans chaque mot (l, u, d, s ou caractères), répétable
             --rules <fichier>            Fichier de règles à utiliser
-
+            --pool                       Mettre la session en attente de mutualisation
+            --distributed                Répartir la session entre des workers (voir coordinator)
+            --wordlist <fichier>         Attaquer une liste de mots externe (filtrée et dédupliquée)
+            --left / --right <fichier>   Combinaison (-a 1) ; un côté absent est généré (--word-mask)
+            --mask-suffix <masque>       Hybride (-a 6) : masque ajouté à chaque mot (--wordlist ou généré)
+            --mask-prefix <masque>       Hybride (-a 7) : masque placé devant chaque mot
+            --instances <n>              Lancer n instances Hashcat par lot (tranches --skip/--limit)
+            --instance-devices <d> ...   Périphériques de chaque instance (défaut: cœurs répartis)
+
+    pool                                 Lancer les sessions en attente mutualisées
+    queue add <nom> <hash_file>          Placer une attaque dans la file de travaux
+        options:
+            --priority <n>               Priorité (défaut: 0, les plus grandes d'abord)
+            --budget <secondes>          Temps de cassage maximal du travail
+    queue list                           Lister les travaux de la file
+    queue cancel <job_id>                Annuler un travail
+    queue run [--slots <n>]              Planifier la file (préemption par checkpoint)
     continue <session_id>                Continuer une attaque avec un nouveau dictionnaire
     status <session_id>                  Vérifier le statut d'une session
     stop <session_id>                    Arrêter une session
     list                                 Lister toutes les sessions
+    rules                                Afficher l'efficacité des règles (hits, coût par hit)
+    coverage                             Afficher la couverture globale de chaque keyspace
+    scan <répertoire>                    Détecter le type de hash de tous les fichiers (en cache)
+        options:
+            --pattern <motif>            Fichiers à analyser (défaut: *)
+            --recursive                  Parcourir les sous-répertoires
+            --workers <n>                Nombre de threads d'analyse
+    wordlist <fichier>                   Filtrer et dédupliquer une liste de mots (en cache)
+        options:
+            --hash-type <n>              Longueurs acceptées par ce type (ex: 8-63 pour WPA)
+            --min-length / --max-length  Longueurs imposées
+            --charset <chars>            Caractères autorisés
+    bench <hash_file>                    Mesurer chaque étape du pipeline et le débit de bout en bout
+        options:
+            --hash-type <n>              Type de hash (détection automatique par défaut)
+            --words <n>                  Mots générés pour la mesure (défaut: 200000)
+            --launches <n>               Lancements de Hashcat pour la mesure (défaut: 3)
+    coordinator [--port <n>]             Servir les sessions distribuées aux workers (HTTP)
+    worker <url>                         Traiter les plages d'un coordinateur avec le Hashcat local
+        options:
+            --name <nom>                 Nom du worker (défaut: nom d'hôte)
+            --session <session_id>       Ne traiter que cette session
+            --once                       S'arrêter quand il n'y a plus de plage
+    brain <start|stop|status>            Gérer le serveur brain local et afficher le travail économisé
     cleanup                             Nettoyer les ressources
 
+OPTIONS GLOBALES:
+    --metrics-file <fichier>             Exporter les métriques pour Prometheus (textfile)
+    --metrics-port <port>                Exposer les métriques sur un endpoint HTTP local
+    --profile                            Afficher le temps passé dans chaque étape
+    --profile-cpu / --profile-memory     Capturer en plus cProfile / tracemalloc
+    --batch-size <n>                     Taille fixe des dictionnaires (défaut: adaptative)
+    --batch-seconds <s>                  Durée visée pour un lot adaptatif (défaut: 600)
+    --cpu-governor                       Répartir les cœurs entre génération et Hashcat (CPU seul)
+    --brain                              Rejeter les candidats déjà testés (serveur brain local)
+    --brain-port <port>                  Port du serveur brain local (défaut: 6863)
+    --socket <fichier>                   Socket du démon myhashcatd (défaut: ~/.myhashcat/myhashcatd.sock)
+    --no-daemon                          Ne pas passer par le démon même s'il est actif
+
 EXEMPLES:
     # Démarrer une attaque avec détection automatique du type de hash
     myhashcat start test1 hash.txt
@@ -58,10 +153,23 @@ Pour plus d'informations: myhashcat --help
 def main():
     """Point d'entrée principal du CLI"""
     parser = argparse.ArgumentParser(description="Interface en ligne de commande pour MyHashcat")
+    parser.add_argument("--metrics-file", type=Path, help="Fichier .prom pour le textfile collector de Prometheus")
+    parser.add_argument("--metrics-port", type=int, help="Expose les métriques Prometheus sur http://127.0.0.1:<port>/metrics")
+    parser.add_argument("--profile", action="store_true", help="Chronomètre chaque étape et écrit le profil dans le répertoire de travail")
+    parser.add_argument("--profile-cpu", action="store_true", help="Ajoute une capture cProfile au profil")
+    parser.add_argument("--profile-memory", action="store_true", help="Ajoute le suivi des allocations (tracemalloc) au profil")
+    parser.add_argument("--batch-size", type=int, help="Taille fixe des dictionnaires (par défaut adaptée à la vitesse mesurée)")
+    parser.add_argument("--batch-seconds", type=float, default=600.0, help="Durée visée pour un lot en taille adaptative (secondes)")
+    parser.add_argument("--cpu-governor", action="store_true", help="Sépare les cœurs de la génération et de Hashcat (hôtes sans GPU)")
+    parser.add_argument("--brain", action="store_true", help="Lance les attaques en clients d'un serveur brain local (candidats déjà testés rejetés)")
+    parser.add_argument("--brain-port", type=int, default=BRAIN_PORT, help="Port du serveur brain local")
+    parser.add_argument("--socket", type=Path, default=default_socket_path(), help="Socket du démon myhashcatd")
+    parser.add_argument("--no-daemon", action="store_true", help="Exécute la commande localement même si le démon est actif")
     subparsers = parser.add_subparsers(dest="command", help="Commandes disponibles")
 
     # Configuration du logging
     logger = logging.getLogger('myhashcat.cli')
+    hashcat = None
     
     try:
         # Commande start
@@ -73,10 +181,54 @@ def main():
         start_parser.add_argument("--charset", help="Jeu de caractères (A-Z0-9 par défaut)")
         start_parser.add_argument("--rules", type=Path, nargs="+", help="Fichiers de règles à utiliser")
         start_parser.add_argument("--mask", help="Masque pour l'attaque")
+        start_parser.add_argument("--word-mask", help="Caractères autorisés par position pour le générateur (syntaxe Hashcat, ex: ABC?d?d?u)")
+        start_parser.add_argument("--markov-corpus", help="Corpus de mots de passe ordonnant l'énumération par probabilité")
+        start_parser.add_argument("--markov-order", type=int, choices=[0, 1], default=1, help="Ordre du modèle de Markov")
+        start_parser.add_argument("--max-repeat", type=int, help="Répétitions consécutives maximales d'un même caractère")
+        start_parser.add_argument("--require-class", action="append", help="Classe de caractères requise (l, u, d, s ou liste de caractères)")
         start_parser.add_argument("--skip", type=int, help="Nombre de mots à sauter dans le dictionnaire")
         start_parser.add_argument("--auto-continue", action="store_true", help="Continue automatiquement avec un nouveau dictionnaire")
+        start_parser.add_argument("--pool", action="store_true", help="Met la session en attente de mutualisation (voir la commande pool)")
+        start_parser.add_argument("--distributed", action="store_true", help="Répartit la session entre des workers (voir les commandes coordinator et worker)")
+        start_parser.add_argument("--wordlist", help="Liste de mots externe (filtrée et dédupliquée) à la place des dictionnaires générés")
+        start_parser.add_argument("--left", help="Liste de gauche d'une attaque par combinaison (-a 1)")
+        start_parser.add_argument("--right", help="Liste de droite d'une attaque par combinaison (-a 1)")
+        start_parser.add_argument("--mask-suffix", help="Attaque hybride (-a 6) : masque Hashcat ajouté après chaque mot")
+        start_parser.add_argument("--mask-prefix", help="Attaque hybride (-a 7) : masque Hashcat placé devant chaque mot")
+        start_parser.add_argument("--instances", type=int, default=1, help="Nombre d'instances Hashcat se partageant chaque lot")
+        start_parser.add_argument("--instance-devices", nargs="+", help="Périphériques de chaque instance (--backend-devices, ex: 1 2,3)")
         start_parser.add_argument("-v", "--verbose", action="store_true", help="Mode verbeux")
 
+        # Commande pool
+        pool_parser = subparsers.add_parser("pool", help="Lance les sessions en attente en les mutualisant")
+        pool_parser.add_argument("-v", "--verbose", action="store_true", help="Mode verbeux")
+
+        # Commande queue
+        queue_parser = subparsers.add_parser("queue", help="Gère la file de travaux prioritaire")
+        queue_subparsers = queue_parser.add_subparsers(dest="queue_action", help="Actions sur la file")
+        queue_add_parser = queue_subparsers.add_parser("add", help="Place une attaque dans la file")
+        queue_add_parser.add_argument("name", help="Nom de la session")
+        queue_add_parser.add_argument("hash_file", type=Path, help="Fichier contenant le hash")
+        queue_add_parser.add_argument("--hash-type", type=int, help="Type de hash (détection automatique par défaut)")
+        queue_add_parser.add_argument("--charset", help="Jeu de caractères (A-Z0-9 par défaut)")
+        queue_add_parser.add_argument("--rules", type=Path, nargs="+", help="Fichiers de règles à utiliser")
+        queue_add_parser.add_argument("--mask", help="Masque pour l'attaque")
+        queue_add_parser.add_argument("--word-mask", help="Caractères autorisés par position pour le générateur (syntaxe Hashcat)")
+        queue_add_parser.add_argument("--markov-corpus", help="Corpus de mots de passe ordonnant l'énumération par probabilité")
+        queue_add_parser.add_argument("--markov-order", type=int, choices=[0, 1], default=1, help="Ordre du modèle de Markov")
+        queue_add_parser.add_argument("--max-repeat", type=int, help="Répétitions consécutives maximales d'un même caractère")
+        queue_add_parser.add_argument("--require-class", action="append", help="Classe de caractères requise (l, u, d, s ou liste de caractères)")
+        queue_add_parser.add_argument("--priority", type=int, default=0, help="Priorité (les plus grandes passent en premier)")
+        queue_add_parser.add_argument("--budget", type=float, help="Temps de cassage maximal en secondes")
+        queue_subparsers.add_parser("list", help="Liste les travaux")
+        queue_cancel_parser = queue_subparsers.add_parser("cancel", help="Annule un travail")
+        queue_cancel_parser.add_argument("job_id", help="Identifiant du travail")
+        queue_run_parser = queue_subparsers.add_parser("run", help="Planifie la file jusqu'à épuisement")
+        queue_run_parser.add_argument("--slots", type=int, default=1, help="Travaux exécutés simultanément")
+        queue_run_parser.add_argument("--quantum", type=float, default=600.0, help="Temps accordé avant de céder la place à un travail de même priorité (secondes)")
+        queue_run_parser.add_argument("--interval", type=float, default=10.0, help="Intervalle de planification (secondes)")
+        queue_run_parser.add_argument("--once", action="store_true", help="N'effectue qu'un tour de planification")
+
         # Commande continue
         continue_parser = subparsers.add_parser("continue", help="Continue une session avec un nouveau dictionnaire")
         continue_parser.add_argument("session_id", help="Identifiant de la session")
@@ -94,6 +246,58 @@ def main():
         # Commande list
         list_parser = subparsers.add_parser("list", help="Liste toutes les sessions")
 
+        # Commande rules
+        rules_parser = subparsers.add_parser("rules", help="Affiche les statistiques d'efficacité des règles")
+        rules_parser.add_argument("--limit", type=int, default=30, help="Nombre de règles affichées")
+
+        # Commande coverage
+        subparsers.add_parser("coverage", help="Affiche la couverture globale de chaque keyspace")
+
+        # Commande scan
+        scan_parser = subparsers.add_parser("scan", help="Détecte le type de hash de tous les fichiers d'un répertoire")
+        scan_parser.add_argument("directory", type=Path, help="Répertoire de fichiers de hash")
+        scan_parser.add_argument("--pattern", default="*", help="Motif des fichiers à analyser")
+        scan_parser.add_argument("--recursive", action="store_true", help="Parcourt les sous-répertoires")
+        scan_parser.add_argument("--workers", type=int, help="Nombre de threads d'analyse")
+
+        # Commande wordlist
+        wordlist_parser = subparsers.add_parser("wordlist", help="Filtre et déduplique une liste de mots externe")
+        wordlist_parser.add_argument("wordlist", type=Path, help="Liste de mots d'origine")
+        wordlist_parser.add_argument("--hash-type", type=int, help="Type de hash (longueurs acceptées)")
+        wordlist_parser.add_argument("--min-length", type=int, help="Longueur minimale des mots")
+        wordlist_parser.add_argument("--max-length", type=int, help="Longueur maximale des mots")
+        wordlist_parser.add_argument("--charset", help="Caractères autorisés")
+
+        # Commande bench
+        bench_parser = subparsers.add_parser("bench", help="Mesure chaque étape du pipeline et le débit de bout en bout")
+        bench_parser.add_argument("hash_file", type=Path, help="Fichier de hash de la configuration mesurée")
+        bench_parser.add_argument("--hash-type", type=int, help="Type de hash (détection automatique par défaut)")
+        bench_parser.add_argument("--charset", help="Jeu de caractères (A-Z0-9 par défaut)")
+        bench_parser.add_argument("--word-mask", help="Caractères autorisés par position (syntaxe Hashcat)")
+        bench_parser.add_argument("--rules", type=Path, nargs="+", help="Fichiers de règles")
+        bench_parser.add_argument("--words", type=int, default=200_000, help="Mots générés pour mesurer le générateur")
+        bench_parser.add_argument("--write-mb", type=int, default=64, help="Mégaoctets écrits pour mesurer le disque")
+        bench_parser.add_argument("--launches", type=int, default=3, help="Lancements de Hashcat pour mesurer le coût fixe")
+
+        # Commandes de répartition sur plusieurs machines
+        coordinator_parser = subparsers.add_parser("coordinator", help="Sert les sessions distribuées aux workers")
+        coordinator_parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute")
+        coordinator_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port d'écoute")
+        coordinator_parser.add_argument("--token", help="Jeton exigé des workers")
+        coordinator_parser.add_argument("--lease-seconds", type=float, default=120.0, help="Durée d'un bail sans battement de cœur")
+        worker_parser = subparsers.add_parser("worker", help="Traite les plages d'un coordinateur")
+        worker_parser.add_argument("coordinator", help="URL du coordinateur (http://hôte:port)")
+        worker_parser.add_argument("--hashcat", default="hashcat", help="Chemin vers l'exécutable hashcat")
+        worker_parser.add_argument("--name", help="Nom du worker (nom d'hôte par défaut)")
+        worker_parser.add_argument("--token", help="Jeton du coordinateur")
+        worker_parser.add_argument("--session", help="Ne traite que cette session")
+        worker_parser.add_argument("--heartbeat", type=float, default=10.0, help="Période des battements de cœur (secondes)")
+        worker_parser.add_argument("--once", action="store_true", help="S'arrête lorsqu'il n'y a plus de plage à traiter")
+
+        # Commande brain
+        brain_parser = subparsers.add_parser("brain", help="Gère le serveur brain local")
+        brain_parser.add_argument("action", choices=["start", "stop", "status"], help="Action sur le serveur")
+
         # Commande cleanup
         cleanup_parser = subparsers.add_parser("cleanup", help="Nettoie les ressources")
 
@@ -103,15 +307,76 @@ def main():
             parser.print_help()
             return
 
-        logger.debug(f"Commande reçue: {args.command}")
-        logger.debug(f"Arguments: {vars(args)}")
-
-        hashcat = MyHashcat()
+        logger.debug("Commande reçue: %s", args.command)
+        logger.debug("Arguments: %s", vars(args))
+
+        # Le worker n'utilise que le Hashcat local, sans sessions
+        if args.command == "worker":
+            worker = Worker(
+                args.coordinator,
+                hashcat_path=args.hashcat,
+                name=args.name,
+                token=args.token,
+                session_id=args.session,
+                heartbeat_interval=args.heartbeat
+            )
+            print(f"Worker {worker.name} connecté à {worker.coordinator_url}")
+            try:
+                done = worker.run(wait=not args.once)
+            except KeyboardInterrupt:
+                return 0
+            print(f"{done} plage(s) traitée(s)")
+            return 0
+
+        # Le démon, s'il répond, possède les processus : le CLI n'est qu'un client
+        client = None
+        if args.command in DAEMON_COMMANDS and not args.no_daemon and args.socket.exists():
+            candidate = DaemonClient(args.socket)
+            if not candidate.is_running():
+                # Exécuter localement lancerait des processus que le démon
+                # bloqué ne connaîtrait pas
+                print(
+                    f"Erreur: le démon ne répond pas sur {args.socket} "
+                    "(relancez myhashcatd, supprimez la socket résiduelle ou utilisez --no-daemon)"
+                )
+                return 1
+            ignored = daemon_ignored_options(parser, args)
+            if ignored:
+                print(
+                    f"Erreur: options sans effet sur le démon: {', '.join(ignored)} "
+                    "(configurez myhashcatd ou utilisez --no-daemon)"
+                )
+                return 1
+            client = candidate
+            logger.debug("Commande transmise au démon %s", args.socket)
+
+        hashcat = client or MyHashcat(
+            metrics_file=args.metrics_file,
+            batch_size=args.batch_size,
+            target_batch_seconds=args.batch_seconds,
+            cpu_governor=args.cpu_governor,
+            brain=args.brain or args.command == "brain",
+            brain_port=args.brain_port,
+            profile=args.profile,
+            profile_cpu=args.profile_cpu,
+            profile_memory=args.profile_memory
+        )
+        if args.metrics_port is not None and client is None:
+            REGISTRY.start_http_server(args.metrics_port)
+            logger.info("Métriques exposées sur le port %s", args.metrics_port)
 
         if args.command == "start":
             try:
                 # Conversion du charset en set si spécifié
                 charset = set(args.charset) if args.charset else None
+                if args.mask_suffix and args.mask_prefix:
+                    parser.error("--mask-suffix et --mask-prefix sont exclusifs")
+                if args.left or args.right:
+                    attack_mode = "combination"
+                elif args.mask_suffix or args.mask_prefix:
+                    attack_mode = "hybrid" if args.mask_suffix else "hybrid_prefix"
+                else:
+                    attack_mode = "straight"
                 
                 # Création de la session
                 session_id = hashcat.create_attack_session(
@@ -121,50 +386,133 @@ def main():
                     word_length=args.word_length,
                     charset=charset,
                     rules=args.rules,
-                    mask=args.mask,
+                    mask=args.mask_suffix or args.mask_prefix or args.mask,
                     skip=args.skip,
+                    position_charsets=parse_word_mask(args.word_mask),
+                    markov_corpus=resolve_path(args.markov_corpus),
+                    markov_order=args.markov_order,
+                    max_repeat=args.max_repeat,
+                    required_classes=args.require_class,
                     auto_continue=args.auto_continue,
+                    pool=args.pool,
+                    distributed=args.distributed,
+                    instances=args.instances,
+                    instance_devices=args.instance_devices,
+                    wordlist=resolve_path(args.wordlist),
+                    attack_mode=attack_mode,
+                    left_wordlist=resolve_path(args.left),
+                    right_wordlist=resolve_path(args.right),
                     verbose=args.verbose
                 )
                 
                 print(f"Session créée avec l'ID: {session_id}")
-                logger.info(f"Session {session_id} créée avec succès")
+                logger.info("Session %s créée avec succès", session_id)
                 
                 # Si auto-continue est activé, on surveille la session
-                if args.auto_continue:
+                # (le démon enchaîne lui-même les dictionnaires)
+                if args.auto_continue and client is not None:
+                    print("Auto-continue pris en charge par le démon")
+                elif args.auto_continue and not (args.pool or args.distributed or (args.wordlist and attack_mode == "straight")):
                     if args.verbose:
                         print("Mode auto-continue activé. Surveillance de la session...")
-                    logger.info(f"Mode auto-continue activé pour la session {session_id}")
+                    logger.info("Mode auto-continue activé pour la session %s", session_id)
                     while True:
                         try:
                             status = hashcat.get_session_status(session_id)
                             if status.get("status") == "finished" and status.get("recovered", 0) == 0:
                                 if args.verbose:
                                     print("\nDictionnaire épuisé, génération d'un nouveau dictionnaire...")
-                                logger.info(f"Dictionnaire épuisé pour la session {session_id}, continuation...")
+                                logger.info("Dictionnaire épuisé pour la session %s, continuation...", session_id)
                                 session_id = hashcat.continue_attack(session_id)
                                 print(f"Nouvelle session: {session_id}")
                             elif status.get("recovered", 0) > 0:
                                 print("\nHash craqué !")
-                                logger.info(f"Hash craqué dans la session {session_id}")
+                                logger.info("Hash craqué dans la session %s", session_id)
                                 break
-                            time.sleep(10)
+                            # Réveil dès la fin du processus Hashcat
+                            hashcat.wait_for_exit(timeout=10)
                         except Exception as e:
-                            logger.error(f"Erreur pendant la surveillance de la session: {str(e)}", exc_info=True)
+                            logger.error("Erreur pendant la surveillance de la session: %s", e, exc_info=True)
                             print(f"Erreur pendant la surveillance: {str(e)}")
                             break
 
             except Exception as e:
-                logger.error(f"Erreur lors du démarrage de la session: {str(e)}", exc_info=True)
+                logger.error("Erreur lors du démarrage de la session: %s", e, exc_info=True)
+                print(f"Erreur: {str(e)}")
+                return 1
+
+        elif args.command == "pool":
+            try:
+                pool_ids = hashcat.run_pooled_sessions(verbose=args.verbose)
+                if pool_ids:
+                    for pool_id in pool_ids:
+                        print(f"Pool démarré: {pool_id}")
+                else:
+                    print("Aucune session en attente")
+                logger.info("%s pool(s) démarré(s)", len(pool_ids))
+            except Exception as e:
+                logger.error("Erreur lors du démarrage des pools: %s", e, exc_info=True)
+                print(f"Erreur: {str(e)}")
+                return 1
+
+        elif args.command == "queue":
+            try:
+                if args.queue_action == "add":
+                    job_id = hashcat.submit_job(
+                        name=args.name,
+                        hash_file=args.hash_file,
+                        priority=args.priority,
+                        budget=args.budget,
+                        hash_type=args.hash_type,
+                        charset=set(args.charset) if args.charset else None,
+                        rules=args.rules,
+                        mask=args.mask,
+                        position_charsets=parse_word_mask(args.word_mask),
+                        markov_corpus=resolve_path(args.markov_corpus),
+                        markov_order=args.markov_order,
+                        max_repeat=args.max_repeat,
+                        required_classes=args.require_class
+                    )
+                    print(f"Travail ajouté à la file: {job_id}")
+                elif args.queue_action == "list":
+                    jobs = hashcat.list_jobs()
+                    if not jobs:
+                        print("Aucun travail dans la file")
+                    for job in jobs:
+                        budget = f"{job['budget']:.0f}s" if job.get("budget") is not None else "illimité"
+                        print(f"- {job['id']} [{job['params']['name']}] priorité {job['priority']}: "
+                              f"{job['status']} ({job['runtime']:.0f}s / {budget}, "
+                              f"session {job.get('session_id') or '-'})")
+                elif args.queue_action == "cancel":
+                    hashcat.cancel_job(args.job_id)
+                    print(f"Travail {args.job_id} annulé")
+                elif args.queue_action == "run":
+                    if client is not None:
+                        print("La file est planifiée par le démon (voir myhashcatd --job-slots)")
+                        return 0
+                    while True:
+                        events = hashcat.schedule_jobs(slots=args.slots, quantum=args.quantum)
+                        for kind, job_ids in events.items():
+                            for job_id in job_ids:
+                                print(f"{job_id}: {kind}")
+                        pending = [job for job in hashcat.list_jobs() if job["status"] in ("queued", "preempted", "running")]
+                        if args.once or not pending:
+                            break
+                        time.sleep(args.interval)
+                else:
+                    queue_parser.print_help()
+                    return 1
+            except Exception as e:
+                logger.error("Erreur lors de la gestion de la file: %s", e, exc_info=True)
                 print(f"Erreur: {str(e)}")
                 return 1
 
         elif args.command == "continue":
             try:
                 hashcat.continue_attack(args.session_id, verbose=args.verbose)
-                logger.info(f"Session {args.session_id} continuée avec succès")
+                logger.info("Session %s continuée avec succès", args.session_id)
             except Exception as e:
-                logger.error(f"Erreur lors de la continuation de la session: {str(e)}", exc_info=True)
+                logger.error("Erreur lors de la continuation de la session: %s", e, exc_info=True)
                 print(f"Erreur: {str(e)}")
                 return 1
 
@@ -175,13 +523,21 @@ def main():
                     print("\nStatut détaillé de la session:")
                     for key, value in status.items():
                         print(f"- {key}: {value}")
+                    resources = hashcat.resource_report() if isinstance(hashcat, MyHashcat) else {}
+                    if resources:
+                        print("\nRessources CPU:")
+                        print(f"- Génération : cœurs {resources['generator_cpus']}, {resources['generator_util']:.0%}")
+                        print(f"- Hashcat : cœurs {resources['hashcat_cpus']}, {resources['hashcat_util']:.0%}")
+                        print(f"- Goulot d'étranglement : {resources['bottleneck']}")
                 else:
                     print(f"Session {args.session_id}: {status.get('status', 'unknown')}")
+                    for entry in status.get("instances") or []:
+                        print(f"  {entry['key']}: mots {entry['start']:,} à {entry['end']:,}, {entry['state']}")
                     if status.get("recovered", 0) > 0:
                         print("Hash craqué !")
-                logger.info(f"Statut récupéré pour la session {args.session_id}: {status.get('status', 'unknown')}")
+                logger.info("Statut récupéré pour la session %s: %s", args.session_id, status.get('status', 'unknown'))
             except Exception as e:
-                logger.error(f"Erreur lors de la récupération du statut: {str(e)}", exc_info=True)
+                logger.error("Erreur lors de la récupération du statut: %s", e, exc_info=True)
                 print(f"Erreur: {str(e)}")
                 return 1
 
@@ -189,48 +545,162 @@ def main():
             try:
                 hashcat.stop_session(args.session_id)
                 print(f"Session {args.session_id} arrêtée")
-                logger.info(f"Session {args.session_id} arrêtée avec succès")
+                logger.info("Session %s arrêtée avec succès", args.session_id)
             except Exception as e:
-                logger.error(f"Erreur lors de l'arrêt de la session: {str(e)}", exc_info=True)
+                logger.error("Erreur lors de l'arrêt de la session: %s", e, exc_info=True)
                 print(f"Erreur: {str(e)}")
                 return 1
 
         elif args.command == "list":
             try:
-                sessions = hashcat.session_manager.list_sessions()
+                sessions = hashcat.list_sessions()
                 if sessions:
                     print("\nSessions:")
-                    for session_id in sessions:
-                        session = hashcat.session_manager.load_session(session_id)
-                        if session:
-                            pid = session.get("process_pid")
-                            pid_exists = pid and os.path.exists(f"/proc/{pid}")
-                            
-                            if not pid_exists and session.get("status") == "running":
-                                session["status"] = "finished"
-                                hashcat.session_manager.update_session(session_id, {"status": "finished"})
-                            
-                            status = session.get("status", "unknown")
-                            name = session.get("name", "Sans nom")
-                            name_display = f"\033[91m{name}\033[0m" if not pid_exists else name
-                            pid_display = f"PID: {pid}" if pid_exists else "\033[91mAucun PID\033[0m"
-                            print(f"- {session_id} ({name_display}): {status} [{pid_display}]")
-                    logger.info(f"Liste des sessions affichée ({len(sessions)} sessions)")
+                    for session_id, session in sessions.items():
+                        pid = session.get("process_pid")
+                        pid_exists = session.get("pid_alive")
+                        status = session.get("status", "unknown")
+                        name = session.get("name", "Sans nom")
+                        name_display = f"\033[91m{name}\033[0m" if not pid_exists else name
+                        pid_display = f"PID: {pid}" if pid_exists else "\033[91mAucun PID\033[0m"
+                        print(f"- {session_id} ({name_display}): {status} [{pid_display}]")
+                    logger.info("Liste des sessions affichée (%s sessions)", len(sessions))
                 else:
                     print("Aucune session trouvée")
                     logger.info("Aucune session trouvée")
             except Exception as e:
-                logger.error(f"Erreur lors de la récupération des sessions: {str(e)}", exc_info=True)
+                logger.error("Erreur lors de la récupération des sessions: %s", e, exc_info=True)
                 print(f"Erreur: {str(e)}")
                 return 1
 
+        elif args.command == "rules":
+            summary = hashcat.rule_stats.summary()
+            if not summary:
+                print("Aucune statistique de règles disponible")
+            else:
+                print(f"\n{'Règle':<20} {'Hits':>8} {'Candidats':>16} {'Coût/hit':>14}")
+                for entry in summary[:args.limit]:
+                    cost = "∞" if entry["cost_per_hit"] == float("inf") else f"{entry['cost_per_hit']:,.0f}"
+                    marker = " (écartée)" if hashcat.rule_stats.is_unproductive(entry["rule"]) else ""
+                    print(f"{entry['rule']:<20} {entry['hits']:>8} {entry['candidates']:>16,} {cost:>14}{marker}")
+
+        elif args.command == "coverage":
+            report = hashcat.coverage_report()
+            if not report:
+                print("Aucune plage parcourue enregistrée")
+            else:
+                print(f"\n{'Keyspace':<22} {'Session':<16} {'Parcourus':>16} {'Couverture':>12} {'Plages':>7}")
+                for key, entry in report.items():
+                    name = (entry.get("description") or {}).get("name") or "-"
+                    percent = f"{entry['percent']:.6f}%" if entry.get("percent") is not None else "?"
+                    print(f"{key:<22} {name:<16} {entry['covered']:>16,} {percent:>12} {entry['ranges']:>7}")
+
+        elif args.command == "scan":
+            try:
+                results = hashcat.scan_hashes(
+                    args.directory, pattern=args.pattern, recursive=args.recursive, workers=args.workers
+                )
+            except Exception as e:
+                logger.error("Erreur lors de l'analyse de %s: %s", args.directory, e, exc_info=True)
+                print(f"Erreur: {str(e)}")
+                return 1
+            if not results:
+                print("Aucun fichier trouvé")
+            for path, detected in results.items():
+                kind = f"{detected['name']} (ID: {detected['id']})" if detected else "non reconnu"
+                print(f"{path}: {kind}")
+
+        elif args.command == "wordlist":
+            try:
+                result = hashcat.prepare_wordlist(
+                    args.wordlist,
+                    hash_type=args.hash_type,
+                    min_length=args.min_length,
+                    max_length=args.max_length,
+                    charset=args.charset
+                )
+            except Exception as e:
+                logger.error("Erreur lors de la préparation de %s: %s", args.wordlist, e, exc_info=True)
+                print(f"Erreur: {str(e)}")
+                return 1
+            print(f"Liste préparée : {result['path']}{' (en cache)' if result['cached'] else ''}")
+            print(f"- Mots lus : {result['read']:,}")
+            print(f"- Conservés : {result['kept']:,}")
+            print(f"- Filtrés (longueur {result['min_length']}-{result['max_length']}, charset) : {result['filtered']:,}")
+            print(f"- Doublons : {result['duplicates']:,}")
+
+        elif args.command == "brain":
+            try:
+                if args.action == "start":
+                    state = hashcat.brain.start()
+                    print(f"Serveur brain actif sur {state['host']}:{state['port']} (PID {state['pid']})")
+                elif args.action == "stop":
+                    print("Serveur brain arrêté" if hashcat.brain.stop() else "Aucun serveur brain actif")
+                state = hashcat.brain.status()
+            except Exception as e:
+                logger.error("Erreur du serveur brain: %s", e, exc_info=True)
+                print(f"Erreur: {str(e)}")
+                return 1
+            if args.action == "status":
+                running = f"actif (PID {state['pid']})" if state["running"] else "arrêté"
+                print(f"Serveur brain {state['host']}:{state['port']} : {running}")
+            totals = state["totals"]
+            print(f"- Attaques clientes : {totals['attacks']:,}")
+            print(f"- Candidats rejetés : {totals['rejected']:,} sur {totals['candidates']:,} ({100 * totals['rejected_ratio']:.2f}%)")
+            print(f"- Temps économisé : {totals['saved_seconds']:.1f}s")
+
+        elif args.command == "bench":
+            try:
+                result = hashcat.benchmark(
+                    args.hash_file,
+                    hash_type=args.hash_type,
+                    charset=set(args.charset) if args.charset else None,
+                    position_charsets=parse_word_mask(args.word_mask),
+                    rules=args.rules,
+                    sample_words=args.words,
+                    write_bytes=args.write_mb * 1024 * 1024,
+                    launches=args.launches
+                )
+            except Exception as e:
+                logger.error("Erreur lors du banc d'essai: %s", e, exc_info=True)
+                print(f"Erreur: {str(e)}")
+                return 1
+            print(f"Type de hash : {result['hash_type']}")
+            print(f"Générateur   : {result['generation']['words_per_second']:,.0f} mots/s")
+            print(f"Écriture     : {result['write']['bytes_per_second'] / 1024 / 1024:,.1f} Mo/s")
+            print(f"Lancement    : {result['launch']['seconds']:.2f} s par lot")
+            speed = result["hashcat_speed"]
+            print(f"Hashcat      : {f'{speed:,.0f} H/s' if speed else 'non mesuré'}")
+            print(f"\nLot de {result['batch_words']:,} mots × {result['rules_multiplier']} règle(s)")
+            print(f"{'Étape':<26} {'s/lot':>10} {'part':>7} {'candidats/s':>16}")
+            print("-" * 62)
+            for stage, entry in result["stages"].items():
+                print(
+                    f"{bench.STAGE_NAMES[stage]:<26} {entry['seconds_per_batch']:>10.2f} "
+                    f"{entry['share']:>7.1%} {entry['candidates_per_second']:>16,.0f}"
+                )
+            print(f"\nDébit de bout en bout : {result['end_to_end']:,.0f} candidats/s")
+            print(f"Étape limitante      : {bench.STAGE_NAMES[result['bottleneck']]}")
+            if speed is None:
+                print("Attention : vitesse de Hashcat non mesurée, le cassage n'est pas compté")
+
+        elif args.command == "coordinator":
+            coordinator = CoordinatorServer(
+                hashcat, host=args.host, port=args.port, token=args.token, lease_seconds=args.lease_seconds
+            )
+            print(f"Coordinateur à l'écoute sur {coordinator.url}")
+            try:
+                coordinator.serve_forever()
+            except KeyboardInterrupt:
+                pass
+
         elif args.command == "cleanup":
             try:
                 hashcat.cleanup()
                 print("Nettoyage terminé")
                 logger.info("Nettoyage des ressources effectué avec succès")
             except Exception as e:
-                logger.error(f"Erreur lors du nettoyage: {str(e)}", exc_info=True)
+                logger.error("Erreur lors du nettoyage: %s", e, exc_info=True)
                 print(f"Erreur: {str(e)}")
                 return 1
 
@@ -239,9 +709,12 @@ def main():
             return 1
 
     except Exception as e:
-        logger.error(f"Erreur non gérée: {str(e)}", exc_info=True)
+        logger.error("Erreur non gérée: %s", e, exc_info=True)
         print(f"Erreur inattendue: {str(e)}")
         return 1
+    finally:
+        if isinstance(hashcat, MyHashcat):
+            hashcat.report_profile()
 
     return 0
 
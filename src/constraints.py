@@ -0,0 +1,183 @@
+"""
+Module de contraintes structurelles sur le keyspace
+
+Une grande partie du keyspace est invraisemblable pour nos cibles : longues
+suites d'un même caractère, classes de caractères absentes... Plutôt que de
+filtrer les mots après génération, les contraintes sont appliquées pendant
+l'énumération. Un comptage par programmation dynamique donne la taille exacte
+de l'espace contraint ainsi qu'une numérotation (rang ↔ mot) compacte, ce qui
+permet de reprendre une session par index dans l'espace réduit.
+"""
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+
+# Classes de caractères nommées utilisables dans required_classes
+CLASS_NAMES = {
+    "l": "abcdefghijklmnopqrstuvwxyz",
+    "u": "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "d": "0123456789",
+    "s": " !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~",
+}
+
+# État d'énumération : (dernier caractère, longueur de la répétition en cours,
+# masque des classes déjà présentes)
+State = Tuple[Optional[str], int, int]
+
+
+class KeyspaceConstraints:
+    """Contraintes déclaratives sur les mots énumérés"""
+
+    def __init__(
+        self,
+        max_repeat: Optional[int] = None,
+        required_classes: Optional[List[str]] = None
+    ):
+        """
+        Initialise les contraintes
+
+        Args:
+            max_repeat (Optional[int]): Nombre maximal de répétitions
+                consécutives d'un même caractère
+            required_classes (Optional[List[str]]): Classes devant apparaître
+                au moins une fois : nom (« l », « u », « d », « s ») ou liste
+                explicite de caractères
+        """
+        if max_repeat is not None and max_repeat < 1:
+            raise ValueError("Le nombre maximal de répétitions doit être supérieur à 0")
+        self.max_repeat = max_repeat
+        self.required_classes = list(required_classes or [])
+        self.class_sets = [set(CLASS_NAMES.get(name, name)) for name in self.required_classes]
+        if any(not chars for chars in self.class_sets):
+            raise ValueError("Une classe de caractères requise ne peut pas être vide")
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["KeyspaceConstraints"]:
+        """Reconstruit des contraintes sérialisées par to_dict (None si aucune)"""
+        if not data:
+            return None
+        return cls(max_repeat=data.get("max_repeat"), required_classes=data.get("required_classes"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sérialise les contraintes pour la configuration d'une session"""
+        return {"max_repeat": self.max_repeat, "required_classes": self.required_classes}
+
+    def allows(self, word: str) -> bool:
+        """
+        Vérifie qu'un mot respecte les contraintes
+
+        Args:
+            word (str): Mot à vérifier
+
+        Returns:
+            bool: True si le mot appartient à l'espace contraint
+        """
+        if self.max_repeat is not None:
+            run = 0
+            previous = None
+            for char in word:
+                run = run + 1 if char == previous else 1
+                if run > self.max_repeat:
+                    return False
+                previous = char
+        return all(chars.intersection(word) for chars in self.class_sets)
+
+
+class ConstrainedSpace:
+    """Comptage exact des mots respectant des contraintes"""
+
+    def __init__(self, position_lists: Sequence[Sequence[str]], constraints: KeyspaceConstraints):
+        """
+        Initialise l'espace contraint
+
+        Args:
+            position_lists (Sequence[Sequence[str]]): Caractères de chaque
+                position
+            constraints (KeyspaceConstraints): Contraintes à respecter
+        """
+        self.position_lists = [list(chars) for chars in position_lists]
+        self._position_sets = [set(chars) for chars in self.position_lists]
+        self.constraints = constraints
+        self.length = len(self.position_lists)
+        self.full_mask = (1 << len(constraints.class_sets)) - 1
+        self._class_bits: Dict[str, int] = {}
+        for chars in self.position_lists:
+            for char in chars:
+                if char not in self._class_bits:
+                    self._class_bits[char] = sum(
+                        1 << i for i, class_set in enumerate(constraints.class_sets) if char in class_set
+                    )
+        self._completions: Dict[Tuple[int, State], int] = {}
+        self._any_next: Dict[Tuple[int, int], int] = {}
+        self.initial_state: State = (None, 0, 0)
+        self.total = self.completions(0, self.initial_state)
+
+    def step(self, state: State, char: str) -> Optional[State]:
+        """
+        Ajoute un caractère à un préfixe
+
+        Args:
+            state (State): État du préfixe
+            char (str): Caractère ajouté
+
+        Returns:
+            Optional[State]: Nouvel état, None si la contrainte de répétition
+                est violée
+        """
+        last, run, mask = state
+        mask |= self._class_bits[char]
+        max_repeat = self.constraints.max_repeat
+        if max_repeat is None:
+            return (None, 0, mask)
+        run = run + 1 if char == last else 1
+        if run > max_repeat:
+            return None
+        return (char, run, mask)
+
+    def completions(self, position: int, state: State) -> int:
+        """
+        Nombre de suffixes valides à partir d'une position
+
+        Args:
+            position (int): Position du prochain caractère
+            state (State): État du préfixe déjà fixé
+
+        Returns:
+            int: Nombre de façons de compléter le mot
+        """
+        if position == self.length:
+            return 1 if state[2] == self.full_mask else 0
+        key = (position, state)
+        cached = self._completions.get(key)
+        if cached is not None:
+            return cached
+
+        last, run, mask = state
+        # Somme sur tous les caractères comme s'ils démarraient une nouvelle
+        # suite, puis correction pour le caractère identique au précédent
+        total = self._sum_new_runs(position, mask)
+        if last is not None and last in self._position_sets[position]:
+            next_mask = mask | self._class_bits[last]
+            total -= self.completions(position + 1, (last, 1, next_mask))
+            if run < self.constraints.max_repeat:
+                total += self.completions(position + 1, (last, run + 1, next_mask))
+        self._completions[key] = total
+        return total
+
+    def _sum_new_runs(self, position: int, mask: int) -> int:
+        """Somme des complétions lorsque chaque caractère débute une nouvelle suite"""
+        key = (position, mask)
+        cached = self._any_next.get(key)
+        if cached is not None:
+            return cached
+        if self.constraints.max_repeat is None:
+            total = sum(
+                self.completions(position + 1, (None, 0, mask | self._class_bits[char]))
+                for char in self.position_lists[position]
+            )
+        else:
+            total = sum(
+                self.completions(position + 1, (char, 1, mask | self._class_bits[char]))
+                for char in self.position_lists[position]
+            )
+        self._any_next[key] = total
+        return total
@@ -0,0 +1,226 @@
+"""
+Module d'index de couverture du keyspace
+
+La couverture n'était connue qu'implicitement, via la chaîne
+``next_word_index`` / ``previous_session`` de chaque session : relancer une
+attaque avec ``start`` au lieu de ``continue`` reparcourait le keyspace depuis
+l'index 0. L'index conserve, pour chaque keyspace canonique (charset,
+longueur, contraintes, ordre d'énumération, règles) et chaque empreinte de
+hashs, la liste triée des intervalles déjà parcourus, fusionnés à chaque
+ajout. Trouver le prochain index non couvert se fait par dichotomie et le
+total couvert est tenu à jour à chaque ajout.
+"""
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import yaml
+
+from .rule_stats import read_rules
+from .session_manager import atomic_write_yaml, store_lock
+
+
+def hash_fingerprint(hash_file: Path) -> str:
+    """
+    Calcule l'empreinte d'un ensemble de hashs
+
+    L'ordre des lignes, les doublons et les lignes vides sont ignorés.
+
+    Args:
+        hash_file (Path): Fichier de hashs
+
+    Returns:
+        str: Empreinte SHA-1 des hashs
+    """
+    with Path(hash_file).open("r", errors="ignore") as f:
+        hashes = sorted({line.strip() for line in f if line.strip()})
+    return hashlib.sha1("\n".join(hashes).encode()).hexdigest()
+
+
+def rules_signature(rules_file: Path) -> str:
+    """
+    Empreinte de l'ensemble des règles d'un fichier
+
+    Les versions classées et élaguées d'un même fichier n'ont ni le même nom
+    ni le même ordre : seul l'ensemble des règles appliquées compte.
+
+    Args:
+        rules_file (Path): Fichier de règles
+
+    Returns:
+        str: Empreinte SHA-1 des règles, ou le chemin si le fichier est illisible
+    """
+    try:
+        rules = sorted(read_rules(Path(rules_file)))
+    except OSError:
+        return str(rules_file)
+    return hashlib.sha1("\n".join(rules).encode("utf-8")).hexdigest()
+
+
+def keyspace_key(config: Dict[str, Any], rules: Optional[List[Path]] = None) -> str:
+    """
+    Calcule la clé canonique du keyspace d'une session et de ses hashs
+
+    Deux sessions partagent la même clé si un index donné désigne le même
+    candidat pour les mêmes hashs.
+
+    Args:
+        config (Dict[str, Any]): Configuration ou données de la session
+        rules (Optional[List[Path]]): Règles réellement passées à Hashcat
+            (``active_rules``) ; par défaut celles de la configuration
+
+    Returns:
+        str: Clé de l'index de couverture
+    """
+    if rules is None:
+        rules = config.get("rules")
+    canonical = {
+        "hashes": hash_fingerprint(Path(config["hash_file"])),
+        "hash_type": config.get("hash_type"),
+        "attack_mode": config.get("attack_mode", "straight"),
+        "word_length": config.get("word_length"),
+        "charset": "".join(sorted(config.get("charset") or [])),
+        "position_charsets": config.get("position_charsets"),
+        "markov_model": config.get("markov_model"),
+        "constraints": config.get("constraints"),
+        "rules": sorted(rules_signature(r) for r in rules or []),
+        "mask": config.get("mask"),
+    }
+    return hashlib.sha1(json.dumps(canonical, sort_keys=True).encode()).hexdigest()[:20]
+
+
+class CoverageIndex:
+    """Intervalles parcourus par keyspace canonique (YAML)"""
+
+    def __init__(self, index_file: Path):
+        """
+        Initialise l'index
+
+        Args:
+            index_file (Path): Fichier YAML de stockage
+        """
+        self.index_file = index_file
+        self._keyspaces: Dict[str, Dict[str, Any]] = {}
+        self._loaded_mtime: Optional[int] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Charge l'index si le fichier a changé depuis la dernière lecture"""
+        try:
+            mtime = self.index_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._keyspaces, self._loaded_mtime = {}, None
+            return self._keyspaces
+        if mtime != self._loaded_mtime:
+            with self.index_file.open("r") as f:
+                data = yaml.safe_load(f) or {}
+            self._keyspaces = data.get("keyspaces", {})
+            self._loaded_mtime = mtime
+        return self._keyspaces
+
+    def _save(self) -> None:
+        """Enregistre l'index"""
+        atomic_write_yaml(self.index_file, {"updated_at": datetime.now().isoformat(), "keyspaces": self._keyspaces})
+        self._loaded_mtime = self.index_file.stat().st_mtime_ns
+
+    def add(
+        self,
+        key: str,
+        start: int,
+        end: int,
+        total: Optional[int] = None,
+        description: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Marque un intervalle comme parcouru
+
+        Args:
+            key (str): Clé du keyspace (keyspace_key)
+            start (int): Premier index parcouru
+            end (int): Index suivant le dernier index parcouru
+            total (Optional[int]): Taille du keyspace
+            description (Optional[Dict[str, Any]]): Informations affichées
+                dans le rapport
+
+        Returns:
+            int: Nombre total d'index couverts pour ce keyspace
+        """
+        # Relecture sous verrou : les intervalles ajoutés par d'autres
+        # processus depuis la dernière lecture sont conservés
+        with store_lock(self.index_file):
+            self._loaded_mtime = None
+            keyspaces = self._load()
+            entry = keyspaces.setdefault(key, {"starts": [], "ends": [], "covered": 0})
+            if total is not None:
+                entry["total"] = total
+            if description:
+                entry["description"] = description
+            if end <= start:
+                return entry["covered"]
+
+            starts, ends = entry["starts"], entry["ends"]
+            # Intervalles chevauchant ou touchant [start, end)
+            first = bisect_left(ends, start)
+            last = bisect_right(starts, end)
+            if first < last:
+                removed = sum(e - s for s, e in zip(starts[first:last], ends[first:last]))
+                start = min(start, starts[first])
+                end = max(end, ends[last - 1])
+            else:
+                removed = 0
+            starts[first:last] = [start]
+            ends[first:last] = [end]
+            entry["covered"] += (end - start) - removed
+            entry["updated_at"] = datetime.now().isoformat()
+            self._save()
+            return entry["covered"]
+
+    def next_uncovered(self, key: str, index: int = 0) -> Tuple[int, Optional[int]]:
+        """
+        Cherche le premier index non parcouru
+
+        Args:
+            key (str): Clé du keyspace
+            index (int): Index à partir duquel chercher
+
+        Returns:
+            Tuple[int, Optional[int]]: Premier index non couvert et début de
+                l'intervalle couvert suivant (None s'il n'y en a pas)
+        """
+        entry = self._load().get(key)
+        if not entry or not entry["starts"]:
+            return index, None
+        starts, ends = entry["starts"], entry["ends"]
+        position = bisect_right(starts, index) - 1
+        if position >= 0 and ends[position] > index:
+            index = ends[position]
+        following = bisect_right(starts, index)
+        return index, starts[following] if following < len(starts) else None
+
+    def coverage(self, key: str) -> Dict[str, Any]:
+        """
+        Retourne la couverture d'un keyspace
+
+        Args:
+            key (str): Clé du keyspace
+
+        Returns:
+            Dict[str, Any]: Index couverts, taille, pourcentage et nombre
+                d'intervalles
+        """
+        entry = self._load().get(key) or {"starts": [], "covered": 0}
+        total = entry.get("total")
+        return {
+            "key": key,
+            "covered": entry["covered"],
+            "total": total,
+            "percent": 100.0 * entry["covered"] / total if total else None,
+            "ranges": len(entry["starts"]),
+            "description": entry.get("description", {}),
+        }
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Couverture de tous les keyspaces de l'index"""
+        return {key: self.coverage(key) for key in self._load()}
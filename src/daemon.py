@@ -0,0 +1,549 @@
+"""
+Démon myhashcatd
+
+Le démon possède les processus Hashcat, les générateurs de dictionnaires et
+l'état en mémoire des sessions. Il expose une API JSON-RPC 2.0 (un objet
+JSON par ligne) sur une socket Unix : le CLI devient un client léger et les
+appels successifs retrouvent les processus lancés par les appels précédents.
+"""
+import argparse
+import inspect
+import itertools
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .myhashcat import MyHashcat
+from .brain import DEFAULT_PORT as BRAIN_PORT
+from .metrics import REGISTRY
+
+
+JSONRPC_VERSION = "2.0"
+
+# Codes d'erreur JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+APPLICATION_ERROR = -32000
+
+# Méthodes traitées sans le verrou de MyHashcat : elles doivent répondre même
+# pendant un appel long (génération d'un dictionnaire)
+LOCK_FREE_METHODS = {"ping", "shutdown"}
+
+
+def default_socket_path() -> Path:
+    """
+    Chemin par défaut de la socket du démon
+
+    Returns:
+        Path: Variable d'environnement MYHASHCAT_SOCKET ou
+            ~/.myhashcat/myhashcatd.sock
+    """
+    return Path(os.environ.get("MYHASHCAT_SOCKET", Path.home() / ".myhashcat" / "myhashcatd.sock"))
+
+
+class DaemonError(RuntimeError):
+    """Erreur renvoyée par le démon"""
+
+    def __init__(self, message: str, code: int = APPLICATION_ERROR):
+        super().__init__(message)
+        self.code = code
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Traite les requêtes d'une connexion, une par ligne"""
+
+    def handle(self):
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            response = self.server.owner.handle_line(raw)
+            if response is not None:
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serveur Unix traitant chaque connexion dans un thread"""
+
+    daemon_threads = True
+
+
+class MyHashcatDaemon:
+    """Démon exposant MyHashcat via JSON-RPC sur une socket Unix"""
+
+    def __init__(
+        self,
+        hashcat: MyHashcat,
+        socket_path: Optional[Path] = None,
+        monitor_interval: float = 5.0,
+        job_slots: int = 1
+    ):
+        """
+        Initialise le démon
+
+        Args:
+            hashcat (MyHashcat): Instance propriétaire des processus
+            socket_path (Optional[Path]): Socket d'écoute
+            monitor_interval (float): Intervalle de surveillance des sessions
+                en cours (secondes)
+            job_slots (int): Nombre de travaux de la file exécutés
+                simultanément
+        """
+        self.hashcat = hashcat
+        self.socket_path = socket_path or default_socket_path()
+        self.monitor_interval = monitor_interval
+        self.job_slots = job_slots
+        self.logger = logging.getLogger('myhashcat.daemon')
+        # MyHashcat n'est pas thread-safe : les appels sont sérialisés, y
+        # compris avec le traitement des hashs retrouvés (suiveur de sortie)
+        self._lock = hashcat.lock
+        self._auto_continue: Set[str] = set()
+        self._stopping = threading.Event()
+        self._server: Optional[_UnixServer] = None
+        self._monitor: Optional[threading.Thread] = None
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "ping": self.ping,
+            "create_attack_session": self.create_attack_session,
+            "continue_attack": self.continue_attack,
+            "get_session_status": self.hashcat.get_session_status,
+            "stop_session": self.stop_session,
+            "list_sessions": self.hashcat.list_sessions,
+            "run_pooled_sessions": self.hashcat.run_pooled_sessions,
+            "resource_report": self.hashcat.resource_report,
+            "coverage_report": self.hashcat.coverage_report,
+            "submit_job": self.submit_job,
+            "list_jobs": self.hashcat.list_jobs,
+            "cancel_job": self.hashcat.cancel_job,
+            "shutdown": self.request_shutdown,
+        }
+
+    def handle_line(self, raw: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Traite une requête JSON-RPC reçue sous forme de ligne
+
+        Args:
+            raw (bytes): Ligne reçue
+
+        Returns:
+            Optional[Dict[str, Any]]: Réponse, ou None pour une notification
+        """
+        try:
+            request = json.loads(raw)
+        except ValueError as e:
+            return self._error(None, PARSE_ERROR, f"JSON invalide: {e}")
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return self._error(None, INVALID_REQUEST, "Requête JSON-RPC invalide")
+
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return self._error(request_id, METHOD_NOT_FOUND, f"Méthode inconnue: {request['method']}")
+
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return self._error(request_id, INVALID_PARAMS, "Les paramètres doivent être nommés")
+
+        # Seul un échec de liaison des arguments est une erreur de paramètres :
+        # un TypeError levé pendant l'appel est une erreur applicative
+        try:
+            inspect.signature(method).bind(**params)
+        except TypeError as e:
+            return self._error(request_id, INVALID_PARAMS, str(e))
+
+        try:
+            if request["method"] in LOCK_FREE_METHODS:
+                result = method(**params)
+            else:
+                with self._lock:
+                    result = method(**params)
+        except Exception as e:
+            self.logger.error("Erreur lors de l'appel %s: %s", request["method"], e, exc_info=True)
+            return self._error(request_id, APPLICATION_ERROR, str(e))
+
+        if "id" not in request:
+            return None
+        return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        """Construit une réponse d'erreur JSON-RPC"""
+        return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "error": {"code": code, "message": message}}
+
+    def ping(self) -> Dict[str, Any]:
+        """
+        Vérifie que le démon répond
+
+        Le nombre de sessions actives n'est lu que si MyHashcat est libre
+        (None sinon) : le ping n'attend jamais la fin d'un autre appel.
+        """
+        active_sessions = None
+        if self._lock.acquire(blocking=False):
+            try:
+                active_sessions = len(self.hashcat.active_sessions())
+            finally:
+                self._lock.release()
+        return {
+            "pid": os.getpid(),
+            "hashcat_version": self.hashcat.hashcat.version,
+            "active_sessions": active_sessions,
+        }
+
+    def create_attack_session(
+        self,
+        name: str,
+        hash_file: str,
+        charset: Optional[List[str]] = None,
+        rules: Optional[List[str]] = None,
+        auto_continue: bool = False,
+        **kwargs: Any
+    ) -> str:
+        """
+        Crée une session à partir de paramètres JSON
+
+        Les chemins et le charset sont reconvertis ; avec ``auto_continue``
+        le démon enchaîne lui-même les dictionnaires.
+        """
+        session_id = self.hashcat.create_attack_session(
+            name=name,
+            hash_file=Path(hash_file),
+            charset=set(charset) if charset else None,
+            rules=[Path(r) for r in rules] if rules else None,
+            auto_continue=auto_continue,
+            **kwargs
+        )
+        hybrid = kwargs.get("attack_mode") in ("hybrid", "hybrid_prefix")
+        if auto_continue and not (
+            kwargs.get("pool") or kwargs.get("distributed") or (kwargs.get("wordlist") and not hybrid)
+        ):
+            self._auto_continue.add(session_id)
+        return session_id
+
+    def continue_attack(self, session_id: str, verbose: bool = False) -> str:
+        """Continue une session et transfère le suivi automatique"""
+        new_session_id = self.hashcat.continue_attack(session_id, verbose=verbose)
+        if session_id in self._auto_continue:
+            self._auto_continue.discard(session_id)
+            self._auto_continue.add(new_session_id)
+        return new_session_id
+
+    def stop_session(self, session_id: str) -> None:
+        """Arrête une session et désactive son suivi automatique"""
+        self._auto_continue.discard(session_id)
+        self.hashcat.stop_session(session_id)
+
+    def submit_job(
+        self,
+        name: str,
+        hash_file: str,
+        charset: Optional[List[str]] = None,
+        rules: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> str:
+        """Place une attaque dans la file à partir de paramètres JSON"""
+        return self.hashcat.submit_job(
+            name=name,
+            hash_file=Path(hash_file),
+            charset=set(charset) if charset else None,
+            rules=[Path(r) for r in rules] if rules else None,
+            **kwargs
+        )
+
+    def monitor_once(self) -> None:
+        """
+        Met à jour les sessions en cours et enchaîne les dictionnaires
+
+        Interroger régulièrement les processus évite qu'ils restent zombies
+        et maintient l'état des sessions à jour sans appel du client. La
+        file de travaux est planifiée à chaque passage.
+        """
+        with self._lock:
+            try:
+                self.hashcat.schedule_jobs(slots=self.job_slots)
+            except Exception as e:
+                self.logger.error("Erreur de planification de la file: %s", e, exc_info=True)
+            for session_id in self.hashcat.active_sessions():
+                try:
+                    status = self.hashcat.get_session_status(session_id)
+                except Exception as e:
+                    self.logger.error("Erreur de surveillance de %s: %s", session_id, e)
+                    continue
+                if session_id not in self._auto_continue or status.get("status") != "finished":
+                    continue
+                self._auto_continue.discard(session_id)
+                if status.get("recovered", 0) > 0:
+                    self.logger.info("Hash craqué dans la session %s", session_id)
+                    continue
+                try:
+                    new_session_id = self.hashcat.continue_attack(session_id)
+                    self._auto_continue.add(new_session_id)
+                    self.logger.info("Dictionnaire épuisé pour %s, continuation: %s", session_id, new_session_id)
+                except Exception as e:
+                    self.logger.error("Continuation impossible pour %s: %s", session_id, e)
+
+    def _monitor_loop(self) -> None:
+        """
+        Boucle de surveillance exécutée dans un thread
+
+        Le passage suivant a lieu dès la fin d'un processus Hashcat, ou au
+        plus tard après monitor_interval.
+        """
+        while not self._stopping.is_set():
+            self.hashcat.wait_for_exit(timeout=self.monitor_interval)
+            if self._stopping.is_set():
+                break
+            self.monitor_once()
+
+    def start(self) -> None:
+        """
+        Ouvre la socket et démarre la surveillance
+
+        Une socket existante à laquelle personne ne répond est considérée
+        comme résiduelle et remplacée.
+        """
+        if self.socket_path.exists():
+            if DaemonClient(self.socket_path).is_running():
+                raise RuntimeError(f"Un démon écoute déjà sur {self.socket_path}")
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._server = _UnixServer(str(self.socket_path), _RequestHandler)
+        self._server.owner = self
+        os.chmod(self.socket_path, 0o600)
+        self._monitor = threading.Thread(target=self._monitor_loop, name="myhashcatd-monitor", daemon=True)
+        self._monitor.start()
+        self.logger.info("Démon à l'écoute sur %s", self.socket_path)
+
+    def serve_forever(self) -> None:
+        """Traite les requêtes jusqu'à l'arrêt du démon"""
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._close()
+
+    def request_shutdown(self) -> bool:
+        """Demande l'arrêt du démon après la réponse en cours"""
+        threading.Thread(target=self.shutdown, name="myhashcatd-shutdown", daemon=True).start()
+        return True
+
+    def shutdown(self) -> None:
+        """
+        Arrête le démon
+
+        Les processus Hashcat en cours ne sont pas interrompus.
+        """
+        self._stopping.set()
+        self.hashcat.process_watcher.wakeup()
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _close(self) -> None:
+        """Ferme la socket et la supprime du disque"""
+        self._stopping.set()
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+        self.logger.info("Démon arrêté")
+
+
+class DaemonClient:
+    """Client JSON-RPC du démon, utilisable à la place de MyHashcat"""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: Optional[float] = None):
+        """
+        Initialise le client
+
+        Args:
+            socket_path (Optional[Path]): Socket du démon
+            timeout (Optional[float]): Délai maximal d'un appel (aucun par
+                défaut, la génération d'un dictionnaire pouvant être longue)
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+
+    def call(self, method: str, timeout: Optional[float] = None, **params: Any) -> Any:
+        """
+        Appelle une méthode du démon
+
+        Args:
+            method (str): Nom de la méthode
+            timeout (Optional[float]): Délai propre à cet appel
+            **params: Paramètres nommés
+
+        Returns:
+            Any: Résultat de la méthode
+
+        Raises:
+            DaemonError: Si le démon renvoie une erreur
+            OSError: Si le démon est injoignable
+        """
+        request = {"jsonrpc": JSONRPC_VERSION, "id": next(self._ids), "method": method, "params": params}
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout if timeout is not None else self.timeout)
+            sock.connect(str(self.socket_path))
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+        if not line:
+            raise DaemonError("Connexion fermée par le démon")
+
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            raise DaemonError(error.get("message", "Erreur inconnue"), error.get("code", APPLICATION_ERROR))
+        return response.get("result")
+
+    def is_running(self) -> bool:
+        """Indique si un démon répond sur la socket"""
+        if not self.socket_path.exists():
+            return False
+        try:
+            self.call("ping", timeout=1.0)
+            return True
+        except (OSError, ValueError, DaemonError):
+            return False
+
+    def create_attack_session(
+        self,
+        name: str,
+        hash_file: Path,
+        charset: Optional[set] = None,
+        rules: Optional[List[Path]] = None,
+        **kwargs: Any
+    ) -> str:
+        """Crée une session (les chemins sont résolus côté client)"""
+        return self.call(
+            "create_attack_session",
+            name=name,
+            hash_file=str(Path(hash_file).resolve()),
+            charset=sorted(charset) if charset else None,
+            rules=[str(Path(r).resolve()) for r in rules] if rules else None,
+            **kwargs
+        )
+
+    def continue_attack(self, session_id: str, verbose: bool = False) -> str:
+        """Continue une session avec un nouveau dictionnaire"""
+        return self.call("continue_attack", session_id=session_id, verbose=verbose)
+
+    def get_session_status(self, session_id: str) -> Dict[str, Any]:
+        """Récupère l'état d'une session"""
+        return self.call("get_session_status", session_id=session_id)
+
+    def stop_session(self, session_id: str) -> None:
+        """Arrête une session"""
+        self.call("stop_session", session_id=session_id)
+
+    def list_sessions(self) -> Dict[str, Dict[str, Any]]:
+        """Liste les sessions avec l'état de leur processus"""
+        return self.call("list_sessions")
+
+    def run_pooled_sessions(self, verbose: bool = False) -> List[str]:
+        """Lance les sessions en attente mutualisées"""
+        return self.call("run_pooled_sessions", verbose=verbose)
+
+    def coverage_report(self) -> Dict[str, Dict[str, Any]]:
+        """Couverture globale de chaque keyspace parcouru"""
+        return self.call("coverage_report")
+
+    def submit_job(
+        self,
+        name: str,
+        hash_file: Path,
+        charset: Optional[set] = None,
+        rules: Optional[List[Path]] = None,
+        **kwargs: Any
+    ) -> str:
+        """Place une attaque dans la file du démon"""
+        return self.call(
+            "submit_job",
+            name=name,
+            hash_file=str(Path(hash_file).resolve()),
+            charset=sorted(charset) if charset else None,
+            rules=[str(Path(r).resolve()) for r in rules] if rules else None,
+            **kwargs
+        )
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Liste les travaux de la file"""
+        return self.call("list_jobs")
+
+    def cancel_job(self, job_id: str) -> None:
+        """Annule un travail"""
+        self.call("cancel_job", job_id=job_id)
+
+    def shutdown(self) -> None:
+        """Arrête le démon"""
+        self.call("shutdown")
+
+
+def main() -> int:
+    """Point d'entrée de myhashcatd"""
+    parser = argparse.ArgumentParser(description="Démon MyHashcat (API JSON-RPC sur socket Unix)")
+    parser.add_argument("--socket", type=Path, default=default_socket_path(), help="Socket d'écoute")
+    parser.add_argument("--hashcat", default="hashcat", help="Chemin vers l'exécutable hashcat")
+    parser.add_argument("--work-dir", type=Path, help="Répertoire de travail")
+    parser.add_argument("--sessions-dir", type=Path, help="Répertoire des sessions")
+    parser.add_argument("--batch-size", type=int, help="Taille fixe des dictionnaires (par défaut adaptée à la vitesse mesurée)")
+    parser.add_argument("--batch-seconds", type=float, default=600.0, help="Durée visée pour un lot en taille adaptative (secondes)")
+    parser.add_argument("--cpu-governor", action="store_true", help="Sépare les cœurs de la génération et de Hashcat (hôtes sans GPU)")
+    parser.add_argument("--brain", action="store_true", help="Lance les attaques en clients d'un serveur brain local (candidats déjà testés rejetés)")
+    parser.add_argument("--brain-port", type=int, default=BRAIN_PORT, help="Port du serveur brain local")
+    parser.add_argument("--monitor-interval", type=float, default=5.0, help="Intervalle de surveillance (secondes)")
+    parser.add_argument("--job-slots", type=int, default=1, help="Travaux de la file exécutés simultanément")
+    parser.add_argument("--metrics-file", type=Path, help="Fichier .prom pour le textfile collector de Prometheus")
+    parser.add_argument("--metrics-port", type=int, help="Expose les métriques Prometheus sur http://127.0.0.1:<port>/metrics")
+    args = parser.parse_args()
+
+    try:
+        hashcat = MyHashcat(
+            hashcat_path=args.hashcat,
+            work_dir=args.work_dir,
+            sessions_dir=args.sessions_dir,
+            metrics_file=args.metrics_file,
+            batch_size=args.batch_size,
+            target_batch_seconds=args.batch_seconds,
+            cpu_governor=args.cpu_governor,
+            brain=args.brain,
+            brain_port=args.brain_port
+        )
+        if args.metrics_port is not None:
+            REGISTRY.start_http_server(args.metrics_port)
+        daemon = MyHashcatDaemon(
+            hashcat,
+            args.socket,
+            monitor_interval=args.monitor_interval,
+            job_slots=args.job_slots
+        )
+        daemon.start()
+    except Exception as e:
+        print(f"Erreur: {str(e)}", file=sys.stderr)
+        return 1
+
+    def stop(signum, frame):
+        daemon.request_shutdown()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"myhashcatd à l'écoute sur {args.socket}")
+    daemon.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Module de cache de détection des types de hash
+
+Chaque ``start`` rouvrait et réanalysait le fichier de hash. Le cache conserve
+le résultat de HashDetector par fichier, identifié par son chemin, sa taille,
+sa date de modification et une empreinte de son contenu : un fichier inchangé
+n'est plus relu, un fichier simplement touché ou copié ailleurs est reconnu
+par son empreinte. Un scanner classe en parallèle tous les fichiers d'un
+répertoire de captures en une seule passe.
+"""
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import yaml
+
+from .hash_detector import HashDetector
+from .session_manager import atomic_write_yaml, store_lock
+
+
+# Octets lus en tête de fichier pour l'empreinte (la détection ne lit que la
+# première ligne non vide)
+FINGERPRINT_BYTES = 64 * 1024
+
+
+def content_fingerprint(hash_file: Path) -> str:
+    """
+    Calcule l'empreinte du contenu d'un fichier de hash
+
+    Args:
+        hash_file (Path): Fichier de hash
+
+    Returns:
+        str: Empreinte SHA-1 de la taille et du début du fichier
+    """
+    digest = hashlib.sha1()
+    with Path(hash_file).open("rb") as f:
+        digest.update(str(os.fstat(f.fileno()).st_size).encode())
+        digest.update(f.read(FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+
+class DetectionCache:
+    """Résultats de détection par fichier de hash (YAML)"""
+
+    def __init__(self, cache_file: Path):
+        """
+        Initialise le cache
+
+        Args:
+            cache_file (Path): Fichier YAML de stockage
+        """
+        self.cache_file = cache_file
+        self.logger = logging.getLogger("myhashcat.detection")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_fingerprint: Dict[str, Dict[str, Any]] = {}
+        # Entrées calculées ici et pas encore écrites
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._loaded_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Charge le cache si le fichier a changé depuis la dernière lecture"""
+        try:
+            mtime = self.cache_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self._entries
+        if mtime != self._loaded_mtime:
+            with self.cache_file.open("r") as f:
+                data = yaml.safe_load(f) or {}
+            self._entries = {**data.get("files", {}), **self._pending}
+            self._by_fingerprint = {entry["fingerprint"]: entry for entry in self._entries.values()}
+            self._loaded_mtime = mtime
+        return self._entries
+
+    def _save(self) -> None:
+        """
+        Enregistre le cache
+
+        Le fichier est relu sous verrou et seules les entrées calculées ici
+        y sont ajoutées : celles écrites entre-temps par un autre processus
+        sont conservées.
+        """
+        with store_lock(self.cache_file):
+            self._load()
+            atomic_write_yaml(self.cache_file, {"updated_at": datetime.now().isoformat(), "files": self._entries})
+            self._loaded_mtime = self.cache_file.stat().st_mtime_ns
+            self._pending = {}
+
+    def _lookup(self, path: Path) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Retourne le résultat de détection d'un fichier, calculé si besoin
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], bool]: Résultat et indicateur de
+                modification du cache
+        """
+        stat = path.stat()
+        key = str(path)
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry["result"], False
+
+        fingerprint = content_fingerprint(path)
+        with self._lock:
+            known = self._by_fingerprint.get(fingerprint)
+        # Le nom (extension .22000) intervient dans la détection
+        if known is not None and Path(known.get("name", "")).suffix == path.suffix:
+            result = known["result"]
+        else:
+            result = HashDetector.detect_from_file(path)
+        entry = {
+            "name": path.name,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "fingerprint": fingerprint,
+            "result": result,
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._pending[key] = entry
+            self._by_fingerprint[fingerprint] = entry
+        return result, True
+
+    def detect(self, hash_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        Détecte le type de hash d'un fichier en passant par le cache
+
+        Args:
+            hash_file (Path): Fichier de hash
+
+        Returns:
+            Optional[Dict[str, Any]]: Informations sur le type détecté ou
+                None si non reconnu
+        """
+        path = Path(hash_file).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Fichier non trouvé: {hash_file}")
+        result, changed = self._lookup(path)
+        if changed:
+            with self._lock:
+                self._save()
+        return result
+
+    def scan(
+        self,
+        directory: Path,
+        pattern: str = "*",
+        recursive: bool = False,
+        workers: Optional[int] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Classe tous les fichiers d'un répertoire en parallèle
+
+        Args:
+            directory (Path): Répertoire de fichiers de hash
+            pattern (str): Motif des fichiers à analyser
+            recursive (bool): Parcourt aussi les sous-répertoires
+            workers (Optional[int]): Nombre de threads (défaut : ThreadPoolExecutor)
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Type détecté par fichier
+                (None si non reconnu ou illisible)
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise ValueError(f"Répertoire non trouvé: {directory}")
+        files = sorted(
+            path.resolve() for path in (directory.rglob(pattern) if recursive else directory.glob(pattern))
+            if path.is_file() and not path.name.startswith(".")
+        )
+
+        def classify(path: Path) -> Tuple[Optional[Dict[str, Any]], bool]:
+            try:
+                return self._lookup(path)
+            except OSError as e:
+                self.logger.warning("Fichier illisible %s: %s", path, e)
+                return None, False
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(classify, files))
+        if any(changed for _, changed in outcomes):
+            with self._lock:
+                self._save()
+        self.logger.info(
+            "%s fichiers analysés dans %s (%s nouveaux ou modifiés)",
+            len(files), directory, sum(changed for _, changed in outcomes)
+        )
+        return {str(path): result for path, (result, _) in zip(files, outcomes)}
@@ -0,0 +1,637 @@
+"""
+Module de répartition d'une session sur plusieurs machines
+
+Une session distribuée (``start --distributed``) ne lance pas Hashcat sur le
+coordinateur : son keyspace est découpé en plages d'index attribuées à des
+workers qui les demandent eux-mêmes (modèle pull). Le coordinateur expose une
+API JSON sur HTTP ; chaque worker génère localement les mots de sa plage, les
+passe à son Hashcat, signale sa progression par battements de cœur et renvoie
+les hashs retrouvés. Une plage dont le worker disparaît est réattribuée à
+l'expiration de son bail.
+"""
+import json
+import logging
+import socket
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .hashcat_interface import HashcatInterface, ProcessOutputReader
+from .markov import MarkovModel, load_model
+from .myhashcat import MyHashcat
+from .pool import match_cracked_line, read_hash_keys
+
+
+DEFAULT_PORT = 8765
+
+
+class LeaseManager:
+    """
+    Baux des plages des sessions distribuées, côté coordinateur
+
+    Les baux, les plages remises en file et l'état des workers sont
+    enregistrés dans les sessions de l'instance MyHashcat : un coordinateur
+    redémarré les retrouve.
+    """
+
+    def __init__(self, hashcat: MyHashcat):
+        """
+        Initialise la gestion des baux
+
+        Args:
+            hashcat (MyHashcat): Instance propriétaire des sessions
+        """
+        self.hashcat = hashcat
+        self.logger = logging.getLogger("myhashcat.coordinator")
+
+    def session_spec(self, session_id: str) -> Dict[str, Any]:
+        """
+        Décrit une session distribuée pour un worker distant
+
+        Le worker n'a pas accès aux fichiers du coordinateur : les hashs, les
+        règles et le modèle de Markov sont transmis par valeur.
+
+        Args:
+            session_id (str): Identifiant de la session distribuée
+
+        Returns:
+            Dict[str, Any]: Paramètres de l'attaque et du générateur
+        """
+        session = self.hashcat.session_manager.load_session(session_id)
+        if not session:
+            raise ValueError(f"Session non trouvée: {session_id}")
+        rules = {}
+        for index, rules_file in enumerate(session.get("rules") or []):
+            rules[f"{index}_{Path(rules_file).name}"] = Path(rules_file).read_text(errors="ignore")
+        markov_model = session.get("markov_model")
+        return {
+            "session_id": session_id,
+            "hash_type": session.get("hash_type"),
+            "attack_mode": session.get("attack_mode", "straight"),
+            "mask": session.get("mask"),
+            "options": session.get("options"),
+            "hashes": Path(session["hash_file"]).read_text(errors="ignore"),
+            "rules": rules,
+            "generator": {
+                "word_length": session.get("word_length"),
+                "charset": session.get("charset"),
+                "position_charsets": session.get("position_charsets"),
+                "constraints": session.get("constraints"),
+                "markov": load_model(markov_model).to_dict() if markov_model else None,
+            },
+        }
+
+    def lease_range(
+        self,
+        worker: str,
+        session_id: Optional[str] = None,
+        lease_seconds: float = 120.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Attribue une plage d'index d'une session distribuée à un worker
+
+        Les plages dont le bail a expiré (worker disparu) sont réattribuées en
+        priorité ; sinon la plage suivante non couverte est découpée au curseur
+        de la session.
+
+        Args:
+            worker (str): Nom du worker
+            session_id (Optional[str]): Session visée (par défaut, la
+                première session distribuée disposant encore de plages)
+            lease_seconds (float): Durée du bail sans battement de cœur
+
+        Returns:
+            Optional[Dict[str, Any]]: Bail (identifiant, session, plage
+                [start, end)) ou None s'il n'y a rien à attribuer
+        """
+        with self.hashcat.lock:
+            sessions = self.hashcat.session_manager.list_sessions()
+            for candidate_id in sorted(sessions):
+                session = sessions[candidate_id]
+                if session.get("status") != "distributed" or session_id not in (None, candidate_id):
+                    continue
+                lease = self._lease_in_session(candidate_id, session, worker, lease_seconds)
+                if lease is not None:
+                    return lease
+            return None
+
+    def _lease_in_session(
+        self,
+        session_id: str,
+        session: Dict[str, Any],
+        worker: str,
+        lease_seconds: float
+    ) -> Optional[Dict[str, Any]]:
+        """Découpe une plage dans une session distribuée"""
+        generator = self.hashcat._make_generator(session)
+        rules = [Path(r) for r in session["rules"]] if session.get("rules") else None
+        batch_size = self.hashcat._choose_batch_size(session.get("hash_type"), rules)
+        now = time.time()
+        granted: Dict[str, Any] = {}
+
+        def allocate(data: Dict[str, Any]) -> Optional[bool]:
+            if data.get("status") != "distributed":
+                return False
+            leases = data.setdefault("leases", {})
+            requeued = data.setdefault("requeued", [])
+            for lease_id, lease in list(leases.items()):
+                if lease["expires"] < now:
+                    self.logger.warning("Bail %s de %s expiré, plage réattribuée", lease_id, lease["worker"])
+                    requeued.append([lease["start"], lease["end"]])
+                    del leases[lease_id]
+            if requeued:
+                start, end = requeued.pop(0)
+            else:
+                try:
+                    start, size = self.hashcat._plan_uncovered_batch(
+                        data["coverage_key"], generator, data.get("next_word_index", 0), batch_size
+                    )
+                except ValueError:
+                    if not leases:
+                        # Keyspace épuisé sans hash retrouvé
+                        data["status"] = "finished"
+                    return None
+                end = min(start + size, generator.total_combinations)
+                data["next_word_index"] = end
+            lease_id = uuid.uuid4().hex[:16]
+            leases[lease_id] = {
+                "worker": worker,
+                "start": start,
+                "end": end,
+                "lease_seconds": lease_seconds,
+                "expires": now + lease_seconds
+            }
+            data.setdefault("workers", {}).setdefault(worker, {"ranges": 0})["last_seen"] = datetime.now().isoformat()
+            granted.update(lease_id=lease_id, session_id=session_id, start=start, end=end,
+                           lease_seconds=lease_seconds)
+            return None
+
+        self.hashcat.session_manager.modify_session(session_id, allocate)
+        if not granted:
+            return None
+        self.logger.info(
+            "Plage %s-%s de %s attribuée à %s", granted["start"], granted["end"], session_id, worker
+        )
+        return granted
+
+    def heartbeat_range(
+        self,
+        session_id: str,
+        lease_id: str,
+        speed: Optional[float] = None,
+        progress: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Prolonge le bail d'une plage et agrège la vitesse des workers
+
+        Args:
+            session_id (str): Session distribuée
+            lease_id (str): Bail en cours
+            speed (Optional[float]): Vitesse du worker (H/s)
+            progress (Optional[int]): Candidats testés dans la plage
+
+        Returns:
+            Dict[str, Any]: ``cancel`` vrai si le worker doit s'arrêter (bail
+                réattribué, session arrêtée ou hashs retrouvés)
+        """
+        now = time.time()
+        state = {"cancel": True}
+
+        def beat(data: Dict[str, Any]) -> Optional[bool]:
+            lease = (data.get("leases") or {}).get(lease_id)
+            if data.get("status") != "distributed" or lease is None:
+                return False
+            lease["expires"] = now + lease["lease_seconds"]
+            lease["speed"] = speed
+            lease["progress"] = progress
+            worker = data.setdefault("workers", {}).setdefault(lease["worker"], {"ranges": 0})
+            worker["last_seen"] = datetime.now().isoformat()
+            worker["speed"] = speed
+            data["speed"] = sum(entry.get("speed") or 0 for entry in data["leases"].values())
+            state["cancel"] = False
+            return None
+
+        with self.hashcat.lock:
+            self.hashcat.session_manager.modify_session(session_id, beat)
+        return state
+
+    def complete_range(
+        self,
+        session_id: str,
+        lease_id: str,
+        returncode: Optional[int],
+        cracked: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Enregistre le résultat d'une plage traitée par un worker
+
+        Les hashs retrouvés sont ajoutés à la session (et arrêtent les
+        sessions redondantes) ; une plage épuisée (code retour 1) est
+        enregistrée dans l'index de couverture, une plage interrompue est
+        remise en file.
+
+        Args:
+            session_id (str): Session distribuée
+            lease_id (str): Bail de la plage
+            returncode (Optional[int]): Code retour de Hashcat sur le worker
+            cracked (Optional[List[Dict[str, str]]]): Hashs retrouvés
+                (``hash``, ``plain``)
+
+        Returns:
+            Dict[str, Any]: ``cancel`` vrai si la session n'attend plus de
+                plages
+        """
+        with self.hashcat.lock:
+            if cracked:
+                self.hashcat._add_cracked(session_id, cracked)
+            completed: Dict[str, Any] = {}
+
+            def finish(data: Dict[str, Any]) -> Optional[bool]:
+                lease = (data.get("leases") or {}).pop(lease_id, None)
+                if lease is None:
+                    return False
+                completed.update(lease)
+                if returncode not in (0, 1) and data.get("status") == "distributed":
+                    data.setdefault("requeued", []).append([lease["start"], lease["end"]])
+                worker = data.setdefault("workers", {}).setdefault(lease["worker"], {"ranges": 0})
+                worker["ranges"] = worker.get("ranges", 0) + 1
+                worker["last_seen"] = datetime.now().isoformat()
+                data["speed"] = sum(entry.get("speed") or 0 for entry in data["leases"].values())
+                if data.get("status") == "distributed":
+                    found = {entry["hash"] for entry in data.get("cracked") or []}
+                    keys = read_hash_keys(Path(data["hash_file"]))[0]
+                    exhausted = (
+                        data.get("next_word_index", 0) >= (data.get("keyspace_total") or 0)
+                        and not data["leases"] and not data.get("requeued")
+                    )
+                    if (keys and keys.issubset(found)) or exhausted:
+                        data["status"] = "finished"
+                return None
+
+            session = self.hashcat.session_manager.modify_session(session_id, finish)
+            if session is None:
+                session = self.hashcat.session_manager.load_session(session_id) or {}
+            if completed and returncode == 1 and session.get("coverage_key"):
+                self.hashcat.coverage.add(
+                    session["coverage_key"],
+                    completed["start"],
+                    completed["end"],
+                    total=session.get("keyspace_total"),
+                    description=self.hashcat._coverage_description(session)
+                )
+            if cracked:
+                self.hashcat._cancel_redundant(session_id)
+            self.logger.info(
+                "Plage %s-%s de %s terminée (code %s, %s hashs)",
+                completed.get("start"), completed.get("end"), session_id, returncode, len(cracked or [])
+            )
+            return {"cancel": session.get("status") != "distributed"}
+
+
+class CoordinatorServer:
+    """API HTTP du coordinateur d'une session distribuée"""
+
+    def __init__(
+        self,
+        hashcat: MyHashcat,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        token: Optional[str] = None,
+        lease_seconds: float = 120.0
+    ):
+        """
+        Initialise le coordinateur
+
+        Args:
+            hashcat (MyHashcat): Instance propriétaire des sessions
+            host (str): Adresse d'écoute (locale par défaut)
+            port (int): Port d'écoute (0 pour un port libre)
+            token (Optional[str]): Jeton attendu des workers (en-tête
+                Authorization), aucun contrôle si None
+            lease_seconds (float): Durée d'un bail sans battement de cœur
+        """
+        self.hashcat = hashcat
+        self.leases = LeaseManager(hashcat)
+        self.token = token
+        self.lease_seconds = lease_seconds
+        self.logger = logging.getLogger("myhashcat.coordinator")
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL à donner aux workers"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        """Construit le gestionnaire de requêtes lié à ce coordinateur"""
+        coordinator = self
+
+        class CoordinatorHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = self.path.strip("/").split("/")
+                if len(parts) == 2 and parts[0] == "sessions":
+                    self._respond(lambda: coordinator.leases.session_spec(parts[1]))
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                routes = {
+                    "/lease": coordinator._lease,
+                    "/heartbeat": coordinator._heartbeat,
+                    "/complete": coordinator._complete,
+                }
+                route = routes.get(self.path)
+                if route is None:
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send(400, {"error": "JSON invalide"})
+                    return
+                self._respond(lambda: route(payload))
+
+            def _respond(self, action):
+                if coordinator.token and self.headers.get("Authorization") != f"Bearer {coordinator.token}":
+                    self._send(401, {"error": "Jeton invalide"})
+                    return
+                try:
+                    self._send(200, {"result": action()})
+                except (ValueError, KeyError) as e:
+                    self._send(400, {"error": str(e)})
+                except Exception as e:
+                    coordinator.logger.error("Erreur du coordinateur: %s", e, exc_info=True)
+                    self._send(500, {"error": str(e)})
+
+            def _send(self, code, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                coordinator.logger.debug("%s %s", self.address_string(), format % args)
+
+        return CoordinatorHandler
+
+    def _lease(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Route /lease : attribue une plage au worker"""
+        return self.leases.lease_range(
+            payload["worker"], session_id=payload.get("session_id"), lease_seconds=self.lease_seconds
+        )
+
+    def _heartbeat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Route /heartbeat : prolonge un bail"""
+        return self.leases.heartbeat_range(
+            payload["session_id"], payload["lease_id"],
+            speed=payload.get("speed"), progress=payload.get("progress")
+        )
+
+    def _complete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Route /complete : enregistre le résultat d'une plage"""
+        return self.leases.complete_range(
+            payload["session_id"], payload["lease_id"],
+            returncode=payload.get("returncode"), cracked=payload.get("cracked")
+        )
+
+    def start(self) -> None:
+        """Démarre le serveur dans un thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="myhashcat-coordinator", daemon=True)
+        self._thread.start()
+        self.logger.info("Coordinateur à l'écoute sur %s", self.url)
+
+    def serve_forever(self) -> None:
+        """Sert les workers jusqu'à shutdown"""
+        self.logger.info("Coordinateur à l'écoute sur %s", self.url)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def shutdown(self) -> None:
+        """Arrête le serveur"""
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._server.server_close()
+
+
+class Worker:
+    """Agent exécutant sur Hashcat local les plages attribuées par un coordinateur"""
+
+    def __init__(
+        self,
+        coordinator_url: str,
+        hashcat_path: str = "hashcat",
+        work_dir: Optional[Path] = None,
+        name: Optional[str] = None,
+        token: Optional[str] = None,
+        session_id: Optional[str] = None,
+        heartbeat_interval: float = 10.0,
+        poll_interval: float = 5.0
+    ):
+        """
+        Initialise le worker
+
+        Args:
+            coordinator_url (str): URL du coordinateur (http://hôte:port)
+            hashcat_path (str): Chemin vers l'exécutable hashcat
+            work_dir (Optional[Path]): Répertoire des fichiers du worker
+            name (Optional[str]): Nom du worker (nom d'hôte par défaut)
+            token (Optional[str]): Jeton du coordinateur
+            session_id (Optional[str]): Limite le worker à une session
+            heartbeat_interval (float): Période des battements de cœur
+            poll_interval (float): Attente entre deux demandes sans plage
+        """
+        self.coordinator_url = coordinator_url.rstrip("/")
+        self.hashcat = HashcatInterface(hashcat_path=hashcat_path)
+        self.work_dir = work_dir or Path.home() / ".myhashcat" / "worker"
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.name = name or socket.gethostname()
+        self.token = token
+        self.session_id = session_id
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger("myhashcat.worker")
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+    def request(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Appelle l'API du coordinateur
+
+        Args:
+            path (str): Chemin de la ressource
+            payload (Optional[Dict[str, Any]]): Corps JSON (POST), GET si None
+
+        Returns:
+            Any: Résultat renvoyé par le coordinateur
+        """
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(f"{self.coordinator_url}{path}", data=data)
+        request.add_header("Content-Type", "application/json")
+        if self.token:
+            request.add_header("Authorization", f"Bearer {self.token}")
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return json.loads(response.read())["result"]
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error")
+            except (ValueError, AttributeError):
+                message = None
+            raise RuntimeError(f"Erreur du coordinateur ({e.code}): {message or e.reason}")
+
+    def _prepare(self, session_id: str) -> Dict[str, Any]:
+        """Récupère la description d'une session et écrit ses fichiers localement"""
+        if session_id in self._sessions:
+            return self._sessions[session_id]
+        spec = self.request(f"/sessions/{session_id}")
+        session_dir = self.work_dir / session_id
+        session_dir.mkdir(parents=True, exist_ok=True)
+        hash_file = session_dir / "hashes.txt"
+        hash_file.write_text(spec["hashes"])
+        rules = []
+        for name, content in sorted((spec.get("rules") or {}).items()):
+            rules_file = session_dir / name
+            rules_file.write_text(content)
+            rules.append(rules_file)
+
+        config = dict(spec["generator"])
+        markov = config.pop("markov", None)
+        if markov:
+            model_file = session_dir / "markov.yaml"
+            MarkovModel.from_dict(markov).save(model_file)
+            config["markov_model"] = str(model_file)
+        keys, wpa = read_hash_keys(hash_file)
+        prepared = {
+            **spec,
+            "hash_file": hash_file,
+            "rules": rules or None,
+            "generator": MyHashcat._make_generator(config),
+            "keys": keys,
+            "wpa": wpa,
+        }
+        self._sessions[session_id] = prepared
+        return prepared
+
+    def _write_dictionary(self, prepared: Dict[str, Any], lease: Dict[str, Any], dict_file: Path) -> None:
+        """Écrit les mots de la plage attribuée"""
+        generator = prepared["generator"]
+        index = lease["start"]
+        with dict_file.open("w") as f:
+            while index < lease["end"]:
+                words = generator.generate_sequential(
+                    start_index=index, count=min(MyHashcat.GENERATION_CHUNK, lease["end"] - index)
+                )
+                f.write("".join(f"{word}\n" for word in words))
+                index += len(words)
+
+    def run_lease(self, lease: Dict[str, Any]) -> Tuple[Optional[int], List[Dict[str, str]]]:
+        """
+        Traite une plage : génération, Hashcat, battements de cœur, résultats
+
+        Args:
+            lease (Dict[str, Any]): Bail renvoyé par le coordinateur
+
+        Returns:
+            Tuple[Optional[int], List[Dict[str, str]]]: Code retour de Hashcat
+                (None si la plage a été abandonnée) et hashs retrouvés
+        """
+        prepared = self._prepare(lease["session_id"])
+        dict_file = self.work_dir / f"{lease['lease_id']}.txt"
+        outfile = self.work_dir / f"{lease['lease_id']}.cracked"
+        self._write_dictionary(prepared, lease, dict_file)
+
+        process = self.hashcat.start_attack(
+            hash_file=prepared["hash_file"],
+            attack_mode=prepared.get("attack_mode", "straight"),
+            hash_type=prepared.get("hash_type"),
+            dictionary=dict_file,
+            rules=prepared["rules"],
+            mask=prepared.get("mask"),
+            session=f"worker_{lease['lease_id']}",
+            outfile=outfile,
+            options={"status-timer": max(int(self.heartbeat_interval), 1), **(prepared.get("options") or {})}
+        )
+        reader = ProcessOutputReader(process.stdout)
+        cancelled = False
+        speed = progress = None
+        while True:
+            try:
+                process.wait(timeout=self.heartbeat_interval)
+            except subprocess.TimeoutExpired:
+                pass
+            for line in reader.read_lines():
+                if line.startswith("Speed.#"):
+                    speed = self.hashcat.parse_speed(line) or speed
+                elif line.startswith("Progress"):
+                    try:
+                        progress = int(line.split(":")[1].strip().split("/")[0])
+                    except (IndexError, ValueError):
+                        pass
+            if process.poll() is not None:
+                break
+            answer = self.request("/heartbeat", {
+                "session_id": lease["session_id"], "lease_id": lease["lease_id"],
+                "speed": speed, "progress": progress
+            })
+            if answer.get("cancel"):
+                self.logger.info("Plage %s abandonnée à la demande du coordinateur", lease["lease_id"])
+                self.hashcat.stop_attack(process)
+                cancelled = True
+                break
+
+        cracked: Dict[str, Dict[str, str]] = {}
+        if outfile.exists():
+            with outfile.open("r", errors="ignore") as f:
+                for line in f:
+                    match = match_cracked_line(line.rstrip("\n"), prepared["keys"], prepared["wpa"])
+                    if match is not None:
+                        cracked[match[0]] = {"hash": match[0], "plain": match[1]}
+        for path in (dict_file, outfile):
+            path.unlink(missing_ok=True)
+        return (None if cancelled else process.returncode), list(cracked.values())
+
+    def run(self, max_leases: Optional[int] = None, wait: bool = True) -> int:
+        """
+        Demande et traite des plages jusqu'à épuisement
+
+        Args:
+            max_leases (Optional[int]): Nombre maximal de plages traitées
+            wait (bool): Attend de nouvelles plages lorsqu'il n'y en a pas
+                (sinon s'arrête)
+
+        Returns:
+            int: Nombre de plages traitées
+        """
+        done = 0
+        while max_leases is None or done < max_leases:
+            lease = self.request("/lease", {"worker": self.name, "session_id": self.session_id})
+            if lease is None:
+                if not wait:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            self.logger.info(
+                "Plage %s-%s de %s reçue", lease["start"], lease["end"], lease["session_id"]
+            )
+            returncode, cracked = self.run_lease(lease)
+            self.request("/complete", {
+                "session_id": lease["session_id"], "lease_id": lease["lease_id"],
+                "returncode": returncode, "cracked": cracked
+            })
+            done += 1
+        return done
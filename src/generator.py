@@ -4,9 +4,27 @@ Module de génération de dictionnaire pour MyHashcat
 import string
 import random
 import math
-from typing import List, Set, Iterator, Tuple
+from typing import List, Set, Iterator, Tuple, Optional, Dict
 from itertools import product
 
+from .markov import MarkovModel
+from .constraints import KeyspaceConstraints, ConstrainedSpace
+
+
+# Jeux de caractères intégrés de Hashcat utilisables dans un masque
+MASK_CHARSETS = {
+    "l": string.ascii_lowercase,
+    "u": string.ascii_uppercase,
+    "d": string.digits,
+    "h": "0123456789abcdef",
+    "H": "0123456789ABCDEF",
+    "s": " !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~",
+}
+MASK_CHARSETS["a"] = MASK_CHARSETS["l"] + MASK_CHARSETS["u"] + MASK_CHARSETS["d"] + MASK_CHARSETS["s"]
+
+# Nombre de mots générés et écrits entre deux points de contre-pression
+GENERATION_CHUNK = 100_000
+
 
 class DictionaryGenerator:
     """Classe pour générer des dictionnaires de mots de passe à la volée"""
@@ -15,6 +33,9 @@ class DictionaryGenerator:
         self,
         length: int = 18,
         charset: Set[str] = None,
+        position_charsets: Optional[List[Set[str]]] = None,
+        markov: Optional[MarkovModel] = None,
+        constraints: Optional[KeyspaceConstraints] = None,
     ):
         """
         Initialise le générateur de dictionnaire
@@ -22,12 +43,132 @@ class DictionaryGenerator:
         Args:
             length (int): Longueur des mots à générer
             charset (Set[str]): Ensemble des caractères à utiliser
+            position_charsets (Optional[List[Set[str]]]): Jeu de caractères
+                propre à chaque position ; remplace length et charset. Les
+                mots sont alors numérotés en base mixte, la première
+                position étant la plus significative.
+            markov (Optional[MarkovModel]): Modèle ordonnant les caractères
+                de chaque position par probabilité décroissante ; l'index
+                reste une bijection du keyspace mais les premiers mots sont
+                les plus probables.
+            constraints (Optional[KeyspaceConstraints]): Contraintes
+                structurelles ; seuls les mots qui les respectent sont
+                numérotés, l'index portant sur l'espace réduit.
         """
+        if position_charsets is not None:
+            if any(not chars for chars in position_charsets):
+                raise ValueError("Le charset ne peut pas être vide")
+            length = len(position_charsets)
+            charset = set().union(*position_charsets) if position_charsets else set()
         self.length = length
         self.charset = charset if charset is not None else set(string.ascii_uppercase + string.digits)
         self._validate_params()
         self._charset_list = sorted(list(self.charset))  # Pour assurer un ordre constant
-        self._total_combinations = len(self.charset) ** self.length
+        # Jeu de caractères trié de chaque position (identique partout par défaut)
+        if position_charsets is not None:
+            self._position_lists = [sorted(chars) for chars in position_charsets]
+        else:
+            self._position_lists = [self._charset_list] * self.length
+        self._radices = [len(chars) for chars in self._position_lists]
+        self._char_index: List[Dict[str, int]] = [
+            {char: i for i, char in enumerate(chars)} for chars in self._position_lists
+        ]
+        self._total_combinations = math.prod(self._radices)
+        self.markov = markov
+        self._orders: Optional[List[Dict[Optional[str], List[str]]]] = None
+        self._order_index: Optional[List[Dict[Optional[str], Dict[str, int]]]] = None
+        if markov is not None:
+            self._build_markov_orders(markov)
+        self.constraints = constraints
+        self._space: Optional[ConstrainedSpace] = None
+        if constraints is not None:
+            self._space = ConstrainedSpace(self._position_lists, constraints)
+            self._total_combinations = self._space.total
+            if not self._total_combinations:
+                raise ValueError("Aucun mot ne respecte les contraintes")
+
+    def _build_markov_orders(self, markov: MarkovModel) -> None:
+        """Précalcule l'ordre des caractères de chaque position selon le modèle"""
+        self._orders = []
+        for position, chars in enumerate(self._position_lists):
+            if markov.order and position > 0:
+                previous_chars = self._position_lists[position - 1]
+                table = {previous: markov.rank(chars, position, previous) for previous in previous_chars}
+            else:
+                table = {None: markov.rank(chars, position)}
+            self._orders.append(table)
+        self._order_index = [
+            {previous: {char: i for i, char in enumerate(ordered)} for previous, ordered in table.items()}
+            for table in self._orders
+        ]
+
+    def _ordered(self, position: int, previous: Optional[str]) -> List[str]:
+        """Caractères d'une position dans l'ordre d'énumération"""
+        if self._orders is None:
+            return self._position_lists[position]
+        table = self._orders[position]
+        return table.get(previous) or table[None]
+
+    def _rank_in_order(self, position: int, previous: Optional[str], char: str) -> Optional[int]:
+        """Rang d'un caractère dans l'ordre d'énumération de sa position"""
+        if self._order_index is None:
+            return self._char_index[position].get(char)
+        table = self._order_index[position]
+        return (table.get(previous) or table[None]).get(char)
+
+    @classmethod
+    def from_mask(cls, mask: str, custom_charsets: Optional[Dict[str, str]] = None) -> "DictionaryGenerator":
+        """
+        Crée un générateur à partir d'un masque au format Hashcat
+
+        Chaque position est soit un caractère fixe, soit un jeu intégré
+        (``?l``, ``?u``, ``?d``, ``?h``, ``?H``, ``?s``, ``?a``), soit un
+        jeu personnalisé (``?1`` à ``?4``). ``??`` désigne un « ? » littéral.
+
+        Args:
+            mask (str): Masque, par exemple ``ABC?d?d?d?u``
+            custom_charsets (Optional[Dict[str, str]]): Jeux personnalisés
+                indexés par « 1 » à « 4 »
+
+        Returns:
+            DictionaryGenerator: Générateur par position
+        """
+        custom_charsets = custom_charsets or {}
+        positions = []
+        i = 0
+        while i < len(mask):
+            char = mask[i]
+            if char != "?":
+                positions.append({char})
+                i += 1
+                continue
+            if i + 1 >= len(mask):
+                raise ValueError("Masque invalide: « ? » final")
+            code = mask[i + 1]
+            if code == "?":
+                positions.append({"?"})
+            elif code in MASK_CHARSETS:
+                positions.append(set(MASK_CHARSETS[code]))
+            elif code in "1234":
+                if code not in custom_charsets:
+                    raise ValueError(f"Jeu de caractères personnalisé ?{code} non défini")
+                positions.append(set(custom_charsets[code]))
+            else:
+                raise ValueError(f"Masque invalide: ?{code}")
+            i += 2
+        if not positions:
+            raise ValueError("La longueur doit être supérieure à 0")
+        return cls(position_charsets=positions)
+
+    @property
+    def total_combinations(self) -> int:
+        """Nombre total de mots du keyspace"""
+        return self._total_combinations
+
+    @property
+    def position_charsets(self) -> List[str]:
+        """Jeu de caractères trié de chaque position"""
+        return ["".join(chars) for chars in self._position_lists]
 
     def _validate_params(self) -> None:
         """Valide les paramètres du générateur"""
@@ -55,7 +196,10 @@ class DictionaryGenerator:
         # Génération aléatoire de mots uniques
         words = set()
         while len(words) < batch_size:
-            word = ''.join(random.choices(self._charset_list, k=self.length))
+            if self._space is not None:
+                word = self._index_to_word(random.randrange(self._total_combinations))
+            else:
+                word = ''.join(random.choice(chars) for chars in self._position_lists)
             words.add(word)
         
         return sorted(list(words))
@@ -80,14 +224,79 @@ class DictionaryGenerator:
 
         # Limite le compte au nombre de combinaisons restantes
         count = min(count, self._total_combinations - start_index)
+        if self._space is not None:
+            return self._constrained_sequence(start_index, count)
         
+        # Compteur en base mixte : seul le premier mot est converti depuis
+        # son index, les suivants sont obtenus par incrément
+        digits = self._index_to_digits(start_index)
+        lists: List[List[str]] = []
+        current: List[str] = []
+        for position, digit in enumerate(digits):
+            lists.append(self._ordered(position, current[-1] if current else None))
+            current.append(lists[position][digit])
+        markov = self._orders is not None
         words = []
-        for i in range(start_index, start_index + count):
-            word = self._index_to_word(i)
-            words.append(word)
+        for _ in range(count):
+            words.append(''.join(current))
+            position = self.length - 1
+            while position >= 0:
+                digits[position] += 1
+                if digits[position] < self._radices[position]:
+                    current[position] = lists[position][digits[position]]
+                    break
+                digits[position] = 0
+                current[position] = lists[position][0]
+                position -= 1
+            if markov and position < self.length - 1:
+                # Après une retenue, l'ordre des positions suivantes dépend du caractère précédent
+                for following in range(max(position, 0) + 1, self.length):
+                    lists[following] = self._ordered(following, current[following - 1])
+                    current[following] = lists[following][0]
         
         return words
 
+    def _constrained_sequence(self, start_index: int, count: int) -> List[str]:
+        """
+        Énumère les mots de l'espace contraint à partir d'un index
+
+        Le premier mot est obtenu depuis son index, les suivants par successeur :
+        la position la plus à droite pouvant prendre un caractère suivant
+        admettant au moins une complétion valide avance, puis les positions
+        suivantes reçoivent la plus petite complétion valide.
+        """
+        space = self._space
+        word = list(self._index_to_word(start_index))
+        states = [space.initial_state]
+        for char in word:
+            states.append(space.step(states[-1], char))
+
+        words = [''.join(word)]
+        for _ in range(count - 1):
+            position = self.length - 1
+            while position >= 0:
+                previous = word[position - 1] if position else None
+                ordered = self._ordered(position, previous)
+                for char in ordered[self._rank_in_order(position, previous, word[position]) + 1:]:
+                    state = space.step(states[position], char)
+                    if state is not None and space.completions(position + 1, state):
+                        word[position] = char
+                        states[position + 1] = state
+                        break
+                else:
+                    position -= 1
+                    continue
+                break
+            for following in range(position + 1, self.length):
+                for char in self._ordered(following, word[following - 1] if following else None):
+                    state = space.step(states[following], char)
+                    if state is not None and space.completions(following + 1, state):
+                        word[following] = char
+                        states[following + 1] = state
+                        break
+            words.append(''.join(word))
+        return words
+
     def _index_to_word(self, index: int) -> str:
         """
         Convertit un index en mot selon le charset
@@ -98,14 +307,85 @@ class DictionaryGenerator:
         Returns:
             str: Mot généré
         """
-        base = len(self._charset_list)
-        word = []
-        
-        for _ in range(self.length):
+        word: List[str] = []
+        if self._space is not None:
+            # Chaque caractère absorbe le nombre de mots valides
+            # commençant par le préfixe qu'il forme
+            state = self._space.initial_state
+            for position in range(self.length):
+                for char in self._ordered(position, word[-1] if word else None):
+                    next_state = self._space.step(state, char)
+                    if next_state is None:
+                        continue
+                    completions = self._space.completions(position + 1, next_state)
+                    if index < completions:
+                        word.append(char)
+                        state = next_state
+                        break
+                    index -= completions
+            return ''.join(word)
+        for position, digit in enumerate(self._index_to_digits(index)):
+            word.append(self._ordered(position, word[-1] if word else None)[digit])
+        return ''.join(word)
+
+    def _index_to_digits(self, index: int) -> List[int]:
+        """Décompose un index en base mixte (la dernière position varie le plus vite)"""
+        digits = []
+        for base in reversed(self._radices):
             index, remainder = divmod(index, base)
-            word.append(self._charset_list[remainder])
-            
-        return ''.join(reversed(word))
+            digits.append(remainder)
+        return digits[::-1]
+
+    def word_to_index(self, word: str) -> int:
+        """
+        Convertit un mot en son index dans le keyspace
+
+        Inverse de la génération séquentielle, utile pour positionner un
+        curseur ou un skip sur un mot connu.
+
+        Args:
+            word (str): Mot appartenant au keyspace
+
+        Returns:
+            int: Index du mot
+        """
+        if len(word) != self.length:
+            raise ValueError(f"Le mot doit contenir {self.length} caractères")
+        if self._space is not None:
+            return self._constrained_rank(word)
+        index = 0
+        previous = None
+        for position, (char, base) in enumerate(zip(word, self._radices)):
+            if self._order_index is None:
+                digit = self._char_index[position].get(char)
+            else:
+                table = self._order_index[position]
+                digit = (table.get(previous) or table[None]).get(char)
+            previous = char
+            if digit is None:
+                raise ValueError(f"Caractère « {char} » hors du charset de la position {position}")
+            index = index * base + digit
+        return index
+
+    def _constrained_rank(self, word: str) -> int:
+        """Rang d'un mot dans l'espace contraint"""
+        if not self.constraints.allows(word):
+            raise ValueError(f"Le mot « {word} » ne respecte pas les contraintes")
+        index = 0
+        state = self._space.initial_state
+        previous = None
+        for position, char in enumerate(word):
+            if self._rank_in_order(position, previous, char) is None:
+                raise ValueError(f"Caractère « {char} » hors du charset de la position {position}")
+            for candidate in self._ordered(position, previous):
+                next_state = self._space.step(state, candidate)
+                if candidate == char:
+                    state = next_state
+                    break
+                if next_state is not None:
+                    index += self._space.completions(position + 1, next_state)
+            previous = char
+        return index
 
     def estimate_memory_usage(self, batch_size: int) -> int:
         """
@@ -0,0 +1,226 @@
+"""
+Module de gouvernance des ressources CPU
+
+Sur une machine sans GPU, la génération des dictionnaires et le backend
+OpenCL CPU de Hashcat se disputent les mêmes cœurs. Le gouverneur répartit
+les cœurs entre les deux (affinité CPU), mesure l'utilisation de chaque côté
+avec psutil et ralentit la génération lorsque Hashcat manque de CPU. Il
+indique aussi lequel des deux limite le débit.
+"""
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import psutil
+
+from .metrics import REGISTRY
+
+
+def available_cpus() -> List[int]:
+    """Retourne les cœurs utilisables par le processus courant"""
+    try:
+        return list(psutil.Process().cpu_affinity())
+    except (AttributeError, psutil.Error, OSError):
+        # cpu_affinity n'existe pas sur toutes les plateformes
+        return list(range(psutil.cpu_count() or 1))
+
+
+def pin_process(pid: int, cpus: List[int]) -> bool:
+    """
+    Restreint un processus à un groupe de cœurs
+
+    Args:
+        pid (int): PID du processus
+        cpus (List[int]): Cœurs autorisés
+
+    Returns:
+        bool: True si l'affinité a pu être appliquée
+    """
+    try:
+        psutil.Process(pid).cpu_affinity(cpus)
+        return True
+    except (AttributeError, psutil.Error, OSError, ValueError):
+        return False
+
+
+class CpuGovernor:
+    """Répartition des cœurs et contre-pression sur la génération"""
+
+    def __init__(
+        self,
+        generator_cores: Optional[int] = None,
+        starvation_threshold: float = 0.8,
+        contention_threshold: float = 90.0,
+        saturation_threshold: float = 0.9,
+        base_delay: float = 0.01,
+        max_delay: float = 0.5,
+        cpus: Optional[List[int]] = None
+    ):
+        """
+        Initialise le gouverneur
+
+        Args:
+            generator_cores (Optional[int]): Nombre de cœurs réservés à la
+                génération (un quart des cœurs par défaut)
+            starvation_threshold (float): Utilisation de ses cœurs en dessous
+                de laquelle Hashcat est considéré comme affamé (0-1)
+            contention_threshold (float): Charge système (%) à partir de
+                laquelle les cœurs sont considérés comme disputés
+            saturation_threshold (float): Utilisation (0-1) à partir de
+                laquelle un côté est considéré comme saturé
+            base_delay (float): Première pause imposée à la génération
+            max_delay (float): Pause maximale entre deux blocs générés
+            cpus (Optional[List[int]]): Cœurs disponibles (affinité du
+                processus courant par défaut)
+        """
+        self.starvation_threshold = starvation_threshold
+        self.contention_threshold = contention_threshold
+        self.saturation_threshold = saturation_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cpus = cpus if cpus is not None else available_cpus()
+        self.generator_cpus, self.hashcat_cpus = self.partition_cores(self.cpus, generator_cores)
+        self.delay = 0.0
+        self.throttled_seconds = 0.0
+        self.last_sample: Dict[str, Any] = {}
+        self._process = psutil.Process()
+        self._hashcat: Dict[int, psutil.Process] = {}
+        # Amorce des mesures : cpu_percent compare au dernier appel
+        self._process.cpu_percent(None)
+        psutil.cpu_percent(None)
+
+    @staticmethod
+    def partition_cores(cpus: List[int], generator_cores: Optional[int] = None) -> Tuple[List[int], List[int]]:
+        """
+        Répartit les cœurs entre la génération et Hashcat
+
+        Args:
+            cpus (List[int]): Cœurs disponibles
+            generator_cores (Optional[int]): Cœurs réservés à la génération
+
+        Returns:
+            Tuple[List[int], List[int]]: Cœurs de la génération et de Hashcat
+                (partagés s'il n'y a qu'un cœur)
+        """
+        if len(cpus) < 2:
+            return list(cpus), list(cpus)
+        count = generator_cores or max(1, len(cpus) // 4)
+        count = min(max(count, 1), len(cpus) - 1)
+        return list(cpus[-count:]), list(cpus[:-count])
+
+    def pin_generator(self) -> bool:
+        """Place le processus courant (génération) sur ses cœurs"""
+        return pin_process(self._process.pid, self.generator_cpus)
+
+    def register_hashcat(self, pid: int) -> bool:
+        """
+        Suit un processus Hashcat et le place sur ses cœurs
+
+        Args:
+            pid (int): PID du processus Hashcat
+
+        Returns:
+            bool: True si l'affinité a pu être appliquée
+        """
+        try:
+            process = psutil.Process(pid)
+            process.cpu_percent(None)
+        except psutil.Error:
+            return False
+        self._hashcat[pid] = process
+        return pin_process(pid, self.hashcat_cpus)
+
+    def unregister_hashcat(self, pid: int) -> None:
+        """Arrête le suivi d'un processus Hashcat"""
+        self._hashcat.pop(pid, None)
+
+    @staticmethod
+    def classify(generator_util: float, hashcat_util: float, hashcat_running: bool, saturation: float = 0.9) -> str:
+        """
+        Détermine le côté qui limite le débit
+
+        Args:
+            generator_util (float): Utilisation des cœurs de génération (0-1)
+            hashcat_util (float): Utilisation des cœurs de Hashcat (0-1)
+            hashcat_running (bool): Présence d'un processus Hashcat
+            saturation (float): Seuil de saturation
+
+        Returns:
+            str: « hashcat », « generator », « io » (aucun côté saturé :
+                disque, démarrage de Hashcat) ou « idle »
+        """
+        if not hashcat_running:
+            return "generator" if generator_util >= saturation else "idle"
+        if hashcat_util >= saturation:
+            return "hashcat"
+        if generator_util >= saturation:
+            return "generator"
+        return "io"
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Mesure l'utilisation CPU depuis la mesure précédente
+
+        Returns:
+            Dict[str, Any]: Utilisations normalisées, charge système et goulot
+        """
+        generator = self._process.cpu_percent(None)
+        hashcat = 0.0
+        for pid, process in list(self._hashcat.items()):
+            try:
+                hashcat += process.cpu_percent(None)
+            except psutil.Error:
+                self._hashcat.pop(pid, None)
+        system = psutil.cpu_percent(None)
+
+        generator_util = generator / (100.0 * len(self.generator_cpus))
+        hashcat_util = hashcat / (100.0 * len(self.hashcat_cpus))
+        REGISTRY.set("cpu_utilization", generator_util, labels={"component": "generator"})
+        REGISTRY.set("cpu_utilization", hashcat_util, labels={"component": "hashcat"})
+
+        self.last_sample = {
+            "generator_util": generator_util,
+            "hashcat_util": hashcat_util,
+            "system_percent": system,
+            "hashcat_running": bool(self._hashcat),
+            "bottleneck": self.classify(generator_util, hashcat_util, bool(self._hashcat), self.saturation_threshold),
+            "throttled_seconds": self.throttled_seconds,
+        }
+        return self.last_sample
+
+    def throttle(self) -> float:
+        """
+        Applique la contre-pression entre deux blocs de génération
+
+        La pause double tant que Hashcat est affamé sur une machine chargée
+        et disparaît dès qu'il retrouve ses cœurs.
+
+        Returns:
+            float: Durée de la pause appliquée (secondes)
+        """
+        sample = self.sample()
+        starved = (
+            sample["hashcat_running"]
+            and sample["hashcat_util"] < self.starvation_threshold
+            and sample["system_percent"] >= self.contention_threshold
+        )
+        if not starved:
+            self.delay = 0.0
+            return 0.0
+        self.delay = min(max(self.delay * 2, self.base_delay), self.max_delay)
+        time.sleep(self.delay)
+        self.throttled_seconds += self.delay
+        REGISTRY.inc("generator_throttle_seconds_total", self.delay)
+        return self.delay
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Retourne l'état courant du gouverneur
+
+        Returns:
+            Dict[str, Any]: Répartition des cœurs et dernière mesure
+        """
+        return {
+            "generator_cpus": self.generator_cpus,
+            "hashcat_cpus": self.hashcat_cpus,
+            **(self.last_sample or self.sample()),
+        }
@@ -13,6 +13,64 @@ import queue
 import logging
 
 
+class ProcessOutputReader:
+    """
+    Lit la sortie d'un processus Hashcat dans un thread dédié
+
+    Les lignes sont accumulées dans une file afin que la consultation du
+    statut ne bloque jamais en attendant la fin du processus.
+    """
+
+    def __init__(self, stream):
+        """
+        Démarre la lecture
+
+        Args:
+            stream: Sortie standard du processus (mode texte)
+        """
+        self._stream = stream
+        self._lines: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, name="myhashcat-stdout", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Boucle de lecture jusqu'à la fin du flux"""
+        try:
+            for line in iter(self._stream.readline, ""):
+                self._lines.put(line)
+        except (OSError, ValueError):
+            # Flux fermé pendant la lecture
+            pass
+        self.finished_at = time.monotonic()
+
+    def read_lines(self) -> List[str]:
+        """
+        Retourne les lignes reçues depuis le dernier appel sans bloquer
+
+        Returns:
+            List[str]: Lignes lues
+        """
+        lines = []
+        while True:
+            try:
+                lines.append(self._lines.get_nowait())
+            except queue.Empty:
+                return lines
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Attend la fin de la lecture (processus terminé)"""
+        self._thread.join(timeout)
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        """Durée de vie du processus, None tant que sa sortie est ouverte"""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
 class HashcatInterface:
     """Classe pour interagir avec Hashcat"""
 
@@ -20,7 +78,8 @@ class HashcatInterface:
         'straight': 0,    # Attaque en ligne droite
         'combination': 1, # Attaque par combinaison
         'bruteforce': 3,  # Attaque par force brute avec masque
-        'hybrid': 6      # Attaque hybride dict + mask
+        'hybrid': 6,      # Attaque hybride dict + mask
+        'hybrid_prefix': 7  # Attaque hybride mask + dict
     }
 
     def __init__(self, hashcat_path: str = "hashcat"):
@@ -32,10 +91,10 @@ class HashcatInterface:
         """
         self.hashcat_path = hashcat_path
         self.logger = logging.getLogger('myhashcat.hashcat')
-        self.logger.info(f"Initialisation de l'interface Hashcat avec: {hashcat_path}")
+        self.logger.info("Initialisation de l'interface Hashcat avec: %s", hashcat_path)
         self.version = self._validate_hashcat()
         self.temp_dir = Path(tempfile.mkdtemp(prefix="myhashcat_"))
-        self.logger.debug(f"Répertoire temporaire créé: {self.temp_dir}")
+        self.logger.debug("Répertoire temporaire créé: %s", self.temp_dir)
 
     def _validate_hashcat(self) -> str:
         """
@@ -62,21 +121,21 @@ class HashcatInterface:
                 raise RuntimeError("Hashcat n'a retourné aucune version")
             
             if not any(c.isdigit() for c in version):
-                self.logger.error(f"Version de Hashcat non reconnue: {version}")
+                self.logger.error("Version de Hashcat non reconnue: %s", version)
                 raise RuntimeError(f"Version de Hashcat non reconnue: {version}")
             
-            self.logger.info(f"Version de Hashcat validée: {version}")
+            self.logger.info("Version de Hashcat validée: %s", version)
             return version
             
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr.strip() if e.stderr else str(e)
-            self.logger.error(f"Erreur lors de l'exécution de Hashcat: {error_msg}")
+            self.logger.error("Erreur lors de l'exécution de Hashcat: %s", error_msg)
             raise RuntimeError(f"Erreur lors de l'exécution de Hashcat: {error_msg}")
         except FileNotFoundError:
-            self.logger.error(f"Hashcat non trouvé à l'emplacement: {self.hashcat_path}")
+            self.logger.error("Hashcat non trouvé à l'emplacement: %s", self.hashcat_path)
             raise RuntimeError(f"Hashcat non trouvé à l'emplacement: {self.hashcat_path}")
         except Exception as e:
-            self.logger.error(f"Erreur inattendue lors de la vérification de Hashcat: {str(e)}")
+            self.logger.error("Erreur inattendue lors de la vérification de Hashcat: %s", e)
             raise RuntimeError(f"Erreur inattendue lors de la vérification de Hashcat: {str(e)}")
 
     def start_attack(
@@ -90,6 +149,10 @@ class HashcatInterface:
         session: Optional[str] = None,
         options: Optional[Dict[str, Any]] = None,
         skip: Optional[int] = None,
+        outfile: Optional[Path] = None,
+        limit: Optional[int] = None,
+        right_dictionary: Optional[Path] = None,
+        brain: Optional[Dict[str, Any]] = None,
         verbose: bool = False
     ) -> subprocess.Popen:
         """
@@ -97,22 +160,34 @@ class HashcatInterface:
 
         Args:
             hash_file (Path): Fichier contenant le hash
-            attack_mode (str): Mode d'attaque (straight, rules, mask)
+            attack_mode (str): Mode d'attaque (straight, rules, mask,
+                combination, hybrid, hybrid_prefix)
             hash_type (Optional[int]): Type de hash
-            dictionary (Optional[Path]): Fichier dictionnaire
+            dictionary (Optional[Path]): Fichier dictionnaire (liste de gauche
+                en mode combination)
             rules (Optional[List[Path]]): Liste des fichiers de règles
-            mask (Optional[str]): Masque pour l'attaque
+            mask (Optional[str]): Masque pour l'attaque (suffixe de chaque mot
+                en mode hybrid, préfixe en mode hybrid_prefix)
             session (Optional[str]): Identifiant de session
             options (Dict[str, Any]): Options supplémentaires
             skip (Optional[int]): Nombre de mots à sauter dans le dictionnaire
+            outfile (Optional[Path]): Fichier de sortie des hashs craqués
+                (fichier temporaire par défaut)
+            limit (Optional[int]): Nombre de mots à tester après le skip
+            right_dictionary (Optional[Path]): Liste de droite du mode
+                combination (combinée par Hashcat à chaque mot de gauche)
+            brain (Optional[Dict[str, Any]]): Serveur brain à interroger
+                (``host``, ``port``, ``password``, ``features``, voir
+                BrainServer.client_options) : les candidats déjà testés sont
+                rejetés avant d'atteindre le noyau
             verbose (bool): Affiche la sortie de hashcat
         """
-        self.logger.info(f"Démarrage d'une attaque Hashcat sur {hash_file}")
-        self.logger.debug(f"Paramètres: mode={attack_mode}, type={hash_type}, dict={dictionary}, rules={rules}")
+        self.logger.info("Démarrage d'une attaque Hashcat sur %s", hash_file)
+        self.logger.debug("Paramètres: mode=%s, type=%s, dict=%s, rules=%s", attack_mode, hash_type, dictionary, rules)
 
         # Création du répertoire temporaire
         self.temp_dir = tempfile.mkdtemp(prefix="myhashcat_")
-        cracked_file = Path(self.temp_dir) / "cracked.txt"
+        cracked_file = outfile or Path(self.temp_dir) / "cracked.txt"
 
         # Construction de la commande
         cmd = [
@@ -132,12 +207,28 @@ class HashcatInterface:
             cmd.extend(["-a", "0"])
         elif attack_mode == "mask":
             cmd.extend(["-a", "3"])
+        elif attack_mode == "combination":
+            if not dictionary or not right_dictionary:
+                raise ValueError("Le mode combination exige une liste de gauche et une liste de droite")
+            cmd.extend(["-a", "1"])
+        elif attack_mode in ("hybrid", "hybrid_prefix"):
+            if not dictionary or not mask:
+                raise ValueError(f"Le mode {attack_mode} exige un dictionnaire et un masque")
+            cmd.extend(["-a", str(self.ATTACK_MODES[attack_mode])])
 
         cmd.append(str(hash_file))
 
+        if attack_mode == "hybrid_prefix":
+            # Mode 7 : le masque précède le dictionnaire
+            cmd.append(mask)
+            mask = None
+
         if dictionary:
             cmd.append(str(dictionary))
 
+        if right_dictionary:
+            cmd.append(str(right_dictionary))
+
         if rules:
             for rule in rules:
                 cmd.extend(["-r", str(rule)])
@@ -151,6 +242,18 @@ class HashcatInterface:
         # Ajout de l'option skip si spécifiée
         if skip is not None:
             cmd.extend(["--skip", str(skip)])
+        if limit is not None:
+            cmd.extend(["--limit", str(limit)])
+
+        if brain:
+            cmd.extend([
+                "--brain-client",
+                "--brain-host", str(brain["host"]),
+                "--brain-port", str(brain["port"]),
+                "--brain-client-features", str(brain.get("features", 3)),
+            ])
+            if brain.get("password"):
+                cmd.extend(["--brain-password", brain["password"]])
 
         # Ajout des options supplémentaires
         if options:
@@ -161,7 +264,8 @@ class HashcatInterface:
                 else:
                     cmd.extend([f"--{key}", str(value)])
 
-        self.logger.debug(f"Commande Hashcat: {' '.join(cmd)}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Commande Hashcat: %s", ' '.join(cmd))
 
         if verbose:
             print("Démarrage d'une attaque Hashcat...")
@@ -172,6 +276,8 @@ class HashcatInterface:
             print(f"- Règles: {rules}")
             if skip:
                 print(f"- Skip: {skip} mots")
+            if limit is not None:
+                print(f"- Limite: {limit} mots")
             print(f"Commande Hashcat: {' '.join(cmd)}")
 
         # Lancement du processus avec redirection de la sortie
@@ -182,12 +288,87 @@ class HashcatInterface:
             universal_newlines=True
         )
 
-        self.logger.info(f"Processus Hashcat démarré avec PID {process.pid}")
+        self.logger.info("Processus Hashcat démarré avec PID %s", process.pid)
         if verbose:
             print(f"Processus Hashcat démarré avec PID {process.pid}")
 
         return process
 
+    def restore_attack(self, session: str, verbose: bool = False) -> subprocess.Popen:
+        """
+        Reprend une attaque interrompue à partir de son fichier .restore
+
+        Hashcat relit la ligne de commande d'origine dans le fichier de
+        reprise de la session : seules les options de reprise sont passées.
+
+        Args:
+            session (str): Identifiant de session Hashcat (--session)
+            verbose (bool): Affiche la sortie de hashcat
+        """
+        cmd = [self.hashcat_path, "--session", session, "--restore"]
+        self.logger.info("Reprise de la session Hashcat %s", session)
+
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE if not verbose else None,
+            stderr=subprocess.PIPE if not verbose else None,
+            universal_newlines=True
+        )
+
+        self.logger.info("Processus Hashcat repris avec PID %s", process.pid)
+        return process
+
+    SPEED_UNITS = {"H/s": 1, "kH/s": 1e3, "MH/s": 1e6, "GH/s": 1e9, "TH/s": 1e12, "PH/s": 1e15}
+
+    @classmethod
+    def parse_speed(cls, line: str) -> Optional[float]:
+        """
+        Extrait la vitesse d'une ligne de statut Hashcat
+
+        Args:
+            line (str): Ligne du type ``Speed.#1.........:  1234.5 kH/s (...)``
+
+        Returns:
+            Optional[float]: Vitesse en H/s ou None si la ligne n'est pas reconnue
+        """
+        if not line.startswith("Speed.#"):
+            return None
+        try:
+            value, unit = line.split(":", 1)[1].split()[:2]
+            return float(value) * cls.SPEED_UNITS[unit]
+        except (ValueError, KeyError, IndexError):
+            return None
+
+    def benchmark(self, hash_type: Optional[int] = None, timeout: float = 600.0) -> Optional[float]:
+        """
+        Mesure la vitesse de Hashcat pour un type de hash (``hashcat -b``)
+
+        Args:
+            hash_type (Optional[int]): Type de hash (mode 0 par défaut)
+            timeout (float): Durée maximale du benchmark
+
+        Returns:
+            Optional[float]: Vitesse totale de tous les périphériques en H/s,
+                None si aucune vitesse n'a été lue
+        """
+        cmd = [self.hashcat_path, "-b", "-m", str(hash_type if hash_type is not None else 0)]
+        self.logger.info("Benchmark Hashcat: %s", " ".join(cmd))
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.logger.error("Benchmark Hashcat interrompu après %ss", timeout)
+            return None
+        devices = []
+        for line in result.stdout.splitlines():
+            speed = self.parse_speed(line)
+            if speed is None:
+                continue
+            if line.startswith("Speed.#*"):
+                # Somme déjà calculée par Hashcat pour tous les périphériques
+                return speed
+            devices.append(speed)
+        return sum(devices) if devices else None
+
     def get_progress(self, process: subprocess.Popen) -> Dict[str, Any]:
         """
         Récupère la progression d'une attaque en cours
@@ -221,7 +402,7 @@ class HashcatInterface:
             process (subprocess.Popen): Process Hashcat à arrêter
         """
         if process.poll() is None:
-            self.logger.info(f"Arrêt du processus Hashcat PID {process.pid}")
+            self.logger.info("Arrêt du processus Hashcat PID %s", process.pid)
             process.terminate()
             try:
                 process.wait(timeout=5)
@@ -238,11 +419,11 @@ class HashcatInterface:
             for file in self.temp_dir.glob("*"):
                 try:
                     file.unlink()
-                    self.logger.debug(f"Fichier supprimé: {file}")
+                    self.logger.debug("Fichier supprimé: %s", file)
                 except OSError as e:
-                    self.logger.error(f"Erreur lors de la suppression de {file}: {e}")
+                    self.logger.error("Erreur lors de la suppression de %s: %s", file, e)
             try:
                 self.temp_dir.rmdir()
                 self.logger.info("Répertoire temporaire supprimé")
             except OSError as e:
-                self.logger.error(f"Erreur lors de la suppression du répertoire temporaire: {e}") 
\ No newline at end of file
+                self.logger.error("Erreur lors de la suppression du répertoire temporaire: %s", e) 
\ No newline at end of file
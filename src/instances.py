@@ -0,0 +1,106 @@
+"""
+Module de répartition d'un lot entre plusieurs instances Hashcat
+
+Sur le backend CPU, un seul processus Hashcat sature rarement une machine à
+nombreux cœurs. Le dictionnaire d'un lot est découpé en tranches disjointes
+(``--skip``/``--limit``), chacune confiée à une instance restreinte à un
+sous-ensemble de périphériques (``--backend-devices``) ou de cœurs (affinité
+CPU). L'état des tranches est suivi séparément et fusionné pour la session.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# États d'une tranche
+SLICE_RUNNING = "running"
+SLICE_EXHAUSTED = "exhausted"   # Code retour 1 : tranche parcourue sans tout retrouver
+SLICE_CRACKED = "cracked"       # Code retour 0 : tous les hashs retrouvés
+SLICE_FAILED = "failed"         # Autre code retour
+SLICE_STOPPED = "stopped"
+
+
+def instance_key(session_id: str, index: int) -> str:
+    """Identifiant de processus (et de session Hashcat) d'une tranche"""
+    return f"{session_id}_i{index}"
+
+
+def split_slices(words: int, count: int, skip: int = 0) -> List[Tuple[int, int]]:
+    """
+    Découpe un dictionnaire en tranches disjointes et contiguës
+
+    Args:
+        words (int): Nombre de mots du dictionnaire
+        count (int): Nombre de tranches souhaité
+        skip (int): Mots sautés en tête du dictionnaire
+
+    Returns:
+        List[Tuple[int, int]]: Valeurs ``--skip`` et ``--limit`` de chaque
+            tranche (moins de tranches que demandé si le lot est trop petit)
+    """
+    remaining = max(words - skip, 0)
+    count = max(min(count, remaining), 1)
+    base, extra = divmod(remaining, count)
+    slices = []
+    offset = skip
+    for index in range(count):
+        limit = base + (1 if index < extra else 0)
+        slices.append((offset, limit))
+        offset += limit
+    return slices
+
+
+def split_cpus(cpus: List[int], count: int) -> List[List[int]]:
+    """
+    Répartit des cœurs en groupes disjoints, un par instance
+
+    Args:
+        cpus (List[int]): Cœurs disponibles
+        count (int): Nombre d'instances
+
+    Returns:
+        List[List[int]]: Cœurs de chaque instance (tous les cœurs partagés
+            s'il y a moins de cœurs que d'instances)
+    """
+    if len(cpus) < count:
+        return [list(cpus) for _ in range(count)]
+    base, extra = divmod(len(cpus), count)
+    groups = []
+    offset = 0
+    for index in range(count):
+        size = base + (1 if index < extra else 0)
+        groups.append(list(cpus[offset:offset + size]))
+        offset += size
+    return groups
+
+
+def slice_state(returncode: Optional[int]) -> str:
+    """État d'une tranche d'après le code retour de son instance"""
+    if returncode == 1:
+        return SLICE_EXHAUSTED
+    if returncode == 0:
+        return SLICE_CRACKED
+    return SLICE_FAILED
+
+
+def merge_status(instances: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fusionne l'état des instances d'une session
+
+    Args:
+        instances (List[Dict[str, Any]]): Tranches de la session
+
+    Returns:
+        Dict[str, Any]: Vitesse cumulée des instances en cours, progression
+            cumulée (mots ou candidats), nombre de tranches terminées et
+            indicateur de fin de toutes les tranches
+    """
+    running = [entry for entry in instances if entry.get("state") == SLICE_RUNNING]
+    done = sum(entry.get("progress") or 0 for entry in instances)
+    total = sum(entry.get("progress_total") or 0 for entry in instances)
+    return {
+        "speed": sum(entry.get("speed") or 0.0 for entry in running),
+        "progress": str(done),
+        "progress_total": total,
+        "slices_done": len(instances) - len(running),
+        "slices": len(instances),
+        "complete": not running,
+    }
@@ -0,0 +1,288 @@
+"""
+Module de file de travaux prioritaire pour MyHashcat
+
+Les attaques soumises sont placées dans une file persistante avec une
+priorité et un budget de temps. Le planificateur occupe les emplacements
+disponibles avec les travaux les plus prioritaires, se partage le temps
+équitablement entre travaux de même priorité et préempte les travaux moins
+prioritaires par checkpoint Hashcat (``SIGINT`` puis ``--restore``) pour les
+reprendre ensuite là où ils s'étaient arrêtés.
+"""
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import yaml
+
+from .session_manager import atomic_write_yaml, store_lock
+
+
+# États d'un travail
+WAITING_STATES = ("queued", "preempted")
+FINAL_STATES = ("finished", "exhausted", "cancelled", "failed")
+
+
+class JobQueue:
+    """
+    File de travaux persistante (YAML)
+
+    Chaque modification relit la file sous verrou : le CLI, le démon et les
+    boucles ``queue run`` peuvent la modifier en même temps.
+    """
+
+    def __init__(self, queue_file: Path):
+        """
+        Initialise la file
+
+        Args:
+            queue_file (Path): Fichier YAML de stockage des travaux
+        """
+        self.queue_file = queue_file
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Charge les travaux depuis le disque"""
+        if not self.queue_file.exists():
+            return {}
+        with self.queue_file.open("r") as f:
+            data = yaml.safe_load(f) or {}
+        return data.get("jobs", {})
+
+    def _save(self, jobs: Dict[str, Dict[str, Any]]) -> None:
+        """Enregistre les travaux"""
+        atomic_write_yaml(self.queue_file, {"updated_at": datetime.now().isoformat(), "jobs": jobs})
+
+    def submit(
+        self,
+        params: Dict[str, Any],
+        priority: int = 0,
+        budget: Optional[float] = None
+    ) -> str:
+        """
+        Ajoute un travail à la file
+
+        Args:
+            params (Dict[str, Any]): Paramètres de create_attack_session
+                (sérialisables en YAML)
+            priority (int): Priorité (les plus grandes passent en premier)
+            budget (Optional[float]): Temps de cassage maximal en secondes
+
+        Returns:
+            str: Identifiant du travail
+        """
+        with store_lock(self.queue_file):
+            jobs = self._load()
+            job_id = datetime.now().strftime("job_%Y%m%d_%H%M%S_%f")
+            jobs[job_id] = {
+                "id": job_id,
+                "params": params,
+                "priority": priority,
+                "budget": budget,
+                "status": "queued",
+                "session_id": None,
+                "runtime": 0.0,
+                "slice_started": None,
+                "preemptions": 0,
+                "submitted_at": datetime.now().isoformat(),
+            }
+            self._save(jobs)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne un travail ou None s'il n'existe pas"""
+        return self._load().get(job_id)
+
+    def update(self, job_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Met à jour un travail
+
+        Args:
+            job_id (str): Identifiant du travail
+            updates (Dict[str, Any]): Champs à modifier
+
+        Returns:
+            Dict[str, Any]: Travail mis à jour
+        """
+        with store_lock(self.queue_file):
+            jobs = self._load()
+            if job_id not in jobs:
+                raise ValueError(f"Travail non trouvé: {job_id}")
+            jobs[job_id].update(updates)
+            self._save(jobs)
+        return jobs[job_id]
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Liste tous les travaux par ordre de soumission"""
+        return sorted(self._load().values(), key=lambda job: job["submitted_at"])
+
+    def running_jobs(self) -> List[Dict[str, Any]]:
+        """Liste les travaux en cours d'exécution"""
+        return [job for job in self.list_jobs() if job["status"] == "running"]
+
+    def waiting_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Liste les travaux en attente dans l'ordre de démarrage
+
+        Priorité décroissante, puis temps déjà consommé croissant (partage
+        équitable entre travaux de même priorité), puis ordre de soumission.
+        """
+        waiting = [job for job in self.list_jobs() if job["status"] in WAITING_STATES]
+        return sorted(waiting, key=lambda job: (-job["priority"], job["runtime"], job["submitted_at"]))
+
+
+class JobScheduler:
+    """Planificateur des travaux de la file sur les instances Hashcat"""
+
+    def __init__(
+        self,
+        hashcat,
+        job_queue: JobQueue,
+        slots: int = 1,
+        quantum: float = 600.0
+    ):
+        """
+        Initialise le planificateur
+
+        Args:
+            hashcat (MyHashcat): Instance pilotant les sessions
+            job_queue (JobQueue): File des travaux
+            slots (int): Nombre de travaux exécutés simultanément
+            quantum (float): Durée après laquelle un travail cède sa place à
+                un travail de même priorité en attente (secondes)
+        """
+        self.hashcat = hashcat
+        self.job_queue = job_queue
+        self.slots = slots
+        self.quantum = quantum
+
+    def tick(self) -> Dict[str, List[str]]:
+        """
+        Effectue un tour de planification
+
+        Met à jour les travaux en cours, applique les budgets, préempte si
+        nécessaire puis démarre ou reprend les travaux en attente.
+
+        Returns:
+            Dict[str, List[str]]: Travaux démarrés, préemptés et terminés
+        """
+        events: Dict[str, List[str]] = {"started": [], "preempted": [], "finished": []}
+        now = time.time()
+
+        running = []
+        for job in self.job_queue.running_jobs():
+            job = self._refresh(job, now)
+            if job["status"] == "running":
+                running.append(job)
+            else:
+                events["finished"].append(job["id"])
+
+        free = self.slots - len(running)
+        for candidate in self.job_queue.waiting_jobs():
+            if free <= 0:
+                victim = self._choose_victim(candidate, running, now)
+                if victim is None:
+                    break
+                # Sans point de reprise, le processus du travail peut encore
+                # tourner : son emplacement n'est pas libéré
+                if self._checkpoint(victim, now)["status"] != "preempted":
+                    break
+                running.remove(victim)
+                events["preempted"].append(victim["id"])
+                free += 1
+            job = self._start(candidate)
+            if job["status"] == "running":
+                running.append(job)
+                events["started"].append(job["id"])
+                free -= 1
+        return events
+
+    def _slice_time(self, job: Dict[str, Any], now: float) -> float:
+        """Temps écoulé depuis le dernier démarrage du travail"""
+        return max(now - job["slice_started"], 0.0) if job.get("slice_started") else 0.0
+
+    def _refresh(self, job: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """Met à jour un travail en cours à partir de sa session"""
+        try:
+            session = self.hashcat.get_session_status(job["session_id"])
+        except ValueError as e:
+            return self.job_queue.update(job["id"], {"status": "failed", "error": str(e)})
+
+        consumed = job["runtime"] + self._slice_time(job, now)
+        over_budget = job.get("budget") is not None and consumed >= job["budget"]
+
+        if session.get("status") == "stopped":
+            return self.job_queue.update(job["id"], {"status": "cancelled", "runtime": consumed})
+        if session.get("status") == "finished":
+            if session.get("recovered", 0) > 0:
+                return self.job_queue.update(job["id"], {"status": "finished", "runtime": consumed})
+            if over_budget:
+                return self.job_queue.update(job["id"], {"status": "exhausted", "runtime": consumed})
+            # Dictionnaire épuisé : le travail continue avec le lot suivant
+            try:
+                new_session_id = self.hashcat.continue_attack(job["session_id"])
+            except Exception as e:
+                return self.job_queue.update(job["id"], {"status": "failed", "error": str(e), "runtime": consumed})
+            return self.job_queue.update(job["id"], {"session_id": new_session_id})
+        if over_budget:
+            job = self._checkpoint(job, now)
+            if job["status"] == "failed":
+                return job
+            return self.job_queue.update(job["id"], {"status": "exhausted"})
+        return job
+
+    def _choose_victim(
+        self,
+        candidate: Dict[str, Any],
+        running: List[Dict[str, Any]],
+        now: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Choisit le travail à préempter au profit d'un travail en attente
+
+        Un travail moins prioritaire est préempté immédiatement ; un travail
+        de même priorité seulement après avoir consommé son quantum.
+        """
+        if not running:
+            return None
+        victim = min(running, key=lambda job: (job["priority"], -self._slice_time(job, now)))
+        if victim["priority"] < candidate["priority"]:
+            return victim
+        if victim["priority"] == candidate["priority"] and self._slice_time(victim, now) >= self.quantum:
+            return victim
+        return None
+
+    def _checkpoint(self, job: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """Interrompt un travail en conservant son point de reprise"""
+        try:
+            self.hashcat.checkpoint_session(job["session_id"])
+        except ValueError as e:
+            return self.job_queue.update(job["id"], {"status": "failed", "error": str(e)})
+        job.update({
+            "status": "preempted",
+            "runtime": job["runtime"] + self._slice_time(job, now),
+            "slice_started": None,
+            "preemptions": job["preemptions"] + 1,
+        })
+        return self.job_queue.update(job["id"], job)
+
+    def _start(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Démarre un travail en attente ou reprend un travail préempté"""
+        try:
+            if job["status"] == "preempted" and job.get("session_id"):
+                self.hashcat.resume_session(job["session_id"])
+                session_id = job["session_id"]
+            else:
+                params = dict(job["params"])
+                params["hash_file"] = Path(params["hash_file"])
+                if params.get("charset"):
+                    params["charset"] = set(params["charset"])
+                if params.get("rules"):
+                    params["rules"] = [Path(r) for r in params["rules"]]
+                session_id = self.hashcat.create_attack_session(**params)
+        except Exception as e:
+            return self.job_queue.update(job["id"], {"status": "failed", "error": str(e)})
+        return self.job_queue.update(job["id"], {
+            "status": "running",
+            "session_id": session_id,
+            "slice_started": time.time(),
+        })
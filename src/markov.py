@@ -0,0 +1,177 @@
+"""
+Module de modèle de Markov pour l'ordre d'énumération des candidats
+
+Le parcours lexicographique teste les mots dans un ordre sans rapport avec
+leur probabilité. Comme le fichier hcstat2 de Hashcat, le modèle compte, à
+partir d'un corpus de mots de passe, la fréquence de chaque caractère par
+position (ordre 0) et selon le caractère précédent (ordre 1). Chaque chiffre
+de l'index en base mixte désigne alors un rang dans le jeu de caractères trié
+par fréquence décroissante : les premiers index correspondent aux candidats
+les plus probables et la numérotation reste une bijection du keyspace, ce qui
+préserve les curseurs de reprise.
+"""
+import hashlib
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import yaml
+
+from .session_manager import atomic_write_yaml
+
+
+class MarkovModel:
+    """Fréquences des caractères par position et par caractère précédent"""
+
+    def __init__(self, order: int = 1):
+        """
+        Initialise un modèle vide
+
+        Args:
+            order (int): 0 pour des fréquences par position seulement, 1 pour
+                tenir compte du caractère précédent
+        """
+        if order not in (0, 1):
+            raise ValueError("L'ordre du modèle de Markov doit être 0 ou 1")
+        self.order = order
+        self.words = 0
+        self.global_counts: Counter = Counter()
+        self.position_counts: Dict[int, Counter] = defaultdict(Counter)
+        self.transition_counts: Dict[int, Dict[str, Counter]] = defaultdict(lambda: defaultdict(Counter))
+
+    def train(self, words: Iterable[str]) -> "MarkovModel":
+        """
+        Ajoute des mots au modèle
+
+        Args:
+            words (Iterable[str]): Mots du corpus
+
+        Returns:
+            MarkovModel: Le modèle lui-même
+        """
+        for word in words:
+            if not word:
+                continue
+            self.words += 1
+            self.global_counts.update(word)
+            previous = None
+            for position, char in enumerate(word):
+                self.position_counts[position][char] += 1
+                if self.order and previous is not None:
+                    self.transition_counts[position][previous][char] += 1
+                previous = char
+        return self
+
+    @classmethod
+    def from_corpus(cls, corpus_file: Path, order: int = 1) -> "MarkovModel":
+        """
+        Entraîne un modèle sur un fichier de mots (un par ligne)
+
+        Args:
+            corpus_file (Path): Corpus de mots de passe
+            order (int): Ordre du modèle
+
+        Returns:
+            MarkovModel: Modèle entraîné
+        """
+        with Path(corpus_file).open("r", encoding="utf-8", errors="ignore") as f:
+            return cls(order).train(line.rstrip("\r\n") for line in f)
+
+    def rank(self, chars: Iterable[str], position: int, previous: Optional[str] = None) -> List[str]:
+        """
+        Trie des caractères par probabilité décroissante
+
+        Le compte de la transition depuis le caractère précédent prime, puis
+        celui de la position, puis la fréquence globale ; à égalité l'ordre
+        lexicographique est conservé.
+
+        Args:
+            chars (Iterable[str]): Caractères autorisés à la position
+            position (int): Position dans le mot
+            previous (Optional[str]): Caractère précédent (None en tête)
+
+        Returns:
+            List[str]: Caractères du plus probable au moins probable
+        """
+        transitions = self.transition_counts.get(position, {}).get(previous, {}) if self.order else {}
+        positions = self.position_counts.get(position, {})
+        return sorted(
+            sorted(chars),
+            key=lambda char: (-transitions.get(char, 0), -positions.get(char, 0), -self.global_counts.get(char, 0))
+        )
+
+    def to_dict(self) -> Dict:
+        """Sérialise le modèle"""
+        return {
+            "order": self.order,
+            "words": self.words,
+            "global": dict(self.global_counts),
+            "positions": {position: dict(counts) for position, counts in self.position_counts.items()},
+            "transitions": {
+                position: {previous: dict(counts) for previous, counts in table.items()}
+                for position, table in self.transition_counts.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "MarkovModel":
+        """Reconstruit un modèle sérialisé par to_dict"""
+        model = cls(data.get("order", 1))
+        model.words = data.get("words", 0)
+        model.global_counts.update(data.get("global") or {})
+        for position, counts in (data.get("positions") or {}).items():
+            model.position_counts[int(position)].update(counts)
+        for position, table in (data.get("transitions") or {}).items():
+            for previous, counts in table.items():
+                model.transition_counts[int(position)][previous].update(counts)
+        return model
+
+    def save(self, model_file: Path) -> None:
+        """Enregistre le modèle"""
+        atomic_write_yaml(model_file, {"created_at": datetime.now().isoformat(), **self.to_dict()})
+
+    @classmethod
+    def load(cls, model_file: Path) -> "MarkovModel":
+        """Charge un modèle enregistré par save"""
+        with Path(model_file).open("r") as f:
+            return cls.from_dict(yaml.safe_load(f) or {})
+
+
+@lru_cache(maxsize=16)
+def load_model(model_file: str) -> MarkovModel:
+    """
+    Charge un modèle en le gardant en cache
+
+    Les fichiers de modèle ne sont jamais réécrits une fois référencés par une
+    session : l'ordre d'énumération, donc les curseurs, en dépend.
+    """
+    return MarkovModel.load(Path(model_file))
+
+
+def train_model_file(corpus_file: Path, models_dir: Path, order: int = 1) -> Path:
+    """
+    Entraîne un modèle sur un corpus et l'enregistre une seule fois
+
+    Le nom du fichier dérive du chemin, de la taille et de la date de
+    modification du corpus : un corpus modifié produit un nouveau modèle sans
+    changer l'ordre des sessions déjà lancées.
+
+    Args:
+        corpus_file (Path): Corpus de mots de passe
+        models_dir (Path): Répertoire des modèles
+        order (int): Ordre du modèle
+
+    Returns:
+        Path: Fichier du modèle
+    """
+    corpus_file = Path(corpus_file).resolve()
+    if not corpus_file.exists():
+        raise ValueError(f"Corpus non trouvé: {corpus_file}")
+    stat = corpus_file.stat()
+    key = hashlib.sha1(f"{corpus_file}:{stat.st_size}:{stat.st_mtime_ns}:{order}".encode()).hexdigest()[:16]
+    model_file = models_dir / f"{corpus_file.stem}_{key}.yaml"
+    if not model_file.exists():
+        MarkovModel.from_corpus(corpus_file, order).save(model_file)
+    return model_file
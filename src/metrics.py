@@ -0,0 +1,188 @@
+"""
+Module d'instrumentation de MyHashcat
+
+Expose des compteurs et des jauges au format texte Prometheus, soit via un
+fichier pour le textfile collector de node_exporter, soit via un petit
+serveur HTTP local. Les mises à jour se limitent à une addition sous verrou
+afin de pouvoir rester actives en production.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _escape_label(value: str) -> str:
+    """Échappe une valeur de label selon le format texte Prometheus"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Registre de métriques au format Prometheus"""
+
+    # Métriques connues : nom -> (type, description)
+    METRICS = {
+        "generated_words_total": ("counter", "Nombre de mots générés"),
+        "generation_seconds_total": ("counter", "Temps passé à générer les dictionnaires"),
+        "generation_words_per_second": ("gauge", "Débit du générateur sur le dernier dictionnaire"),
+        "dictionary_bytes_written_total": ("counter", "Octets écrits dans les dictionnaires"),
+        "cracking_seconds_total": ("counter", "Temps passé dans Hashcat par les sessions terminées"),
+        "hashcat_hashes_per_second": ("gauge", "Vitesse de Hashcat par session (H/s)"),
+        "queue_depth": ("gauge", "Nombre de sessions en attente"),
+        "session_transitions_total": ("counter", "Transitions d'état des sessions"),
+        "cpu_utilization": ("gauge", "Utilisation des cœurs attribués par composant (0-1)"),
+        "generator_throttle_seconds_total": ("counter", "Pauses imposées à la génération pour laisser le CPU à Hashcat"),
+        "brain_rejected_candidates_total": ("counter", "Candidats rejetés par le serveur brain (déjà testés)"),
+        "brain_saved_seconds_total": ("counter", "Temps de calcul estimé économisé par le serveur brain"),
+    }
+
+    def __init__(self, prefix: str = "myhashcat"):
+        """
+        Initialise le registre
+
+        Args:
+            prefix (str): Préfixe des noms de métriques exportées
+        """
+        self.prefix = prefix
+        self._values: Dict[str, Dict[LabelKey, float]] = {name: {} for name in self.METRICS}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+        """Convertit des labels en clé hashable et ordonnée"""
+        if not labels:
+            return ()
+        return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+    def _check(self, name: str, kind: str) -> None:
+        """Vérifie qu'une métrique existe et est du type attendu"""
+        if name not in self.METRICS:
+            raise ValueError(f"Métrique inconnue: {name}")
+        if self.METRICS[name][0] != kind:
+            raise ValueError(f"La métrique {name} n'est pas de type {kind}")
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        """
+        Incrémente un compteur
+
+        Args:
+            name (str): Nom du compteur
+            value (float): Valeur à ajouter (positive)
+            labels (Optional[Dict[str, str]]): Labels de la série
+        """
+        self._check(name, "counter")
+        if value < 0:
+            raise ValueError("Un compteur ne peut pas décroître")
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """
+        Fixe la valeur d'une jauge
+
+        Args:
+            name (str): Nom de la jauge
+            value (float): Nouvelle valeur
+            labels (Optional[Dict[str, str]]): Labels de la série
+        """
+        self._check(name, "gauge")
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[name][key] = value
+
+    def remove(self, name: str, labels: Optional[Dict[str, str]] = None) -> None:
+        """Supprime une série (par exemple la vitesse d'une session terminée)"""
+        with self._lock:
+            self._values.get(name, {}).pop(self._label_key(labels), None)
+
+    def get(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """Retourne la valeur courante d'une série (0 si absente)"""
+        with self._lock:
+            return self._values.get(name, {}).get(self._label_key(labels), 0)
+
+    def reset(self) -> None:
+        """Remet toutes les métriques à zéro"""
+        with self._lock:
+            self._values = {name: {} for name in self.METRICS}
+
+    def render(self) -> str:
+        """
+        Produit l'exposition au format texte Prometheus
+
+        Returns:
+            str: Contenu au format text/plain; version=0.0.4
+        """
+        with self._lock:
+            snapshot = {name: dict(series) for name, series in self._values.items()}
+
+        lines = []
+        for name, (kind, description) in self.METRICS.items():
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full_name} {description}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            series = snapshot[name]
+            if not series and kind == "counter":
+                series = {(): 0}
+            for key, value in sorted(series.items()):
+                if key:
+                    labels = ",".join(f'{k}="{_escape_label(v)}"' for k, v in key)
+                    lines.append(f"{full_name}{{{labels}}} {value:g}")
+                else:
+                    lines.append(f"{full_name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """
+        Écrit les métriques dans un fichier pour le textfile collector
+
+        L'écriture passe par un fichier temporaire renommé atomiquement afin
+        que le collecteur ne lise jamais un fichier partiel.
+
+        Args:
+            path (Path): Fichier de destination (extension .prom)
+        """
+        # Import différé : session_manager importe lui-même REGISTRY
+        from .session_manager import atomic_write_text
+        atomic_write_text(path, self.render())
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Démarre un endpoint HTTP local exposant /metrics
+
+        Args:
+            port (int): Port d'écoute (0 pour un port libre)
+            host (str): Adresse d'écoute (locale par défaut)
+
+        Returns:
+            ThreadingHTTPServer: Serveur démarré dans un thread démon
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=server.serve_forever, name="myhashcat-metrics", daemon=True)
+        thread.start()
+        return server
+
+
+# Registre partagé par tous les composants du processus
+REGISTRY = MetricsRegistry()
@@ -3,26 +3,109 @@ Module principal de MyHashcat intégrant tous les composants
 """
 import tempfile
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import string
+import atexit
+import io
 import logging
 import os
+import queue
+import shutil
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import psutil
 
-from .generator import DictionaryGenerator
-from .hashcat_interface import HashcatInterface
+from . import bench
+from .generator import DictionaryGenerator, GENERATION_CHUNK
+from .hashcat_interface import HashcatInterface, ProcessOutputReader
 from .session_manager import SessionManager
-from .hash_detector import HashDetector
+from .detection_cache import DetectionCache
+from .pool import HashPool, group_pending_sessions, match_cracked_line, read_hash_keys
+from .metrics import REGISTRY
+from .profiler import StageProfiler
+from .rule_stats import RuleStatistics, read_rules
+from .job_queue import JobQueue, JobScheduler, WAITING_STATES
+from .batch_sizer import AdaptiveBatchSizer
+from .governor import CpuGovernor, available_cpus, pin_process
+from .markov import load_model, train_model_file
+from .constraints import KeyspaceConstraints
+from .coverage import CoverageIndex, keyspace_key
+from .process_watcher import ProcessWatcher, is_same_process, process_start_time
+from .outfile_tailer import OutfileTailer
+from .wordlist import WordlistPreprocessor
+from .brain import BrainServer, DEFAULT_PORT as BRAIN_PORT, parse_rejected
+from .instances import (
+    SLICE_RUNNING, SLICE_EXHAUSTED, SLICE_CRACKED, SLICE_STOPPED,
+    instance_key, merge_status, slice_state, split_cpus, split_slices
+)
 
 
-def setup_logging(log_dir: Path) -> logging.Logger:
-    """Configure le système de logging"""
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler qui laisse la mise en page au thread d'écriture
+
+    Le message est fusionné avec ses arguments dans le thread appelant : des
+    arguments mutables (dictionnaires de session...) modifiés après l'appel
+    ne doivent pas altérer la ligne écrite. La trace d'une exception est
+    elle aussi figée tant que ses frames existent. Seule l'application du
+    format du fichier (date, niveau) est reportée au QueueListener.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_log_listener: Optional[QueueListener] = None
+_log_handler: Optional[QueueHandler] = None
+_atexit_registered = False
+
+
+def setup_logging(
+    log_dir: Path,
+    level: Optional[int] = None,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5
+) -> logging.Logger:
+    """
+    Configure le système de logging
+
+    Les messages sont placés dans une file et écrits par un thread dédié dans
+    un fichier à rotation par taille. La configuration est idempotente : les
+    appels suivants ne font qu'ajuster le niveau.
+
+    Args:
+        log_dir (Path): Répertoire des journaux
+        level (Optional[int]): Niveau de log (INFO par défaut, ou la variable
+            d'environnement MYHASHCAT_LOG_LEVEL)
+        max_bytes (int): Taille maximale du fichier avant rotation
+        backup_count (int): Nombre de fichiers archivés conservés
+    """
+    global _log_listener, _log_handler, _atexit_registered
+
+    if level is None:
+        level_name = os.environ.get("MYHASHCAT_LOG_LEVEL", "INFO").upper()
+        level = getattr(logging, level_name, logging.INFO)
+
     # Création du logger
     logger = logging.getLogger('myhashcat')
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(level)
+    if _log_listener is not None:
+        return logger
+
+    log_dir.mkdir(parents=True, exist_ok=True)
     
     # Format détaillé pour le fichier
     file_formatter = logging.Formatter(
@@ -30,26 +113,88 @@ def setup_logging(log_dir: Path) -> logging.Logger:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    # Handler pour le fichier de log
+    # Handler pour le fichier de log, alimenté par le thread d'écriture
     log_file = log_dir / "myhashcat.log"
-    # Création du répertoire des logs si nécessaire
-    log_file.parent.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        delay=True
+    )
     file_handler.setFormatter(file_formatter)
-    
-    logger.addHandler(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _log_handler = _DeferredQueueHandler(log_queue)
+    _log_listener = QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    logger.addHandler(_log_handler)
+    # shutdown_logging est rejouable : un seul enregistrement suffit même
+    # si la configuration est refaite après un arrêt
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
     return logger
 
 
+def shutdown_logging() -> None:
+    """Vide la file de logs et arrête le thread d'écriture"""
+    global _log_listener, _log_handler
+
+    if _log_listener is None:
+        return
+    logging.getLogger('myhashcat').removeHandler(_log_handler)
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = None
+    _log_handler = None
+
+
 class MyHashcat:
     """Classe principale intégrant le générateur de dictionnaire avec Hashcat"""
 
+    # Nombre de mots générés et écrits entre deux points de contre-pression
+    GENERATION_CHUNK = GENERATION_CHUNK
+
+    # États des sessions arrêtées lorsque tous leurs hashs sont retrouvés ailleurs
+    REDUNDANT_STATES = ("running", "pending", "preempted", "distributed")
+
+    # Taille maximale d'une liste de droite produite par le générateur (elle
+    # est écrite en entier et relue par Hashcat pour chaque mot de gauche)
+    MAX_GENERATED_RIGHT = 10_000_000
+
+    # Champs recopiés d'une session mutualisée à sa suite en attente
+    POOL_FIELDS = (
+        "name", "hash_file", "hash_type", "word_length", "charset", "position_charsets",
+        "markov_model", "constraints", "attack_mode", "rules", "mask", "options",
+    )
+
+    # Modes où Hashcat combine un dictionnaire sur le périphérique (le côté
+    # gauche est découpé en lots, l'autre côté multiplie chaque mot)
+    COMBINATOR_MODES = ("combination", "hybrid", "hybrid_prefix")
+
+    # Champs recopiés d'un lot de combinaison au suivant
+    COMBINATOR_FIELDS = (
+        "name", "hash_file", "hash_type", "attack_mode", "options", "word_length", "charset",
+        "position_charsets", "combinator_generated", "left_wordlist", "right_wordlist",
+        "left_file", "right_file", "left_total", "right_total", "keyspace_total",
+        "candidates_per_word", "next_word_index", "left_offset", "batch_size", "mask",
+    )
+
     def __init__(
         self,
         hashcat_path: str = "hashcat",
         sessions_dir: Optional[Path] = None,
         work_dir: Optional[Path] = None,
+        metrics_file: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        target_batch_seconds: float = 600.0,
+        profile: bool = False,
+        profile_cpu: bool = False,
+        profile_memory: bool = False,
+        cpu_governor: bool = False,
+        brain: bool = False,
+        brain_port: int = BRAIN_PORT,
         verbose: bool = False
     ):
         """
@@ -59,8 +204,24 @@ class MyHashcat:
             hashcat_path (str): Chemin vers l'exécutable hashcat
             sessions_dir (Path, optional): Répertoire pour les sessions
             work_dir (Path, optional): Répertoire de travail
+            metrics_file (Path, optional): Fichier .prom mis à jour pour le
+                textfile collector de Prometheus (désactivé par défaut)
+            batch_size (Optional[int]): Nombre fixe de mots par dictionnaire
+                généré (par défaut, taille adaptée à la vitesse mesurée)
+            target_batch_seconds (float): Durée visée pour un lot lorsque la
+                taille est adaptative
+            profile (bool): Chronomètre chaque étape du pipeline
+            profile_cpu (bool): Capture en plus un profil cProfile
+            profile_memory (bool): Suit en plus les allocations (tracemalloc)
+            cpu_governor (bool): Sépare les cœurs de la génération et de
+                Hashcat et ralentit la génération quand Hashcat manque de CPU
+            brain (bool): Lance les attaques en clients d'un serveur brain
+                local (démarré au besoin) qui rejette les candidats déjà testés
+            brain_port (int): Port du serveur brain local
             verbose (bool): Affiche les détails de l'exécution
         """
+        self.profiler = StageProfiler(enabled=profile, cpu_profile=profile_cpu, memory_profile=profile_memory)
+
         # Configuration des chemins par défaut
         default_base_dir = Path.home() / ".myhashcat"
         self.work_dir = work_dir or default_base_dir / "work"
@@ -72,17 +233,48 @@ class MyHashcat:
         self.logger.info("Initialisation de MyHashcat")
         
         # Initialisation des composants
-        self.hashcat = HashcatInterface(hashcat_path=hashcat_path)
+        with self.profiler.stage("hashcat_validate"):
+            self.hashcat = HashcatInterface(hashcat_path=hashcat_path)
         self.session_manager = SessionManager(sessions_dir=self.sessions_dir)
         self._active_processes = {}  # Stockage des processus actifs
+        self._output_readers: Dict[str, ProcessOutputReader] = {}
+        self.process_watcher = ProcessWatcher()
+        # Les résultats arrivent depuis le thread du suiveur de fichiers de
+        # sortie : ce verrou sérialise leur traitement avec les autres appels
+        self.lock = threading.RLock()
+        self.outfile_tailer = OutfileTailer(self._on_cracked)
+        self.metrics_file = metrics_file
+        self.batch_size = batch_size
         
         # Création des répertoires nécessaires
         self.work_dir.mkdir(parents=True, exist_ok=True)
         self.dict_dir = self.work_dir / "dictionaries"
         self.dict_dir.mkdir(exist_ok=True)
+        self.pool_dir = self.work_dir / "pools"
+        self.rules_dir = self.work_dir / "rules"
+        self.debug_dir = self.work_dir / "debug"
+        self.rule_stats = RuleStatistics(self.sessions_dir.parent / "rule_stats.yaml")
+        self.job_queue = JobQueue(self.sessions_dir.parent / "job_queue.yaml")
+        self.markov_dir = self.sessions_dir.parent / "markov"
+        self.coverage = CoverageIndex(self.sessions_dir.parent / "coverage.yaml")
+        self.outfile_dir = self.sessions_dir.parent / "outfiles"
+        self.detection_cache = DetectionCache(self.sessions_dir.parent / "detection_cache.yaml")
+        self.wordlists = WordlistPreprocessor(self.sessions_dir.parent / "wordlists")
+        self.governor = CpuGovernor() if cpu_governor else None
+        if self.governor:
+            self.governor.pin_generator()
+            self.logger.info(
+                "Gouverneur CPU: génération sur %s, Hashcat sur %s",
+                self.governor.generator_cpus, self.governor.hashcat_cpus
+            )
+        self.batch_sizer = AdaptiveBatchSizer(
+            self.sessions_dir.parent / "batch_calibration.yaml",
+            target_seconds=target_batch_seconds
+        )
+        self.brain = BrainServer(hashcat_path, self.sessions_dir.parent / "brain", port=brain_port) if brain else None
         
-        self.logger.info(f"Répertoires initialisés: work_dir={self.work_dir}, sessions_dir={self.sessions_dir}")
-        self.logger.info(f"Version de Hashcat: {self.hashcat.version}")
+        self.logger.info("Répertoires initialisés: work_dir=%s, sessions_dir=%s", self.work_dir, self.sessions_dir)
+        self.logger.info("Version de Hashcat: %s", self.hashcat.version)
 
     def create_attack_session(
         self,
@@ -97,6 +289,18 @@ class MyHashcat:
         options: Optional[Dict[str, Any]] = None,
         skip: Optional[int] = None,
         auto_continue: bool = False,
+        pool: bool = False,
+        position_charsets: Optional[List[str]] = None,
+        markov_corpus: Optional[Path] = None,
+        markov_order: int = 1,
+        max_repeat: Optional[int] = None,
+        required_classes: Optional[List[str]] = None,
+        distributed: bool = False,
+        instances: int = 1,
+        instance_devices: Optional[List[str]] = None,
+        wordlist: Optional[Path] = None,
+        left_wordlist: Optional[Path] = None,
+        right_wordlist: Optional[Path] = None,
         verbose: bool = False
     ) -> str:
         """
@@ -108,17 +312,46 @@ class MyHashcat:
             hash_type (Optional[int]): Type de hash (détection automatique si None)
             word_length (Optional[int]): Longueur des mots (18 par défaut)
             charset (Optional[set]): Jeu de caractères (A-Z0-9 par défaut)
-            attack_mode (str): Mode d'attaque (straight, rules, mask)
+            attack_mode (str): Mode d'attaque (straight, rules, mask,
+                combination, hybrid, hybrid_prefix)
             rules (Optional[List[Path]]): Liste des fichiers de règles
-            mask (Optional[str]): Masque pour l'attaque
+            mask (Optional[str]): Masque pour l'attaque (ajouté après chaque
+                mot en mode hybrid, avant en mode hybrid_prefix)
             options (Optional[Dict[str, Any]]): Options supplémentaires
             skip (Optional[int]): Nombre de mots à sauter dans le dictionnaire
             auto_continue (bool): Continue automatiquement avec un nouveau dictionnaire
+            pool (bool): Met la session en attente pour qu'elle soit mutualisée
+                avec les sessions compatibles par run_pooled_sessions
+            position_charsets (Optional[List[str]]): Caractères autorisés à
+                chaque position (remplace word_length et charset)
+            markov_corpus (Optional[Path]): Corpus de mots de passe servant à
+                énumérer les candidats par probabilité décroissante
+            markov_order (int): Ordre du modèle de Markov (0 : par position,
+                1 : selon le caractère précédent)
+            max_repeat (Optional[int]): Nombre maximal de répétitions
+                consécutives d'un même caractère dans les mots générés
+            required_classes (Optional[List[str]]): Classes de caractères
+                devant figurer dans chaque mot (« l », « u », « d », « s » ou
+                liste de caractères)
+            distributed (bool): Répartit le keyspace entre des workers
+                distants (voir distributed.LeaseManager) au lieu de lancer Hashcat ici
+            instances (int): Nombre d'instances Hashcat se partageant chaque
+                lot (tranches disjointes --skip/--limit)
+            instance_devices (Optional[List[str]]): Périphériques de chaque
+                instance (--backend-devices, ex: ["1", "2,3"]) ; à défaut,
+                les cœurs sont répartis entre les instances
+            wordlist (Optional[Path]): Liste de mots externe attaquée à la
+                place des dictionnaires générés (filtrée et dédupliquée par
+                prepare_wordlist) ; dictionnaire des modes hybrides
+            left_wordlist (Optional[Path]): Liste de gauche du mode combination
+                (produite par le générateur si absente)
+            right_wordlist (Optional[Path]): Liste de droite du mode combination
+                (produite par le générateur si absente)
             verbose (bool): Affiche les détails de l'exécution
         """
         try:
-            self.logger.info(f"Création d'une nouvelle session d'attaque: {name}")
-            self.logger.debug(f"Paramètres: hash_file={hash_file}, hash_type={hash_type}, word_length={word_length}")
+            self.logger.info("Création d'une nouvelle session d'attaque: %s", name)
+            self.logger.debug("Paramètres: hash_file=%s, hash_type=%s, word_length=%s", hash_file, hash_type, word_length)
 
             # Vérification du fichier de hash
             if not hash_file.exists():
@@ -126,13 +359,23 @@ class MyHashcat:
                 self.logger.error(error_msg)
                 raise ValueError(error_msg)
 
+            if instances < 1:
+                raise ValueError(f"Nombre d'instances invalide: {instances}")
+            if wordlist is not None and (pool or distributed):
+                raise ValueError("Une liste de mots externe ne peut pas être mutualisée ni distribuée")
+            if instance_devices and len(instance_devices) != instances:
+                raise ValueError(
+                    f"{len(instance_devices)} jeux de périphériques pour {instances} instances"
+                )
+
             # Détection automatique du type de hash si non spécifié
             if hash_type is None:
                 try:
-                    detected = HashDetector.detect_from_file(hash_file)
+                    with self.profiler.stage("hash_detection"):
+                        detected = self.detection_cache.detect(hash_file)
                     if detected:
                         hash_type = detected["id"]
-                        self.logger.info(f"Type de hash détecté: {detected['name']} (ID: {detected['id']})")
+                        self.logger.info("Type de hash détecté: %s (ID: %s)", detected['name'], detected['id'])
                         if verbose:
                             print(f"Type de hash détecté : {detected['name']} (ID: {detected['id']})")
                     else:
@@ -140,29 +383,63 @@ class MyHashcat:
                         self.logger.error(error_msg)
                         raise ValueError(f"{error_msg}. Veuillez le spécifier manuellement.")
                 except Exception as e:
-                    self.logger.error(f"Erreur lors de la détection du type de hash: {str(e)}")
+                    self.logger.error("Erreur lors de la détection du type de hash: %s", e)
                     raise ValueError(f"Erreur lors de la détection du type de hash: {str(e)}")
 
-            # Définition de la longueur par défaut
-            if word_length is None:
-                word_length = 18  # Longueur par défaut
-                self.logger.debug(f"Utilisation de la longueur par défaut: {word_length}")
-            elif word_length != 18:
-                self.logger.warning(f"Longueur spécifiée ({word_length}) ignorée, utilisation de 18 caractères")
-                if verbose:
-                    print(f"Attention : La longueur des mots est fixée à 18 caractères selon les spécifications.")
-                word_length = 18
+            if attack_mode == "combination":
+                if pool or distributed or instances > 1 or wordlist is not None or rules or skip:
+                    raise ValueError(
+                        "Le mode combination n'accepte ni mutualisation, ni distribution, ni instances "
+                        "multiples, ni liste unique, ni règles, ni skip"
+                    )
+                return self._create_combinator_session(
+                    name, hash_file, hash_type, left_wordlist, right_wordlist,
+                    word_length=word_length, charset=charset, position_charsets=position_charsets,
+                    options=options, verbose=verbose
+                )
+            if attack_mode in ("hybrid", "hybrid_prefix"):
+                if pool or distributed or instances > 1 or rules or left_wordlist or right_wordlist:
+                    raise ValueError(
+                        f"Le mode {attack_mode} n'accepte ni mutualisation, ni distribution, ni instances "
+                        "multiples, ni règles, ni listes de combinaison"
+                    )
+                return self._create_hybrid_session(
+                    name, hash_file, hash_type, attack_mode, mask, wordlist,
+                    word_length=word_length, charset=charset, position_charsets=position_charsets,
+                    options=options, skip=skip, verbose=verbose
+                )
 
-            # Configuration du charset par défaut (A-Z, 0-9)
-            if charset is None:
-                charset = set(string.ascii_uppercase + string.digits)
-                self.logger.debug(f"Utilisation du charset par défaut: {''.join(sorted(charset))}")
+            if position_charsets:
+                # Format connu : chaque position a son propre jeu de caractères
+                position_charsets = ["".join(sorted(set(chars))) for chars in position_charsets]
+                if word_length is not None and word_length != len(position_charsets):
+                    raise ValueError(
+                        f"Longueur incohérente: {word_length} pour {len(position_charsets)} positions"
+                    )
+                word_length = len(position_charsets)
+                charset = set("".join(position_charsets))
             else:
-                # Force le charset à n'utiliser que des majuscules et des chiffres
-                old_charset = charset
-                charset = set(c.upper() for c in charset if c.upper() in string.ascii_uppercase + string.digits)
-                if charset != old_charset:
-                    self.logger.warning(f"Charset modifié pour n'inclure que les majuscules et chiffres: {''.join(sorted(charset))}")
+                # Définition de la longueur par défaut
+                if word_length is None:
+                    word_length = 18  # Longueur par défaut
+                    self.logger.debug("Utilisation de la longueur par défaut: %s", word_length)
+                elif word_length != 18:
+                    self.logger.warning("Longueur spécifiée (%s) ignorée, utilisation de 18 caractères", word_length)
+                    if verbose:
+                        print(f"Attention : La longueur des mots est fixée à 18 caractères selon les spécifications.")
+                    word_length = 18
+
+                # Configuration du charset par défaut (A-Z, 0-9)
+                if charset is None:
+                    charset = set(string.ascii_uppercase + string.digits)
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("Utilisation du charset par défaut: %s", ''.join(sorted(charset)))
+                else:
+                    # Force le charset à n'utiliser que des majuscules et des chiffres
+                    old_charset = charset
+                    charset = set(c.upper() for c in charset if c.upper() in string.ascii_uppercase + string.digits)
+                    if charset != old_charset:
+                        self.logger.warning("Charset modifié pour n'inclure que les majuscules et chiffres: %s", ''.join(sorted(charset)))
 
             # Ajustements spécifiques pour WPA
             if hash_type == 22000:  # WPA-PBKDF2-PMKID+EAPOL
@@ -182,6 +459,26 @@ class MyHashcat:
                     else:
                         self.logger.warning("Fichier de règles best64.rule non trouvé")
 
+            # Modèle de Markov figé pour toute la durée de la session
+            markov_model = None
+            if markov_corpus:
+                with self.profiler.stage("markov_training"):
+                    markov_model = train_model_file(Path(markov_corpus), self.markov_dir, markov_order)
+                self.logger.info("Modèle de Markov: %s", markov_model)
+
+            # Liste de mots externe, filtrée pour ce type de hash
+            prepared = None
+            if wordlist is not None:
+                prepared = self.prepare_wordlist(wordlist, hash_type=hash_type)
+                if not prepared["kept"]:
+                    raise ValueError(f"Aucun mot utilisable dans {wordlist}")
+                if verbose:
+                    print(f"Liste de mots : {prepared['kept']:,} mots conservés sur {prepared['read']:,}")
+
+            constraints = None
+            if max_repeat is not None or required_classes:
+                constraints = KeyspaceConstraints(max_repeat, required_classes).to_dict()
+
             # Configuration de la session
             config = {
                 "name": name,
@@ -189,11 +486,17 @@ class MyHashcat:
                 "hash_type": hash_type,
                 "word_length": word_length,
                 "charset": list(charset),
+                "position_charsets": position_charsets,
+                "markov_model": str(markov_model) if markov_model else None,
+                "constraints": constraints,
                 "attack_mode": attack_mode,
                 "rules": [str(r) for r in rules] if rules else None,
                 "mask": mask,
                 "options": options,
                 "skip": skip,
+                "instance_count": instances,
+                "instance_devices": instance_devices,
+                "wordlist": str(Path(wordlist).resolve()) if prepared else None,
                 "start_time": datetime.now().isoformat()
             }
 
@@ -203,26 +506,33 @@ class MyHashcat:
                 if "hash_file" not in config or not config["hash_file"]:
                     raise ValueError("Le fichier de hash n'est pas spécifié dans la configuration")
                 
-                session_id = self.session_manager.create_session(name, config)
-                self.logger.info(f"Session créée avec l'ID: {session_id}")
-                self.logger.debug(f"Configuration de la session: {config}")
+                with self.profiler.stage("session_write"):
+                    session_id = self.session_manager.create_session(name, config)
+                self.logger.info("Session créée avec l'ID: %s", session_id)
+                self.logger.debug("Configuration de la session: %s", config)
                 
                 # Vérification immédiate que la session a été créée avec le bon fichier de hash
-                created_session = self.session_manager.load_session(session_id)
+                with self.profiler.stage("session_read"):
+                    created_session = self.session_manager.load_session(session_id)
                 if not created_session.get("hash_file"):
                     raise ValueError("Le fichier de hash n'a pas été enregistré dans la session")
-                self.logger.debug(f"Fichier de hash vérifié dans la session: {created_session['hash_file']}")
+                self.logger.debug("Fichier de hash vérifié dans la session: %s", created_session['hash_file'])
             except Exception as e:
-                self.logger.error(f"Erreur lors de la création de la session: {str(e)}")
+                self.logger.error("Erreur lors de la création de la session: %s", e)
                 raise RuntimeError(f"Erreur lors de la création de la session: {str(e)}")
 
+            # Classement des règles selon leur rentabilité observée
+            active_rules = self._plan_rules(rules)
+            batch_size = self._choose_batch_size(hash_type, active_rules)
+
             # Initialisation du générateur avec les paramètres spécifiés
             try:
-                generator = DictionaryGenerator(length=word_length, charset=charset)
+                with self.profiler.stage("generator_init"):
+                    generator = self._make_generator(config)
                 if verbose:
                     # Récupération des informations sur le charset et les combinaisons
                     charset_size, total_combinations, total_size_tb = generator.get_charset_info()
-                    dict_needed, coverage = generator.estimate_dictionaries_needed()
+                    dict_needed, coverage = generator.estimate_dictionaries_needed(batch_size)
                     
                     print(f"\nAnalyse des combinaisons possibles :")
                     print(f"- Charset : {''.join(sorted(charset))} ({charset_size} caractères)")
@@ -230,7 +540,7 @@ class MyHashcat:
                     print(f"- Nombre total de combinaisons : {total_combinations:,}")
                     print(f"- Taille totale estimée : {total_size_tb:.2f} To")
                     print(f"\nEstimation des dictionnaires :")
-                    print(f"- Taille des dictionnaires : 1 million de mots")
+                    print(f"- Taille des dictionnaires : {batch_size:,} mots")
                     print(f"- Nombre de dictionnaires nécessaires : {dict_needed:,}")
                     print(f"- Couverture : {coverage:.2f}%")
                     
@@ -242,66 +552,151 @@ class MyHashcat:
                     if skip:
                         print(f"- Skip : {skip} mots")
             except Exception as e:
-                self.logger.error(f"Erreur lors de l'initialisation du générateur: {str(e)}")
+                self.logger.error("Erreur lors de l'initialisation du générateur: %s", e)
                 raise RuntimeError(f"Erreur lors de l'initialisation du générateur: {str(e)}")
 
+            # Mode pool : la session attend d'être regroupée avec d'autres
+            if pool:
+                self.session_manager.update_session(session_id, {
+                    "status": "pending",
+                    "next_word_index": 0
+                })
+                self.logger.info("Session %s mise en attente de mutualisation", session_id)
+                if verbose:
+                    print(f"Session {session_id} en attente de mutualisation")
+                self._update_queue_depth()
+                return session_id
+
+            # Mode distribué : les plages sont attribuées aux workers
+            if distributed:
+                self.session_manager.update_session(session_id, {
+                    "status": "distributed",
+                    "next_word_index": 0,
+                    # Les workers appliquent les règles demandées, sans classement
+                    "coverage_key": keyspace_key(config),
+                    "keyspace_total": generator.total_combinations,
+                    "leases": {},
+                    "requeued": [],
+                    "workers": {}
+                })
+                self.logger.info("Session %s en attente de workers", session_id)
+                if verbose:
+                    print(f"Session {session_id} distribuée : en attente de workers")
+                return session_id
+
             # Création du dictionnaire initial
-            try:
-                dict_file = self.dict_dir / f"{session_id}_initial.txt"
-                next_index = self._generate_dictionary(
-                    generator, 
-                    dict_file, 
-                    start_index=0,  # Premier dictionnaire commence à 0
-                    verbose=verbose
-                )
-                self.logger.info(f"Dictionnaire généré: {dict_file}")
-                
-                # Mise à jour de la configuration avec l'index de génération
+            keyspace_total = generator.total_combinations
+            if prepared:
+                # La liste préparée forme un lot unique, hors index de couverture
+                dict_file = Path(prepared["path"])
+                coverage_key = None
+                start_index, next_index = 0, prepared["kept"]
+                batch_size = keyspace_total = prepared["kept"]
                 config["next_word_index"] = next_index
-                self.session_manager.update_session(session_id, {"next_word_index": next_index})
-                
-            except Exception as e:
-                self.logger.error(f"Erreur lors de la génération du dictionnaire: {str(e)}")
-                raise RuntimeError(f"Erreur lors de la génération du dictionnaire: {str(e)}")
+                self.session_manager.update_session(session_id, {
+                    "next_word_index": next_index,
+                    "wordlist_file": prepared["path"]
+                })
+            else:
+                try:
+                    dict_file = self.dict_dir / f"{session_id}_initial.txt"
+                    # Premier dictionnaire : à partir du premier index non parcouru
+                    coverage_key = keyspace_key(config, active_rules)
+                    start_index, batch_size = self._plan_uncovered_batch(coverage_key, generator, 0, batch_size)
+                    next_index = self._generate_dictionary(
+                        generator, 
+                        dict_file, 
+                        batch_size=batch_size,
+                        start_index=start_index,
+                        verbose=verbose
+                    )
+                    self.logger.info("Dictionnaire généré: %s", dict_file)
+                    
+                    # Mise à jour de la configuration avec l'index de génération
+                    config["next_word_index"] = next_index
+                    with self.profiler.stage("session_write"):
+                        self.session_manager.update_session(session_id, {"next_word_index": next_index})
+                    
+                except Exception as e:
+                    self.logger.error("Erreur lors de la génération du dictionnaire: %s", e)
+                    raise RuntimeError(f"Erreur lors de la génération du dictionnaire: {str(e)}")
+
+            # Plusieurs instances : chacune parcourt une tranche du lot
+            if instances > 1:
+                launched = self._start_instances(
+                    session_id, config, dict_file, start_index, next_index - start_index, active_rules, skip=skip
+                )
+                with self.profiler.stage("session_write"):
+                    self.session_manager.update_session(session_id, {
+                        "instances": launched,
+                        "dictionary_file": str(dict_file),
+                        "outfile": str(self._session_outfile(session_id)),
+                        "status": "running",
+                        "active_rules": [str(r) for r in active_rules] if active_rules else None,
+                        "debug_file": self._rule_debug_options(session_id, active_rules).get("debug-file"),
+                        "batch_words": next_index - start_index,
+                        "batch_size": batch_size,
+                        "batch_start": min(start_index + (skip or 0), next_index),
+                        "coverage_key": coverage_key,
+                        "keyspace_total": keyspace_total
+                    })
+                if verbose:
+                    print(f"{len(launched)} instances Hashcat démarrées pour la session {session_id}")
+                self._export_metrics()
+                return session_id
 
             # Lancement de l'attaque
             try:
-                process = self.hashcat.start_attack(
-                    hash_file=hash_file,
-                    attack_mode=attack_mode,
-                    hash_type=hash_type,
-                    dictionary=dict_file,
-                    rules=rules,
-                    mask=mask,
-                    session=session_id,
-                    skip=skip,
-                    options={
-                        "status-timer": 10,  # Mise à jour toutes les 10 secondes
-                        **(options or {})
-                    }
-                )
-                self.logger.info(f"Attaque démarrée avec le PID {process.pid}")
+                with self.profiler.stage("hashcat_start"):
+                    process = self.hashcat.start_attack(
+                        hash_file=hash_file,
+                        attack_mode=attack_mode,
+                        hash_type=hash_type,
+                        dictionary=dict_file,
+                        rules=active_rules,
+                        mask=mask,
+                        session=session_id,
+                        skip=skip,
+                        outfile=self._session_outfile(session_id),
+                        brain=self._brain_client(),
+                        options={
+                            "status-timer": 10,  # Mise à jour toutes les 10 secondes
+                            **self._rule_debug_options(session_id, active_rules),
+                            **(options or {})
+                        }
+                    )
+                self.logger.info("Attaque démarrée avec le PID %s", process.pid)
             except Exception as e:
-                self.logger.error(f"Erreur lors du lancement de l'attaque: {str(e)}")
+                self.logger.error("Erreur lors du lancement de l'attaque: %s", e)
                 raise RuntimeError(f"Erreur lors du lancement de l'attaque: {str(e)}")
 
             # Stockage du processus
-            self._active_processes[session_id] = process
+            self._register_process(session_id, process, outfile=self._session_outfile(session_id))
             if verbose:
                 print(f"Processus enregistré pour la session {session_id}: PID {process.pid}")
 
             # Mise à jour de la session
             try:
-                self.session_manager.update_session(session_id, {
-                    "process_pid": process.pid,
-                    "dictionary_file": str(dict_file),
-                    "status": "running",
-                    "rules": [str(r) for r in rules] if rules else None,
-                    "skip": skip
-                })
-                self.logger.info(f"Session mise à jour avec le PID {process.pid}")
+                with self.profiler.stage("session_write"):
+                    self.session_manager.update_session(session_id, {
+                        "process_pid": process.pid,
+                        "process_started": process_start_time(process.pid),
+                        "dictionary_file": str(dict_file),
+                        "outfile": str(self._session_outfile(session_id)),
+                        "status": "running",
+                        "rules": [str(r) for r in rules] if rules else None,
+                        "active_rules": [str(r) for r in active_rules] if active_rules else None,
+                        "debug_file": self._rule_debug_options(session_id, active_rules).get("debug-file"),
+                        "batch_words": next_index - start_index,
+                        "batch_size": batch_size,
+                        "batch_start": min(start_index + (skip or 0), next_index),
+                        "coverage_key": coverage_key,
+                        "keyspace_total": keyspace_total,
+                        "skip": skip
+                    })
+                self.logger.info("Session mise à jour avec le PID %s", process.pid)
             except Exception as e:
-                self.logger.error(f"Erreur lors de la mise à jour de la session: {str(e)}")
+                self.logger.error("Erreur lors de la mise à jour de la session: %s", e)
                 raise RuntimeError(f"Erreur lors de la mise à jour de la session: {str(e)}")
 
             # Vérification immédiate du statut
@@ -310,19 +705,20 @@ class MyHashcat:
                 if verbose:
                     print("Le processus s'est terminé immédiatement")
                 self.session_manager.update_session(session_id, {"status": "finished"})
-                self._active_processes.pop(session_id, None)
+                self._forget_process(session_id)
 
+            self._export_metrics()
             return session_id
 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la création de la session d'attaque: {str(e)}", exc_info=True)
+            self.logger.error("Erreur lors de la création de la session d'attaque: %s", e, exc_info=True)
             raise
 
     def _generate_dictionary(
         self,
         generator: DictionaryGenerator,
         output_file: Path,
-        batch_size: int = 1_000_000,
+        batch_size: Optional[int] = None,
         start_index: int = 0,
         verbose: bool = False
     ) -> int:
@@ -332,22 +728,49 @@ class MyHashcat:
         Args:
             generator (DictionaryGenerator): Générateur à utiliser
             output_file (Path): Fichier de sortie
-            batch_size (int): Taille du lot de mots à générer (par défaut : 1 million)
+            batch_size (Optional[int]): Taille du lot de mots à générer
+                (par défaut : self.batch_size ou la taille par défaut du
+                calculateur adaptatif)
             start_index (int): Index de départ pour la génération séquentielle
             verbose (bool): Affiche les détails de l'exécution
 
         Returns:
             int: Index du dernier mot généré + 1 (pour la prochaine génération)
         """
+        batch_size = batch_size or self.batch_size or self.batch_sizer.default_batch
         if verbose:
             print(f"Génération d'un dictionnaire de {batch_size} mots à partir de l'index {start_index}...")
         
-        words = generator.generate_sequential(start_index=start_index, count=batch_size)
+        count = min(batch_size, generator.total_combinations - start_index)
+        if count < 1:
+            raise ValueError("L'index de départ dépasse le nombre total de combinaisons possibles")
+
+        # Génération par blocs : mémoire bornée et points de contre-pression
+        started = time.perf_counter()
+        bytes_written = 0
+        next_index = start_index
         with output_file.open("w") as f:
-            for word in words:
-                f.write(f"{word}\n")
+            while next_index < start_index + count:
+                with self.profiler.stage("generate_sequential"):
+                    words = generator.generate_sequential(
+                        start_index=next_index,
+                        count=min(self.GENERATION_CHUNK, start_index + count - next_index)
+                    )
+                with self.profiler.stage("dictionary_write"):
+                    bytes_written += f.write("".join(f"{word}\n" for word in words))
+                next_index += len(words)
+                if self.governor:
+                    self.governor.throttle()
+        elapsed = time.perf_counter() - started
         
-        next_index = start_index + len(words)
+        REGISTRY.inc("generated_words_total", count)
+        REGISTRY.inc("generation_seconds_total", elapsed)
+        REGISTRY.inc("dictionary_bytes_written_total", bytes_written)
+        if elapsed > 0:
+            REGISTRY.set("generation_words_per_second", count / elapsed)
+        if self.governor:
+            self.logger.info("Goulot d'étranglement: %s", self.governor.last_sample.get("bottleneck"))
+        self._export_metrics()
         
         if verbose:
             print(f"Dictionnaire généré avec succès : {output_file}")
@@ -355,226 +778,1859 @@ class MyHashcat:
         
         return next_index
 
-    def get_session_status(self, session_id: str) -> Dict[str, Any]:
+    def _create_combinator_session(
+        self,
+        name: str,
+        hash_file: Path,
+        hash_type: Optional[int],
+        left_wordlist: Optional[Path],
+        right_wordlist: Optional[Path],
+        word_length: Optional[int] = None,
+        charset: Optional[set] = None,
+        position_charsets: Optional[List[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        verbose: bool = False
+    ) -> str:
         """
-        Récupère l'état d'une session
+        Crée et démarre une attaque par combinaison (-a 1)
 
-        Args:
-            session_id (str): Identifiant de la session
+        Hashcat concatène sur le périphérique chaque mot de gauche avec chaque
+        mot de droite : seul le côté gauche est découpé en lots, le produit
+        cartésien n'est jamais écrit sur disque. Un côté sans liste est
+        produit par le générateur ; le keyspace vaut |gauche| × |droite|.
 
         Returns:
-            Dict[str, Any]: État de la session
+            str: Identifiant de la session
         """
-        session = self.session_manager.load_session(session_id)
-        if not session:
-            raise ValueError(f"Session non trouvée: {session_id}")
-
-        # Mise à jour du statut si un processus est en cours
-        if session.get("process_pid"):
-            process = self._active_processes.get(session_id)
-            if process:
-                # Vérification si le processus est toujours en cours d'exécution
-                if process.poll() is None:
-                    # Lecture de la sortie sans l'afficher
-                    if process.stdout:
-                        while True:
-                            line = process.stdout.readline()
-                            if not line:
-                                break
-                            # Analyse des lignes importantes
-                            if "Recovered" in line:
-                                recovered = line.split(":")[1].strip().split("/")[0]
-                                if int(recovered) > 0:
-                                    session["recovered"] = int(recovered)
-                                    session["status"] = "finished"
-                                    self.session_manager.update_session(session_id, {
-                                        "status": "finished",
-                                        "recovered": int(recovered)
-                                    })
-                                    return session
-                            elif "Progress" in line:
-                                progress = line.split(":")[1].strip().split("/")[0]
-                                session["progress"] = progress
-                    
-                    # Si le processus est toujours en cours
-                    session["status"] = "running"
-                else:
-                    session["status"] = "finished"
-                    self.session_manager.update_session(session_id, {"status": "finished"})
-                    self._active_processes.pop(session_id, None)
-            else:
-                # Mise à jour du statut pour refléter l'absence de processus
-                session["status"] = "finished"
-                self.session_manager.update_session(session_id, {"status": "finished"})
+        if left_wordlist is None and right_wordlist is None:
+            raise ValueError("Le mode combination exige au moins une liste de mots (gauche ou droite)")
 
-        return session
+        config: Dict[str, Any] = {
+            "name": name,
+            "hash_file": str(hash_file.resolve()),
+            "hash_type": hash_type,
+            "attack_mode": "combination",
+            "options": options,
+            "start_time": datetime.now().isoformat()
+        }
+        generated = None
+        if left_wordlist is None or right_wordlist is None:
+            if not position_charsets and not word_length:
+                raise ValueError("Le côté généré d'une combinaison exige un masque de mot ou une longueur")
+            generated = "left" if left_wordlist is None else "right"
+            if position_charsets:
+                position_charsets = ["".join(sorted(set(chars))) for chars in position_charsets]
+            config.update({
+                "combinator_generated": generated,
+                "position_charsets": position_charsets,
+                "word_length": len(position_charsets) if position_charsets else word_length,
+                "charset": sorted(charset or set(string.ascii_uppercase + string.digits)),
+            })
 
-    def stop_session(self, session_id: str) -> None:
-        """Arrête une session en cours d'exécution."""
-        self.logger.info(f"Tentative d'arrêt de la session {session_id}")
-        
-        try:
-            session = self.session_manager.load_session(session_id)
-            if not session:
-                self.logger.error(f"Session {session_id} non trouvée")
-                raise ValueError(f"Session {session_id} non trouvée")
+        sizes = {}
+        for side, wordlist in (("left", left_wordlist), ("right", right_wordlist)):
+            if wordlist is None:
+                continue
+            prepared = self.prepare_wordlist(wordlist)
+            if not prepared["kept"]:
+                raise ValueError(f"Aucun mot utilisable dans {wordlist}")
+            config[f"{side}_wordlist"] = str(Path(wordlist).resolve())
+            config[f"{side}_file"] = prepared["path"]
+            sizes[side] = prepared["kept"]
+        generator = self._make_generator(config) if generated else None
+        if generated:
+            sizes[generated] = generator.total_combinations
+        if generated == "right" and sizes["right"] > self.MAX_GENERATED_RIGHT:
+            raise ValueError(
+                f"Liste de droite générée trop grande ({sizes['right']:,} mots, "
+                f"maximum {self.MAX_GENERATED_RIGHT:,}) : générez plutôt le côté gauche"
+            )
+        config.update({
+            "left_total": sizes["left"],
+            "right_total": sizes["right"],
+            "keyspace_total": sizes["left"] * sizes["right"],
+            "candidates_per_word": sizes["right"],
+            "next_word_index": 0,
+            "left_offset": 0
+        })
 
-            # Récupérer le PID du processus
-            pid = session.get("process_pid")
-            if not pid:
-                self.logger.warning(f"Aucun PID trouvé pour la session {session_id}")
-                return
+        with self.profiler.stage("session_write"):
+            session_id = self.session_manager.create_session(name, config)
+        self.logger.info(
+            "Combinaison %s: %s × %s = %s candidats", session_id, sizes["left"], sizes["right"], config["keyspace_total"]
+        )
+        if verbose:
+            print(f"Combinaison : {sizes['left']:,} × {sizes['right']:,} = {config['keyspace_total']:,} candidats")
 
-            # Tenter d'arrêter le processus principal
-            try:
-                parent = psutil.Process(pid)
-                # Arrêter tous les processus enfants
-                children = parent.children(recursive=True)
-                for child in children:
-                    self.logger.debug(f"Tentative d'arrêt du processus enfant {child.pid}")
-                    child.kill()
-                # Arrêter le processus parent
-                self.logger.debug(f"Tentative d'arrêt du processus parent {pid}")
-                parent.kill()
-            except psutil.NoSuchProcess:
-                self.logger.warning(f"Processus {pid} déjà terminé")
-            except Exception as e:
-                self.logger.error(f"Erreur lors de l'arrêt du processus {pid}: {str(e)}")
+        if generated == "right":
+            # La liste de droite est relue pour chaque lot : écrite une seule fois
+            right_file = self.dict_dir / f"{session_id}_right.txt"
+            self._generate_dictionary(generator, right_file, batch_size=sizes["right"], verbose=verbose)
+            config["right_file"] = str(right_file)
+            self.session_manager.update_session(session_id, {"right_file": config["right_file"]})
+        self._start_combinator_batch(session_id, config, verbose=verbose)
+        self._export_metrics()
+        return session_id
 
-            # Mettre à jour le statut de la session
-            session["status"] = "stopped"
-            self.session_manager.update_session(session_id, session)
-            
-            # Supprimer le processus de la liste des processus actifs
-            if session_id in self._active_processes:
-                del self._active_processes[session_id]
-            
-            self.logger.info(f"Session {session_id} arrêtée avec succès")
+    def _create_hybrid_session(
+        self,
+        name: str,
+        hash_file: Path,
+        hash_type: Optional[int],
+        attack_mode: str,
+        mask: Optional[str],
+        wordlist: Optional[Path],
+        word_length: Optional[int] = None,
+        charset: Optional[set] = None,
+        position_charsets: Optional[List[str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        skip: Optional[int] = None,
+        verbose: bool = False
+    ) -> str:
+        """
+        Crée et démarre une attaque hybride (-a 6 dictionnaire + masque, -a 7
+        masque + dictionnaire)
 
-        except Exception as e:
-            self.logger.error(f"Erreur lors de l'arrêt de la session {session_id}: {str(e)}")
-            raise
+        La partie variable est confiée au moteur de masques de Hashcat : seul
+        le dictionnaire (liste externe ou générateur) est découpé en lots, le
+        keyspace vaut |dictionnaire| × |masque|. Hashcat prend le dictionnaire
+        pour base, --skip/--limit s'appliquent donc directement à la liste.
 
-    def cleanup(self) -> None:
-        """
-        Nettoie les ressources temporaires et les sessions
-        
-        Cette méthode va :
-        1. Lister toutes les sessions actives
-        2. Arrêter les processus en cours
-        3. Supprimer toutes les sessions sauf nao1_20250123_110122
-        4. Nettoyer les fichiers temporaires sauf ceux de la session conservée
+        Returns:
+            str: Identifiant de la session
         """
-        print("\n=== Nettoyage de MyHashcat ===")
-        
-        SESSION_TO_KEEP = "nao1_20250123_110122"
-        
-        # 1. Liste et arrêt des processus actifs
-        if self._active_processes:
-            print("\n1. Sessions actives trouvées :")
-            active_sessions = list(self._active_processes.keys())
-            for session_id in active_sessions:
-                session = self.session_manager.load_session(session_id)
-                if session:
-                    print(f"   - {session_id} (PID: {session.get('process_pid')})")
-                    try:
-                        print(f"     → Arrêt de la session {session_id}...")
-                        self.stop_session(session_id)
-                        print(f"     → Session arrêtée avec succès")
-                    except Exception as e:
-                        print(f"     → Erreur lors de l'arrêt : {e}")
-        else:
-            print("\n1. Aucune session active trouvée")
-
-        # 2. Nettoyage de l'interface Hashcat
-        print("\n2. Nettoyage des ressources Hashcat...")
-        try:
-            self.hashcat.cleanup()
-            print("   → Ressources Hashcat nettoyées")
-        except Exception as e:
-            print(f"   → Erreur lors du nettoyage Hashcat : {e}")
+        if not mask:
+            raise ValueError(f"Le mode {attack_mode} exige un masque")
+        custom_charsets = {
+            str(n): (options or {})[f"custom-charset{n}"]
+            for n in range(1, 5) if (options or {}).get(f"custom-charset{n}")
+        }
+        mask_size = DictionaryGenerator.from_mask(mask, custom_charsets).total_combinations
 
-        # 3. Suppression des sessions
-        print("\n3. Nettoyage des sessions...")
-        sessions = self.session_manager.list_sessions()
-        if sessions:
-            for session_id in sessions:
-                if session_id != SESSION_TO_KEEP:  # Garde uniquement cette session
-                    try:
-                        self.session_manager.delete_session(session_id)
-                        print(f"   - Session {session_id} supprimée")
-                    except Exception as e:
-                        print(f"   - Erreur lors de la suppression de {session_id}: {e}")
-                else:
-                    print(f"   - Session {session_id} conservée")
+        config: Dict[str, Any] = {
+            "name": name,
+            "hash_file": str(hash_file.resolve()),
+            "hash_type": hash_type,
+            "attack_mode": attack_mode,
+            "mask": mask,
+            "options": options,
+            "start_time": datetime.now().isoformat()
+        }
+        if wordlist is not None:
+            prepared = self.prepare_wordlist(wordlist)
+            if not prepared["kept"]:
+                raise ValueError(f"Aucun mot utilisable dans {wordlist}")
+            config.update({
+                "left_wordlist": str(Path(wordlist).resolve()),
+                "left_file": prepared["path"],
+                "left_total": prepared["kept"]
+            })
         else:
-            print("   → Aucune session trouvée")
-
-        # 4. Nettoyage des fichiers temporaires
-        print("\n4. Nettoyage des fichiers temporaires...")
-        
-        # Nettoyage des dictionnaires
-        if self.dict_dir.exists():
-            try:
-                # Récupération du fichier dictionnaire de la session à conserver
-                session_to_keep = self.session_manager.load_session(SESSION_TO_KEEP)
-                dict_file_to_keep = None
-                if session_to_keep and "dictionary_file" in session_to_keep:
-                    dict_file_to_keep = Path(session_to_keep["dictionary_file"])
-                
-                files_count = 0
-                for file in self.dict_dir.glob("*"):
-                    if dict_file_to_keep and file == dict_file_to_keep:
-                        print(f"   → Conservation du dictionnaire: {file.name}")
-                        continue
-                    try:
-                        file.unlink()
-                        files_count += 1
-                    except OSError as e:
-                        print(f"   → Erreur lors de la suppression de {file.name}: {e}")
-                
-                if files_count > 0:
-                    print(f"   → {files_count} fichiers dictionnaire(s) supprimé(s)")
-                
-                # Ne pas supprimer le répertoire s'il contient encore le dictionnaire à conserver
-                if not any(self.dict_dir.iterdir()):
-                    self.dict_dir.rmdir()
-                    print("   → Répertoire des dictionnaires supprimé")
-                else:
-                    print("   → Répertoire des dictionnaires conservé (contient le dictionnaire actif)")
-                    
-            except OSError as e:
-                print(f"   → Erreur lors du nettoyage des dictionnaires : {e}")
-
-        # Nettoyage du répertoire de travail seulement s'il est vide
-        if self.work_dir.exists():
-            try:
-                if not any(self.work_dir.iterdir()):
-                    self.work_dir.rmdir()
-                    print("   → Répertoire de travail supprimé")
-                else:
-                    print("   → Répertoire de travail conservé (contient des fichiers actifs)")
-            except OSError as e:
-                print("   → Le répertoire de travail contient encore des fichiers, il sera conservé")
+            if not position_charsets and not word_length:
+                raise ValueError(f"Le dictionnaire généré du mode {attack_mode} exige un masque de mot ou une longueur")
+            if position_charsets:
+                position_charsets = ["".join(sorted(set(chars))) for chars in position_charsets]
+            config.update({
+                "combinator_generated": "left",
+                "position_charsets": position_charsets,
+                "word_length": len(position_charsets) if position_charsets else word_length,
+                "charset": sorted(charset or set(string.ascii_uppercase + string.digits)),
+            })
+            config["left_total"] = self._make_generator(config).total_combinations
+        if skip and skip >= config["left_total"]:
+            raise ValueError(f"Skip {skip} au-delà du dictionnaire ({config['left_total']} mots)")
+        config.update({
+            "right_total": mask_size,
+            "keyspace_total": config["left_total"] * mask_size,
+            "candidates_per_word": mask_size,
+            "next_word_index": skip or 0,
+            "left_offset": 0
+        })
 
-        print("\n=== Nettoyage terminé ===\n")
+        with self.profiler.stage("session_write"):
+            session_id = self.session_manager.create_session(name, config)
+        self.logger.info(
+            "Hybride %s: %s mots × %s (%s) = %s candidats",
+            session_id, config["left_total"], mask_size, mask, config["keyspace_total"]
+        )
+        if verbose:
+            print(f"Hybride : {config['left_total']:,} mots × {mask_size:,} ({mask}) = {config['keyspace_total']:,} candidats")
+        self._start_combinator_batch(session_id, config, verbose=verbose)
+        self._export_metrics()
+        return session_id
 
-    def continue_attack(self, session_id: str, verbose: bool = False) -> str:
+    def _start_combinator_batch(self, session_id: str, session: Dict[str, Any], verbose: bool = False) -> None:
         """
-        Continue une attaque avec le même dictionnaire
+        Lance le lot suivant d'une combinaison à partir de ses curseurs
+
+        En mode combination, le lot est une tranche de la liste de gauche,
+        écrite dans son propre fichier : Hashcat choisit comme base la plus
+        grande des deux listes, si bien que --skip/--limit ne porteraient pas
+        toujours sur la gauche. En mode hybride, la liste externe est la base
+        et le lot est sélectionné par --skip/--limit, sans recopie.
 
         Args:
-            session_id (str): Identifiant de la session à continuer
+            session_id (str): Identifiant de la session
+            session (Dict[str, Any]): Configuration et curseurs de la session
+                (``next_word_index``, ``left_offset``)
             verbose (bool): Affiche les détails de l'exécution
-
-        Returns:
-            str: ID de la nouvelle session
         """
-        self.logger.info(f"Continuation de l'attaque pour la session {session_id}")
+        start = session.get("next_word_index", 0)
+        if start >= session["left_total"]:
+            raise ValueError("Keyspace déjà entièrement parcouru pour cette combinaison")
+        if self.batch_size:
+            batch_size = self.batch_size
+        else:
+            batch_size = self.batch_sizer.batch_size(
+                session.get("hash_type"), session["right_total"], previous=session.get("batch_size")
+            )
+        batch_size = min(batch_size, session["left_total"] - start)
 
-        # Chargement de la session
-        session = self.session_manager.load_session(session_id)
-        if not session:
+        attack_mode = session.get("attack_mode") or "combination"
+        dict_file = self.dict_dir / f"{session_id}_left.txt"
+        offset = session.get("left_offset") or 0
+        skip = limit = None
+        if session.get("combinator_generated") == "left":
+            next_index = self._generate_dictionary(
+                self._make_generator(session), dict_file, batch_size=batch_size, start_index=start, verbose=verbose
+            )
+        elif attack_mode != "combination":
+            dict_file = Path(session["left_file"])
+            skip, limit = start, batch_size
+            next_index = start + batch_size
+        else:
+            # Reprise à l'octet près dans la liste préparée
+            next_index = start
+            with self.profiler.stage("dictionary_write"):
+                with open(session["left_file"], "rb") as source, dict_file.open("wb") as f:
+                    source.seek(offset)
+                    while next_index < start + batch_size:
+                        line = source.readline()
+                        if not line:
+                            break
+                        f.write(line)
+                        next_index += 1
+                    offset = source.tell()
+
+        outfile = self._session_outfile(session_id)
+        try:
+            with self.profiler.stage("hashcat_start"):
+                process = self.hashcat.start_attack(
+                    hash_file=Path(session["hash_file"]),
+                    attack_mode=attack_mode,
+                    hash_type=session.get("hash_type"),
+                    dictionary=dict_file,
+                    right_dictionary=Path(session["right_file"]) if attack_mode == "combination" else None,
+                    mask=session.get("mask") if attack_mode != "combination" else None,
+                    session=session_id,
+                    outfile=outfile,
+                    skip=skip,
+                    limit=limit,
+                    brain=self._brain_client(),
+                    options={"status-timer": 10, **(session.get("options") or {})}
+                )
+        except Exception as e:
+            self.logger.error("Erreur lors du lancement de la combinaison: %s", e)
+            raise RuntimeError(f"Erreur lors du lancement de la combinaison: {str(e)}")
+        self._register_process(session_id, process, outfile=outfile)
+        self.logger.info(
+            "%s %s: mots de gauche %s à %s (PID %s)", attack_mode, session_id, start, next_index, process.pid
+        )
+
+        with self.profiler.stage("session_write"):
+            self.session_manager.update_session(session_id, {
+                "process_pid": process.pid,
+                "process_started": process_start_time(process.pid),
+                "dictionary_file": str(dict_file),
+                "outfile": str(outfile),
+                "status": "running",
+                "next_word_index": next_index,
+                "left_offset": offset,
+                "batch_start": start,
+                "batch_words": next_index - start,
+                "batch_size": batch_size
+            })
+
+    def _continue_combinator(self, session_id: str, session: Dict[str, Any], verbose: bool = False) -> str:
+        """
+        Poursuit une combinaison avec la tranche de gauche suivante
+
+        Args:
+            session_id (str): Session terminée ou arrêtée
+            session (Dict[str, Any]): Données de la session
+            verbose (bool): Affiche les détails de l'exécution
+
+        Returns:
+            str: Identifiant de la nouvelle session
+        """
+        if session.get("next_word_index", 0) >= session["left_total"]:
+            raise ValueError(f"Keyspace déjà entièrement parcouru pour la session {session_id}")
+        new_config = {key: session.get(key) for key in self.COMBINATOR_FIELDS}
+        new_config.update({
+            "start_time": datetime.now().isoformat(),
+            "previous_session": session_id,
+            "status": "created"
+        })
+        with self.profiler.stage("session_write"):
+            new_session_id = self.session_manager.create_session(session["name"], new_config)
+        self.logger.info("Nouvelle session créée: %s", new_session_id)
+        self._start_combinator_batch(new_session_id, new_config, verbose=verbose)
+        if verbose:
+            print(f"Combinaison poursuivie avec la session {new_session_id}")
+        return new_session_id
+
+    def run_pooled_sessions(self, verbose: bool = False) -> List[str]:
+        """
+        Lance les sessions en attente en les regroupant par keyspace
+
+        Les sessions en attente ayant le même type de hash, le même keyspace
+        et la même position de départ sont fusionnées en une seule liste de
+        hashs et attaquées par un seul processus Hashcat.
+
+        Args:
+            verbose (bool): Affiche les détails de l'exécution
+
+        Returns:
+            List[str]: Identifiants des pools démarrés
+        """
+        sessions = self.session_manager.list_sessions()
+        pool_ids = []
+        for members in group_pending_sessions(sessions):
+            try:
+                pool_ids.append(self._start_pool(members, sessions, verbose=verbose))
+            except Exception as e:
+                self.logger.error("Erreur lors du démarrage du pool %s: %s", members, e, exc_info=True)
+                raise RuntimeError(f"Erreur lors du démarrage du pool: {str(e)}")
+        self._update_queue_depth()
+        return pool_ids
+
+    def _start_pool(
+        self,
+        members: List[str],
+        sessions: Dict[str, Dict[str, Any]],
+        verbose: bool = False
+    ) -> str:
+        """
+        Démarre un processus Hashcat unique pour un groupe de sessions
+
+        Args:
+            members (List[str]): Sessions à mutualiser
+            sessions (Dict[str, Dict[str, Any]]): Données des sessions
+            verbose (bool): Affiche les détails de l'exécution
+
+        Returns:
+            str: Identifiant du pool
+        """
+        reference = sessions[members[0]]
+        pool = HashPool(HashPool.generate_id(reference.get("hash_type")), self.pool_dir, members)
+        hash_count = pool.merge_hash_files({
+            session_id: Path(sessions[session_id]["hash_file"]) for session_id in members
+        })
+        self.logger.info("Pool %s: %s sessions, %s hashs uniques", pool.pool_id, len(members), hash_count)
+        if verbose:
+            print(f"Pool {pool.pool_id} : {len(members)} sessions, {hash_count} hashs uniques")
+
+        generator = self._make_generator(reference)
+        rules = [Path(r) for r in reference["rules"]] if reference.get("rules") else None
+        active_rules = self._plan_rules(rules)
+        batch_size = self._choose_batch_size(reference.get("hash_type"), active_rules)
+
+        start_index = reference.get("next_word_index", 0)
+        dict_file = self.dict_dir / f"{pool.pool_id}_initial.txt"
+        next_index = self._generate_dictionary(
+            generator, dict_file, batch_size=batch_size, start_index=start_index, verbose=verbose
+        )
+
+        debug_options = self._rule_debug_options(pool.pool_id, active_rules)
+        with self.profiler.stage("hashcat_start"):
+            process = self.hashcat.start_attack(
+                hash_file=pool.hash_file,
+                attack_mode=reference.get("attack_mode", "straight"),
+                hash_type=reference.get("hash_type"),
+                dictionary=dict_file,
+                rules=active_rules,
+                mask=reference.get("mask"),
+                session=pool.pool_id,
+                skip=reference.get("skip"),
+                outfile=pool.outfile,
+                brain=self._brain_client(),
+                options={
+                    "status-timer": 10,
+                    **debug_options,
+                    **(reference.get("options") or {})
+                }
+            )
+        self._register_process(pool.pool_id, process, outfile=pool.outfile)
+        self.logger.info("Pool %s démarré avec le PID %s", pool.pool_id, process.pid)
+
+        for session_id in members:
+            self.session_manager.update_session(session_id, {
+                **pool.to_dict(),
+                "batch_start": min(start_index + (reference.get("skip") or 0), next_index),
+                "coverage_key": keyspace_key(sessions[session_id], active_rules),
+                "keyspace_total": generator.total_combinations,
+                "process_pid": process.pid,
+                "process_started": process_start_time(process.pid),
+                "dictionary_file": str(dict_file),
+                "next_word_index": next_index,
+                "active_rules": [str(r) for r in active_rules] if active_rules else None,
+                "debug_file": debug_options.get("debug-file"),
+                "batch_words": next_index - start_index,
+                "batch_size": batch_size,
+                "status": "running"
+            })
+        return pool.pool_id
+
+    def _continue_pooled(self, session_id: str, session: Dict[str, Any], verbose: bool = False) -> str:
+        """
+        Remet en attente de mutualisation la suite d'une session mutualisée
+
+        Les membres d'un même pool reprennent au même index : leurs suites
+        sont regroupées à nouveau par run_pooled_sessions au lieu de lancer
+        chacune son propre processus Hashcat.
+
+        Args:
+            session_id (str): Session membre terminée ou arrêtée
+            session (Dict[str, Any]): Données de la session
+            verbose (bool): Affiche les détails de l'exécution
+
+        Returns:
+            str: Identifiant de la nouvelle session en attente
+        """
+        next_index = session.get("next_word_index", 0)
+        if next_index >= self._make_generator(session).total_combinations:
+            raise ValueError(f"Keyspace déjà entièrement parcouru pour la session {session_id}")
+        new_config = {key: session.get(key) for key in self.POOL_FIELDS}
+        new_config.update({
+            "start_time": datetime.now().isoformat(),
+            "previous_session": session_id,
+            "next_word_index": next_index,
+            "status": "pending"
+        })
+        with self.profiler.stage("session_write"):
+            new_session_id = self.session_manager.create_session(session["name"], new_config)
+        self.logger.info("Session %s remise en attente de mutualisation: %s", session_id, new_session_id)
+        if verbose:
+            print(f"Session {new_session_id} en attente de mutualisation (voir la commande pool)")
+        self._update_queue_depth()
+        return new_session_id
+
+    def _collect_pool_results(self, session_id: str, session: Dict[str, Any]) -> int:
+        """
+        Récupère les hashs craqués revenant à une session mutualisée
+
+        Args:
+            session_id (str): Identifiant de la session membre
+            session (Dict[str, Any]): Données de la session (mises à jour)
+
+        Returns:
+            int: Nombre de hashs de la session retrouvés
+        """
+        cracked = HashPool.from_session(session).route_results().get(session_id, [])
+        if cracked:
+            session["recovered"] = len(cracked)
+            session["cracked"] = cracked
+            self.session_manager.update_session(session_id, {
+                "recovered": len(cracked),
+                "cracked": cracked
+            })
+        return len(cracked)
+
+    def _session_outfile(self, session_id: str) -> Path:
+        """Fichier de sortie Hashcat d'une session (suivi en direct)"""
+        return self.outfile_dir / f"{session_id}.cracked"
+
+    def _start_instances(
+        self,
+        session_id: str,
+        session: Dict[str, Any],
+        dict_file: Path,
+        start_index: int,
+        batch_words: int,
+        active_rules: Optional[List[Path]],
+        skip: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Lance les instances Hashcat d'une session, une par tranche du lot
+
+        Les instances partagent le fichier de sortie (suivi une seule fois
+        sous l'identifiant de la session) et le fichier de debug des règles.
+
+        Args:
+            session_id (str): Identifiant de la session
+            session (Dict[str, Any]): Configuration de la session
+            dict_file (Path): Dictionnaire du lot
+            start_index (int): Index du premier mot du dictionnaire
+            batch_words (int): Nombre de mots du dictionnaire
+            active_rules (Optional[List[Path]]): Règles passées à Hashcat
+            skip (Optional[int]): Mots sautés en tête du dictionnaire
+
+        Returns:
+            List[Dict[str, Any]]: État initial de chaque tranche
+        """
+        devices = session.get("instance_devices")
+        slices = split_slices(batch_words, session.get("instance_count") or 1, skip or 0)
+        cpu_groups = None
+        if not devices:
+            cpus = self.governor.hashcat_cpus if self.governor else available_cpus()
+            cpu_groups = split_cpus(cpus, len(slices))
+        outfile = self._session_outfile(session_id)
+        debug_options = self._rule_debug_options(session_id, active_rules)
+
+        launched = []
+        for index, (slice_skip, limit) in enumerate(slices):
+            key = instance_key(session_id, index)
+            restriction = {"backend-devices": devices[index]} if devices else {}
+            try:
+                with self.profiler.stage("hashcat_start"):
+                    process = self.hashcat.start_attack(
+                        hash_file=Path(session["hash_file"]),
+                        attack_mode=session.get("attack_mode", "straight"),
+                        hash_type=session.get("hash_type"),
+                        dictionary=dict_file,
+                        rules=active_rules,
+                        mask=session.get("mask"),
+                        session=key,
+                        skip=slice_skip,
+                        limit=limit,
+                        outfile=outfile,
+                        brain=self._brain_client(),
+                        options={
+                            "status-timer": 10,
+                            **debug_options,
+                            **restriction,
+                            **(session.get("options") or {})
+                        }
+                    )
+            except Exception as e:
+                self.logger.error("Erreur lors du lancement de l'instance %s: %s", key, e)
+                self._stop_instances(session_id, launched)
+                raise RuntimeError(f"Erreur lors du lancement de l'instance {key}: {str(e)}")
+            self._register_process(key, process)
+            entry = {
+                "key": key,
+                "pid": process.pid,
+                "started": process_start_time(process.pid),
+                "start": start_index + slice_skip,
+                "end": start_index + slice_skip + limit,
+                "state": SLICE_RUNNING,
+            }
+            if devices:
+                entry["devices"] = devices[index]
+            elif pin_process(process.pid, cpu_groups[index]):
+                entry["cpus"] = cpu_groups[index]
+            launched.append(entry)
+            self.logger.info(
+                "Instance %s (PID %s): mots %s à %s%s", key, process.pid, entry["start"], entry["end"],
+                f", périphériques {devices[index]}" if devices else ""
+            )
+        self.outfile_tailer.watch(session_id, outfile)
+        return launched
+
+    def _refresh_instances(self, session_id: str, session: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Met à jour une session multi-instance à partir de ses tranches
+
+        La progression et la vitesse des instances sont cumulées ; la session
+        est terminée lorsque toutes ses tranches le sont. Une instance ayant
+        retrouvé tous les hashs rend les autres tranches inutiles.
+        """
+        slices = session["instances"]
+        for entry in slices:
+            if entry["state"] != SLICE_RUNNING:
+                continue
+            process = self._active_processes.get(entry["key"])
+            if process is None:
+                # Instance lancée par un autre processus MyHashcat : seule son
+                # existence peut être vérifiée, pas son code retour
+                if not is_same_process(entry["pid"], entry.get("started")):
+                    entry["state"] = slice_state(None)
+                continue
+            running = process.poll() is None
+            for line in self._read_process_output(entry["key"], wait=not running):
+                if line.startswith("Progress"):
+                    done, _, total = line.split(":", 1)[1].split()[0].partition("/")
+                    if done.isdigit() and total.isdigit():
+                        entry["progress"], entry["progress_total"] = int(done), int(total)
+                elif line.startswith("Speed.#"):
+                    speed = self.hashcat.parse_speed(line)
+                    if speed is not None:
+                        entry["speed"] = speed
+                elif line.startswith("Rejected") and self.brain:
+                    rejected = parse_rejected(line)
+                    if rejected:
+                        entry["brain_rejected"], entry["brain_candidates"] = rejected
+            if running:
+                continue
+            entry["state"] = slice_state(process.returncode)
+            entry["returncode"] = process.returncode
+            self._forget_process(entry["key"])
+            self._record_brain(entry)
+            if entry["state"] == SLICE_EXHAUSTED and session.get("coverage_key"):
+                self.coverage.add(
+                    session["coverage_key"], entry["start"], entry["end"],
+                    total=session.get("keyspace_total"),
+                    description=self._coverage_description(session)
+                )
+            self.logger.info("Tranche %s terminée: %s", entry["key"], entry["state"])
+
+        if any(entry["state"] == SLICE_CRACKED for entry in slices):
+            self._stop_instances(session_id, slices)
+
+        merged = merge_status(slices)
+        session.update({
+            "instances": slices,
+            "speed": merged["speed"],
+            "progress": merged["progress"],
+            "progress_total": merged["progress_total"],
+            "slices_done": merged["slices_done"],
+        })
+        self.session_manager.update_session(session_id, {
+            key: session[key] for key in ("instances", "speed", "progress", "progress_total", "slices_done")
+        })
+        if not merged["complete"]:
+            REGISTRY.set("hashcat_hashes_per_second", merged["speed"], labels={"session": session_id})
+            session["status"] = "running"
+            return session
+
+        # Les dernières lignes du fichier de sortie sont traitées avant la fin
+        self.outfile_tailer.unwatch(session_id, flush=True)
+        current = self.session_manager.load_session(session_id) or {}
+        for key in ("cracked", "recovered"):
+            if key in current:
+                session[key] = current[key]
+        self._mark_finished(session_id, session)
+        self._record_cracking_time(session_id, session)
+        return session
+
+    def _stop_instances(self, session_id: str, slices: List[Dict[str, Any]]) -> None:
+        """Arrête les instances encore en cours d'une session"""
+        for entry in slices:
+            if entry["state"] != SLICE_RUNNING:
+                continue
+            self.logger.info("Arrêt de l'instance %s (PID %s)", entry["key"], entry["pid"])
+            self._kill_process_tree(entry["pid"], entry.get("started"))
+            process = self._active_processes.get(entry["key"])
+            if process is not None:
+                process.wait()
+            entry["state"] = SLICE_STOPPED
+            self._forget_process(entry["key"])
+
+    def _kill_process_tree(self, pid: int, started: Optional[float]) -> None:
+        """
+        Tue un processus Hashcat et ses enfants
+
+        Args:
+            pid (int): PID du processus
+            started (Optional[float]): Date de démarrage enregistrée (un PID
+                réattribué à un autre programme n'est pas tué)
+        """
+        try:
+            if not is_same_process(pid, started):
+                # PID terminé ou réattribué à un autre programme
+                raise psutil.NoSuchProcess(pid)
+            parent = psutil.Process(pid)
+            # Arrêter tous les processus enfants
+            children = parent.children(recursive=True)
+            for child in children:
+                self.logger.debug("Tentative d'arrêt du processus enfant %s", child.pid)
+                child.kill()
+            # Arrêter le processus parent
+            self.logger.debug("Tentative d'arrêt du processus parent %s", pid)
+            parent.kill()
+        except psutil.NoSuchProcess:
+            self.logger.warning("Processus %s déjà terminé", pid)
+        except Exception as e:
+            self.logger.error("Erreur lors de l'arrêt du processus %s: %s", pid, e)
+
+    def _brain_client(self) -> Optional[Dict[str, Any]]:
+        """Options client du serveur brain (démarré au besoin), None sans brain"""
+        if not self.brain:
+            return None
+        self.brain.start()
+        return self.brain.client_options()
+
+    def _record_brain(self, stats: Dict[str, Any]) -> None:
+        """Ajoute au bilan du serveur brain les rejets d'une attaque terminée"""
+        if self.brain and stats.get("brain_candidates"):
+            self.brain.record(stats.get("brain_rejected", 0), stats["brain_candidates"], stats.get("speed"))
+
+    def _on_cracked(self, process_key: str, lines: List[str]) -> None:
+        """
+        Enregistre les hashs écrits par Hashcat dans un fichier de sortie
+
+        Appelé par le suiveur dès l'écriture des lignes : les résultats sont
+        ajoutés aux sessions concernées (membres d'un pool compris), puis les
+        sessions et travaux devenus inutiles sont arrêtés.
+
+        Args:
+            process_key (str): Session ou pool propriétaire du fichier
+            lines (List[str]): Nouvelles lignes ``hash:plain``
+        """
+        with self.lock:
+            sessions = self.session_manager.list_sessions()
+            found: Dict[str, Dict[str, Dict[str, str]]] = {}
+            pools: Dict[str, HashPool] = {}
+            for session_id, session in sessions.items():
+                if session_id != process_key and session.get("pool_id") != process_key:
+                    continue
+                if session.get("pool_id"):
+                    # Table de routage lue une fois pour tous les membres
+                    if session["pool_id"] not in pools:
+                        pools[session["pool_id"]] = HashPool.from_session(session)
+                    pool = pools[session["pool_id"]]
+                    known, wpa = pool.routing, pool.wpa
+                else:
+                    try:
+                        known, wpa = read_hash_keys(Path(session["hash_file"]))
+                    except (KeyError, OSError):
+                        continue
+                for line in lines:
+                    match = match_cracked_line(line, known, wpa)
+                    if match is None:
+                        continue
+                    key, plain = match
+                    if session.get("pool_id") and session_id not in known[key]:
+                        continue
+                    found.setdefault(session_id, {})[key] = {"hash": key, "plain": plain}
+
+            for session_id, entries in found.items():
+                self.logger.info("Hashs retrouvés par %s: %s", process_key, len(entries))
+                self._add_cracked(session_id, list(entries.values()))
+            if found:
+                self._cancel_redundant(process_key)
+
+    def _add_cracked(self, session_id: str, entries: List[Dict[str, str]]) -> None:
+        """Ajoute des hashs retrouvés à une session (sans doublon)"""
+        def add(data: Dict[str, Any]) -> Optional[bool]:
+            cracked = list(data.get("cracked") or [])
+            known = {entry["hash"] for entry in cracked}
+            new = [entry for entry in entries if entry["hash"] not in known]
+            if not new:
+                return False
+            data["cracked"] = cracked + new
+            data["recovered"] = max(len(data["cracked"]), data.get("recovered") or 0)
+            data["cracked_at"] = datetime.now().isoformat()
+            return None
+
+        self.session_manager.modify_session(session_id, add)
+
+    def _cancel_redundant(self, process_key: str) -> Dict[str, List[str]]:
+        """
+        Arrête les sessions et travaux dont tous les hashs sont retrouvés
+
+        Une session en cours, en attente de mutualisation ou préemptée (et
+        tout travail encore en file) ne visant que des hashs déjà retrouvés
+        ne ferait que consommer du temps de calcul. Un pool n'est arrêté que
+        si tous ses membres sont dans ce cas.
+
+        Args:
+            process_key (str): Session ou pool ayant retrouvé les hashs
+
+        Returns:
+            Dict[str, List[str]]: Sessions et travaux arrêtés
+        """
+        stopped: Dict[str, List[str]] = {"sessions": [], "jobs": []}
+        sessions = self.session_manager.list_sessions()
+        cracked = {
+            entry["hash"]: entry
+            for session in sessions.values()
+            for entry in session.get("cracked") or []
+            if entry.get("hash")
+        }
+        if not cracked:
+            return stopped
+
+        hash_keys: Dict[str, Optional[set]] = {}
+
+        def keys_of(hash_file: Optional[str]) -> Optional[set]:
+            if hash_file not in hash_keys:
+                try:
+                    hash_keys[hash_file] = read_hash_keys(Path(hash_file))[0] if hash_file else None
+                except OSError:
+                    hash_keys[hash_file] = None
+            return hash_keys[hash_file]
+
+        def redundant(hash_file: Optional[str]) -> bool:
+            keys = keys_of(hash_file)
+            return bool(keys) and keys.issubset(cracked)
+
+        def stop_waiting(data: Dict[str, Any]) -> Optional[bool]:
+            # La session a pu démarrer ou se terminer depuis la lecture
+            if data.get("status") not in ("pending", "preempted", "distributed"):
+                return False
+            data["status"] = "stopped"
+            return None
+
+        groups: Dict[str, List[str]] = {}
+        for session_id, session in sessions.items():
+            group = session.get("pool_id") or session_id
+            if group != process_key and session.get("status") in self.REDUNDANT_STATES:
+                groups.setdefault(group, []).append(session_id)
+
+        for group, members in groups.items():
+            member_ids = sessions[members[0]].get("pool_members") or members
+            if not all(redundant(sessions.get(member_id, {}).get("hash_file")) for member_id in member_ids):
+                continue
+            if any(sessions[member_id].get("status") == "running" for member_id in members):
+                self.stop_session(members[0])
+            else:
+                for member_id in members:
+                    self.session_manager.modify_session(member_id, stop_waiting)
+            for member_id in member_ids:
+                entries = [cracked[key] for key in sorted(keys_of(sessions[member_id]["hash_file"]))]
+                self._add_cracked(member_id, entries)
+                self.session_manager.update_session(member_id, {"stop_reason": f"hashs retrouvés par {process_key}"})
+                stopped["sessions"].append(member_id)
+            self.logger.warning("Hashs déjà retrouvés par %s: arrêt de %s", process_key, ", ".join(member_ids))
+
+        for job in self.job_queue.list_jobs():
+            if job["status"] in WAITING_STATES and redundant(job["params"].get("hash_file")):
+                self.cancel_job(job["id"])
+                self.job_queue.update(job["id"], {"cancel_reason": f"hashs retrouvés par {process_key}"})
+                stopped["jobs"].append(job["id"])
+                self.logger.warning("Hashs déjà retrouvés par %s: travail %s annulé", process_key, job["id"])
+        return stopped
+
+    def get_session_status(self, session_id: str) -> Dict[str, Any]:
+        """
+        Récupère l'état d'une session
+
+        Args:
+            session_id (str): Identifiant de la session
+
+        Returns:
+            Dict[str, Any]: État de la session
+        """
+        session = self._refresh_session_status(session_id)
+        if session.get("status") == "finished":
+            self._record_rule_stats(session_id, session)
+        self._export_metrics()
+        return session
+
+    def _refresh_session_status(self, session_id: str) -> Dict[str, Any]:
+        """Met à jour l'état d'une session à partir de son processus Hashcat"""
+        session = self.session_manager.load_session(session_id)
+        if not session:
+            raise ValueError(f"Session non trouvée: {session_id}")
+
+        if session.get("instances") and session.get("status") == "running":
+            return self._refresh_instances(session_id, session)
+
+        # Mise à jour du statut si un processus est en cours
+        if session.get("process_pid"):
+            pool_id = session.get("pool_id")
+            process = self._active_processes.get(pool_id or session_id)
+            if process:
+                # Vérification si le processus est toujours en cours d'exécution
+                running = process.poll() is None
+                speed_updated = False
+                # Lecture de la sortie sans l'afficher ni bloquer
+                for line in self._read_process_output(pool_id or session_id, wait=not running):
+                    # Analyse des lignes importantes
+                    # (les hashs d'un pool sont routés via le fichier de sortie)
+                    if "Recovered" in line and not pool_id:
+                        recovered = line.split(":")[1].strip().split("/")[0]
+                        if int(recovered) > 0:
+                            session["recovered"] = int(recovered)
+                            session["status"] = "finished"
+                            self.session_manager.update_session(session_id, {
+                                "status": "finished",
+                                "recovered": int(recovered)
+                            })
+                            if running:
+                                return session
+                    elif "Progress" in line:
+                        progress, _, total = line.split(":")[1].strip().split()[0].partition("/")
+                        session["progress"] = progress
+                        if total.isdigit():
+                            session["progress_total"] = int(total)
+                    elif line.startswith("Speed.#"):
+                        speed = self.hashcat.parse_speed(line)
+                        if speed is not None:
+                            session["speed"] = speed
+                            speed_updated = True
+                            REGISTRY.set("hashcat_hashes_per_second", speed,
+                                         labels={"session": pool_id or session_id})
+                    elif line.startswith("Rejected") and self.brain:
+                        rejected = parse_rejected(line)
+                        if rejected:
+                            session["brain_rejected"], session["brain_candidates"] = rejected
+                            self.session_manager.update_session(session_id, {
+                                "brain_rejected": rejected[0],
+                                "brain_candidates": rejected[1]
+                            })
+
+                if speed_updated:
+                    self.session_manager.update_session(session_id, {"speed": session["speed"]})
+
+                if running:
+                    if pool_id:
+                        # La progression du pool est partagée par tous ses membres
+                        if session.get("progress") is not None:
+                            for member_id in session.get("pool_members", []):
+                                self.session_manager.update_session(member_id, {
+                                    "progress": session["progress"]
+                                })
+                        if self._collect_pool_results(session_id, session) > 0:
+                            session["status"] = "finished"
+                            self.session_manager.update_session(session_id, {"status": "finished"})
+                            return session
+                    
+                    # Si le processus est toujours en cours
+                    session["status"] = "running"
+                else:
+                    self._mark_finished(session_id, session)
+                    if session.get("progress_total"):
+                        self.session_manager.update_session(session_id, {
+                            "progress": session["progress"],
+                            "progress_total": session["progress_total"]
+                        })
+                    self._record_batch_timing(pool_id or session_id, process, session)
+                    self._record_coverage(process, session)
+                    reader = self._output_readers.get(pool_id or session_id)
+                    self._forget_process(pool_id or session_id)
+                    # Les hashs du fichier de sortie, transmis au vidage du
+                    # suivi, sont écrits dans la session et non dans cette copie
+                    stored = self.session_manager.load_session(session_id) or {}
+                    for key in ("cracked", "recovered", "cracked_at"):
+                        if stored.get(key):
+                            session[key] = stored[key]
+                    self._record_brain(session)
+                    self._record_cracking_time(
+                        pool_id or session_id, session, run_seconds=reader.run_seconds if reader else None
+                    )
+                    if pool_id:
+                        self._collect_pool_results(session_id, session)
+            elif is_same_process(session["process_pid"], session.get("process_started")):
+                # Processus lancé par une autre instance (CLI, démon) : la
+                # session garde son état jusqu'à la sortie réelle de Hashcat
+                pass
+            elif pool_id:
+                self._mark_finished(session_id, session)
+                self._collect_pool_results(session_id, session)
+            else:
+                # Mise à jour du statut pour refléter l'absence de processus
+                self._mark_finished(session_id, session)
+
+        return session
+
+    def _mark_finished(self, session_id: str, session: Dict[str, Any]) -> None:
+        """
+        Passe une session terminée à l'état « finished »
+
+        La transition est faite sous le verrou de la session : une session
+        arrêtée ou préemptée entre-temps (autre processus, démon) garde son
+        état au lieu d'être écrasée.
+        """
+        def finish(data: Dict[str, Any]) -> Optional[bool]:
+            if data.get("status") in ("stopped", "preempted"):
+                return False
+            data["status"] = "finished"
+            return None
+
+        written = self.session_manager.modify_session(session_id, finish)
+        if written is None:
+            current = self.session_manager.load_session(session_id) or {}
+            session["status"] = current.get("status", "finished")
+        else:
+            session["status"] = "finished"
+
+    @staticmethod
+    def _make_generator(config: Dict[str, Any]) -> DictionaryGenerator:
+        """
+        Crée le générateur correspondant à la configuration d'une session
+
+        Args:
+            config (Dict[str, Any]): Configuration ou données de la session
+
+        Returns:
+            DictionaryGenerator: Générateur par position si la session en
+                définit, sinon avec un charset commun ; ordonné par le modèle
+                de Markov et restreint par les contraintes de la session le
+                cas échéant
+        """
+        markov = load_model(config["markov_model"]) if config.get("markov_model") else None
+        constraints = KeyspaceConstraints.from_dict(config.get("constraints"))
+        if config.get("position_charsets"):
+            return DictionaryGenerator(
+                position_charsets=[set(chars) for chars in config["position_charsets"]],
+                markov=markov,
+                constraints=constraints
+            )
+        return DictionaryGenerator(
+            length=config.get("word_length") or 18,
+            charset=set(config.get("charset") or []),
+            markov=markov,
+            constraints=constraints
+        )
+
+    def _rules_multiplier(self, rules: Optional[List[Path]]) -> int:
+        """Nombre de candidats testés par mot du dictionnaire"""
+        multiplier = 1
+        for rules_file in rules or []:
+            try:
+                multiplier *= max(len(read_rules(Path(rules_file))), 1)
+            except OSError:
+                continue
+        return multiplier
+
+    def _choose_batch_size(
+        self,
+        hash_type: Optional[int],
+        rules: Optional[List[Path]],
+        previous: Optional[int] = None
+    ) -> int:
+        """
+        Choisit la taille du prochain lot
+
+        Args:
+            hash_type (Optional[int]): Type de hash
+            rules (Optional[List[Path]]): Règles appliquées au lot
+            previous (Optional[int]): Taille du lot précédent de la session
+
+        Returns:
+            int: Nombre de mots du lot (taille fixe si configurée)
+        """
+        if self.batch_size:
+            return self.batch_size
+        batch_size = self.batch_sizer.batch_size(hash_type, self._rules_multiplier(rules), previous=previous)
+        self.logger.info("Taille de lot adaptée pour le type %s: %s mots", hash_type, batch_size)
+        return batch_size
+
+    def _record_batch_timing(self, process_key: str, process, session: Dict[str, Any]) -> None:
+        """
+        Enregistre la durée et la vitesse d'un lot épuisé
+
+        Seuls les lots parcourus jusqu'au bout (code retour 1 de Hashcat)
+        reflètent le coût réel d'un lot complet.
+        """
+        reader = self._output_readers.get(process_key)
+        run_seconds = reader.run_seconds if reader else None
+        if run_seconds is None or process.returncode != 1 or not session.get("batch_words"):
+            return
+        rules = session.get("active_rules") or session.get("rules")
+        entry = self.batch_sizer.record(
+            session.get("hash_type"),
+            words=session["batch_words"],
+            rules_multiplier=(
+                session.get("candidates_per_word")
+                or self._rules_multiplier([Path(r) for r in rules] if rules else None)
+            ),
+            run_seconds=run_seconds,
+            speed=session.get("speed")
+        )
+        session["run_seconds"] = run_seconds
+        for member_id in session.get("pool_members") or [session.get("id") or process_key]:
+            self.session_manager.update_session(member_id, {"run_seconds": run_seconds})
+        self.logger.info(
+            "Lot de %s mots en %.1fs (démarrage estimé %.1fs)",
+            session["batch_words"], run_seconds, entry.get("startup", 0.0)
+        )
+
+    def _plan_uncovered_batch(
+        self,
+        coverage_key: str,
+        generator: DictionaryGenerator,
+        start_index: int,
+        batch_size: int
+    ) -> Tuple[int, int]:
+        """
+        Place le prochain lot sur une plage non encore parcourue
+
+        Args:
+            coverage_key (str): Clé du keyspace dans l'index de couverture
+            generator (DictionaryGenerator): Générateur de la session
+            start_index (int): Index de départ souhaité
+            batch_size (int): Taille souhaitée du lot
+
+        Returns:
+            Tuple[int, int]: Index de départ et taille du lot, arrêté avant la
+                plage couverte suivante
+        """
+        uncovered, next_covered = self.coverage.next_uncovered(coverage_key, start_index)
+        if uncovered >= generator.total_combinations:
+            raise ValueError("Keyspace déjà entièrement parcouru pour ces hashs")
+        if uncovered != start_index:
+            self.logger.info("Plage déjà parcourue ignorée: %s à %s", start_index, uncovered)
+        if next_covered is not None:
+            batch_size = min(batch_size, next_covered - uncovered)
+        return uncovered, batch_size
+
+    @staticmethod
+    def _coverage_description(session: Dict[str, Any]) -> Dict[str, Any]:
+        """Description d'un keyspace dans l'index de couverture"""
+        return {
+            "name": session.get("name"),
+            "hash_file": session.get("hash_file"),
+            "hash_type": session.get("hash_type"),
+            "word_length": session.get("word_length"),
+        }
+
+    def _record_coverage(self, process, session: Dict[str, Any]) -> None:
+        """
+        Enregistre dans l'index de couverture la plage d'un lot épuisé
+
+        Un lot interrompu ou ayant retrouvé le hash (code retour autre que 1)
+        n'a pas forcément été parcouru jusqu'au bout.
+        """
+        if process.returncode != 1:
+            return
+        members = session.get("pool_members") or [session.get("id")]
+        for member_id in members:
+            member = session if member_id == session.get("id") else self.session_manager.load_session(member_id)
+            if not member or not member.get("coverage_key") or member.get("batch_start") is None:
+                continue
+            covered = self.coverage.add(
+                member["coverage_key"],
+                member["batch_start"],
+                member.get("next_word_index", 0),
+                total=member.get("keyspace_total"),
+                description=self._coverage_description(member)
+            )
+            self.logger.info("Couverture %s: %s mots parcourus", member["coverage_key"], covered)
+
+    def coverage_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne la couverture globale de chaque keyspace parcouru
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Index couverts, taille, pourcentage et
+                nombre de plages par clé de keyspace
+        """
+        return self.coverage.report()
+
+    def _register_process(self, process_key: str, process, outfile: Optional[Path] = None) -> None:
+        """
+        Enregistre un processus Hashcat et démarre la lecture de sa sortie
+
+        Args:
+            process_key (str): Identifiant de la session ou du pool
+            process (subprocess.Popen): Processus lancé
+            outfile (Optional[Path]): Fichier de sortie suivi en direct
+        """
+        self._active_processes[process_key] = process
+        self.process_watcher.watch(process_key, process.pid)
+        if outfile is not None:
+            self.outfile_tailer.watch(process_key, outfile)
+        if self.governor:
+            self.governor.register_hashcat(process.pid)
+        if isinstance(process.stdout, io.IOBase):
+            self._output_readers[process_key] = ProcessOutputReader(process.stdout)
+
+    def _forget_process(self, process_key: str) -> None:
+        """Retire un processus des processus suivis"""
+        process = self._active_processes.pop(process_key, None)
+        self.process_watcher.unwatch(process_key)
+        # Les dernières lignes écrites avant la fin du processus sont traitées
+        self.outfile_tailer.unwatch(process_key, flush=True)
+        if process is not None and self.governor:
+            self.governor.unregister_hashcat(process.pid)
+        self._output_readers.pop(process_key, None)
+
+    def wait_for_exit(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Attend la fin d'un processus Hashcat suivi
+
+        Le réveil a lieu dès la fin du processus (pidfd) et non au prochain
+        passage d'une boucle d'interrogation.
+
+        Args:
+            timeout (Optional[float]): Durée maximale d'attente
+
+        Returns:
+            List[str]: Sessions ou pools dont le processus s'est terminé
+        """
+        return self.process_watcher.wait(timeout)
+
+    def _read_process_output(self, process_key: str, wait: bool = False) -> List[str]:
+        """
+        Retourne les nouvelles lignes de sortie d'un processus
+
+        Args:
+            process_key (str): Identifiant de la session ou du pool
+            wait (bool): Attend la fin de la lecture (processus terminé)
+
+        Returns:
+            List[str]: Lignes reçues depuis la dernière lecture
+        """
+        reader = self._output_readers.get(process_key)
+        if reader is None:
+            return []
+        if wait:
+            reader.wait(timeout=1.0)
+        return reader.read_lines()
+
+    def active_sessions(self) -> List[str]:
+        """
+        Liste les sessions dont le processus Hashcat est suivi par cette instance
+
+        Returns:
+            List[str]: Identifiants des sessions en cours
+        """
+        return [
+            session_id
+            for session_id, session in self.session_manager.list_sessions().items()
+            if session.get("status") == "running"
+            and (
+                (session.get("pool_id") or session_id) in self._active_processes
+                or any(entry["key"] in self._active_processes for entry in session.get("instances") or [])
+            )
+        ]
+
+    def list_sessions(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Liste les sessions avec l'état de leur processus
+
+        Une session « running » dont le processus n'existe plus est passée à
+        « finished ». L'identité du processus est vérifiée par sa date de
+        démarrage : un PID réutilisé par un autre programme n'est pas pris
+        pour Hashcat.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Sessions par identifiant, avec la clé
+                ``pid_alive`` indiquant si le processus existe encore
+        """
+        sessions = self.session_manager.list_sessions()
+        for session_id, session in sessions.items():
+            if session.get("instances"):
+                pid_alive = any(
+                    entry["state"] == SLICE_RUNNING and is_same_process(entry["pid"], entry.get("started"))
+                    for entry in session["instances"]
+                )
+            else:
+                pid_alive = is_same_process(session.get("process_pid"), session.get("process_started"))
+            if not pid_alive and session.get("status") == "running":
+                session["status"] = "finished"
+                self.session_manager.update_session(session_id, {"status": "finished"})
+            session["pid_alive"] = pid_alive
+        return sessions
+
+    def _plan_rules(self, rules: Optional[List[Path]]) -> Optional[List[Path]]:
+        """
+        Remplace chaque fichier de règles par sa version classée et élaguée
+
+        Args:
+            rules (Optional[List[Path]]): Fichiers de règles demandés
+
+        Returns:
+            Optional[List[Path]]: Fichiers de règles à passer à Hashcat
+        """
+        if not rules:
+            return rules
+        planned = []
+        for rules_file in rules:
+            try:
+                planned_file, dropped = self.rule_stats.plan_rules(Path(rules_file), self.rules_dir)
+            except OSError as e:
+                self.logger.warning("Planification impossible pour %s: %s", rules_file, e)
+                planned_file, dropped = Path(rules_file), 0
+            if dropped:
+                self.logger.info("%s règles peu rentables écartées de %s", dropped, rules_file)
+            planned.append(planned_file)
+        return planned
+
+    def _rule_debug_options(self, run_id: str, rules: Optional[List[Path]]) -> Dict[str, Any]:
+        """
+        Options Hashcat enregistrant la règle responsable de chaque hit
+
+        Args:
+            run_id (str): Identifiant de la session ou du pool
+            rules (Optional[List[Path]]): Règles utilisées (--debug-mode
+                n'est accepté par Hashcat qu'avec des règles)
+
+        Returns:
+            Dict[str, Any]: Options --debug-mode/--debug-file, vides sans règles
+        """
+        if not rules:
+            return {}
+        self.debug_dir.mkdir(parents=True, exist_ok=True)
+        return {
+            "debug-mode": 1,
+            "debug-file": str(self.debug_dir / f"{run_id}.rules")
+        }
+
+    def _record_rule_stats(self, session_id: str, session: Dict[str, Any]) -> None:
+        """
+        Cumule les statistiques de règles d'une session terminée
+
+        Les membres d'un pool partagent un même lot : les statistiques ne sont
+        enregistrées qu'une fois pour l'ensemble du pool. Un lot interrompu
+        (hash retrouvé, arrêt) n'est crédité que de la part parcourue selon
+        la progression annoncée par Hashcat.
+        """
+        active_rules = session.get("active_rules")
+        if not active_rules or session.get("rule_stats_recorded"):
+            return
+        words_tested = session.get("batch_words", 0)
+        progress, progress_total = session.get("progress"), session.get("progress_total")
+        if progress is not None and progress_total:
+            words_tested = min(words_tested, words_tested * int(progress) // progress_total)
+        try:
+            hits = self.rule_stats.record_batch(
+                [Path(r) for r in active_rules],
+                words_tested=words_tested,
+                debug_file=Path(session["debug_file"]) if session.get("debug_file") else None
+            )
+            self.logger.info("Statistiques de règles enregistrées pour %s (%s hits)", session_id, hits)
+        except OSError as e:
+            self.logger.warning("Impossible d'enregistrer les statistiques de règles: %s", e)
+            return
+        session["rule_stats_recorded"] = True
+        for member_id in session.get("pool_members") or [session_id]:
+            self.session_manager.update_session(member_id, {"rule_stats_recorded": True})
+
+    def _record_cracking_time(
+        self,
+        process_key: str,
+        session: Dict[str, Any],
+        run_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Comptabilise le temps passé dans Hashcat par une session terminée
+
+        La durée part du démarrage du processus et non de la création de la
+        session : la génération du dictionnaire, mesurée à part, n'y est pas
+        comptée une seconde fois.
+
+        Args:
+            process_key (str): Session ou pool propriétaire du processus
+            session (Dict[str, Any]): Données de la session
+            run_seconds (Optional[float]): Durée de vie mesurée du processus
+                (à défaut, écart depuis sa date de démarrage enregistrée)
+        """
+        REGISTRY.remove("hashcat_hashes_per_second", labels={"session": process_key})
+        if run_seconds is None:
+            started = session.get("process_started") or min(
+                (entry["started"] for entry in session.get("instances") or [] if entry.get("started")),
+                default=None
+            )
+            if not started:
+                return
+            run_seconds = time.time() - started
+        REGISTRY.inc("cracking_seconds_total", max(run_seconds, 0))
+
+    def _update_queue_depth(self) -> None:
+        """Met à jour la jauge du nombre de sessions en attente"""
+        sessions = self.session_manager.list_sessions()
+        pending = sum(1 for session in sessions.values() if session.get("status") == "pending")
+        REGISTRY.set("queue_depth", pending)
+        self._export_metrics()
+
+    def _export_metrics(self) -> None:
+        """Écrit les métriques dans le fichier textfile s'il est configuré"""
+        if not self.metrics_file:
+            return
+        try:
+            REGISTRY.write_textfile(self.metrics_file)
+        except OSError as e:
+            self.logger.warning("Impossible d'écrire les métriques dans %s: %s", self.metrics_file, e)
+
+    def resource_report(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du gouverneur CPU
+
+        Returns:
+            Dict[str, Any]: Répartition des cœurs, utilisations et goulot
+                d'étranglement (vide si le gouverneur est désactivé)
+        """
+        if not self.governor:
+            return {}
+        self.governor.sample()
+        return self.governor.report()
+
+    def report_profile(self) -> Optional[Path]:
+        """
+        Affiche le détail des étapes profilées et écrit les données brutes
+
+        Returns:
+            Optional[Path]: Répertoire du profil dans work_dir/profiles
+        """
+        if not self.profiler.enabled:
+            return None
+        print("\n=== Profil des étapes ===")
+        print(self.profiler.report())
+        profile_dir = self.profiler.dump(self.work_dir / "profiles")
+        if profile_dir:
+            print(f"Données brutes du profil : {profile_dir}")
+            self.logger.info("Profil écrit dans %s", profile_dir)
+        return profile_dir
+
+    def stop_session(self, session_id: str) -> None:
+        """Arrête une session en cours d'exécution."""
+        self.logger.info("Tentative d'arrêt de la session %s", session_id)
+        
+        try:
+            session = self.session_manager.load_session(session_id)
+            if not session:
+                self.logger.error("Session %s non trouvée", session_id)
+                raise ValueError(f"Session {session_id} non trouvée")
+
+            # Session multi-instance : toutes ses tranches sont arrêtées
+            if session.get("instances"):
+                self._stop_instances(session_id, session["instances"])
+                self.outfile_tailer.unwatch(session_id, flush=True)
+                REGISTRY.remove("hashcat_hashes_per_second", labels={"session": session_id})
+                self.session_manager.update_session(session_id, {
+                    "status": "stopped",
+                    "instances": session["instances"]
+                })
+                self.logger.info("Session %s arrêtée avec succès", session_id)
+                return
+
+            # Récupérer le PID du processus
+            pid = session.get("process_pid")
+            if not pid:
+                self.logger.warning("Aucun PID trouvé pour la session %s", session_id)
+                if session.get("status") == "distributed":
+                    # Les workers s'arrêtent à leur prochain battement de cœur
+                    self.session_manager.update_session(session_id, {"status": "stopped"})
+                return
+
+            # Tenter d'arrêter le processus principal
+            self._kill_process_tree(pid, session.get("process_started"))
+
+            # Mettre à jour le statut de la session (seul ce champ est écrit
+            # pour ne pas écraser les mises à jour concurrentes)
+            session["status"] = "stopped"
+            self.session_manager.update_session(session_id, {"status": "stopped"})
+
+            # Un pool partage son processus : tous ses membres sont arrêtés
+            pool_id = session.get("pool_id")
+            if pool_id:
+                self.logger.warning("Arrêt du pool %s partagé par %s", pool_id, session.get('pool_members'))
+                for member_id in session.get("pool_members", []):
+                    if member_id != session_id:
+                        self.session_manager.update_session(member_id, {"status": "stopped"})
+                self._forget_process(pool_id)
+            
+            # Supprimer le processus de la liste des processus actifs
+            self._forget_process(session_id)
+            
+            self.logger.info("Session %s arrêtée avec succès", session_id)
+
+        except Exception as e:
+            self.logger.error("Erreur lors de l'arrêt de la session %s: %s", session_id, e)
+            raise
+
+    def checkpoint_session(self, session_id: str, timeout: float = 30.0) -> None:
+        """
+        Interrompt une session en conservant son point de reprise
+
+        Hashcat écrit son fichier .restore à la réception de SIGINT ; la
+        session passe à l'état « preempted » et peut être reprise par
+        resume_session.
+
+        Args:
+            session_id (str): Identifiant de la session
+            timeout (float): Délai accordé à Hashcat pour s'arrêter
+        """
+        session = self.session_manager.load_session(session_id)
+        if not session:
+            raise ValueError(f"Session non trouvée: {session_id}")
+        if session.get("pool_id"):
+            raise ValueError(f"La session {session_id} est mutualisée et ne peut pas être préemptée")
+        if session.get("instances"):
+            raise ValueError(f"La session {session_id} est répartie entre plusieurs instances et ne peut pas être préemptée")
+        process = self._active_processes.get(session_id)
+        if process is None:
+            raise ValueError(f"Aucun processus suivi pour la session {session_id}")
+
+        self.logger.info("Checkpoint de la session %s (PID %s)", session_id, process.pid)
+        if process.poll() is None:
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.logger.warning("Hashcat ne répond pas au checkpoint de %s, arrêt forcé", session_id)
+                process.kill()
+                process.wait()
+        self._read_process_output(session_id, wait=True)
+        self._forget_process(session_id)
+        REGISTRY.remove("hashcat_hashes_per_second", labels={"session": session_id})
+        self.session_manager.update_session(session_id, {
+            "status": "preempted",
+            "preempted_at": datetime.now().isoformat(),
+            "checkpoint_exit_code": process.returncode
+        })
+
+    def resume_session(self, session_id: str, verbose: bool = False) -> None:
+        """
+        Reprend une session préemptée à partir de son point de reprise
+
+        Args:
+            session_id (str): Identifiant de la session
+            verbose (bool): Affiche les détails de l'exécution
+        """
+        session = self.session_manager.load_session(session_id)
+        if not session:
+            raise ValueError(f"Session non trouvée: {session_id}")
+        if session.get("status") != "preempted":
+            raise ValueError(f"La session {session_id} n'est pas préemptée")
+
+        with self.profiler.stage("hashcat_start"):
+            process = self.hashcat.restore_attack(session_id)
+        outfile = session.get("outfile")
+        self._register_process(session_id, process, outfile=Path(outfile) if outfile else None)
+        self.session_manager.update_session(session_id, {
+            "process_pid": process.pid,
+            "process_started": process_start_time(process.pid),
+            "status": "running"
+        })
+        self.logger.info("Session %s reprise avec le PID %s", session_id, process.pid)
+        if verbose:
+            print(f"Session {session_id} reprise : PID {process.pid}")
+
+    def submit_job(
+        self,
+        name: str,
+        hash_file: Path,
+        priority: int = 0,
+        budget: Optional[float] = None,
+        hash_type: Optional[int] = None,
+        charset: Optional[set] = None,
+        rules: Optional[List[Path]] = None,
+        mask: Optional[str] = None,
+        skip: Optional[int] = None,
+        options: Optional[Dict[str, Any]] = None,
+        position_charsets: Optional[List[str]] = None,
+        markov_corpus: Optional[Path] = None,
+        markov_order: int = 1,
+        max_repeat: Optional[int] = None,
+        required_classes: Optional[List[str]] = None
+    ) -> str:
+        """
+        Place une attaque dans la file de travaux
+
+        Args:
+            name (str): Nom de la session
+            hash_file (Path): Fichier contenant le hash
+            priority (int): Priorité (les plus grandes passent en premier)
+            budget (Optional[float]): Temps de cassage maximal en secondes
+            hash_type (Optional[int]): Type de hash (détection automatique si None)
+            charset (Optional[set]): Jeu de caractères
+            rules (Optional[List[Path]]): Liste des fichiers de règles
+            mask (Optional[str]): Masque pour l'attaque
+            skip (Optional[int]): Nombre de mots à sauter
+            options (Optional[Dict[str, Any]]): Options supplémentaires
+            position_charsets (Optional[List[str]]): Caractères autorisés à
+                chaque position
+            markov_corpus (Optional[Path]): Corpus pour l'ordre de Markov
+            markov_order (int): Ordre du modèle de Markov
+            max_repeat (Optional[int]): Répétitions consécutives maximales
+            required_classes (Optional[List[str]]): Classes de caractères requises
+
+        Returns:
+            str: Identifiant du travail
+        """
+        hash_file = Path(hash_file)
+        if not hash_file.exists():
+            raise ValueError(f"Fichier de hash non trouvé: {hash_file}")
+        if hash_type is None:
+            # Détection à la soumission (en cache) : le démarrage du travail
+            # n'a plus à relire le fichier
+            detected = self.detection_cache.detect(hash_file)
+            hash_type = detected["id"] if detected else None
+        job_id = self.job_queue.submit({
+            "name": name,
+            "hash_file": str(hash_file.resolve()),
+            "hash_type": hash_type,
+            "charset": sorted(charset) if charset else None,
+            "rules": [str(Path(r).resolve()) for r in rules] if rules else None,
+            "mask": mask,
+            "skip": skip,
+            "options": options,
+            "position_charsets": position_charsets,
+            "markov_corpus": str(Path(markov_corpus).resolve()) if markov_corpus else None,
+            "markov_order": markov_order,
+            "max_repeat": max_repeat,
+            "required_classes": required_classes
+        }, priority=priority, budget=budget)
+        self.logger.info("Travail %s soumis (priorité %s, budget %s)", job_id, priority, budget)
+        return job_id
+
+    def scan_hashes(
+        self,
+        directory: Path,
+        pattern: str = "*",
+        recursive: bool = False,
+        workers: Optional[int] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Détecte le type de hash de tous les fichiers d'un répertoire
+
+        Les fichiers inchangés depuis une analyse précédente ne sont pas relus.
+
+        Args:
+            directory (Path): Répertoire de fichiers de hash
+            pattern (str): Motif des fichiers à analyser
+            recursive (bool): Parcourt aussi les sous-répertoires
+            workers (Optional[int]): Nombre de threads d'analyse
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Type détecté par fichier
+        """
+        with self.profiler.stage("hash_detection"):
+            return self.detection_cache.scan(directory, pattern=pattern, recursive=recursive, workers=workers)
+
+    def prepare_wordlist(
+        self,
+        wordlist: Path,
+        hash_type: Optional[int] = None,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None,
+        charset: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Filtre et déduplique une liste de mots externe (résultat en cache)
+
+        Args:
+            wordlist (Path): Liste de mots d'origine
+            hash_type (Optional[int]): Type de hash (longueurs acceptées)
+            min_length (Optional[int]): Longueur minimale imposée
+            max_length (Optional[int]): Longueur maximale imposée
+            charset (Optional[str]): Caractères autorisés
+
+        Returns:
+            Dict[str, Any]: Chemin de la liste préparée et statistiques
+        """
+        with self.profiler.stage("wordlist_prepare"):
+            return self.wordlists.prepare(
+                Path(wordlist), hash_type=hash_type, min_length=min_length,
+                max_length=max_length, charset=charset
+            )
+
+    def benchmark(
+        self,
+        hash_file: Path,
+        hash_type: Optional[int] = None,
+        charset: Optional[set] = None,
+        position_charsets: Optional[List[str]] = None,
+        rules: Optional[List[Path]] = None,
+        sample_words: int = 200_000,
+        write_bytes: int = 64 * 1024 * 1024,
+        launches: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Mesure chaque étape du pipeline et en déduit le débit de bout en bout
+
+        Args:
+            hash_file (Path): Fichier de hash de la configuration mesurée
+            hash_type (Optional[int]): Type de hash (détection automatique si None)
+            charset (Optional[set]): Jeu de caractères (A-Z0-9 par défaut)
+            position_charsets (Optional[List[str]]): Caractères par position
+            rules (Optional[List[Path]]): Fichiers de règles
+            sample_words (int): Mots générés pour mesurer le générateur
+            write_bytes (int): Volume écrit pour mesurer le disque
+            launches (int): Lancements de Hashcat pour mesurer le coût fixe
+
+        Returns:
+            Dict[str, Any]: Mesures brutes et synthèse (voir bench.summarize)
+        """
+        if not hash_file.exists():
+            raise ValueError(f"Fichier de hash non trouvé: {hash_file}")
+        if hash_type is None:
+            detected = self.detection_cache.detect(hash_file)
+            if not detected:
+                raise ValueError("Impossible de détecter automatiquement le type de hash")
+            hash_type = detected["id"]
+
+        generator = self._make_generator({
+            "position_charsets": position_charsets,
+            "charset": sorted(charset or set(string.ascii_uppercase + string.digits)),
+        })
+        batch_words = self._choose_batch_size(hash_type, rules)
+        multiplier = self._rules_multiplier(rules)
+        bench_dir = self.work_dir / f"bench_{uuid.uuid4().hex[:8]}"
+        try:
+            generation = bench.measure_generation(generator, sample_words)
+            write = bench.measure_write(bench_dir, generation.pop("sample"), write_bytes)
+            launch = bench.measure_launch_overhead(self.hashcat, hash_file, hash_type, bench_dir, runs=launches)
+        finally:
+            shutil.rmtree(bench_dir, ignore_errors=True)
+        speed = self.hashcat.benchmark(hash_type)
+        if speed is None:
+            self.logger.warning("Vitesse de Hashcat non mesurée pour le type %s", hash_type)
+
+        summary = bench.summarize(
+            batch_words=batch_words,
+            rules_multiplier=multiplier,
+            words_per_second=generation["words_per_second"],
+            bytes_per_word=generation["bytes_per_word"],
+            write_bytes_per_second=write["bytes_per_second"],
+            launch_seconds=launch["seconds"],
+            hashcat_speed=speed
+        )
+        self.logger.info(
+            "Banc d'essai type %s: %.0f candidats/s de bout en bout, limité par %s",
+            hash_type, summary["end_to_end"], summary["bottleneck"]
+        )
+        return {
+            "hash_type": hash_type,
+            "generation": generation,
+            "write": write,
+            "launch": launch,
+            "hashcat_speed": speed,
+            **summary,
+        }
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Liste les travaux de la file"""
+        return self.job_queue.list_jobs()
+
+    def cancel_job(self, job_id: str) -> None:
+        """
+        Annule un travail et arrête sa session s'il est en cours
+
+        Args:
+            job_id (str): Identifiant du travail
+        """
+        job = self.job_queue.get(job_id)
+        if not job:
+            raise ValueError(f"Travail non trouvé: {job_id}")
+        if job["status"] == "running" and job.get("session_id"):
+            self.stop_session(job["session_id"])
+        self.job_queue.update(job_id, {"status": "cancelled"})
+        self.logger.info("Travail %s annulé", job_id)
+
+    def schedule_jobs(self, slots: int = 1, quantum: float = 600.0) -> Dict[str, List[str]]:
+        """
+        Effectue un tour de planification de la file de travaux
+
+        Args:
+            slots (int): Nombre de travaux exécutés simultanément
+            quantum (float): Temps accordé à un travail avant de céder sa
+                place à un travail de même priorité (secondes)
+
+        Returns:
+            Dict[str, List[str]]: Travaux démarrés, préemptés et terminés
+        """
+        events = JobScheduler(self, self.job_queue, slots=slots, quantum=quantum).tick()
+        for kind, job_ids in events.items():
+            for job_id in job_ids:
+                self.logger.info("Travail %s: %s", job_id, kind)
+        return events
+
+    def cleanup(self) -> None:
+        """
+        Nettoie les ressources temporaires et les sessions
+        
+        Cette méthode va :
+        1. Lister toutes les sessions actives
+        2. Arrêter les processus en cours
+        3. Supprimer toutes les sessions sauf nao1_20250123_110122
+        4. Nettoyer les fichiers temporaires sauf ceux de la session conservée
+        """
+        print("\n=== Nettoyage de MyHashcat ===")
+        
+        SESSION_TO_KEEP = "nao1_20250123_110122"
+        
+        # 1. Liste et arrêt des processus actifs
+        if self._active_processes:
+            print("\n1. Sessions actives trouvées :")
+            active_sessions = list(self._active_processes.keys())
+            for session_id in active_sessions:
+                session = self.session_manager.load_session(session_id)
+                if session:
+                    print(f"   - {session_id} (PID: {session.get('process_pid')})")
+                    try:
+                        print(f"     → Arrêt de la session {session_id}...")
+                        self.stop_session(session_id)
+                        print(f"     → Session arrêtée avec succès")
+                    except Exception as e:
+                        print(f"     → Erreur lors de l'arrêt : {e}")
+        else:
+            print("\n1. Aucune session active trouvée")
+
+        # 2. Nettoyage de l'interface Hashcat
+        print("\n2. Nettoyage des ressources Hashcat...")
+        try:
+            self.hashcat.cleanup()
+            print("   → Ressources Hashcat nettoyées")
+        except Exception as e:
+            print(f"   → Erreur lors du nettoyage Hashcat : {e}")
+
+        # 3. Suppression des sessions
+        print("\n3. Nettoyage des sessions...")
+        sessions = self.session_manager.list_sessions()
+        if sessions:
+            for session_id in sessions:
+                if session_id != SESSION_TO_KEEP:  # Garde uniquement cette session
+                    try:
+                        self.session_manager.delete_session(session_id)
+                        print(f"   - Session {session_id} supprimée")
+                    except Exception as e:
+                        print(f"   - Erreur lors de la suppression de {session_id}: {e}")
+                else:
+                    print(f"   - Session {session_id} conservée")
+        else:
+            print("   → Aucune session trouvée")
+
+        # 4. Nettoyage des fichiers temporaires
+        print("\n4. Nettoyage des fichiers temporaires...")
+        
+        # Nettoyage des dictionnaires
+        if self.dict_dir.exists():
+            try:
+                # Récupération du fichier dictionnaire de la session à conserver
+                session_to_keep = self.session_manager.load_session(SESSION_TO_KEEP)
+                dict_file_to_keep = None
+                if session_to_keep and "dictionary_file" in session_to_keep:
+                    dict_file_to_keep = Path(session_to_keep["dictionary_file"])
+                
+                files_count = 0
+                for file in self.dict_dir.glob("*"):
+                    if dict_file_to_keep and file == dict_file_to_keep:
+                        print(f"   → Conservation du dictionnaire: {file.name}")
+                        continue
+                    try:
+                        file.unlink()
+                        files_count += 1
+                    except OSError as e:
+                        print(f"   → Erreur lors de la suppression de {file.name}: {e}")
+                
+                if files_count > 0:
+                    print(f"   → {files_count} fichiers dictionnaire(s) supprimé(s)")
+                
+                # Ne pas supprimer le répertoire s'il contient encore le dictionnaire à conserver
+                if not any(self.dict_dir.iterdir()):
+                    self.dict_dir.rmdir()
+                    print("   → Répertoire des dictionnaires supprimé")
+                else:
+                    print("   → Répertoire des dictionnaires conservé (contient le dictionnaire actif)")
+                    
+            except OSError as e:
+                print(f"   → Erreur lors du nettoyage des dictionnaires : {e}")
+
+        # Nettoyage du répertoire de travail seulement s'il est vide
+        if self.work_dir.exists():
+            try:
+                if not any(self.work_dir.iterdir()):
+                    self.work_dir.rmdir()
+                    print("   → Répertoire de travail supprimé")
+                else:
+                    print("   → Répertoire de travail conservé (contient des fichiers actifs)")
+            except OSError as e:
+                print("   → Le répertoire de travail contient encore des fichiers, il sera conservé")
+
+        print("\n=== Nettoyage terminé ===\n")
+
+    def continue_attack(self, session_id: str, verbose: bool = False) -> str:
+        """
+        Continue une attaque avec le même dictionnaire
+
+        Args:
+            session_id (str): Identifiant de la session à continuer
+            verbose (bool): Affiche les détails de l'exécution
+
+        Returns:
+            str: ID de la nouvelle session
+        """
+        self.logger.info("Continuation de l'attaque pour la session %s", session_id)
+
+        # Chargement de la session
+        session = self.session_manager.load_session(session_id)
+        if not session:
             error_msg = f"Session non trouvée: {session_id}"
             self.logger.error(error_msg)
             raise ValueError(error_msg)
@@ -585,6 +2641,17 @@ class MyHashcat:
             self.logger.error(error_msg)
             raise ValueError(error_msg)
 
+        if session.get("wordlist"):
+            error_msg = f"La liste de mots de la session {session_id} a été entièrement parcourue"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if session.get("attack_mode") in self.COMBINATOR_MODES:
+            return self._continue_combinator(session_id, session, verbose=verbose)
+
+        if session.get("pool_id"):
+            return self._continue_pooled(session_id, session, verbose=verbose)
+
         # Récupération des paramètres de la session
         try:
             hash_file = session.get("hash_file")
@@ -599,7 +2666,7 @@ class MyHashcat:
                 self.logger.error(error_msg)
                 raise ValueError(error_msg)
                 
-            self.logger.debug(f"Fichier de hash trouvé: {hash_file}")
+            self.logger.debug("Fichier de hash trouvé: %s", hash_file)
 
             # Récupération du dictionnaire existant
             dict_file = session.get("dictionary_file")
@@ -614,7 +2681,7 @@ class MyHashcat:
                 self.logger.error(error_msg)
                 raise ValueError(error_msg)
 
-            self.logger.debug(f"Fichier dictionnaire trouvé: {dict_file}")
+            self.logger.debug("Fichier dictionnaire trouvé: %s", dict_file)
         except Exception as e:
             error_msg = f"Erreur lors de la récupération des fichiers: {str(e)}"
             self.logger.error(error_msg)
@@ -630,24 +2697,50 @@ class MyHashcat:
         
         # Création d'une nouvelle session avec un nouveau dictionnaire
         try:
-            # Création du nouvel identifiant de session
-            base_name = session_id.rsplit("_", 2)[0]  # Retire le timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            new_session_id = f"{base_name}_{timestamp}"
+            # Classement des règles et taille du lot recalibrée sur les mesures
+            active_rules = self._plan_rules(rules)
+            batch_size = self._choose_batch_size(hash_type, active_rules, previous=session.get("batch_size"))
+            generator = self._make_generator(session)
+
+            # Index de départ : suite de la session, en sautant les plages déjà
+            # parcourues par d'autres sessions sur le même keyspace. Un keyspace
+            # épuisé est signalé avant la création de la session suivante.
+            coverage_key = keyspace_key(session, active_rules)
+            start_index, batch_size = self._plan_uncovered_batch(
+                coverage_key, generator, session.get("next_word_index", 0), batch_size
+            )
+
+            # Création de la session avant de nommer ses fichiers : seul
+            # l'identifiant attribué par le gestionnaire est garanti unique
+            new_config = {
+                "name": session["name"],
+                "hash_file": str(hash_file.resolve()),
+                "hash_type": hash_type,
+                "word_length": session.get("word_length"),
+                "charset": session.get("charset"),
+                "position_charsets": session.get("position_charsets"),
+                "markov_model": session.get("markov_model"),
+                "constraints": session.get("constraints"),
+                "attack_mode": session.get("attack_mode", "straight"),
+                "rules": [str(r) for r in rules] if rules else None,
+                "mask": session.get("mask"),
+                "options": session.get("options"),
+                "instance_count": session.get("instance_count"),
+                "instance_devices": session.get("instance_devices"),
+                "start_time": datetime.now().isoformat(),
+                "previous_session": session_id,
+                "status": "created"
+            }
+            with self.profiler.stage("session_write"):
+                new_session_id = self.session_manager.create_session(session["name"], new_config)
+            self.logger.info("Nouvelle session créée: %s", new_session_id)
 
-            # Récupération de l'index de départ pour le nouveau dictionnaire
-            start_index = session.get("next_word_index", 0)
-            
             # Création du nouveau dictionnaire
             dict_file = self.dict_dir / f"{new_session_id}_initial.txt"
-            generator = DictionaryGenerator(
-                length=session.get("word_length", 18),
-                charset=set(session.get("charset", []))
-            )
-            
             next_index = self._generate_dictionary(
                 generator,
                 dict_file,
+                batch_size=batch_size,
                 start_index=start_index,
                 verbose=verbose
             )
@@ -659,48 +2752,61 @@ class MyHashcat:
                 print(f"- Nouveau dictionnaire : {dict_file}")
                 print(f"- Index de départ : {start_index}")
                 print(f"- Index pour le prochain dictionnaire : {next_index}")
+                print(f"- Taille du lot : {batch_size:,} mots")
                 if rules:
                     print(f"- Règles : {', '.join(str(r) for r in rules)}")
-            
-            # Création de la nouvelle session
-            new_config = {
-                "name": session["name"],
-                "hash_file": str(hash_file.resolve()),
-                "hash_type": hash_type,
-                "word_length": session.get("word_length"),
-                "charset": session.get("charset"),
-                "attack_mode": session.get("attack_mode", "straight"),
-                "rules": [str(r) for r in rules] if rules else None,
-                "mask": session.get("mask"),
-                "options": session.get("options"),
-                "start_time": datetime.now().isoformat(),
-                "previous_session": session_id,
+
+            debug_options = self._rule_debug_options(new_session_id, active_rules)
+            batch_fields = {
                 "dictionary_file": str(dict_file),
                 "next_word_index": next_index,
-                "status": "created"
+                "active_rules": [str(r) for r in active_rules] if active_rules else None,
+                "debug_file": debug_options.get("debug-file"),
+                "batch_words": next_index - start_index,
+                "batch_size": batch_size,
+                "batch_start": start_index,
+                "coverage_key": coverage_key,
+                "keyspace_total": generator.total_combinations
             }
-            
-            # Création de la session avant de lancer l'attaque
-            self.session_manager.create_session(session["name"], new_config)
-            self.logger.info(f"Nouvelle session créée: {new_session_id}")
+            new_config.update(batch_fields)
+            with self.profiler.stage("session_write"):
+                self.session_manager.update_session(new_session_id, batch_fields)
+
+            if (session.get("instance_count") or 1) > 1:
+                launched = self._start_instances(
+                    new_session_id, new_config, dict_file, start_index, next_index - start_index, active_rules
+                )
+                with self.profiler.stage("session_write"):
+                    self.session_manager.update_session(new_session_id, {
+                        "instances": launched,
+                        "outfile": str(self._session_outfile(new_session_id)),
+                        "status": "running"
+                    })
+                if verbose:
+                    print(f"Attaque reprise avec la session {new_session_id} ({len(launched)} instances)")
+                return new_session_id
             
             # Lancement de l'attaque avec le nouveau dictionnaire
             try:
-                process = self.hashcat.start_attack(
-                    hash_file=hash_file,
-                    attack_mode=session.get("attack_mode", "straight"),
-                    hash_type=hash_type,
-                    dictionary=dict_file,
-                    rules=rules,
-                    session=new_session_id,
-                    options={
-                        "status-timer": 10,
-                        **(session.get("options") or {})
-                    }
-                )
-                self.logger.info(f"Attaque reprise avec PID {process.pid}")
+                with self.profiler.stage("hashcat_start"):
+                    process = self.hashcat.start_attack(
+                        hash_file=hash_file,
+                        attack_mode=session.get("attack_mode", "straight"),
+                        hash_type=hash_type,
+                        dictionary=dict_file,
+                        rules=active_rules,
+                        session=new_session_id,
+                        outfile=self._session_outfile(new_session_id),
+                        brain=self._brain_client(),
+                        options={
+                            "status-timer": 10,
+                            **debug_options,
+                            **(session.get("options") or {})
+                        }
+                    )
+                self.logger.info("Attaque reprise avec PID %s", process.pid)
             except Exception as e:
-                self.logger.error(f"Erreur lors du lancement de l'attaque: {str(e)}")
+                self.logger.error("Erreur lors du lancement de l'attaque: %s", e)
                 raise RuntimeError(f"Erreur lors du lancement de l'attaque: {str(e)}")
 
             # Vérification que le processus a bien démarré
@@ -710,19 +2816,22 @@ class MyHashcat:
                 raise RuntimeError(error_msg)
 
             # Stockage du processus
-            self._active_processes[new_session_id] = process
+            self._register_process(new_session_id, process, outfile=self._session_outfile(new_session_id))
             if verbose:
                 print(f"Attaque reprise avec la session {new_session_id}")
                 print(f"Processus enregistré: PID {process.pid}")
 
             # Mise à jour du statut
-            self.session_manager.update_session(new_session_id, {
-                "process_pid": process.pid,
-                "status": "running"
-            })
+            with self.profiler.stage("session_write"):
+                self.session_manager.update_session(new_session_id, {
+                    "process_pid": process.pid,
+                    "process_started": process_start_time(process.pid),
+                    "outfile": str(self._session_outfile(new_session_id)),
+                    "status": "running"
+                })
 
             return new_session_id
 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la continuation de l'attaque: {str(e)}", exc_info=True)
+            self.logger.error("Erreur lors de la continuation de l'attaque: %s", e, exc_info=True)
             raise RuntimeError(f"Erreur lors de la continuation de l'attaque: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Module de suivi en direct des fichiers de sortie de Hashcat
+
+Hashcat écrit chaque hash retrouvé dans son fichier ``--outfile`` dès qu'il
+le casse. Le suiveur surveille ces fichiers avec inotify (via ctypes, sans
+dépendance) et transmet les nouvelles lignes à un rappel aussitôt écrites,
+sans attendre qu'une ligne « Recovered » passe sur la sortie standard. Sur
+les systèmes sans inotify, la taille des fichiers est interrogée
+périodiquement.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+# Masques inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Retourne la libc si elle expose inotify, None sinon"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class _TailedFile:
+    """Position de lecture d'un fichier suivi"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.offset = 0
+        self.partial = b""
+
+    def read_lines(self) -> List[str]:
+        """Lit les lignes complètes ajoutées depuis la dernière lecture"""
+        try:
+            with self.path.open("rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        if not data:
+            return []
+        self.offset += len(data)
+        data = self.partial + data
+        *lines, self.partial = data.split(b"\n")
+        return [line.decode("utf-8", errors="ignore").rstrip("\r") for line in lines if line.strip()]
+
+
+class OutfileTailer:
+    """Suivi des fichiers de sortie par inotify, avec repli par interrogation"""
+
+    def __init__(
+        self,
+        callback: Callable[[str, List[str]], None],
+        poll_interval: float = 0.5,
+        use_inotify: bool = True
+    ):
+        """
+        Initialise le suiveur
+
+        Args:
+            callback (Callable[[str, List[str]], None]): Appelé avec la clé du
+                fichier et ses nouvelles lignes (depuis le thread du suiveur)
+            poll_interval (float): Période d'interrogation sans inotify
+            use_inotify (bool): Utilise inotify lorsqu'il est disponible
+        """
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger("myhashcat.outfile")
+        self._files: Dict[str, _TailedFile] = {}
+        self._dir_watches: Dict[int, Path] = {}
+        self._lock = threading.RLock()
+        # Tenu de la lecture jusqu'à la fin du rappel : un vidage attend
+        # qu'un traitement en cours dans le thread de suivi soit terminé
+        self._dispatch_lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._wake_read, self._wake_write = os.pipe()
+        self._libc = _load_inotify() if use_inotify else None
+        self._inotify_fd = -1
+        if self._libc is not None:
+            self._inotify_fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if self._inotify_fd < 0:
+                self._libc = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Indique si les fichiers sont suivis par inotify"""
+        return self._inotify_fd >= 0
+
+    def watch(self, key: str, path: Path) -> None:
+        """
+        Suit un fichier de sortie (il peut ne pas encore exister)
+
+        Args:
+            key (str): Clé transmise au rappel (session ou pool)
+            path (Path): Fichier de sortie de Hashcat
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._files[key] = _TailedFile(path)
+            if self.uses_inotify and path.parent not in self._dir_watches.values():
+                wd = self._libc.inotify_add_watch(
+                    self._inotify_fd, os.fsencode(path.parent),
+                    IN_MODIFY | IN_CLOSE_WRITE | IN_CREATE | IN_MOVED_TO
+                )
+                if wd >= 0:
+                    self._dir_watches[wd] = path.parent
+                else:
+                    self.logger.warning("inotify indisponible pour %s (errno %s)", path.parent, ctypes.get_errno())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="myhashcat-outfile", daemon=True)
+                self._thread.start()
+        # Des lignes ont pu être écrites avant l'ajout de la surveillance
+        self._dispatch(key)
+
+    def unwatch(self, key: str, flush: bool = True) -> None:
+        """
+        Arrête le suivi d'un fichier
+
+        Args:
+            key (str): Clé du fichier
+            flush (bool): Transmet d'abord les lignes non encore lues
+        """
+        if flush:
+            self._dispatch(key)
+        with self._lock:
+            self._files.pop(key, None)
+
+    def _dispatch(self, key: str) -> None:
+        """Lit les nouvelles lignes d'un fichier et appelle le rappel"""
+        with self._dispatch_lock:
+            with self._lock:
+                tailed = self._files.get(key)
+                lines = tailed.read_lines() if tailed else []
+            if lines:
+                try:
+                    self.callback(key, lines)
+                except Exception as e:
+                    self.logger.error("Erreur de traitement des résultats de %s: %s", key, e, exc_info=True)
+
+    def _keys_for(self, directory: Optional[Path], name: Optional[str]) -> List[str]:
+        """Clés des fichiers concernés par un évènement"""
+        with self._lock:
+            return [
+                key for key, tailed in self._files.items()
+                if directory is None or (tailed.path.parent == directory and tailed.path.name == name)
+            ]
+
+    def _read_events(self) -> List[str]:
+        """Décode les évènements inotify en attente"""
+        keys: List[str] = []
+        try:
+            data = os.read(self._inotify_fd, 65536)
+        except BlockingIOError:
+            return keys
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length]
+            offset += _EVENT_HEADER.size + length
+            name = raw_name.rstrip(b"\0").decode("utf-8", errors="ignore")
+            keys.extend(self._keys_for(self._dir_watches.get(wd), name))
+        return keys
+
+    def _run(self) -> None:
+        """Boucle du thread de suivi"""
+        descriptors = [self._wake_read] + ([self._inotify_fd] if self.uses_inotify else [])
+        timeout = None if self.uses_inotify else self.poll_interval
+        while not self._stopping.is_set():
+            ready, _, _ = select.select(descriptors, [], [], timeout)
+            if self._stopping.is_set():
+                break
+            if not self.uses_inotify:
+                keys = self._keys_for(None, None)
+            elif self._inotify_fd in ready:
+                keys = self._read_events()
+            else:
+                keys = []
+            for key in dict.fromkeys(keys):
+                self._dispatch(key)
+
+    def stop(self) -> None:
+        """Arrête le thread de suivi et libère les descripteurs"""
+        self._stopping.set()
+        os.write(self._wake_write, b"\0")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        for fd in (self._wake_read, self._wake_write, self._inotify_fd):
+            if fd >= 0:
+                os.close(fd)
+        self._inotify_fd = -1
@@ -0,0 +1,280 @@
+"""
+Module de mutualisation des sessions (pooling) pour MyHashcat
+
+Hashcat teste un candidat contre tous les hashs d'un même mode pour un coût
+quasi identique à celui d'un seul hash. Ce module regroupe les sessions en
+attente partageant le même type de hash et le même keyspace afin de les
+lancer dans un seul processus, puis redistribue les résultats à chaque
+session d'origine.
+"""
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Container, Dict, Any, List, Optional, Set, Tuple
+
+import yaml
+
+from .session_manager import atomic_write_yaml
+
+
+_HEX_PATTERN = re.compile(r"^[a-fA-F0-9]+$")
+
+
+def hash_key(line: str) -> Optional[str]:
+    """
+    Calcule la clé de routage d'une ligne de hash
+
+    Hashcat ne réécrit pas toujours le hash tel qu'il a été fourni : les hashs
+    hexadécimaux sont normalisés en minuscules et les hashs 22000 sont
+    réécrits sous la forme ``MIC:MAC_AP:MAC_STA:ESSID``. La clé retenue est
+    donc la partie commune aux deux représentations.
+
+    Args:
+        line (str): Ligne du fichier de hash
+
+    Returns:
+        Optional[str]: Clé de routage ou None pour une ligne vide
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("WPA*"):
+        fields = line.split("*")
+        if len(fields) > 2:
+            return fields[2].lower()
+    if _HEX_PATTERN.match(line):
+        return line.lower()
+    return line
+
+
+def read_hash_keys(hash_file: Path) -> Tuple[Set[str], bool]:
+    """
+    Lit les clés de routage d'un fichier de hashs
+
+    Args:
+        hash_file (Path): Fichier de hashs
+
+    Returns:
+        Tuple[Set[str], bool]: Clés des hashs et présence de hashs WPA
+    """
+    keys: Set[str] = set()
+    wpa = False
+    with Path(hash_file).open("rb") as f:
+        for raw in f:
+            line = raw.decode("utf-8", errors="ignore").strip()
+            key = hash_key(line)
+            if key is not None:
+                keys.add(key)
+                wpa = wpa or line.startswith("WPA*")
+    return keys, wpa
+
+
+def match_cracked_line(line: str, known: Container[str], wpa: bool = False) -> Optional[Tuple[str, str]]:
+    """
+    Associe une ligne ``hash:plain`` du fichier de sortie à une clé connue
+
+    Le mot de passe pouvant lui-même contenir ``:``, chaque séparateur est
+    essayé de gauche à droite jusqu'à trouver un préfixe connu.
+
+    Args:
+        line (str): Ligne écrite par Hashcat
+        known (Container[str]): Clés de routage attendues
+        wpa (bool): Les hashs sont au format 22000
+
+    Returns:
+        Optional[Tuple[str, str]]: Clé du hash et mot de passe, None si la
+            ligne ne correspond à aucun hash connu
+    """
+    if wpa:
+        # Format 22000 réécrit par hashcat : MIC:MAC_AP:MAC_STA:ESSID:plain
+        fields = line.split(":", 4)
+        if len(fields) == 5 and fields[0].lower() in known:
+            return fields[0].lower(), fields[4]
+        return None
+
+    position = line.find(":")
+    while position != -1:
+        key = hash_key(line[:position])
+        if key in known:
+            return key, line[position + 1:]
+        position = line.find(":", position + 1)
+    return None
+
+
+def pool_key(session: Dict[str, Any]) -> Tuple:
+    """
+    Calcule la clé de regroupement d'une session
+
+    Deux sessions ne peuvent être mutualisées que si elles testent exactement
+    les mêmes candidats : même type de hash, même keyspace, même position de
+    départ, mêmes règles et mêmes options.
+
+    Args:
+        session (Dict[str, Any]): Données de la session
+
+    Returns:
+        Tuple: Clé de regroupement
+    """
+    constraints = session.get("constraints") or {}
+    return (
+        session.get("hash_type"),
+        session.get("attack_mode", "straight"),
+        session.get("word_length"),
+        "".join(sorted(session.get("charset") or [])),
+        tuple(session.get("position_charsets") or ()),
+        session.get("markov_model"),
+        (constraints.get("max_repeat"), tuple(constraints.get("required_classes") or ())),
+        session.get("next_word_index", 0),
+        session.get("skip"),
+        tuple(session.get("rules") or ()),
+        session.get("mask"),
+        tuple(sorted((session.get("options") or {}).items())),
+    )
+
+
+def group_pending_sessions(sessions: Dict[str, Dict[str, Any]]) -> List[List[str]]:
+    """
+    Regroupe les sessions en attente par clé de mutualisation
+
+    Args:
+        sessions (Dict[str, Dict[str, Any]]): Sessions indexées par ID
+
+    Returns:
+        List[List[str]]: Groupes d'identifiants de sessions, triés
+    """
+    groups: Dict[Tuple, List[str]] = {}
+    for session_id in sorted(sessions):
+        session = sessions[session_id]
+        if session.get("status") != "pending":
+            continue
+        groups.setdefault(pool_key(session), []).append(session_id)
+    return list(groups.values())
+
+
+class HashPool:
+    """Groupe de sessions partageant un même processus Hashcat"""
+
+    def __init__(self, pool_id: str, pool_dir: Path, members: List[str]):
+        """
+        Initialise le pool
+
+        Args:
+            pool_id (str): Identifiant du pool
+            pool_dir (Path): Répertoire de travail des pools
+            members (List[str]): Identifiants des sessions membres
+        """
+        if not members:
+            raise ValueError("Un pool doit contenir au moins une session")
+        self.pool_id = pool_id
+        self.members = list(members)
+        self.hash_file = pool_dir / f"{pool_id}.hashes"
+        self.outfile = pool_dir / f"{pool_id}.cracked"
+        # Table de routage écrite une seule fois pour tout le pool : les
+        # sessions membres ne conservent que son chemin
+        self.routing_file = pool_dir / f"{pool_id}.routing.yaml"
+        self.routing: Dict[str, List[str]] = {}
+        self.wpa = False
+
+    @staticmethod
+    def generate_id(hash_type: Optional[int]) -> str:
+        """Génère un identifiant de pool"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        return f"pool_{hash_type}_{timestamp}"
+
+    def merge_hash_files(self, hash_files: Dict[str, Path]) -> int:
+        """
+        Fusionne les fichiers de hash des membres en une liste unique
+
+        Args:
+            hash_files (Dict[str, Path]): Fichier de hash de chaque session
+
+        Returns:
+            int: Nombre de hashs uniques dans la liste combinée
+        """
+        lines: List[str] = []
+        self.routing = {}
+        self.wpa = False
+        for session_id in self.members:
+            with Path(hash_files[session_id]).open("rb") as f:
+                for raw in f:
+                    line = raw.decode("utf-8", errors="ignore").strip()
+                    key = hash_key(line)
+                    if key is None:
+                        continue
+                    if line.startswith("WPA*"):
+                        self.wpa = True
+                    owners = self.routing.setdefault(key, [])
+                    if not owners:
+                        lines.append(line)
+                    if session_id not in owners:
+                        owners.append(session_id)
+
+        self.hash_file.parent.mkdir(parents=True, exist_ok=True)
+        with self.hash_file.open("w") as f:
+            for line in lines:
+                f.write(f"{line}\n")
+        self._save_routing()
+        return len(lines)
+
+    def _save_routing(self) -> None:
+        """Écrit la table de routage du pool"""
+        atomic_write_yaml(self.routing_file, {"wpa": self.wpa, "routing": self.routing})
+
+    def _load_routing(self) -> None:
+        """Relit la table de routage du pool"""
+        with self.routing_file.open("r") as f:
+            data = yaml.safe_load(f) or {}
+        self.routing = data.get("routing") or {}
+        self.wpa = bool(data.get("wpa"))
+
+    def route_results(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Redistribue les résultats du fichier de sortie aux sessions d'origine
+
+        Returns:
+            Dict[str, List[Dict[str, str]]]: Hashs craqués par session
+        """
+        results: Dict[str, List[Dict[str, str]]] = {session_id: [] for session_id in self.members}
+        if not self.outfile.exists():
+            return results
+
+        with self.outfile.open("r", errors="ignore") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                match = self._match_line(line)
+                if match is None:
+                    continue
+                key, plain = match
+                for session_id in self.routing[key]:
+                    results[session_id].append({"hash": key, "plain": plain})
+        return results
+
+    def _match_line(self, line: str) -> Optional[Tuple[str, str]]:
+        """Associe une ligne ``hash:plain`` à une clé de routage"""
+        return match_cracked_line(line, self.routing, self.wpa)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sérialise le pool pour le stockage dans les sessions"""
+        return {
+            "pool_id": self.pool_id,
+            "pool_members": self.members,
+            "pool_hash_file": str(self.hash_file),
+            "pool_outfile": str(self.outfile),
+            "pool_routing_file": str(self.routing_file),
+        }
+
+    @classmethod
+    def from_session(cls, session: Dict[str, Any]) -> "HashPool":
+        """Reconstruit un pool à partir des données d'une session membre"""
+        hash_file = Path(session["pool_hash_file"])
+        pool = cls(session["pool_id"], hash_file.parent, session["pool_members"])
+        pool.hash_file = hash_file
+        pool.outfile = Path(session["pool_outfile"])
+        if session.get("pool_routing_file"):
+            pool.routing_file = Path(session["pool_routing_file"])
+            pool._load_routing()
+        else:
+            # Sessions antérieures : table recopiée dans chaque membre
+            pool.routing = session.get("pool_routing") or {}
+            pool.wpa = bool(session.get("pool_wpa"))
+        return pool
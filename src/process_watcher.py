@@ -0,0 +1,226 @@
+"""
+Module de détection de fin des processus Hashcat
+
+Plutôt que d'interroger périodiquement les processus (attente de 10 s entre
+deux statuts, test de ``/proc/<pid>``), le surveillant ouvre un pidfd Linux
+(``os.pidfd_open``) par processus : le descripteur devient lisible dès que le
+processus se termine et un seul ``select`` réveille l'orchestrateur en
+quelques millisecondes. Un pidfd désigne un processus précis et ne peut pas
+être trompé par la réutilisation de son PID ; pour un PID lu dans un fichier
+de session, l'identité est vérifiée par la date de démarrage du processus.
+Sur les systèmes sans pidfd, une interrogation rapide prend le relais.
+"""
+import os
+import selectors
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+
+def process_start_time(pid: int) -> Optional[float]:
+    """
+    Retourne la date de démarrage d'un processus
+
+    Args:
+        pid (int): PID du processus
+
+    Returns:
+        Optional[float]: Date de démarrage (epoch), None si le processus
+            n'existe pas
+    """
+    try:
+        return psutil.Process(pid).create_time()
+    except psutil.Error:
+        return None
+
+
+def is_same_process(pid: Optional[int], start_time: Optional[float] = None) -> bool:
+    """
+    Vérifie qu'un processus existe encore et qu'il s'agit bien du même
+
+    Args:
+        pid (Optional[int]): PID enregistré
+        start_time (Optional[float]): Date de démarrage enregistrée avec le
+            PID (sans elle, seule l'existence du PID est vérifiée)
+
+    Returns:
+        bool: True si le processus est vivant et n'a pas été remplacé par un
+            autre ayant reçu le même PID
+    """
+    if not pid:
+        return False
+    try:
+        process = psutil.Process(pid)
+        if process.status() == psutil.STATUS_ZOMBIE:
+            return False
+        return start_time is None or abs(process.create_time() - start_time) < 0.05
+    except psutil.Error:
+        return False
+
+
+class ProcessWatcher:
+    """Attente événementielle de la fin de processus"""
+
+    def __init__(self, poll_interval: float = 0.05):
+        """
+        Initialise le surveillant
+
+        Args:
+            poll_interval (float): Période d'interrogation des processus
+                surveillés sans pidfd (secondes)
+        """
+        self.poll_interval = poll_interval
+        self.pidfd_supported = hasattr(os, "pidfd_open")
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._pidfds: Dict[str, int] = {}
+        self._polled: Dict[str, Tuple[int, Optional[float]]] = {}
+        self._exited: List[str] = []
+        self._interrupted = False
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, None)
+
+    def watch(self, key: str, pid: int, start_time: Optional[float] = None) -> bool:
+        """
+        Surveille un processus
+
+        Args:
+            key (str): Clé retournée par wait à la fin du processus
+            pid (int): PID du processus
+            start_time (Optional[float]): Date de démarrage attendue (PID lu
+                dans une session)
+
+        Returns:
+            bool: True si le processus est en cours, False s'il est déjà
+                terminé (la clé est alors retournée par le prochain wait)
+        """
+        self.unwatch(key)
+        pidfd = None
+        if self.pidfd_supported:
+            try:
+                pidfd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                return self._mark_exited(key)
+            except OSError:
+                pidfd = None
+        # Le pidfd fige l'identité : une vérification après ouverture suffit
+        if start_time is not None and not is_same_process(pid, start_time):
+            if pidfd is not None:
+                os.close(pidfd)
+            return self._mark_exited(key)
+
+        with self._lock:
+            if pidfd is not None:
+                self._pidfds[key] = pidfd
+                self._selector.register(pidfd, selectors.EVENT_READ, key)
+            else:
+                self._polled[key] = (pid, start_time)
+        if pidfd is None:
+            # Un wait sans délai en cours doit passer en interrogation
+            self._nudge()
+        return True
+
+    def _mark_exited(self, key: str) -> bool:
+        """Signale immédiatement un processus déjà terminé"""
+        with self._lock:
+            self._exited.append(key)
+        self._nudge()
+        return False
+
+    def unwatch(self, key: str) -> None:
+        """Arrête la surveillance d'un processus"""
+        with self._lock:
+            pidfd = self._pidfds.pop(key, None)
+            if pidfd is not None:
+                self._selector.unregister(pidfd)
+                os.close(pidfd)
+            self._polled.pop(key, None)
+            if key in self._exited:
+                self._exited.remove(key)
+
+    def watched(self) -> List[str]:
+        """Clés des processus surveillés"""
+        with self._lock:
+            return list(self._pidfds) + list(self._polled)
+
+    def wakeup(self) -> None:
+        """Interrompt un wait en cours (arrêt de l'orchestrateur)"""
+        self._interrupted = True
+        self._nudge()
+
+    def _nudge(self) -> None:
+        """Fait réévaluer les processus surveillés par un wait en cours"""
+        try:
+            os.write(self._wake_write, b"\0")
+        except BlockingIOError:
+            pass
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Attend la fin d'au moins un processus surveillé
+
+        Args:
+            timeout (Optional[float]): Durée maximale d'attente (None : sans
+                limite)
+
+        Returns:
+            List[str]: Clés des processus terminés (retirés de la
+                surveillance) ; vide si le délai expire ou sur wakeup
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            exited = self._collect(self._poll_fallback())
+            if exited:
+                return exited
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            with self._lock:
+                polling = bool(self._polled)
+            select_timeout = remaining
+            if polling:
+                select_timeout = self.poll_interval if remaining is None else min(remaining, self.poll_interval)
+            woken = False
+            for selector_key, _ in self._selector.select(select_timeout):
+                if selector_key.data is None:
+                    self._drain_wakeups()
+                    woken, self._interrupted = self._interrupted, False
+                else:
+                    with self._lock:
+                        self._exited.append(selector_key.data)
+            exited = self._collect(self._poll_fallback())
+            if exited or woken or (deadline is not None and time.monotonic() >= deadline):
+                return exited
+
+    def _poll_fallback(self) -> List[str]:
+        """Interroge les processus surveillés sans pidfd"""
+        with self._lock:
+            polled = list(self._polled.items())
+        return [key for key, (pid, start_time) in polled if not is_same_process(pid, start_time)]
+
+    def _collect(self, polled_exits: List[str]) -> List[str]:
+        """Retire de la surveillance et retourne les processus terminés"""
+        with self._lock:
+            keys = self._exited + [key for key in polled_exits if key not in self._exited]
+            self._exited = []
+        for key in keys:
+            self.unwatch(key)
+        return list(dict.fromkeys(keys))
+
+    def _drain_wakeups(self) -> None:
+        """Vide le tube de réveil"""
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        """Libère les descripteurs"""
+        for key in self.watched():
+            self.unwatch(key)
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
@@ -0,0 +1,157 @@
+"""
+Module de profilage par étape du pipeline MyHashcat
+
+Chaque étape (détection du hash, génération, écriture du dictionnaire,
+écriture des sessions, lancement de Hashcat...) est chronométrée en temps
+réel et en temps CPU. Les captures cProfile et tracemalloc sont optionnelles
+car nettement plus coûteuses.
+"""
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+
+class StageProfiler:
+    """Profileur cumulant les mesures par étape"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        cpu_profile: bool = False,
+        memory_profile: bool = False
+    ):
+        """
+        Initialise le profileur
+
+        Args:
+            enabled (bool): Active les chronomètres par étape
+            cpu_profile (bool): Active la capture cProfile
+            memory_profile (bool): Active le suivi des allocations (tracemalloc)
+        """
+        self.enabled = enabled or cpu_profile or memory_profile
+        self.cpu_profile = cpu_profile
+        self.memory_profile = memory_profile
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._order: List[str] = []
+        self._depth = 0
+        # Temps réel des seules étapes de premier niveau : base des pourcentages
+        self._top_wall = 0.0
+        self._profile = cProfile.Profile() if cpu_profile else None
+        if memory_profile and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Mesure une étape du pipeline
+
+        Les appels répétés à une même étape sont cumulés. Les étapes
+        imbriquées sont mesurées chacune de leur côté.
+
+        Args:
+            name (str): Nom de l'étape
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if self._profile is not None and self._depth == 0:
+            self._profile.enable()
+        if self.memory_profile:
+            memory_before = tracemalloc.get_traced_memory()[0]
+        self._depth += 1
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._depth -= 1
+            if self._depth == 0:
+                self._top_wall += wall
+                if self._profile is not None:
+                    self._profile.disable()
+
+            if name not in self.stages:
+                self._order.append(name)
+                self.stages[name] = {"calls": 0, "wall": 0.0, "cpu": 0.0, "allocated": 0}
+            stats = self.stages[name]
+            stats["calls"] += 1
+            stats["wall"] += wall
+            stats["cpu"] += cpu
+            if self.memory_profile:
+                stats["allocated"] += max(tracemalloc.get_traced_memory()[0] - memory_before, 0)
+
+    def report(self) -> str:
+        """
+        Produit le tableau récapitulatif des étapes
+
+        Returns:
+            str: Tableau texte trié dans l'ordre d'apparition des étapes ;
+                les pourcentages sont rapportés au temps réel des étapes de
+                premier niveau, les étapes imbriquées n'y étant pas recomptées
+        """
+        if not self.stages:
+            return "Aucune étape profilée"
+
+        total_wall = self._top_wall or 1.0
+        lines = [
+            f"{'Étape':<24} {'Appels':>7} {'Réel (s)':>10} {'CPU (s)':>10} {'%':>6}"
+            + (f" {'Alloué (Mo)':>12}" if self.memory_profile else "")
+        ]
+        for name in self._order:
+            stats = self.stages[name]
+            line = (
+                f"{name:<24} {stats['calls']:>7} {stats['wall']:>10.3f} "
+                f"{stats['cpu']:>10.3f} {100 * stats['wall'] / total_wall:>6.1f}"
+            )
+            if self.memory_profile:
+                line += f" {stats['allocated'] / (1024 ** 2):>12.2f}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def dump(self, output_dir: Path) -> Optional[Path]:
+        """
+        Écrit les données brutes du profilage pour analyse ultérieure
+
+        Produit ``stages.json``, ``cprofile.prof`` (lisible avec pstats ou
+        snakeviz) et ``tracemalloc.txt`` selon les captures activées.
+
+        Args:
+            output_dir (Path): Répertoire parent des profils
+
+        Returns:
+            Optional[Path]: Répertoire du profil ou None si rien n'a été mesuré
+        """
+        if not self.stages:
+            return None
+
+        profile_dir = output_dir / datetime.now().strftime("profile_%Y%m%d_%H%M%S_%f")
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        data: Dict[str, Any] = {
+            "created_at": datetime.now().isoformat(),
+            "stages": [{"name": name, **self.stages[name]} for name in self._order],
+        }
+        (profile_dir / "stages.json").write_text(json.dumps(data, indent=2))
+
+        if self._profile is not None:
+            self._profile.dump_stats(str(profile_dir / "cprofile.prof"))
+            with (profile_dir / "cprofile.txt").open("w") as f:
+                stats = pstats.Stats(self._profile, stream=f)
+                stats.sort_stats("cumulative").print_stats(40)
+
+        if self.memory_profile and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            with (profile_dir / "tracemalloc.txt").open("w") as f:
+                for stat in snapshot.statistics("lineno")[:50]:
+                    f.write(f"{stat}\n")
+
+        return profile_dir
@@ -0,0 +1,212 @@
+"""
+Module de statistiques d'efficacité des règles Hashcat
+
+Chaque règle multiplie le travail d'un lot par le nombre de mots du
+dictionnaire. Les hits sont collectés via ``--debug-mode 1`` (une ligne par
+hash craqué contenant la règle responsable) et cumulés entre toutes les
+sessions pour classer les règles par coût par hit et écarter celles qui ne
+produisent rien.
+"""
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import yaml
+
+from .session_manager import atomic_write_yaml, store_lock
+
+
+def read_rules(rules_file: Path) -> List[str]:
+    """
+    Lit les règles d'un fichier en ignorant lignes vides et commentaires
+
+    Args:
+        rules_file (Path): Fichier de règles Hashcat
+
+    Returns:
+        List[str]: Règles dans l'ordre du fichier, sans doublons
+    """
+    rules = []
+    seen = set()
+    with Path(rules_file).open("r", errors="ignore") as f:
+        for line in f:
+            rule = line.strip()
+            if not rule or rule.startswith("#") or rule in seen:
+                continue
+            seen.add(rule)
+            rules.append(rule)
+    return rules
+
+
+class RuleStatistics:
+    """Statistiques persistantes de hits par règle"""
+
+    def __init__(
+        self,
+        stats_file: Path,
+        min_candidates: int = 50_000_000,
+        max_cost_ratio: float = 100.0
+    ):
+        """
+        Initialise les statistiques
+
+        Args:
+            stats_file (Path): Fichier YAML de stockage
+            min_candidates (int): Nombre de candidats testés avant qu'une
+                règle sans hit puisse être écartée
+            max_cost_ratio (float): Rapport maximal entre le coût par hit
+                d'une règle et le coût médian des règles productives
+        """
+        self.stats_file = stats_file
+        self.min_candidates = min_candidates
+        self.max_cost_ratio = max_cost_ratio
+        self.rules: Dict[str, Dict[str, int]] = {}
+        self._median_cache: Optional[Tuple[Optional[float]]] = None
+        self._load()
+
+    def _load(self) -> None:
+        """Charge les statistiques depuis le disque"""
+        if not self.stats_file.exists():
+            return
+        with self.stats_file.open("r") as f:
+            data = yaml.safe_load(f) or {}
+        self.rules = data.get("rules", {})
+        self._median_cache = None
+
+    def save(self) -> None:
+        """Enregistre les statistiques"""
+        atomic_write_yaml(self.stats_file, {"updated_at": datetime.now().isoformat(), "rules": self.rules})
+
+    def record_batch(
+        self,
+        rules_files: List[Path],
+        words_tested: int,
+        debug_file: Optional[Path] = None
+    ) -> int:
+        """
+        Cumule les résultats d'un lot terminé
+
+        Les statistiques sont relues sous verrou avant l'ajout : celles
+        enregistrées entre-temps par d'autres processus sont conservées.
+
+        Args:
+            rules_files (List[Path]): Fichiers de règles utilisés par le lot
+            words_tested (int): Nombre de mots du dictionnaire testés
+            debug_file (Optional[Path]): Fichier produit par --debug-mode 1
+
+        Returns:
+            int: Nombre de hits attribués à des règles
+        """
+        batch_rules = [rule for rules_file in rules_files for rule in read_rules(rules_file)]
+        hit_rules = []
+        if debug_file and Path(debug_file).exists():
+            with Path(debug_file).open("r", errors="ignore") as f:
+                hit_rules = [line.strip() for line in f if line.strip()]
+
+        with store_lock(self.stats_file):
+            self._load()
+            for rule in batch_rules:
+                stats = self.rules.setdefault(rule, {"hits": 0, "candidates": 0})
+                stats["candidates"] += words_tested
+            for rule in hit_rules:
+                stats = self.rules.setdefault(rule, {"hits": 0, "candidates": 0})
+                stats["hits"] += 1
+            self._median_cache = None
+            self.save()
+        return len(hit_rules)
+
+    def cost_per_hit(self, rule: str) -> float:
+        """
+        Calcule le nombre de candidats testés par hit pour une règle
+
+        Returns:
+            float: Coût par hit (infini si la règle n'a jamais produit de hit)
+        """
+        stats = self.rules.get(rule)
+        if not stats or not stats["hits"]:
+            return float("inf")
+        return stats["candidates"] / stats["hits"]
+
+    def _median_productive_cost(self) -> Optional[float]:
+        """Retourne le coût médian des règles ayant produit au moins un hit"""
+        if self._median_cache is None:
+            costs = sorted(self.cost_per_hit(rule) for rule, stats in self.rules.items() if stats["hits"])
+            self._median_cache = (costs[len(costs) // 2] if costs else None,)
+        return self._median_cache[0]
+
+    def is_unproductive(self, rule: str) -> bool:
+        """
+        Indique si une règle a assez été testée pour être jugée inefficace
+
+        Une règle encore peu testée est conservée pour continuer à explorer.
+        """
+        stats = self.rules.get(rule)
+        if not stats or stats["candidates"] < self.min_candidates:
+            return False
+        if not stats["hits"]:
+            return True
+        median = self._median_productive_cost()
+        return median is not None and self.cost_per_hit(rule) > self.max_cost_ratio * median
+
+    def rank_rules(self, rules: List[str]) -> List[Tuple[str, float]]:
+        """
+        Classe des règles de la plus à la moins rentable
+
+        Les règles productives viennent en premier par coût croissant, puis
+        les règles sans données suffisantes dans leur ordre d'origine, puis
+        les règles jugées inefficaces.
+
+        Args:
+            rules (List[str]): Règles à classer
+
+        Returns:
+            List[Tuple[str, float]]: Règles et coût par hit associé
+        """
+        def sort_key(item: Tuple[int, str]) -> Tuple[int, float, int]:
+            position, rule = item
+            if self.is_unproductive(rule):
+                return 2, self.cost_per_hit(rule), position
+            if self.rules.get(rule, {}).get("hits"):
+                return 0, self.cost_per_hit(rule), position
+            return 1, 0.0, position
+
+        ranked = sorted(enumerate(rules), key=sort_key)
+        return [(rule, self.cost_per_hit(rule)) for _, rule in ranked]
+
+    def plan_rules(self, rules_file: Path, output_dir: Path) -> Tuple[Path, int]:
+        """
+        Produit un fichier de règles classé et élagué
+
+        Args:
+            rules_file (Path): Fichier de règles d'origine
+            output_dir (Path): Répertoire des fichiers de règles planifiés
+
+        Returns:
+            Tuple[Path, int]: Fichier à utiliser et nombre de règles écartées
+        """
+        rules = read_rules(rules_file)
+        kept = [rule for rule, _ in self.rank_rules(rules) if not self.is_unproductive(rule)]
+        dropped = len(rules) - len(kept)
+        if not kept or kept == rules:
+            return rules_file, 0
+
+        content = "".join(f"{rule}\n" for rule in kept)
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+        output_dir.mkdir(parents=True, exist_ok=True)
+        planned_file = output_dir / f"{Path(rules_file).stem}_{digest}.rule"
+        if not planned_file.exists():
+            planned_file.write_text(content)
+        return planned_file, dropped
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Retourne les statistiques triées par coût par hit
+
+        Returns:
+            List[Dict[str, Any]]: Une entrée par règle connue
+        """
+        return [
+            {"rule": rule, **self.rules[rule], "cost_per_hit": cost}
+            for rule, cost in self.rank_rules(list(self.rules))
+        ]
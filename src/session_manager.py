@@ -1,12 +1,96 @@
 """
 Module de gestion des sessions pour MyHashcat
+
+Plusieurs processus (CLI, démon, boucle de continuation automatique) peuvent
+modifier les mêmes sessions. Chaque lecture-modification-écriture se fait donc
+sous un verrou ``fcntl`` propre à la session, l'écriture remplace le fichier de
+façon atomique (les lecteurs non verrouillés voient l'ancienne ou la nouvelle
+version, jamais un fichier tronqué) et un numéro de version permet les mises à
+jour conditionnelles (compare-and-swap). Les identifiants sont réservés par
+création exclusive du fichier, sans collision possible entre processus.
+Les fichiers d'état partagés voisins (statistiques, file, index) se
+verrouillent de la même façon avec ``store_lock`` et s'enregistrent avec
+``atomic_write_yaml``.
 """
-import json
+import fcntl
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, ContextManager, Iterator, Optional
 from datetime import datetime
 import yaml
 
+from .metrics import REGISTRY
+
+
+# Chargement et écriture via libyaml lorsqu'elle est disponible
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@contextmanager
+def file_lock(lock_file: Path) -> Iterator[None]:
+    """
+    Prend un verrou ``fcntl`` exclusif (entre threads et processus)
+
+    Args:
+        lock_file (Path): Fichier portant le verrou, créé au besoin
+    """
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # La fermeture libère le verrou
+        os.close(fd)
+
+
+def store_lock(store_file: Path) -> ContextManager[None]:
+    """
+    Verrouille un fichier d'état partagé le temps d'une lecture-modification-écriture
+
+    Le verrou est porté par un fichier ``.<nom>.lock`` voisin : le fichier
+    d'état lui-même est remplacé atomiquement à chaque écriture.
+
+    Args:
+        store_file (Path): Fichier d'état (YAML)
+    """
+    store_file.parent.mkdir(parents=True, exist_ok=True)
+    return file_lock(store_file.with_name(f".{store_file.name}.lock"))
+
+
+def atomic_write_text(path: Path, text: str, mode: int = 0o644) -> None:
+    """
+    Écrit un fichier par remplacement atomique
+
+    Le contenu passe par un fichier temporaire voisin renommé ensuite : les
+    lecteurs non verrouillés voient l'ancienne ou la nouvelle version, jamais
+    un fichier tronqué.
+
+    Args:
+        path (Path): Fichier de destination, son répertoire est créé au besoin
+        text (str): Contenu du fichier
+        mode (int): Permissions du fichier créé
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(temp_file, path)
+
+
+def atomic_write_yaml(path: Path, data: Any, mode: int = 0o644) -> None:
+    """
+    Enregistre un fichier d'état YAML par remplacement atomique
+
+    Args:
+        path (Path): Fichier d'état
+        data (Any): Données sérialisées (types YAML sûrs)
+        mode (int): Permissions du fichier créé
+    """
+    atomic_write_text(path, yaml.dump(data, Dumper=_YamlDumper, allow_unicode=True), mode)
+
 
 class SessionManager:
     """Gestionnaire de sessions pour MyHashcat"""
@@ -19,19 +103,64 @@ class SessionManager:
             sessions_dir (Path): Répertoire de stockage des sessions
         """
         self.sessions_dir = sessions_dir
+        self.locks_dir = sessions_dir / ".locks"
         self._ensure_sessions_dir()
 
     def _ensure_sessions_dir(self) -> None:
         """Crée le répertoire des sessions s'il n'existe pas"""
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self.locks_dir.mkdir(exist_ok=True)
+
+    def _session_file(self, session_id: str) -> Path:
+        """Chemin du fichier d'une session"""
+        return self.sessions_dir / f"{session_id}.yaml"
+
+    @contextmanager
+    def lock(self, session_id: str) -> Iterator[None]:
+        """
+        Verrouille une session en exclusivité (entre threads et processus)
+
+        Args:
+            session_id (str): Identifiant de la session
+        """
+        with file_lock(self.locks_dir / f"{session_id}.lock"):
+            yield
+
+    def _write(self, session_id: str, session_data: Dict[str, Any]) -> None:
+        """Écrit une session (verrou tenu)"""
+        atomic_write_yaml(self._session_file(session_id), session_data)
+
+    def _reserve_id(self, name: str) -> str:
+        """
+        Réserve un identifiant de session unique
+
+        L'identifiant est le nom suivi de l'horodatage ; si une autre session
+        l'a déjà pris dans la même seconde, un suffixe croissant est ajouté.
+        La création exclusive du fichier garantit l'unicité entre processus.
+        """
+        base_id = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        attempt = 1
+        while True:
+            session_id = base_id if attempt == 1 else f"{base_id}_{attempt}"
+            try:
+                fd = os.open(self._session_file(session_id), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                attempt += 1
+                continue
+            os.close(fd)
+            return session_id
 
     def create_session(self, name: str, config: Dict[str, Any]) -> str:
         """
         Crée une nouvelle session avec la configuration spécifiée
+
+        Args:
+            name (str): Nom de la session
+            config (Dict[str, Any]): Configuration de la session
+
+        Returns:
+            str: Identifiant unique de la session
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        session_id = f"{name}_{timestamp}"
-        
         # Vérification des données requises
         required_fields = ["name", "hash_file"]
         for field in required_fields:
@@ -40,16 +169,17 @@ class SessionManager:
             if not config[field]:
                 raise ValueError(f"Configuration invalide: {field} vide")
         
-        # Création du fichier de session
-        session_file = self.sessions_dir / f"{session_id}.yaml"
-        session_data = {
-            "id": session_id,
-            **config
-        }
-        
         try:
-            with session_file.open("w") as f:
-                yaml.dump(session_data, f)
+            session_id = self._reserve_id(name)
+            session_data = {
+                "id": session_id,
+                **config,
+                "version": 1
+            }
+            with self.lock(session_id):
+                self._write(session_id, session_data)
+            if session_data.get("status"):
+                self._record_transition(None, session_data["status"])
             return session_id
         except Exception as e:
             raise RuntimeError(f"Erreur lors de la création de la session: {str(e)}")
@@ -64,43 +194,100 @@ class SessionManager:
         Returns:
             Optional[Dict[str, Any]]: Données de la session ou None si non trouvée
         """
-        session_file = self.sessions_dir / f"{session_id}.yaml"
+        session_file = self._session_file(session_id)
         if not session_file.exists():
             return None
         
         try:
             with session_file.open("r") as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YamlLoader)
         except Exception as e:
             print(f"Erreur lors du chargement de la session {session_id}: {e}")
             return None
 
-    def update_session(self, session_id: str, updates: Dict[str, Any]) -> bool:
+    def update_session(
+        self,
+        session_id: str,
+        updates: Dict[str, Any],
+        expected_version: Optional[int] = None
+    ) -> bool:
         """
         Met à jour une session existante
 
+        Les champs sont fusionnés sous verrou : deux mises à jour
+        concurrentes de champs différents sont toutes deux conservées.
+
         Args:
             session_id (str): Identifiant de la session
             updates (Dict[str, Any]): Mises à jour à appliquer
+            expected_version (Optional[int]): Si précisé, la mise à jour
+                n'est appliquée que si la session est toujours à cette
+                version (compare-and-swap)
 
         Returns:
-            bool: True si la mise à jour a réussi, False sinon
+            bool: True si la mise à jour a réussi, False sinon (session
+                absente, version différente ou erreur d'écriture)
         """
-        session_data = self.load_session(session_id)
-        if not session_data:
-            return False
+        return self.modify_session(
+            session_id,
+            lambda session_data: session_data.update(updates),
+            expected_version=expected_version
+        ) is not None
 
-        session_data.update(updates)
-        session_data["updated_at"] = datetime.now().isoformat()
-        
-        try:
-            session_file = self.sessions_dir / f"{session_id}.yaml"
-            with session_file.open("w") as f:
-                yaml.dump(session_data, f)
-            return True
-        except Exception as e:
-            print(f"Erreur lors de la mise à jour de la session {session_id}: {e}")
-            return False
+    def modify_session(
+        self,
+        session_id: str,
+        modify: Callable[[Dict[str, Any]], Any],
+        expected_version: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Applique une modification arbitraire à une session sous verrou
+
+        Permet les lectures-modifications-écritures dépendant de l'état
+        courant (compteurs, transitions conditionnelles) sans perte de mise à
+        jour entre processus.
+
+        Args:
+            session_id (str): Identifiant de la session
+            modify (Callable[[Dict[str, Any]], Any]): Fonction modifiant les
+                données de la session en place ; si elle retourne False, rien
+                n'est écrit
+            expected_version (Optional[int]): Version attendue (compare-and-swap)
+
+        Returns:
+            Optional[Dict[str, Any]]: Données écrites, None si la session est
+                absente, la version différente ou la modification annulée
+        """
+        with self.lock(session_id):
+            session_data = self.load_session(session_id)
+            if not session_data:
+                return None
+            version = session_data.get("version", 0)
+            if expected_version is not None and version != expected_version:
+                return None
+
+            previous_status = session_data.get("status")
+            if modify(session_data) is False:
+                return None
+            session_data["version"] = version + 1
+            session_data["updated_at"] = datetime.now().isoformat()
+            
+            try:
+                self._write(session_id, session_data)
+            except Exception as e:
+                print(f"Erreur lors de la mise à jour de la session {session_id}: {e}")
+                return None
+        if session_data.get("status") != previous_status:
+            self._record_transition(previous_status, session_data.get("status"))
+        return session_data
+
+    @staticmethod
+    def _record_transition(previous: Optional[str], current: Optional[str]) -> None:
+        """Comptabilise une transition d'état dans les métriques"""
+        REGISTRY.inc("session_transitions_total", labels={
+            "from": previous or "none",
+            "to": current or "none"
+        })
 
     def list_sessions(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -127,10 +314,12 @@ class SessionManager:
         Returns:
             bool: True si la suppression a réussi, False sinon
         """
-        session_file = self.sessions_dir / f"{session_id}.yaml"
+        session_file = self._session_file(session_id)
         if session_file.exists():
             try:
-                session_file.unlink()
+                with self.lock(session_id):
+                    session_file.unlink()
+                (self.locks_dir / f"{session_id}.lock").unlink(missing_ok=True)
                 return True
             except OSError as e:
                 print(f"Erreur lors de la suppression du fichier de session {session_id}: {e}")
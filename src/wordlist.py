@@ -0,0 +1,300 @@
+"""
+Module de préparation des listes de mots externes
+
+Les listes de mots réelles (plusieurs Go) contiennent des doublons et des mots
+que le type de hash ne peut pas accepter (8 à 63 caractères pour WPA). Le
+préparateur les lit en flux, écarte les mots de longueur ou de caractères
+invalides et supprime les doublons en conservant l'ordre de première
+apparition (les listes sont souvent triées par fréquence). Au-delà du budget
+mémoire, la déduplication passe par un tri fusion externe. Le résultat est mis
+en cache selon l'empreinte du contenu et les filtres appliqués.
+"""
+import hashlib
+import heapq
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import yaml
+
+from .session_manager import atomic_write_yaml, store_lock
+
+
+# Longueurs acceptées par Hashcat selon le type de hash (octets)
+HASH_TYPE_LENGTHS = {
+    2500: (8, 63),    # WPA-EAPOL-PBKDF2
+    16800: (8, 63),   # WPA-PMKID-PBKDF2
+    22000: (8, 63),   # WPA-PBKDF2-PMKID+EAPOL
+}
+DEFAULT_LENGTHS = (1, 256)
+
+# Largeur de l'index de première apparition en tête des enregistrements
+INDEX_WIDTH = 16
+
+READ_BUFFER = 1024 * 1024
+
+
+def length_limits(hash_type: Optional[int]) -> Tuple[int, int]:
+    """
+    Retourne les longueurs de mot acceptées pour un type de hash
+
+    Args:
+        hash_type (Optional[int]): Type de hash
+
+    Returns:
+        Tuple[int, int]: Longueurs minimale et maximale (octets)
+    """
+    return HASH_TYPE_LENGTHS.get(hash_type, DEFAULT_LENGTHS)
+
+
+def file_digest(path: Path) -> str:
+    """
+    Calcule l'empreinte SHA-256 du contenu d'un fichier
+
+    Args:
+        path (Path): Fichier à lire
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(READ_BUFFER), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_run(records: List[bytes], directory: Path) -> Path:
+    """Écrit une séquence triée d'enregistrements dans un fichier temporaire"""
+    fd, name = tempfile.mkstemp(prefix="run_", suffix=".tmp", dir=directory)
+    with os.fdopen(fd, "wb", buffering=READ_BUFFER) as f:
+        for record in records:
+            f.write(record)
+            f.write(b"\n")
+    return Path(name)
+
+
+def _read_run(path: Path) -> Iterator[bytes]:
+    """Relit les enregistrements d'un fichier temporaire"""
+    with path.open("rb", buffering=READ_BUFFER) as f:
+        for line in f:
+            yield line[:-1]
+
+
+def _word_key(record: bytes) -> bytes:
+    """Mot d'un enregistrement (sans l'index de première apparition)"""
+    return record[INDEX_WIDTH:]
+
+
+class WordlistPreprocessor:
+    """Filtrage, déduplication et cache des listes de mots externes"""
+
+    def __init__(self, cache_dir: Path, memory_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialise le préparateur
+
+        Args:
+            cache_dir (Path): Répertoire des listes préparées
+            memory_bytes (int): Volume de mots dédupliqués en mémoire avant
+                de passer au tri fusion externe
+        """
+        self.cache_dir = cache_dir
+        self.memory_bytes = memory_bytes
+        self.index_file = cache_dir / "index.yaml"
+        self.logger = logging.getLogger("myhashcat.wordlist")
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Charge l'index des empreintes et des listes préparées"""
+        if not self.index_file.exists():
+            return {"sources": {}, "prepared": {}}
+        with self.index_file.open("r") as f:
+            data = yaml.safe_load(f) or {}
+        data.setdefault("sources", {})
+        data.setdefault("prepared", {})
+        return data
+
+    def _save_index(self, data: Dict[str, Any]) -> None:
+        """Enregistre l'index"""
+        atomic_write_yaml(self.index_file, data)
+
+    def _source_digest(self, path: Path, index: Dict[str, Any]) -> str:
+        """Empreinte du contenu, relue seulement si le fichier a changé"""
+        stat = path.stat()
+        known = index["sources"].get(str(path))
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime_ns:
+            return known["digest"]
+        digest = file_digest(path)
+        index["sources"][str(path)] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "digest": digest}
+        return digest
+
+    def prepare(
+        self,
+        wordlist: Path,
+        hash_type: Optional[int] = None,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None,
+        charset: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Prépare une liste de mots pour Hashcat
+
+        Args:
+            wordlist (Path): Liste de mots d'origine
+            hash_type (Optional[int]): Type de hash (longueurs acceptées)
+            min_length (Optional[int]): Longueur minimale (remplace celle du type)
+            max_length (Optional[int]): Longueur maximale (remplace celle du type)
+            charset (Optional[str]): Caractères autorisés (tous par défaut)
+
+        Returns:
+            Dict[str, Any]: Chemin de la liste préparée (``path``), nombres
+                de mots lus, conservés, filtrés et en double, et indicateur
+                ``cached`` si le résultat existait déjà
+        """
+        path = Path(wordlist).resolve()
+        if not path.is_file():
+            raise ValueError(f"Liste de mots non trouvée: {wordlist}")
+        default_min, default_max = length_limits(hash_type)
+        min_length = default_min if min_length is None else min_length
+        max_length = default_max if max_length is None else max_length
+        if min_length > max_length:
+            raise ValueError(f"Longueurs incohérentes: {min_length} > {max_length}")
+        allowed = "".join(sorted(set(charset))).encode() if charset else None
+
+        with self._lock, store_lock(self.index_file):
+            index = self._load_index()
+            source = self._source_digest(path, index)
+            key = hashlib.sha256(
+                f"{source}:{min_length}:{max_length}:{allowed.hex() if allowed else '*'}".encode()
+            ).hexdigest()[:32]
+            output = self.cache_dir / f"{key}.txt"
+            entry = index["prepared"].get(key)
+            if entry and output.exists():
+                self.logger.info("Liste %s déjà préparée: %s", path, output)
+                self._save_index(index)
+                return {**entry, "path": str(output), "cached": True}
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.logger.info(
+            "Préparation de %s (longueur %s à %s, charset %s)",
+            path, min_length, max_length, charset or "libre"
+        )
+        temp_output = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        with tempfile.TemporaryDirectory(prefix="dedup_", dir=self.cache_dir) as work:
+            stats = self._process(path, temp_output, Path(work), min_length, max_length, allowed)
+        os.replace(temp_output, output)
+
+        entry = {
+            "source": str(path),
+            "source_digest": source,
+            "min_length": min_length,
+            "max_length": max_length,
+            "charset": charset,
+            "prepared_at": datetime.now().isoformat(),
+            **stats,
+        }
+        with self._lock, store_lock(self.index_file):
+            index = self._load_index()
+            index["sources"][str(path)] = {
+                "size": path.stat().st_size, "mtime": path.stat().st_mtime_ns, "digest": source
+            }
+            index["prepared"][key] = entry
+            self._save_index(index)
+        self.logger.info(
+            "%s: %s mots conservés sur %s (%s filtrés, %s doublons)",
+            path, stats["kept"], stats["read"], stats["filtered"], stats["duplicates"]
+        )
+        return {**entry, "path": str(output), "cached": False}
+
+    def _process(
+        self,
+        source: Path,
+        output: Path,
+        work_dir: Path,
+        min_length: int,
+        max_length: int,
+        allowed: Optional[bytes]
+    ) -> Dict[str, int]:
+        """
+        Filtre et déduplique une liste en conservant l'ordre d'apparition
+
+        Tant que les mots distincts tiennent dans le budget mémoire, un
+        dictionnaire ordonné suffit. Sinon, chaque bloc est écrit trié par mot
+        (préfixé de son index de première apparition) ; la fusion des blocs
+        élimine les doublons puis un second tri externe rétablit l'ordre
+        d'origine.
+        """
+        stats = {"read": 0, "kept": 0, "filtered": 0, "duplicates": 0}
+        chunk: Dict[bytes, int] = {}
+        chunk_bytes = 0
+        runs: List[Path] = []
+
+        with source.open("rb", buffering=READ_BUFFER) as f:
+            for position, line in enumerate(f):
+                word = line.rstrip(b"\r\n")
+                stats["read"] += 1
+                if not min_length <= len(word) <= max_length or (
+                    allowed is not None and word.translate(None, allowed)
+                ):
+                    stats["filtered"] += 1
+                    continue
+                if word in chunk:
+                    continue
+                chunk[word] = position
+                chunk_bytes += len(word) + 64
+                if chunk_bytes >= self.memory_bytes:
+                    runs.append(_write_run(
+                        (b"%016x" % index + word for word, index in sorted(chunk.items())), work_dir
+                    ))
+                    chunk, chunk_bytes = {}, 0
+
+        if not runs:
+            # Tout tient en mémoire : l'ordre d'insertion est celui d'apparition
+            with output.open("wb", buffering=READ_BUFFER) as out:
+                for word in chunk:
+                    out.write(word)
+                    out.write(b"\n")
+            stats["kept"] = len(chunk)
+            stats["duplicates"] = stats["read"] - stats["filtered"] - stats["kept"]
+            return stats
+        if chunk:
+            runs.append(_write_run(
+                (b"%016x" % index + word for word, index in sorted(chunk.items())), work_dir
+            ))
+        del chunk
+
+        # Fusion par mot : à mot égal, le bloc le plus ancien (index le plus
+        # petit) sort en premier et seul lui est conservé
+        ordered_runs: List[Path] = []
+        pending: List[bytes] = []
+        pending_bytes = 0
+        previous = None
+        for record in heapq.merge(*(_read_run(run) for run in runs), key=_word_key):
+            word = _word_key(record)
+            if word == previous:
+                continue
+            previous = word
+            pending.append(record)
+            pending_bytes += len(record) + 64
+            if pending_bytes >= self.memory_bytes:
+                pending.sort()
+                ordered_runs.append(_write_run(pending, work_dir))
+                pending, pending_bytes = [], 0
+        if pending:
+            pending.sort()
+            ordered_runs.append(_write_run(pending, work_dir))
+        for run in runs:
+            run.unlink()
+
+        # Index de largeur fixe : l'ordre des octets est l'ordre d'apparition
+        with output.open("wb", buffering=READ_BUFFER) as out:
+            for record in heapq.merge(*(_read_run(run) for run in ordered_runs)):
+                out.write(_word_key(record))
+                out.write(b"\n")
+                stats["kept"] += 1
+        stats["duplicates"] = stats["read"] - stats["filtered"] - stats["kept"]
+        return stats
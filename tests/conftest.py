@@ -0,0 +1,72 @@
+"""
+Fixtures partagées des tests pilotant le faux Hashcat (tests/fake_hashcat.py)
+"""
+import time
+from pathlib import Path
+
+import pytest
+
+from src.myhashcat import MyHashcat
+
+
+FAKE_HASHCAT = Path(__file__).resolve().parent / "fake_hashcat.py"
+
+
+@pytest.fixture
+def fake_hashcat():
+    """Chemin de l'exécutable du faux Hashcat"""
+    return str(FAKE_HASHCAT)
+
+
+@pytest.fixture
+def make_myhashcat(tmp_path, monkeypatch, fake_hashcat):
+    """
+    Fabrique d'instances de MyHashcat sur le faux Hashcat
+
+    Les points de reprise du faux Hashcat vont dans ``tmp_path/restore``,
+    le travail et les sessions dans ``tmp_path/work`` et ``tmp_path/sessions`` ;
+    les paramètres nommés (batch_size, brain...) sont transmis à MyHashcat.
+    """
+    monkeypatch.setenv("FAKE_HASHCAT_SESSION_DIR", str(tmp_path / "restore"))
+
+    def make(**kwargs):
+        return MyHashcat(
+            hashcat_path=fake_hashcat,
+            work_dir=tmp_path / "work",
+            sessions_dir=tmp_path / "sessions",
+            **kwargs
+        )
+
+    return make
+
+
+@pytest.fixture
+def word_batch_instance(make_myhashcat):
+    """MyHashcat sur le faux Hashcat avec des lots de 2 mots (de gauche)"""
+    return make_myhashcat(batch_size=2)
+
+
+@pytest.fixture
+def run_until_cracked():
+    """
+    Enchaîne les lots d'une session jusqu'au hash retrouvé
+
+    Le callable retourné prend l'instance, la session de départ et le nombre
+    maximal de lots ; il retourne les sessions enchaînées et l'état final.
+    """
+    def run(instance, session_id, max_batches=10, timeout=30.0):
+        sessions = [session_id]
+        for _ in range(max_batches):
+            deadline = time.monotonic() + timeout
+            status = instance.get_session_status(sessions[-1])
+            while status["status"] == "running":
+                if time.monotonic() > deadline:
+                    raise AssertionError(f"Session {sessions[-1]} toujours en cours")
+                instance.wait_for_exit(timeout=0.5)
+                status = instance.get_session_status(sessions[-1])
+            if status.get("recovered"):
+                return sessions, status
+            sessions.append(instance.continue_attack(sessions[-1]))
+        raise AssertionError("Hash non retrouvé")
+
+    return run
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Faux Hashcat scriptable pour les tests et les bancs d'essai d'orchestration
+
+Imite l'interface en ligne de commande de Hashcat (``--version``, ``-b``,
+attaques avec ``--status``/``--status-json``, ``--outfile``, ``--session``,
+``--restore``, ``--skip``/``--limit``, ``--debug-file``, ``--brain-server``
+et ``--brain-client``) sans GPU ni calcul réel coûteux. Le comportement se règle par variables d'environnement :
+
+    FAKE_HASHCAT_SPEED        Candidats simulés par seconde (défaut : 1e9)
+    FAKE_HASHCAT_STARTUP      Délai de démarrage simulé en secondes (défaut : 0)
+    FAKE_HASHCAT_CRACK_INDEX  Index du candidat qui « craque » le premier hash
+                              (défaut : aucun, seuls les vrais hashs MD5, SHA1,
+                              SHA256 et SHA512 du dictionnaire sont trouvés)
+    FAKE_HASHCAT_SESSION_DIR  Répertoire des fichiers .restore (défaut : cwd)
+
+Codes de sortie identiques à Hashcat : 0 craqué, 1 épuisé, 2 interrompu,
+3 interrompu par checkpoint, 255 erreur.
+"""
+import hashlib
+import itertools
+import json
+import os
+import signal
+import socket
+import socketserver
+import string
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+VERSION = "v6.2.6-fake"
+
+# Options attendant une valeur
+VALUE_OPTIONS = {
+    "-m", "--hash-type", "-a", "--attack-mode", "-o", "--outfile", "--session",
+    "-s", "--skip", "-l", "--limit", "--status-timer", "-r", "--rules-file",
+    "--debug-mode", "--debug-file", "-w", "--workload-profile",
+}
+# Instances restreintes à un sous-ensemble de périphériques
+VALUE_OPTIONS |= {"-d", "--backend-devices"}
+# Jeux de caractères personnalisés des masques hybrides
+VALUE_OPTIONS |= {"-1", "-2", "-3", "-4", "--custom-charset1", "--custom-charset2", "--custom-charset3", "--custom-charset4"}
+# Serveur brain et attaques clientes
+VALUE_OPTIONS |= {"--brain-host", "--brain-port", "--brain-password", "--brain-client-features"}
+
+MASK_CHARSETS = {
+    "l": string.ascii_lowercase, "u": string.ascii_uppercase, "d": string.digits,
+    "h": "0123456789abcdef", "H": "0123456789ABCDEF", "s": " !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~",
+}
+MASK_CHARSETS["a"] = MASK_CHARSETS["l"] + MASK_CHARSETS["u"] + MASK_CHARSETS["d"] + MASK_CHARSETS["s"]
+
+HASH_FUNCTIONS = {0: hashlib.md5, 100: hashlib.sha1, 1400: hashlib.sha256, 1700: hashlib.sha512}
+
+SPEED = float(os.environ.get("FAKE_HASHCAT_SPEED", "1e9"))
+STARTUP = float(os.environ.get("FAKE_HASHCAT_STARTUP", "0"))
+CRACK_INDEX = os.environ.get("FAKE_HASHCAT_CRACK_INDEX")
+SESSION_DIR = Path(os.environ.get("FAKE_HASHCAT_SESSION_DIR", "."))
+
+_interrupted: Optional[int] = None
+
+
+def parse_args(argv: List[str]) -> Dict:
+    """Analyse la ligne de commande à la manière de Hashcat"""
+    options: Dict = {"rules": [], "positional": [], "flags": set()}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg.startswith("-") and len(arg) > 1 and not arg.lstrip("-").isdigit() or arg in VALUE_OPTIONS:
+            if "=" in arg and arg.startswith("--"):
+                key, value = arg.split("=", 1)
+            elif arg in VALUE_OPTIONS:
+                key, value = arg, argv[i + 1] if i + 1 < len(argv) else ""
+                i += 1
+            else:
+                options["flags"].add(arg)
+                i += 1
+                continue
+            if key in ("-r", "--rules-file"):
+                options["rules"].append(value)
+            else:
+                options[key.lstrip("-")] = value
+        else:
+            options["positional"].append(arg)
+        i += 1
+    return options
+
+
+def option(options: Dict, *names: str, default=None):
+    """Retourne la première option présente parmi plusieurs alias"""
+    for name in names:
+        if name in options:
+            return options[name]
+    return default
+
+
+def restore_file(session: str) -> Path:
+    """Chemin du fichier .restore d'une session"""
+    return SESSION_DIR / f"{session}.restore"
+
+
+def write_restore(session: Optional[str], argv: List[str], words_done: int) -> None:
+    """Écrit le point de reprise de la session"""
+    if not session:
+        return
+    SESSION_DIR.mkdir(parents=True, exist_ok=True)
+    restore_file(session).write_text(json.dumps({"argv": argv, "words_done": words_done}))
+
+
+def read_lines(path: str) -> List[str]:
+    """Lit un fichier texte ligne par ligne"""
+    with open(path, "r", errors="ignore") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def expand_mask(mask: str, options: Dict) -> List[str]:
+    """Énumère les candidats d'un masque (jeux intégrés et ?1 à ?4)"""
+    positions = []
+    i = 0
+    while i < len(mask):
+        if mask[i] != "?" or i + 1 >= len(mask):
+            positions.append(mask[i])
+            i += 1
+            continue
+        code = mask[i + 1]
+        if code in "1234":
+            positions.append(option(options, code, f"custom-charset{code}", default=""))
+        else:
+            positions.append(MASK_CHARSETS.get(code, code))
+        i += 2
+    return ["".join(chars) for chars in itertools.product(*positions)]
+
+
+def print_status(options: Dict, state: Dict) -> None:
+    """Affiche un bloc de statut texte ou JSON"""
+    total = state["total"]
+    done = state["done"]
+    percent = 100.0 * done / total if total else 100.0
+    if "--status-json" in options["flags"]:
+        print(json.dumps({
+            "session": state["session"],
+            "status": state["status_code"],
+            "progress": [done, total],
+            "recovered_hashes": [state["recovered"], state["digests"]],
+            "rejected": state["rejected"],
+            "devices": [{"device_id": 1, "speed": int(state["speed"])}],
+            "time_start": int(state["started"]),
+        }), flush=True)
+        return
+    print(f"Session..........: {state['session']}")
+    print(f"Status...........: {state['status']}")
+    print(f"Speed.#1.........: {state['speed']:.0f} H/s")
+    print(f"Recovered........: {state['recovered']}/{state['digests']} ({100.0 * state['recovered'] / max(state['digests'], 1):.2f}%) Digests")
+    print(f"Progress.........: {done}/{total} ({percent:.2f}%)")
+    print(f"Rejected.........: {state['rejected']}/{done} ({100.0 * state['rejected'] / max(done, 1):.2f}%)")
+    print("", flush=True)
+
+
+def benchmark(options: Dict) -> int:
+    """Imite hashcat -b"""
+    mode = option(options, "m", "hash-type", default="0")
+    time.sleep(STARTUP)
+    print(f"Hashmode: {mode} - Fake")
+    print(f"Speed.#1.........: {SPEED:.0f} H/s (1.00ms) @ Accel:1 Loops:1 Thr:1 Vec:1", flush=True)
+    return 0
+
+
+def brain_server(options: Dict) -> int:
+    """Imite hashcat --brain-server : mémorise les candidats déjà soumis"""
+    host = option(options, "brain-host", default="127.0.0.1")
+    port = int(option(options, "brain-port", default=6863))
+    password = option(options, "brain-password", default="")
+    seen = set()
+    lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            if self.rfile.readline().decode().strip() != password:
+                return
+            for line in self.rfile:
+                keys = json.loads(line)
+                with lock:
+                    answer = [key in seen for key in keys]
+                    seen.update(keys)
+                self.wfile.write((json.dumps(answer) + "\n").encode())
+
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Brain server started on {host}:{port}", flush=True)
+    while _interrupted is None:
+        time.sleep(0.05)
+    server.shutdown()
+    return 0
+
+
+class BrainClient:
+    """Client du faux serveur brain"""
+
+    def __init__(self, options: Dict, hashes: List[str]):
+        self.connection = socket.create_connection((
+            option(options, "brain-host", default="127.0.0.1"), int(option(options, "brain-port", default=6863))
+        ))
+        self.stream = self.connection.makefile("rwb")
+        self.stream.write((option(options, "brain-password", default="") + "\n").encode())
+        self.salt = "\n".join(sorted(hashes))
+
+    def seen(self, words: List[str]) -> List[bool]:
+        """Soumet des candidats et retourne ceux déjà testés"""
+        keys = [hashlib.sha1((self.salt + "\0" + word).encode()).hexdigest() for word in words]
+        self.stream.write((json.dumps(keys) + "\n").encode())
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+
+def attack(argv: List[str], options: Dict) -> int:
+    """Simule une attaque dictionnaire"""
+    global _interrupted
+
+    session = option(options, "session", default="hashcat")
+    if "--restore" in options["flags"]:
+        if not restore_file(session).exists():
+            print(f"ERROR: {restore_file(session)}: No such file or directory", file=sys.stderr)
+            return 255
+        saved = json.loads(restore_file(session).read_text())
+        argv = saved["argv"]
+        options = parse_args(argv)
+        resume_from = saved["words_done"]
+    else:
+        resume_from = 0
+
+    positional = options["positional"]
+    if not positional:
+        print("ERROR: No hashes loaded", file=sys.stderr)
+        return 255
+    hash_file = positional[0]
+    if not Path(hash_file).exists():
+        print(f"ERROR: {hash_file}: No such file or directory", file=sys.stderr)
+        return 255
+
+    mode = int(option(options, "m", "hash-type", default="0"))
+    attack_mode = option(options, "a", "attack-mode", default="0")
+    hashes = read_lines(hash_file)
+    words = read_lines(positional[1]) if len(positional) > 1 and Path(positional[1]).exists() else []
+    right: List[str] = []
+    left: List[str] = []
+    if attack_mode == "1" and len(positional) > 2 and Path(positional[2]).exists():
+        # Combinateur : chaque mot de gauche est suivi de chaque mot de droite
+        right = read_lines(positional[2])
+    elif attack_mode == "6" and len(positional) > 2:
+        # Hybride liste + masque
+        right = expand_mask(positional[2], options)
+    elif attack_mode == "7" and len(positional) > 2 and Path(positional[2]).exists():
+        # Hybride masque + liste
+        left = expand_mask(positional[1], options)
+        words = read_lines(positional[2])
+
+    skip = int(option(options, "s", "skip", default=0))
+    limit = option(options, "l", "limit")
+    words = words[skip:skip + int(limit)] if limit is not None else words[skip:]
+    rules_count = sum(len([r for r in read_lines(rule) if not r.startswith("#")]) for rule in options["rules"]) or 1
+    if right or left:
+        rules_count = len(right or left)
+
+    outfile = option(options, "o", "outfile")
+    debug_file = option(options, "debug-file")
+    status_timer = float(option(options, "status-timer", default=10))
+    show_status = "--status" in options["flags"] or "--status-json" in options["flags"]
+
+    time.sleep(STARTUP)
+
+    targets = {h.lower(): h for h in hashes}
+    hash_function = HASH_FUNCTIONS.get(mode)
+    forced_index = int(CRACK_INDEX) if CRACK_INDEX not in (None, "") else None
+    state = {
+        "session": session, "status": "Running", "status_code": 3, "speed": SPEED,
+        "total": len(words) * rules_count, "done": resume_from * rules_count,
+        "recovered": 0, "digests": len(hashes), "started": time.time(), "rejected": 0,
+    }
+    brain = BrainClient(options, hashes) if "--brain-client" in options["flags"] else None
+
+    cracked = []
+    last_status = time.monotonic()
+    chunk = max(1, int(SPEED * 0.05 / rules_count))
+    index = resume_from
+    while index < len(words):
+        if _interrupted is not None:
+            write_restore(session, argv, index)
+            state["status"] = "Aborted (Checkpoint)" if _interrupted == signal.SIGINT else "Aborted"
+            if show_status:
+                print_status(options, state)
+            return 3 if _interrupted == signal.SIGINT else 2
+
+        block = words[index:index + chunk]
+        candidates = [
+            (skip + index + offset, word)
+            for offset, base in enumerate(block)
+            for word in [base + suffix for suffix in right] or [prefix + base for prefix in left] or [base]
+        ]
+        if brain is not None:
+            # Les candidats déjà testés sont rejetés avant le « noyau »
+            seen = brain.seen([word for _, word in candidates])
+            state["rejected"] += sum(seen)
+            candidates = [candidate for candidate, known in zip(candidates, seen) if not known]
+        for candidate_index, word in candidates:
+            found = None
+            if forced_index is not None and candidate_index == forced_index and hashes:
+                found = hashes[0]
+            elif hash_function is not None:
+                found = targets.get(hash_function(word.encode("utf-8", errors="ignore")).hexdigest())
+            if found is None or found in [c[0] for c in cracked]:
+                continue
+            cracked.append((found, word))
+            if outfile:
+                with open(outfile, "a") as f:
+                    f.write(f"{found}:{word}\n")
+            if debug_file and options["rules"]:
+                with open(debug_file, "a") as f:
+                    f.write(":\n")
+        index += len(block)
+        state["done"] = index * rules_count
+        state["recovered"] = len(cracked)
+        time.sleep(len(block) * rules_count / SPEED)
+
+        if len(cracked) == len(hashes):
+            break
+        if show_status and time.monotonic() - last_status >= status_timer:
+            print_status(options, state)
+            last_status = time.monotonic()
+            write_restore(session, argv, index)
+
+    state["status"] = "Cracked" if cracked and len(cracked) == len(hashes) else "Exhausted"
+    state["status_code"] = 6 if state["status"] == "Cracked" else 5
+    if show_status:
+        print_status(options, state)
+    if restore_file(session).exists():
+        restore_file(session).unlink()
+    return 0 if state["status"] == "Cracked" else 1
+
+
+def main(argv: List[str]) -> int:
+    """Point d'entrée du faux Hashcat"""
+    def interrupt(signum, frame):
+        global _interrupted
+        _interrupted = signum
+
+    signal.signal(signal.SIGINT, interrupt)
+    signal.signal(signal.SIGTERM, interrupt)
+
+    options = parse_args(argv)
+    if "--version" in options["flags"] or "-V" in options["flags"]:
+        print(VERSION)
+        return 0
+    if "-b" in options["flags"] or "--benchmark" in options["flags"]:
+        return benchmark(options)
+    if "--brain-server" in options["flags"]:
+        return brain_server(options)
+    return attack(argv, options)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai de charge de l'orchestration MyHashcat
+
+Lance des centaines de sessions concurrentes via MyHashcat contre le faux
+Hashcat (tests/fake_hashcat.py) afin de mesurer le surcoût par lot
+(génération, écriture des sessions, lancement du processus) et son évolution
+avec le nombre de workers.
+
+Usage:
+    python tests/load_harness.py --sessions 200 --workers 1,8,32
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.myhashcat import MyHashcat  # noqa: E402
+
+
+FAKE_HASHCAT = Path(__file__).resolve().parent / "fake_hashcat.py"
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    """Percentile simple (valeur la plus proche)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(ratio * len(ordered)))]
+
+
+def run_load(
+    sessions: int,
+    workers: int,
+    batch_size: int,
+    work_root: Path,
+    speed: float = 1e9,
+    startup: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Exécute un scénario de charge
+
+    Args:
+        sessions (int): Nombre de sessions lancées
+        workers (int): Nombre de créations de sessions concurrentes
+        batch_size (int): Taille des dictionnaires générés
+        work_root (Path): Répertoire de travail du scénario
+        speed (float): Vitesse simulée du faux Hashcat (candidats/s)
+        startup (float): Délai de démarrage simulé du faux Hashcat
+
+    Returns:
+        Dict[str, Any]: Mesures du scénario
+    """
+    os.environ["FAKE_HASHCAT_SPEED"] = str(speed)
+    os.environ["FAKE_HASHCAT_STARTUP"] = str(startup)
+    os.environ["FAKE_HASHCAT_SESSION_DIR"] = str(work_root / "restore")
+
+    instance = MyHashcat(
+        hashcat_path=str(FAKE_HASHCAT),
+        work_dir=work_root / "work",
+        sessions_dir=work_root / "sessions",
+        batch_size=batch_size
+    )
+
+    hash_files = []
+    for i in range(sessions):
+        hash_file = work_root / "hashes" / f"hash_{i}.txt"
+        hash_file.parent.mkdir(parents=True, exist_ok=True)
+        # Hash introuvable : chaque session épuise son dictionnaire
+        hash_file.write_text(hashlib.md5(f"introuvable-{i}".encode()).hexdigest() + "\n")
+        hash_files.append(hash_file)
+
+    def create(i: int) -> float:
+        started = time.perf_counter()
+        instance.create_attack_session(
+            name=f"load{i}",
+            hash_file=hash_files[i],
+            hash_type=0,
+            charset=set("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
+        )
+        return time.perf_counter() - started
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        create_latencies = list(executor.map(create, range(sessions)))
+    launched = time.perf_counter() - wall_start
+
+    pending = set(instance.active_sessions())
+    while pending:
+        pending -= set(instance.wait_for_exit(timeout=1.0))
+    completed = time.perf_counter() - wall_start
+
+    status_latencies = []
+    for session_id in instance.session_manager.list_sessions():
+        started = time.perf_counter()
+        instance.get_session_status(session_id)
+        status_latencies.append(time.perf_counter() - started)
+
+    simulated = sessions * batch_size / speed + sessions * startup
+    return {
+        "sessions": sessions,
+        "workers": workers,
+        "batch_size": batch_size,
+        "launch_seconds": launched,
+        "total_seconds": completed,
+        "sessions_per_second": sessions / completed if completed else 0.0,
+        "create_p50": percentile(create_latencies, 0.5),
+        "create_p95": percentile(create_latencies, 0.95),
+        "create_max": max(create_latencies) if create_latencies else 0.0,
+        "status_p50": percentile(status_latencies, 0.5),
+        "status_p95": percentile(status_latencies, 0.95),
+        # Temps par lot non expliqué par le cassage simulé, par worker
+        "overhead_per_batch": max(completed * workers - simulated, 0.0) / sessions,
+        "mean_create": statistics.mean(create_latencies) if create_latencies else 0.0,
+    }
+
+
+def main() -> int:
+    """Point d'entrée du banc d'essai"""
+    parser = argparse.ArgumentParser(description="Banc d'essai de charge de MyHashcat (faux Hashcat)")
+    parser.add_argument("--sessions", type=int, default=100, help="Nombre de sessions par scénario")
+    parser.add_argument("--workers", default="1,8,32", help="Niveaux de concurrence, séparés par des virgules")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Mots par dictionnaire")
+    parser.add_argument("--speed", type=float, default=1e9, help="Vitesse simulée (candidats/s)")
+    parser.add_argument("--startup", type=float, default=0.0, help="Délai de démarrage simulé (s)")
+    args = parser.parse_args()
+
+    print(f"{'Workers':>8} {'Sessions':>9} {'Total (s)':>10} {'Sess/s':>8} "
+          f"{'Création p50':>13} {'p95':>8} {'Statut p95':>11} {'Surcoût/lot':>12}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        with tempfile.TemporaryDirectory(prefix="myhashcat_load_") as work_root:
+            result = run_load(
+                sessions=args.sessions,
+                workers=workers,
+                batch_size=args.batch_size,
+                work_root=Path(work_root),
+                speed=args.speed,
+                startup=args.startup
+            )
+        print(f"{workers:>8} {result['sessions']:>9} {result['total_seconds']:>10.2f} "
+              f"{result['sessions_per_second']:>8.1f} {result['create_p50'] * 1000:>11.1f}ms "
+              f"{result['create_p95'] * 1000:>6.1f}ms {result['status_p95'] * 1000:>9.1f}ms "
+              f"{result['overhead_per_batch'] * 1000:>10.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Tests du dimensionnement adaptatif des lots
+"""
+import hashlib
+import pytest
+from src.batch_sizer import AdaptiveBatchSizer
+
+
+@pytest.fixture
+def sizer(tmp_path):
+    """Calculateur sans mesure préalable"""
+    return AdaptiveBatchSizer(tmp_path / "calibration.yaml", target_seconds=60.0, max_growth=1000.0)
+
+
+def test_default_without_measure(sizer):
+    """Test la taille par défaut en l'absence de mesure"""
+    assert sizer.batch_size(0) == 1_000_000
+
+
+def test_batch_targets_duration(sizer):
+    """Test la taille calculée à partir de la vitesse et du démarrage mesurés"""
+    # 1M mots en 12s à 1M H/s : 1s de cassage, 11s de démarrage
+    sizer.record(0, words=1_000_000, rules_multiplier=1, run_seconds=12.0, speed=1e9 / 1000)
+    # Démarrage de 11s > 10% de 60s : la durée visée est portée à 110s
+    assert sizer.batch_size(0) == 99_000_000
+    # Les règles multiplient le nombre de candidats par mot
+    assert sizer.batch_size(0, rules_multiplier=64) == 99_000_000 // 64 // 1000 * 1000
+    # Les mesures sont persistantes
+    assert AdaptiveBatchSizer(sizer.calibration_file).calibration["0"]["startup"] == pytest.approx(11.0)
+
+
+def test_growth_is_bounded(tmp_path):
+    """Test la limitation de la variation entre deux lots"""
+    sizer = AdaptiveBatchSizer(tmp_path / "calibration.yaml", target_seconds=600.0)
+    sizer.record(1000, words=100_000, rules_multiplier=1, run_seconds=1.0, speed=1e10)
+    assert sizer.batch_size(1000, previous=100_000) == 400_000
+    # Lot terminé sans statut : la taille est multipliée par le facteur maximal
+    sizer.record(22000, words=50_000, rules_multiplier=1, run_seconds=3.0, speed=None)
+    assert sizer.batch_size(22000, previous=50_000) == 200_000
+
+
+def test_recalibration_on_continue(make_myhashcat, tmp_path, monkeypatch):
+    """Test la recalibration de la taille du lot lors de la continuation"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "100000")
+    hashcat = make_myhashcat(target_batch_seconds=1.0)
+    hashcat.batch_sizer.default_batch = 20_000
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+
+    session_id = hashcat.create_attack_session(name="adapt", hash_file=hash_file, hash_type=0, charset={'A', 'B'})
+    assert hashcat.session_manager.load_session(session_id)["batch_size"] == 20_000
+    hashcat._active_processes[session_id].wait(timeout=30)
+    status = hashcat.get_session_status(session_id)
+    assert status["status"] == "finished"
+    assert status["run_seconds"] > 0.2
+
+    new_session_id = hashcat.continue_attack(session_id)
+    # Environ 1s à 100 000 H/s, borné à 4 fois le lot précédent
+    assert hashcat.session_manager.load_session(new_session_id)["batch_size"] == 80_000
+    hashcat._active_processes[new_session_id].kill()
@@ -0,0 +1,47 @@
+"""
+Tests du banc d'essai du pipeline
+"""
+import hashlib
+
+import pytest
+
+from src import bench
+
+
+def test_summarize_names_the_slowest_stage():
+    """Test le calcul du débit de bout en bout et de l'étape limitante"""
+    summary = bench.summarize(
+        batch_words=1_000_000,
+        rules_multiplier=10,
+        words_per_second=500_000.0,
+        bytes_per_word=19.0,
+        write_bytes_per_second=190_000_000.0,
+        launch_seconds=3.0,
+        hashcat_speed=10_000_000.0
+    )
+    stages = summary["stages"]
+    assert stages["generation"]["seconds_per_batch"] == pytest.approx(2.0)
+    assert stages["write"]["seconds_per_batch"] == pytest.approx(0.1)
+    assert stages["cracking"]["seconds_per_batch"] == pytest.approx(1.0)
+    assert summary["bottleneck"] == "launch"
+    assert summary["end_to_end"] == pytest.approx(10_000_000 / 6.1)
+    assert sum(entry["share"] for entry in stages.values()) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("speed, startup, bottleneck", [("1e4", "0", "cracking"), ("1e12", "0.5", "launch")])
+def test_benchmark_with_fake_hashcat(make_myhashcat, tmp_path, monkeypatch, speed, startup, bottleneck):
+    """Test le banc d'essai complet selon la vitesse et le démarrage de Hashcat"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", speed)
+    monkeypatch.setenv("FAKE_HASHCAT_STARTUP", startup)
+    instance = make_myhashcat(batch_size=10_000)
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"bench").hexdigest() + "\n")
+
+    result = instance.benchmark(hash_file, sample_words=5_000, write_bytes=1024 * 1024, launches=1)
+    assert result["hash_type"] == 0
+    assert result["hashcat_speed"] == pytest.approx(float(speed))
+    assert result["generation"]["bytes_per_word"] == pytest.approx(19.0)
+    assert result["write"]["bytes"] >= 1024 * 1024
+    assert result["bottleneck"] == bottleneck
+    # Aucun fichier de mesure ne reste dans le répertoire de travail
+    assert not list((tmp_path / "work").glob("bench_*"))
@@ -0,0 +1,61 @@
+"""
+Tests du serveur brain local
+"""
+import hashlib
+import socket
+
+import pytest
+
+from src.brain import BrainServer, parse_rejected
+
+
+def free_port():
+    """Port TCP local libre"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_parse_rejected_and_loopback_only(fake_hashcat, tmp_path):
+    """Test la lecture des rejets et le refus d'une adresse non locale"""
+    assert parse_rejected("Rejected.........: 120/4000 (3.00%)") == (120, 4000)
+    assert parse_rejected("Progress.........: 120/4000 (3.00%)") is None
+    with pytest.raises(ValueError, match="boucle locale"):
+        BrainServer(fake_hashcat, tmp_path, host="0.0.0.0")
+
+    server = BrainServer(fake_hashcat, tmp_path, port=free_port())
+    assert not server.is_running()
+    assert server.status()["totals"]["rejected"] == 0
+
+
+@pytest.fixture
+def instance(make_myhashcat):
+    """MyHashcat client d'un serveur brain sur le faux Hashcat"""
+    instance = make_myhashcat(batch_size=1000, brain=True, brain_port=free_port())
+    yield instance
+    instance.brain.stop()
+
+
+def test_repeated_candidates_are_rejected(instance, tmp_path):
+    """Test qu'une attaque recouvrant une précédente ne reteste aucun candidat"""
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+
+    # Le second masque, distinct pour l'index de couverture, est inclus dans le premier
+    for word_mask, expected in ((["0123456789"] * 3, (0, 1000)), (["01234"] + ["0123456789"] * 2, (500, 500))):
+        session_id = instance.create_attack_session(
+            name="brain", hash_file=hash_file, hash_type=0, position_charsets=word_mask
+        )
+        assert "--brain-client" in instance._active_processes[session_id].args
+        instance._active_processes[session_id].wait(timeout=30)
+        status = instance.get_session_status(session_id)
+        assert status["status"] == "finished"
+        assert (status["brain_rejected"], status["brain_candidates"]) == expected
+
+    state = instance.brain.status()
+    assert state["running"] and (tmp_path / "brain" / "brain.yaml").stat().st_mode & 0o077 == 0
+    assert state["totals"]["attacks"] == 2
+    assert (state["totals"]["rejected"], state["totals"]["candidates"]) == (500, 1500)
+
+    assert instance.brain.stop()
+    assert not instance.brain.is_running()
@@ -0,0 +1,64 @@
+"""
+Tests des attaques par combinaison (-a 1)
+"""
+import hashlib
+from pathlib import Path
+
+import pytest
+
+
+def test_combination_of_two_wordlists(word_batch_instance, run_until_cracked, tmp_path):
+    """Test le keyspace |G|×|D| et les curseurs sur la liste de gauche"""
+    left = tmp_path / "gauche.txt"
+    left.write_text("rouge\nvert\nrouge\nbleu\n")
+    right = tmp_path / "droite.txt"
+    right.write_text("2024\n!\n2024\n")
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"bleu!").hexdigest() + "\n")
+
+    session_id = word_batch_instance.create_attack_session(
+        name="combi", hash_file=hash_file, hash_type=0, attack_mode="combination",
+        left_wordlist=left, right_wordlist=right
+    )
+    session = word_batch_instance.session_manager.load_session(session_id)
+    assert (session["left_total"], session["right_total"], session["keyspace_total"]) == (3, 2, 6)
+    assert Path(session["dictionary_file"]).read_text() == "rouge\nvert\n"
+
+    sessions, status = run_until_cracked(word_batch_instance, session_id)
+    assert len(sessions) == 2
+    assert status["cracked"] == [{"hash": hashlib.md5(b"bleu!").hexdigest(), "plain": "bleu!"}]
+    last = word_batch_instance.session_manager.load_session(sessions[-1])
+    assert (last["batch_start"], last["next_word_index"], last["left_offset"]) == (2, 3, left.stat().st_size - 6)
+
+    with pytest.raises(ValueError, match="Keyspace"):
+        word_batch_instance.continue_attack(sessions[-1])
+    assert len(word_batch_instance.session_manager.list_sessions()) == 2
+
+
+def test_generated_side(word_batch_instance, run_until_cracked, tmp_path):
+    """Test un côté produit par le générateur, à gauche puis à droite"""
+    words = tmp_path / "mots.txt"
+    words.write_text("chat\nchien\n")
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"chien42").hexdigest() + "\n")
+
+    session_id = word_batch_instance.create_attack_session(
+        name="droite", hash_file=hash_file, hash_type=0, attack_mode="combination",
+        left_wordlist=words, position_charsets=["0123456789"] * 2
+    )
+    session = word_batch_instance.session_manager.load_session(session_id)
+    assert session["keyspace_total"] == 200
+    assert len(Path(session["right_file"]).read_text().splitlines()) == 100
+    _, status = run_until_cracked(word_batch_instance, session_id)
+    assert status["cracked"][0]["plain"] == "chien42"
+
+    hash_file.write_text(hashlib.md5(b"b1chat").hexdigest() + "\n")
+    session_id = word_batch_instance.create_attack_session(
+        name="gauche", hash_file=hash_file, hash_type=0, attack_mode="combination",
+        right_wordlist=words, position_charsets=["ab", "01"]
+    )
+    sessions, status = run_until_cracked(word_batch_instance, session_id)
+    assert [Path(word_batch_instance.session_manager.load_session(s)["dictionary_file"]).name for s in sessions] == [
+        f"{s}_left.txt" for s in sessions
+    ]
+    assert len(sessions) == 2 and status["cracked"][0]["plain"] == "b1chat"
@@ -0,0 +1,51 @@
+"""
+Tests des contraintes structurelles sur le keyspace
+"""
+import pytest
+
+from src.constraints import KeyspaceConstraints
+from src.generator import DictionaryGenerator
+from src.pool import pool_key
+
+
+def _filtered(length, charset, constraints):
+    """Mots du keyspace complet respectant les contraintes (référence)"""
+    full = DictionaryGenerator(length=length, charset=set(charset))
+    words = full.generate_sequential(start_index=0, count=full.total_combinations)
+    return [word for word in words if constraints.allows(word)]
+
+
+@pytest.mark.parametrize("constraints", [
+    KeyspaceConstraints(max_repeat=1),
+    KeyspaceConstraints(required_classes=["d", "u"]),
+    KeyspaceConstraints(max_repeat=2, required_classes=["d"]),
+])
+def test_constrained_space_matches_filter(constraints):
+    """Test que comptage, énumération et rang correspondent au filtrage"""
+    expected = _filtered(5, "AB12", constraints)
+    generator = DictionaryGenerator(length=5, charset=set("AB12"), constraints=constraints)
+
+    assert generator.total_combinations == len(expected)
+    assert generator.generate_sequential(start_index=0, count=10_000) == expected
+    assert generator.generate_sequential(start_index=17, count=5) == expected[17:22]
+    assert [generator.word_to_index(word) for word in expected] == list(range(len(expected)))
+
+
+def test_constraints_validation():
+    """Test les contraintes invalides ou impossibles à satisfaire"""
+    with pytest.raises(ValueError, match="répétitions"):
+        KeyspaceConstraints(max_repeat=0)
+    with pytest.raises(ValueError, match="Aucun mot"):
+        DictionaryGenerator(length=4, charset=set("AB"), constraints=KeyspaceConstraints(required_classes=["d"]))
+
+    generator = DictionaryGenerator(length=3, charset=set("AB1"), constraints=KeyspaceConstraints(max_repeat=1))
+    with pytest.raises(ValueError, match="contraintes"):
+        generator.word_to_index("AAB")
+
+
+def test_constraints_in_pool_key():
+    """Test que des contraintes différentes empêchent la mutualisation"""
+    session = {"hash_type": 0, "charset": list("AB"), "word_length": 4}
+    constrained = dict(session, constraints=KeyspaceConstraints(2, ["d"]).to_dict())
+    assert pool_key(session) != pool_key(constrained)
+    assert pool_key(constrained) == pool_key(dict(constrained))
@@ -0,0 +1,92 @@
+"""
+Tests de l'index de couverture du keyspace
+"""
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.coverage import CoverageIndex, hash_fingerprint, keyspace_key
+
+
+def test_interval_merge_and_lookup(tmp_path):
+    """Test la fusion des plages et la recherche du prochain index libre"""
+    index = CoverageIndex(tmp_path / "coverage.yaml")
+    index.add("k", 10, 20, total=100)
+    index.add("k", 40, 50)
+    assert index.next_uncovered("k", 0) == (0, 10)
+    assert index.next_uncovered("k", 12) == (20, 40)
+    assert index.next_uncovered("k", 45) == (50, None)
+
+    # Plage recouvrant les deux précédentes et touchant la suivante
+    index.add("k", 60, 70)
+    assert index.add("k", 15, 60) == 60
+    coverage = CoverageIndex(tmp_path / "coverage.yaml").coverage("k")
+    assert coverage["ranges"] == 1
+    assert coverage["percent"] == 60.0
+    assert index.next_uncovered("k", 10) == (70, None)
+    assert index.next_uncovered("autre", 5) == (5, None)
+
+    # Ajouts simultanés depuis des index distincts sur le même fichier
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(
+            lambda i: CoverageIndex(tmp_path / "coverage.yaml").add("p", 10 * i, 10 * i + 5), range(16)
+        ))
+    assert CoverageIndex(tmp_path / "coverage.yaml").coverage("p")["covered"] == 80
+
+
+def test_keyspace_key(tmp_path):
+    """Test la clé canonique : ordre des hashs indifférent, keyspace distinct"""
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("h1\nh2\n")
+    second.write_text("h2\n\nh1\nh1\n")
+    assert hash_fingerprint(first) == hash_fingerprint(second)
+
+    config = {"hash_file": str(first), "hash_type": 0, "word_length": 4, "charset": ["A", "B"]}
+    assert keyspace_key(config) == keyspace_key(dict(config, hash_file=str(second), charset=["B", "A"]))
+    assert keyspace_key(config) != keyspace_key(dict(config, word_length=5))
+
+    # Les règles réellement appliquées font la clé, pas le nom du fichier
+    rules = tmp_path / "best.rule"
+    rules.write_text(":\nu\n$1\n")
+    ranked = tmp_path / "best_0a1b.rule"
+    ranked.write_text("$1\n:\nu\n")
+    pruned = tmp_path / "best_2c3d.rule"
+    pruned.write_text("$1\n:\n")
+    config["rules"] = [str(rules)]
+    assert keyspace_key(config) == keyspace_key(config, [ranked])
+    assert keyspace_key(config) != keyspace_key(config, [pruned])
+
+
+def test_restart_skips_covered_range(make_myhashcat, tmp_path, monkeypatch):
+    """Test qu'un nouveau start ne reparcourt pas une plage déjà épuisée"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "1e9")
+    instance = make_myhashcat(batch_size=1000)
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+
+    def run(name, **keyspace):
+        keyspace = keyspace or {"charset": {"A", "B"}}
+        session_id = instance.create_attack_session(name=name, hash_file=hash_file, hash_type=0, **keyspace)
+        status = instance.get_session_status(session_id)
+        deadline = time.monotonic() + 10
+        while status["status"] != "finished" and time.monotonic() < deadline:
+            time.sleep(0.05)
+            status = instance.get_session_status(session_id)
+        return status
+
+    first = run("premier")
+    second = run("second")
+    assert first["batch_start"] == 0
+    assert second["batch_start"] == 1000
+    report = instance.coverage_report()[first["coverage_key"]]
+    assert report["covered"] == 2000
+    assert report["total"] == 2 ** 18
+
+    # Keyspace épuisé : la continuation échoue sans laisser de session orpheline
+    small = run("petit", position_charsets=["AB"])
+    with pytest.raises(RuntimeError, match="entièrement parcouru"):
+        instance.continue_attack(small["id"])
+    assert len(instance.session_manager.list_sessions()) == 3
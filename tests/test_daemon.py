@@ -0,0 +1,107 @@
+"""
+Tests du démon myhashcatd et de son client JSON-RPC
+"""
+import hashlib
+import json
+import socket
+import threading
+import time
+import pytest
+from src import cli
+from src.daemon import (
+    MyHashcatDaemon, DaemonClient, DaemonError,
+    APPLICATION_ERROR, INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR
+)
+
+
+@pytest.fixture
+def daemon(make_myhashcat, tmp_path, monkeypatch):
+    """Démon pilotant le faux Hashcat dans un thread"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "1e9")
+    monkeypatch.setenv("FAKE_HASHCAT_STARTUP", "0.2")
+    hashcat = make_myhashcat(batch_size=1000)
+    instance = MyHashcatDaemon(hashcat, tmp_path / "d.sock", monitor_interval=0.1)
+    instance.start()
+    thread = threading.Thread(target=instance.serve_forever, daemon=True)
+    thread.start()
+    yield instance
+    instance.shutdown()
+    thread.join(timeout=5)
+
+
+def test_ping_and_unknown_method(daemon):
+    """Test la réponse du démon et l'erreur de méthode inconnue"""
+    client = DaemonClient(daemon.socket_path)
+    assert client.is_running()
+    assert client.call("ping")["active_sessions"] == 0
+
+    with pytest.raises(DaemonError) as excinfo:
+        client.call("inexistante")
+    assert excinfo.value.code == METHOD_NOT_FOUND
+
+    # Le ping répond sans attendre un appel en cours
+    with daemon.hashcat.lock:
+        assert client.call("ping", timeout=1.0)["active_sessions"] is None
+
+
+def test_cli_refuses_unusable_daemon(daemon, tmp_path, monkeypatch, capsys):
+    """Test que le CLI échoue au lieu de s'exécuter localement à l'insu du démon"""
+    monkeypatch.setattr("sys.argv", ["myhashcat", "--socket", str(daemon.socket_path), "--batch-size", "5", "list"])
+    assert cli.main() == 1
+    assert "--batch-size" in capsys.readouterr().out
+
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(stale))
+        monkeypatch.setattr("sys.argv", ["myhashcat", "--socket", str(stale), "list"])
+        assert cli.main() == 1
+    assert "ne répond pas" in capsys.readouterr().out
+
+
+def test_invalid_json(daemon):
+    """Test la réponse à une requête mal formée"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(daemon.socket_path))
+        sock.sendall(b"{pas du json\n")
+        response = json.loads(sock.makefile("rb").readline())
+    assert response["error"]["code"] == PARSE_ERROR
+
+    # Seuls les arguments refusés par la signature sont des paramètres invalides
+    def broken():
+        return len(None)
+
+    daemon.methods["broken"] = broken
+    response = daemon.handle_line(b'{"jsonrpc": "2.0", "id": 1, "method": "ping", "params": {"x": 1}}')
+    assert response["error"]["code"] == INVALID_PARAMS
+    response = daemon.handle_line(b'{"jsonrpc": "2.0", "id": 2, "method": "broken"}')
+    assert response["error"]["code"] == APPLICATION_ERROR
+
+
+def test_session_survives_between_clients(daemon, tmp_path):
+    """Test qu'un client retrouve le processus lancé par un autre client"""
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"A" * 17 + b"B").hexdigest() + "\n")
+
+    session_id = DaemonClient(daemon.socket_path).create_attack_session(
+        name="demon", hash_file=hash_file, hash_type=0, charset={'A', 'B'}
+    )
+
+    client = DaemonClient(daemon.socket_path)
+    deadline = time.monotonic() + 10
+    status = client.get_session_status(session_id)
+    while status["status"] != "finished" and time.monotonic() < deadline:
+        time.sleep(0.1)
+        status = client.get_session_status(session_id)
+    assert status["status"] == "finished"
+    assert status["recovered"] == 1
+    assert session_id in client.list_sessions()
+
+
+def test_shutdown_removes_socket(daemon):
+    """Test l'arrêt du démon via l'API"""
+    DaemonClient(daemon.socket_path).shutdown()
+    deadline = time.monotonic() + 5
+    while daemon.socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not daemon.socket_path.exists()
+    assert not DaemonClient(daemon.socket_path).is_running()
@@ -0,0 +1,59 @@
+"""
+Tests du cache de détection des types de hash
+"""
+import hashlib
+import os
+
+from src.detection_cache import DetectionCache
+from src.hash_detector import HashDetector
+
+
+def test_detect_skips_unchanged_files(tmp_path, monkeypatch):
+    """Test que seul un fichier au contenu modifié est réanalysé"""
+    calls = []
+    original = HashDetector.detect_from_file.__func__
+
+    def counting(cls, hash_file):
+        calls.append(hash_file.name)
+        return original(cls, hash_file)
+
+    monkeypatch.setattr(HashDetector, "detect_from_file", classmethod(counting))
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"test").hexdigest() + "\n")
+    cache = DetectionCache(tmp_path / "cache.yaml")
+
+    assert cache.detect(hash_file)["id"] == 0
+    assert DetectionCache(tmp_path / "cache.yaml").detect(hash_file)["id"] == 0
+    assert calls == ["hash.txt"]
+
+    # Fichier touché ou copié : reconnu par son empreinte
+    os.utime(hash_file, ns=(1, 1))
+    copy = tmp_path / "copie.txt"
+    copy.write_bytes(hash_file.read_bytes())
+    assert cache.detect(hash_file)["id"] == 0
+    assert cache.detect(copy)["id"] == 0
+    assert calls == ["hash.txt"]
+
+    hash_file.write_text(hashlib.sha1(b"test").hexdigest() + "\n")
+    assert cache.detect(hash_file)["id"] == 100
+    assert calls == ["hash.txt", "hash.txt"]
+
+
+def test_scan_directory(tmp_path):
+    """Test la classification parallèle d'un répertoire"""
+    directory = tmp_path / "hs"
+    (directory / "sous").mkdir(parents=True)
+    (directory / "a.txt").write_text(hashlib.md5(b"a").hexdigest() + "\n")
+    (directory / "b.txt").write_text(hashlib.sha256(b"b").hexdigest() + "\n")
+    (directory / "capture.22000").write_text("WPA*02*abc\n")
+    (directory / "inconnu.txt").write_text("pas un hash\n")
+    (directory / "sous" / "c.txt").write_text(hashlib.sha1(b"c").hexdigest() + "\n")
+    cache = DetectionCache(tmp_path / "cache.yaml")
+
+    results = cache.scan(directory, workers=4)
+    types = {os.path.basename(path): detected and detected["id"] for path, detected in results.items()}
+    assert types == {"a.txt": 0, "b.txt": 1400, "capture.22000": 22000, "inconnu.txt": None}
+
+    results = cache.scan(directory, pattern="*.txt", recursive=True)
+    assert len(results) == 4
+    assert results[str((directory / "sous" / "c.txt").resolve())]["id"] == 100
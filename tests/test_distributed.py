@@ -0,0 +1,76 @@
+"""
+Tests de la répartition d'une session entre un coordinateur et des workers
+"""
+import hashlib
+import threading
+
+import pytest
+
+from src.distributed import CoordinatorServer, Worker
+
+
+@pytest.fixture
+def coordinator(make_myhashcat):
+    """Coordinateur local servant une instance MyHashcat sur le faux Hashcat"""
+    instance = make_myhashcat(batch_size=100)
+    server = CoordinatorServer(instance, port=0, token="secret")
+    server.start()
+    yield instance, server
+    server.shutdown()
+
+
+def test_workers_share_one_session(coordinator, fake_hashcat, tmp_path):
+    """Test que deux workers se partagent le keyspace et remontent le hash"""
+    instance, server = coordinator
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"742").hexdigest() + "\n")
+    session_id = instance.create_attack_session(
+        name="reparti", hash_file=hash_file, hash_type=0,
+        position_charsets=["0123456789"] * 3, distributed=True
+    )
+    assert instance.session_manager.load_session(session_id)["status"] == "distributed"
+
+    workers = [
+        Worker(server.url, hashcat_path=fake_hashcat, work_dir=tmp_path / f"worker{i}",
+               name=f"w{i}", token="secret", heartbeat_interval=0.2)
+        for i in range(2)
+    ]
+    done = []
+    threads = [threading.Thread(target=lambda w=w: done.append(w.run(wait=False))) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    session = instance.session_manager.load_session(session_id)
+    assert session["status"] == "finished"
+    assert session["cracked"] == [{"hash": hashlib.md5(b"742").hexdigest(), "plain": "742"}]
+    assert sum(done) == sum(worker["ranges"] for worker in session["workers"].values())
+    assert sum(done) >= 8
+    # Les plages épuisées sans succès sont enregistrées dans la couverture
+    assert instance.coverage.coverage(session["coverage_key"])["covered"] >= 700
+
+
+def test_expired_lease_is_reassigned(coordinator, fake_hashcat, tmp_path):
+    """Test qu'une plage abandonnée par un worker est réattribuée"""
+    instance, server = coordinator
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+    session_id = instance.create_attack_session(
+        name="bail", hash_file=hash_file, hash_type=0,
+        position_charsets=["0123456789"] * 3, distributed=True
+    )
+
+    lost = server.leases.lease_range("disparu", lease_seconds=-1)
+    assert (lost["start"], lost["end"]) == (0, 100)
+    again = server.leases.lease_range("vivant")
+    assert (again["start"], again["end"]) == (0, 100)
+    assert server.leases.heartbeat_range(session_id, lost["lease_id"])["cancel"]
+    assert not server.leases.heartbeat_range(session_id, again["lease_id"], speed=1000.0)["cancel"]
+    assert server.leases.lease_range("vivant")["start"] == 100
+
+    # Jeton obligatoire
+    with pytest.raises(RuntimeError, match="401"):
+        Worker(server.url, hashcat_path=fake_hashcat, work_dir=tmp_path / "w").request(
+            "/lease", {"worker": "intrus"}
+        )
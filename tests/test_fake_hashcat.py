@@ -0,0 +1,103 @@
+"""
+Tests de bout en bout avec le faux Hashcat (tests/fake_hashcat.py)
+"""
+import hashlib
+import json
+import signal
+import subprocess
+import sys
+import time
+import pytest
+
+
+@pytest.fixture
+def fake_env(tmp_path, monkeypatch):
+    """Configure le faux Hashcat pour le test"""
+    monkeypatch.setenv("FAKE_HASHCAT_SESSION_DIR", str(tmp_path / "restore"))
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "1e9")
+    return tmp_path
+
+
+@pytest.fixture
+def fake_myhashcat(fake_env, make_myhashcat):
+    """Instance de MyHashcat pilotant le faux Hashcat"""
+    return make_myhashcat(batch_size=1000)
+
+
+def test_version(fake_hashcat):
+    """Test la sortie --version"""
+    result = subprocess.run([fake_hashcat, "--version"], capture_output=True, text=True)
+    assert result.returncode == 0
+    assert result.stdout.strip().startswith("v6")
+
+
+def test_benchmark(fake_hashcat, monkeypatch):
+    """Test la sortie -b avec la vitesse configurée"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "2500")
+    result = subprocess.run([fake_hashcat, "-b", "-m", "0"], capture_output=True, text=True)
+    assert "Speed.#1.........: 2500 H/s" in result.stdout
+
+
+def test_end_to_end_crack(fake_myhashcat, fake_env, monkeypatch):
+    """Test une session complète craquée par le faux Hashcat"""
+    monkeypatch.setenv("FAKE_HASHCAT_STARTUP", "0.5")
+    hash_file = fake_env / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"A" * 17 + b"B").hexdigest() + "\n")
+
+    session_id = fake_myhashcat.create_attack_session(
+        name="e2e", hash_file=hash_file, hash_type=0, charset={'A', 'B'}
+    )
+    status = fake_myhashcat.get_session_status(session_id)
+    deadline = time.monotonic() + 10
+    while status["status"] != "finished" and time.monotonic() < deadline:
+        time.sleep(0.1)
+        status = fake_myhashcat.get_session_status(session_id)
+    assert status["status"] == "finished"
+    assert status["recovered"] == 1
+
+
+def test_status_json_and_outfile(fake_hashcat, fake_env):
+    """Test la sortie --status-json, le fichier de sortie et le code retour"""
+    hash_file = fake_env / "hash.txt"
+    dictionary = fake_env / "dict.txt"
+    outfile = fake_env / "out.txt"
+    hash_file.write_text(hashlib.sha1(b"secret").hexdigest() + "\n")
+    dictionary.write_text("a\nb\nsecret\nc\n")
+
+    result = subprocess.run(
+        [fake_hashcat, "-m", "100", "-a", "0", "--status", "--status-json",
+         "--outfile", str(outfile), str(hash_file), str(dictionary)],
+        capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0
+    status = json.loads(result.stdout.strip().splitlines()[-1])
+    assert status["recovered_hashes"] == [1, 1]
+    assert outfile.read_text().strip().endswith(":secret")
+
+
+def test_checkpoint_and_restore(fake_hashcat, fake_env, monkeypatch):
+    """Test l'interruption avec fichier .restore puis la reprise"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "2000")
+    hash_file = fake_env / "hash.txt"
+    dictionary = fake_env / "dict.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+    dictionary.write_text("".join(f"mot{i}\n" for i in range(5000)))
+
+    process = subprocess.Popen(
+        [sys.executable, fake_hashcat, "-m", "0", "--session", "chk", str(hash_file), str(dictionary)]
+    )
+    time.sleep(0.5)
+    process.send_signal(signal.SIGINT)
+    assert process.wait(timeout=10) == 3
+
+    restore = fake_env / "restore" / "chk.restore"
+    words_done = json.loads(restore.read_text())["words_done"]
+    assert 0 < words_done < 5000
+
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "1e9")
+    result = subprocess.run(
+        [sys.executable, fake_hashcat, "--session", "chk", "--restore"],
+        capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 1
+    assert not restore.exists()
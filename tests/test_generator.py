@@ -92,4 +92,32 @@ def test_memory_usage_estimation():
     memory = generator.estimate_memory_usage(batch_size=1000)
     
     assert memory == 1000 * (10 + 49)  # (longueur + overhead) * batch_size
-    assert memory > 0 
\ No newline at end of file
+    assert memory > 0 
+
+def test_position_charsets_mixed_radix():
+    """Test la numérotation en base mixte avec un charset par position"""
+    generator = DictionaryGenerator(position_charsets=[{'X'}, {'1', '2', '3'}, {'A', 'B'}])
+    assert generator.length == 3
+    assert generator.total_combinations == 6
+    words = generator.generate_sequential(start_index=0, count=10)
+    assert words == ['X1A', 'X1B', 'X2A', 'X2B', 'X3A', 'X3B']
+    assert [generator.word_to_index(word) for word in words] == list(range(6))
+    assert generator.generate_sequential(start_index=3, count=2) == ['X2B', 'X3A']
+    assert generator.estimate_dictionaries_needed(4) == (2, 100.0)
+
+    with pytest.raises(ValueError, match="hors du charset"):
+        generator.word_to_index('X1C')
+
+
+def test_from_mask():
+    """Test la création d'un générateur à partir d'un masque Hashcat"""
+    generator = DictionaryGenerator.from_mask("AB?d?u??", custom_charsets=None)
+    assert generator.position_charsets[:2] == ['A', 'B']
+    assert generator.total_combinations == 10 * 26
+    assert generator.generate_sequential(start_index=0, count=1) == ['AB0A?']
+    assert DictionaryGenerator.from_mask("?1?1", {"1": "xy"}).total_combinations == 4
+
+    with pytest.raises(ValueError, match="non défini"):
+        DictionaryGenerator.from_mask("?2")
+    with pytest.raises(ValueError, match="Masque invalide"):
+        DictionaryGenerator.from_mask("?z")
@@ -0,0 +1,54 @@
+"""
+Tests du gouverneur CPU
+"""
+import subprocess
+import sys
+import pytest
+from src.governor import CpuGovernor
+from src.metrics import REGISTRY
+
+
+def test_partition_cores():
+    """Test la répartition des cœurs entre génération et Hashcat"""
+    assert CpuGovernor.partition_cores([0, 1, 2, 3, 4, 5, 6, 7]) == ([6, 7], [0, 1, 2, 3, 4, 5])
+    assert CpuGovernor.partition_cores([0, 1], generator_cores=4) == ([1], [0])
+    # Un seul cœur : partagé
+    assert CpuGovernor.partition_cores([3]) == ([3], [3])
+
+
+def test_classify_bottleneck():
+    """Test la détermination du goulot d'étranglement"""
+    assert CpuGovernor.classify(0.2, 0.98, hashcat_running=True) == "hashcat"
+    assert CpuGovernor.classify(1.0, 0.3, hashcat_running=True) == "generator"
+    assert CpuGovernor.classify(0.1, 0.1, hashcat_running=True) == "io"
+    assert CpuGovernor.classify(0.0, 0.0, hashcat_running=False) == "idle"
+
+
+def test_throttle_backpressure(monkeypatch):
+    """Test la pause croissante puis levée de la contre-pression"""
+    governor = CpuGovernor(base_delay=0.001, max_delay=0.004, cpus=[0])
+    starved = {"hashcat_running": True, "hashcat_util": 0.2, "system_percent": 100.0}
+    monkeypatch.setattr(governor, "sample", lambda: starved)
+    before = REGISTRY.get("generator_throttle_seconds_total")
+
+    assert governor.throttle() == pytest.approx(0.001)
+    assert governor.throttle() == pytest.approx(0.002)
+    assert governor.throttle() == pytest.approx(0.004)
+    assert governor.throttle() == pytest.approx(0.004)
+    assert REGISTRY.get("generator_throttle_seconds_total") - before == pytest.approx(0.011)
+
+    starved["hashcat_util"] = 0.95
+    assert governor.throttle() == 0.0
+    assert governor.delay == 0.0
+
+
+def test_sample_tracks_hashcat_process():
+    """Test la mesure d'un processus suivi et l'oubli d'un processus disparu"""
+    governor = CpuGovernor(cpus=[0])
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    governor.register_hashcat(process.pid)
+    process.wait()
+    sample = governor.sample()
+    assert set(sample) >= {"generator_util", "hashcat_util", "bottleneck"}
+    governor.unregister_hashcat(process.pid)
+    assert governor.sample()["hashcat_running"] is False
@@ -0,0 +1,67 @@
+"""
+Tests des attaques hybrides dictionnaire + masque (-a 6 et -a 7)
+"""
+import hashlib
+from pathlib import Path
+
+import pytest
+
+
+def test_wordlist_with_mask_suffix(word_batch_instance, run_until_cracked, tmp_path):
+    """Test le keyspace exact et les lots --skip/--limit sur la liste préparée"""
+    wordlist = tmp_path / "liste.txt"
+    wordlist.write_text("lune\nsoleil\nlune\netoile\n")
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"etoile42").hexdigest() + "\n")
+
+    session_id = word_batch_instance.create_attack_session(
+        name="suffixe", hash_file=hash_file, hash_type=0, attack_mode="hybrid",
+        wordlist=wordlist, mask="?d?d"
+    )
+    session = word_batch_instance.session_manager.load_session(session_id)
+    assert (session["left_total"], session["candidates_per_word"], session["keyspace_total"]) == (3, 100, 300)
+    # La liste préparée est passée telle quelle à Hashcat
+    assert session["dictionary_file"] == session["left_file"]
+
+    sessions, status = run_until_cracked(word_batch_instance, session_id)
+    assert len(sessions) == 2
+    assert status["cracked"][0]["plain"] == "etoile42"
+    last = word_batch_instance.session_manager.load_session(sessions[-1])
+    assert (last["batch_start"], last["batch_words"], last["next_word_index"]) == (2, 1, 3)
+
+    # Le skip place directement la session sur le dernier mot
+    session_id = word_batch_instance.create_attack_session(
+        name="skip", hash_file=hash_file, hash_type=0, attack_mode="hybrid",
+        wordlist=wordlist, mask="?d?d", skip=2
+    )
+    _, status = run_until_cracked(word_batch_instance, session_id, max_batches=1)
+    assert status["cracked"][0]["plain"] == "etoile42"
+    with pytest.raises(ValueError, match="Skip"):
+        word_batch_instance.create_attack_session(
+            name="skip", hash_file=hash_file, hash_type=0, attack_mode="hybrid",
+            wordlist=wordlist, mask="?d", skip=3
+        )
+
+
+def test_mask_prefix_on_generated_dictionary(word_batch_instance, run_until_cracked, tmp_path):
+    """Test le mode -a 7 sur un dictionnaire généré et un jeu personnalisé"""
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"y7b1").hexdigest() + "\n")
+
+    session_id = word_batch_instance.create_attack_session(
+        name="prefixe", hash_file=hash_file, hash_type=0, attack_mode="hybrid_prefix",
+        position_charsets=["ab", "01"], mask="?1?d", options={"custom-charset1": "xy"}
+    )
+    session = word_batch_instance.session_manager.load_session(session_id)
+    assert (session["left_total"], session["keyspace_total"]) == (4, 80)
+    assert Path(session["dictionary_file"]).read_text() == "a0\na1\n"
+
+    sessions, status = run_until_cracked(word_batch_instance, session_id)
+    assert len(sessions) == 2
+    assert status["cracked"][0]["plain"] == "y7b1"
+
+    with pytest.raises(ValueError, match="masque"):
+        word_batch_instance.create_attack_session(
+            name="sans", hash_file=hash_file, hash_type=0, attack_mode="hybrid",
+            position_charsets=["ab"]
+        )
@@ -0,0 +1,83 @@
+"""
+Tests de la répartition d'un lot entre plusieurs instances Hashcat
+"""
+import hashlib
+import time
+
+import pytest
+
+from src.instances import merge_status, split_cpus, split_slices
+
+
+def test_split_slices_and_cpus():
+    """Test le découpage du lot et des cœurs en parts disjointes"""
+    assert split_slices(10, 3) == [(0, 4), (4, 3), (7, 3)]
+    assert split_slices(10, 3, skip=4) == [(4, 2), (6, 2), (8, 2)]
+    assert split_slices(2, 4) == [(0, 1), (1, 1)]
+    assert split_cpus([0, 1, 2, 3, 4], 2) == [[0, 1, 2], [3, 4]]
+    assert split_cpus([0], 2) == [[0], [0]]
+
+    merged = merge_status([
+        {"state": "running", "speed": 100.0, "progress": 10, "progress_total": 50},
+        {"state": "exhausted", "speed": 80.0, "progress": 50, "progress_total": 50},
+    ])
+    assert (merged["speed"], merged["progress"], merged["progress_total"]) == (100.0, "60", 100)
+    assert (merged["slices_done"], merged["complete"]) == (1, False)
+
+
+def wait_finished(instance, session_id, timeout=30.0):
+    """Attend la fin de toutes les tranches d'une session"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = instance.get_session_status(session_id)
+        if status["status"] != "running":
+            return status
+        instance.wait_for_exit(timeout=1.0)
+    raise AssertionError(f"Session {session_id} toujours en cours")
+
+
+@pytest.fixture
+def instance(make_myhashcat, monkeypatch):
+    """MyHashcat sur le faux Hashcat avec des lots de 1000 mots"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "500")
+    return make_myhashcat(batch_size=1000)
+
+
+def test_instances_cover_disjoint_slices(instance, tmp_path):
+    """Test que les tranches épuisées couvrent tout le lot"""
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+    session_id = instance.create_attack_session(
+        name="tranches", hash_file=hash_file, hash_type=0,
+        position_charsets=["0123456789"] * 3, instances=3
+    )
+    session = instance.session_manager.load_session(session_id)
+    assert [(entry["start"], entry["end"]) for entry in session["instances"]] == [(0, 334), (334, 667), (667, 1000)]
+    assert set(instance.active_sessions()) == {session_id}
+
+    status = wait_finished(instance, session_id)
+    assert status["status"] == "finished"
+    assert [entry["state"] for entry in status["instances"]] == ["exhausted"] * 3
+    assert status["progress"] == "1000"
+    assert instance.coverage.coverage(session["coverage_key"])["covered"] == 1000
+
+
+def test_crack_stops_sibling_instances(instance, tmp_path):
+    """Test qu'une tranche ayant tout retrouvé arrête les autres"""
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"742").hexdigest() + "\n")
+    session_id = instance.create_attack_session(
+        name="casse", hash_file=hash_file, hash_type=0,
+        position_charsets=["0123456789"] * 3, instances=3
+    )
+
+    status = wait_finished(instance, session_id)
+    assert status["status"] == "finished"
+    assert status["cracked"] == [{"hash": hashlib.md5(b"742").hexdigest(), "plain": "742"}]
+    assert [entry["state"] for entry in status["instances"]] == ["stopped", "stopped", "cracked"]
+    assert not instance.active_sessions()
+
+    with pytest.raises(ValueError, match="instances"):
+        instance.create_attack_session(
+            name="invalide", hash_file=hash_file, hash_type=0, instances=2, instance_devices=["1"]
+        )
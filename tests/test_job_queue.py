@@ -0,0 +1,138 @@
+"""
+Tests de la file de travaux prioritaire et de la préemption
+"""
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.job_queue import JobQueue, JobScheduler
+
+
+class StubHashcat:
+    """Imite les méthodes de MyHashcat utilisées par le planificateur"""
+
+    def __init__(self):
+        self.sessions = {}
+        self.calls = []
+
+    def create_attack_session(self, name, **kwargs):
+        session_id = f"{name}_{len(self.sessions)}"
+        self.sessions[session_id] = {"status": "running", "recovered": 0}
+        self.calls.append(("create", session_id))
+        return session_id
+
+    def get_session_status(self, session_id):
+        return self.sessions[session_id]
+
+    def checkpoint_session(self, session_id):
+        self.sessions[session_id]["status"] = "preempted"
+        self.calls.append(("checkpoint", session_id))
+
+    def resume_session(self, session_id):
+        self.sessions[session_id]["status"] = "running"
+        self.calls.append(("resume", session_id))
+
+    def continue_attack(self, session_id):
+        return self.create_attack_session(session_id.split("_")[0])
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    """File de travaux vide"""
+    return JobQueue(tmp_path / "job_queue.yaml")
+
+
+def test_waiting_order(job_queue):
+    """Test l'ordre priorité, temps consommé puis soumission"""
+    low = job_queue.submit({"name": "low"}, priority=0)
+    greedy = job_queue.submit({"name": "greedy"}, priority=5)
+    fresh = job_queue.submit({"name": "fresh"}, priority=5)
+    job_queue.update(greedy, {"runtime": 120.0})
+
+    assert [job["id"] for job in job_queue.waiting_jobs()] == [fresh, greedy, low]
+    # La file est persistante
+    assert len(JobQueue(job_queue.queue_file).list_jobs()) == 3
+
+    # Des mises à jour simultanées de travaux différents sont toutes conservées
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        list(executor.map(lambda job_id: job_queue.update(job_id, {"runtime": 7.0}), [low, greedy, fresh] * 5))
+    assert all(job["runtime"] == 7.0 for job in job_queue.list_jobs())
+
+
+def test_preemption_and_resume(job_queue):
+    """Test la préemption d'un travail moins prioritaire puis sa reprise"""
+    hashcat = StubHashcat()
+    scheduler = JobScheduler(hashcat, job_queue, slots=1)
+
+    low = job_queue.submit({"name": "low", "hash_file": "h.txt"}, priority=0)
+    assert scheduler.tick()["started"] == [low]
+
+    urgent = job_queue.submit({"name": "urgent", "hash_file": "h.txt"}, priority=10)
+    events = scheduler.tick()
+    assert events["preempted"] == [low]
+    assert events["started"] == [urgent]
+    assert job_queue.get(low)["status"] == "preempted"
+    assert job_queue.get(low)["preemptions"] == 1
+
+    # Le travail urgent aboutit : le travail préempté est repris
+    hashcat.sessions[job_queue.get(urgent)["session_id"]].update({"status": "finished", "recovered": 1})
+    events = scheduler.tick()
+    assert events["finished"] == [urgent]
+    assert events["started"] == [low]
+    assert ("resume", job_queue.get(low)["session_id"]) in hashcat.calls
+
+    # Un point de reprise impossible ne libère pas l'emplacement
+    def refuse(session_id):
+        raise ValueError("Session non trouvée")
+    hashcat.checkpoint_session = refuse
+    job_queue.submit({"name": "other", "hash_file": "h.txt"}, priority=10)
+    events = scheduler.tick()
+    assert events["preempted"] == [] and events["started"] == []
+    assert job_queue.get(low)["status"] == "failed"
+
+
+def test_equal_priority_waits_for_quantum(job_queue):
+    """Test qu'un travail de même priorité attend la fin du quantum"""
+    hashcat = StubHashcat()
+    scheduler = JobScheduler(hashcat, job_queue, slots=1, quantum=3600)
+    first = job_queue.submit({"name": "first", "hash_file": "h.txt"})
+    scheduler.tick()
+    second = job_queue.submit({"name": "second", "hash_file": "h.txt"})
+    assert scheduler.tick()["preempted"] == []
+
+    scheduler.quantum = 0
+    events = scheduler.tick()
+    assert events["preempted"] == [first]
+    assert events["started"] == [second]
+
+
+def test_budget_exhausted(job_queue):
+    """Test l'arrêt d'un travail ayant consommé son budget"""
+    hashcat = StubHashcat()
+    scheduler = JobScheduler(hashcat, job_queue)
+    job_id = job_queue.submit({"name": "court", "hash_file": "h.txt"}, budget=10)
+    scheduler.tick()
+    job_queue.update(job_id, {"slice_started": time.time() - 60})
+
+    assert scheduler.tick()["finished"] == [job_id]
+    assert job_queue.get(job_id)["status"] == "exhausted"
+
+
+def test_checkpoint_and_resume_session(make_myhashcat, tmp_path, monkeypatch):
+    """Test le checkpoint d'une vraie session puis sa reprise (faux Hashcat)"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "2000")
+    hashcat = make_myhashcat(batch_size=5000)
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+
+    session_id = hashcat.create_attack_session(name="chk", hash_file=hash_file, hash_type=0, charset={'A', 'B'})
+    time.sleep(0.5)
+    hashcat.checkpoint_session(session_id)
+    assert hashcat.session_manager.load_session(session_id)["status"] == "preempted"
+    assert (tmp_path / "restore" / f"{session_id}.restore").exists()
+
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "1e9")
+    hashcat.resume_session(session_id)
+    hashcat._active_processes[session_id].wait(timeout=30)
+    assert hashcat.get_session_status(session_id)["status"] == "finished"
+    assert not (tmp_path / "restore" / f"{session_id}.restore").exists()
@@ -0,0 +1,72 @@
+"""
+Tests unitaires pour la configuration du logging
+"""
+import logging
+import pytest
+from src.myhashcat import setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def clean_logging():
+    """Fixture isolant la configuration globale du logging"""
+    shutdown_logging()
+    yield
+    shutdown_logging()
+
+
+def test_setup_logging_idempotent(tmp_path, clean_logging):
+    """Test qu'un second appel n'ajoute pas de handler"""
+    logger = setup_logging(tmp_path)
+    handlers = list(logger.handlers)
+    setup_logging(tmp_path)
+    setup_logging(tmp_path / "other")
+    assert logger.handlers == handlers
+
+    logger.info("message unique")
+    shutdown_logging()
+    content = (tmp_path / "myhashcat.log").read_text()
+    assert content.count("message unique") == 1
+    assert not (tmp_path / "other").exists()
+
+
+def test_setup_logging_level(tmp_path, clean_logging, monkeypatch):
+    """Test le niveau par défaut et la variable d'environnement"""
+    logger = setup_logging(tmp_path)
+    assert logger.level == logging.INFO
+    logger.debug("invisible %s", "debug")
+    shutdown_logging()
+    log_file = tmp_path / "myhashcat.log"
+    assert not log_file.exists() or "invisible" not in log_file.read_text()
+
+    monkeypatch.setenv("MYHASHCAT_LOG_LEVEL", "debug")
+    logger = setup_logging(tmp_path)
+    assert logger.level == logging.DEBUG
+
+
+def test_setup_logging_rotation(tmp_path, clean_logging):
+    """Test la rotation du fichier de log par taille"""
+    logger = setup_logging(tmp_path, max_bytes=500, backup_count=2)
+    for i in range(100):
+        logger.info("ligne de log numéro %d", i)
+    shutdown_logging()
+
+    log_files = sorted(path.name for path in tmp_path.iterdir())
+    assert log_files == ["myhashcat.log", "myhashcat.log.1", "myhashcat.log.2"]
+    assert all(path.stat().st_size <= 500 for path in tmp_path.iterdir())
+
+
+def test_message_frozen_at_call(tmp_path, clean_logging, monkeypatch):
+    """Test que le message est figé à l'appel et atexit enregistré une fois"""
+    registered = []
+    monkeypatch.setattr("src.myhashcat.atexit.register", registered.append)
+    monkeypatch.setattr("src.myhashcat._atexit_registered", False)
+    logger = setup_logging(tmp_path)
+    session = {"status": "running"}
+    logger.info("session %s", session)
+    session["status"] = "finished"
+    shutdown_logging()
+    setup_logging(tmp_path)
+    shutdown_logging()
+
+    assert "{'status': 'running'}" in (tmp_path / "myhashcat.log").read_text()
+    assert registered == [shutdown_logging]
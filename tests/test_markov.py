@@ -0,0 +1,49 @@
+"""
+Tests du modèle de Markov d'ordre d'énumération
+"""
+import pytest
+
+from src.generator import DictionaryGenerator
+from src.markov import MarkovModel, load_model, train_model_file
+
+
+CORPUS = ["PASS12", "PASS99", "PA55WD", "ABC123", "PASSAB"]
+
+
+def test_rank_by_frequency():
+    """Test le classement des caractères par position et par transition"""
+    model = MarkovModel(order=1).train(CORPUS)
+    assert model.rank("ABPZ", 0)[:2] == ["P", "A"]
+    # Après « A » en position 1, « S » (3 fois) précède « 5 » puis les inconnus
+    assert model.rank("S5XA", 2, previous="A")[:2] == ["S", "5"]
+    # Caractères jamais vus : ordre lexicographique
+    assert model.rank("ZYX", 0) == ["X", "Y", "Z"]
+
+    with pytest.raises(ValueError, match="ordre"):
+        MarkovModel(order=2)
+
+
+def test_markov_generator_is_bijection():
+    """Test que l'ordre de Markov parcourt tout le keyspace une seule fois"""
+    model = MarkovModel(order=1).train(CORPUS)
+    generator = DictionaryGenerator(length=4, charset=set("PAS12"), markov=model)
+    words = generator.generate_sequential(start_index=0, count=generator.total_combinations)
+    assert words[0] == "PASS"
+    assert len(set(words)) == generator.total_combinations
+    assert [generator.word_to_index(word) for word in words[:500]] == list(range(500))
+    # Reprise à un curseur quelconque
+    assert generator.generate_sequential(start_index=137, count=50) == words[137:187]
+
+
+def test_model_file_is_frozen(tmp_path):
+    """Test l'enregistrement unique du modèle entraîné sur un corpus"""
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("\n".join(CORPUS) + "\n")
+    model_file = train_model_file(corpus, tmp_path / "markov", order=0)
+    assert train_model_file(corpus, tmp_path / "markov", order=0) == model_file
+    assert train_model_file(corpus, tmp_path / "markov", order=1) != model_file
+
+    model = load_model(str(model_file))
+    assert model.order == 0
+    assert model.words == len(CORPUS)
+    assert model.rank("ABPZ", 0) == MarkovModel(order=0).train(CORPUS).rank("ABPZ", 0)
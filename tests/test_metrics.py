@@ -0,0 +1,101 @@
+"""
+Tests unitaires pour l'instrumentation
+"""
+import time
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+from src.metrics import MetricsRegistry
+from src.hashcat_interface import HashcatInterface
+from src.session_manager import SessionManager
+from src.metrics import REGISTRY
+from src.myhashcat import MyHashcat
+
+
+def test_counter_and_gauge():
+    """Test l'incrément des compteurs et la mise à jour des jauges"""
+    registry = MetricsRegistry()
+    registry.inc("generated_words_total", 10)
+    registry.inc("generated_words_total", 5)
+    registry.set("queue_depth", 3)
+    registry.set("queue_depth", 2)
+    assert registry.get("generated_words_total") == 15
+    assert registry.get("queue_depth") == 2
+
+
+def test_invalid_metrics():
+    """Test le rejet des métriques inconnues ou mal utilisées"""
+    registry = MetricsRegistry()
+    with pytest.raises(ValueError, match="Métrique inconnue"):
+        registry.inc("unknown_total")
+    with pytest.raises(ValueError, match="n'est pas de type counter"):
+        registry.inc("queue_depth")
+    with pytest.raises(ValueError, match="ne peut pas décroître"):
+        registry.inc("generated_words_total", -1)
+
+
+def test_render_prometheus_format():
+    """Test le format texte Prometheus"""
+    registry = MetricsRegistry()
+    registry.set("hashcat_hashes_per_second", 1500.0, labels={"session": 'a"b'})
+    text = registry.render()
+    assert "# TYPE myhashcat_generated_words_total counter" in text
+    assert "myhashcat_generated_words_total 0" in text
+    assert 'myhashcat_hashcat_hashes_per_second{session="a\\"b"} 1500' in text
+
+
+def test_write_textfile(tmp_path):
+    """Test l'écriture atomique du fichier textfile"""
+    registry = MetricsRegistry()
+    registry.inc("dictionary_bytes_written_total", 42)
+    metrics_file = tmp_path / "metrics" / "myhashcat.prom"
+    registry.write_textfile(metrics_file)
+    assert "myhashcat_dictionary_bytes_written_total 42" in metrics_file.read_text()
+    assert list(metrics_file.parent.iterdir()) == [metrics_file]
+
+
+def test_http_endpoint():
+    """Test l'endpoint HTTP local"""
+    registry = MetricsRegistry()
+    registry.set("queue_depth", 7)
+    server = registry.start_http_server(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert "myhashcat_queue_depth 7" in response.read().decode()
+    finally:
+        server.shutdown()
+
+
+def test_parse_speed():
+    """Test l'extraction de la vitesse des lignes de statut"""
+    assert HashcatInterface.parse_speed("Speed.#1.........:   1234.5 kH/s (12.34ms) @ Accel:64") == 1234500.0
+    assert HashcatInterface.parse_speed("Speed.#*.........:  2 MH/s") == 2e6
+    assert HashcatInterface.parse_speed("Progress.........: 1/2") is None
+
+
+def test_session_transitions(tmp_path):
+    """Test le comptage des transitions d'état des sessions"""
+    manager = SessionManager(sessions_dir=tmp_path)
+    labels = {"from": "pending", "to": "running"}
+    before = REGISTRY.get("session_transitions_total", labels=labels)
+    session_id = manager.create_session("test", {"name": "test", "hash_file": "h.txt", "status": "pending"})
+    manager.update_session(session_id, {"status": "running"})
+    manager.update_session(session_id, {"progress": 10})
+    assert REGISTRY.get("session_transitions_total", labels=labels) == before + 1
+
+
+def test_cracking_time_starts_with_process(tmp_path):
+    """Test que le temps Hashcat exclut la génération du dictionnaire"""
+    with patch('subprocess.run') as mock_run:
+        mock_run.return_value.stdout = "v6.2.6 hashcat mock"
+        instance = MyHashcat(work_dir=tmp_path / "work", sessions_dir=tmp_path / "sessions")
+    session = {"start_time": "2000-01-01T00:00:00", "process_started": time.time() - 5}
+
+    before = REGISTRY.get("cracking_seconds_total")
+    instance._record_cracking_time("test", session)
+    assert 5 <= REGISTRY.get("cracking_seconds_total") - before < 60
+    before = REGISTRY.get("cracking_seconds_total")
+    instance._record_cracking_time("test", session, run_seconds=2.0)
+    assert REGISTRY.get("cracking_seconds_total") - before == 2.0
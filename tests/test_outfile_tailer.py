@@ -0,0 +1,71 @@
+"""
+Tests du suivi en direct des fichiers de sortie et de l'arrêt des sessions redondantes
+"""
+import hashlib
+import threading
+import time
+
+import pytest
+
+from src.outfile_tailer import OutfileTailer
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_tailer_delivers_complete_lines(tmp_path, use_inotify):
+    """Test que seules les lignes complètes sont transmises, une seule fois"""
+    received = []
+    event = threading.Event()
+
+    def callback(key, lines):
+        received.extend((key, line) for line in lines)
+        event.set()
+
+    tailer = OutfileTailer(callback, poll_interval=0.02, use_inotify=use_inotify)
+    outfile = tmp_path / "out" / "session.cracked"
+    try:
+        tailer.watch("session", outfile)
+        with outfile.open("a") as f:
+            f.write("hash1:secret\nhash2:moi")
+        assert event.wait(2)
+        time.sleep(0.1)
+        assert received == [("session", "hash1:secret")]
+
+        # La fin de la ligne partielle est transmise au retrait
+        with outfile.open("a") as f:
+            f.write("tie\n")
+        tailer.unwatch("session", flush=True)
+        assert received[-1] == ("session", "hash2:moitie")
+        assert len(received) == 2
+    finally:
+        tailer.stop()
+
+
+def test_crack_stops_redundant_sessions_and_jobs(make_myhashcat, tmp_path, monkeypatch):
+    """Test qu'un hash retrouvé arrête les autres sessions et travaux le visant"""
+    monkeypatch.setenv("FAKE_HASHCAT_SPEED", "200")
+    instance = make_myhashcat(batch_size=1000)
+    hash_value = hashlib.md5(b"042").hexdigest()
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hash_value + "\n")
+
+    # Session sans espoir sur un autre keyspace, puis travail en file
+    slow_id = instance.create_attack_session(
+        name="lettres", hash_file=hash_file, hash_type=0, position_charsets=["abcdefghij"] * 3
+    )
+    job_id = instance.submit_job("file", hash_file, hash_type=0, charset=set("xyz"))
+    fast_id = instance.create_attack_session(
+        name="chiffres", hash_file=hash_file, hash_type=0, position_charsets=["0123456789"] * 3
+    )
+
+    deadline = time.monotonic() + 5
+    while instance.job_queue.get(job_id)["status"] != "cancelled" and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    fast = instance.session_manager.load_session(fast_id)
+    slow = instance.session_manager.load_session(slow_id)
+    assert fast["cracked"] == [{"hash": hash_value, "plain": "042"}]
+    assert slow["status"] == "stopped"
+    assert slow["cracked"] == fast["cracked"]
+    assert fast_id in slow["stop_reason"]
+    assert instance.job_queue.get(job_id)["status"] == "cancelled"
+    assert slow_id not in instance.active_sessions()
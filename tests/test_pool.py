@@ -0,0 +1,102 @@
+"""
+Tests unitaires pour la mutualisation des sessions
+"""
+from pathlib import Path
+from unittest.mock import Mock, patch
+from src.pool import HashPool, hash_key, group_pending_sessions
+from src.myhashcat import MyHashcat
+
+
+def test_hash_key_normalization():
+    """Test la normalisation des clés de routage"""
+    assert hash_key("D41D8CD98F00B204E9800998ECF8427E\n") == "d41d8cd98f00b204e9800998ecf8427e"
+    assert hash_key("WPA*02*ABCDEF*aabb*ccdd*ee") == "abcdef"
+    assert hash_key("$2a$12$abc") == "$2a$12$abc"
+    assert hash_key("   ") is None
+
+
+def test_group_pending_sessions():
+    """Test le regroupement des sessions par keyspace"""
+    base = {"status": "pending", "hash_type": 0, "word_length": 18, "charset": ["A", "B"]}
+    sessions = {
+        "a": dict(base),
+        "b": dict(base, charset=["B", "A"]),
+        "c": dict(base, hash_type=100),
+        "d": dict(base, status="running"),
+    }
+    groups = group_pending_sessions(sessions)
+    assert sorted(groups) == [["a", "b"], ["c"]]
+
+
+def test_merge_and_route_results(tmp_path):
+    """Test la fusion des hashs et le routage des résultats"""
+    file_a = tmp_path / "a.txt"
+    file_b = tmp_path / "b.txt"
+    file_a.write_text("d41d8cd98f00b204e9800998ecf8427e\n0cc175b9c0f1b6a831c399e269772661\n")
+    file_b.write_text("0CC175B9C0F1B6A831C399E269772661\n92eb5ffee6ae2fec3ad71c777531578f\n")
+
+    pool = HashPool("pool_test", tmp_path, ["a", "b"])
+    assert pool.merge_hash_files({"a": file_a, "b": file_b}) == 3
+    assert len(pool.hash_file.read_text().splitlines()) == 3
+
+    pool.outfile.write_text("0cc175b9c0f1b6a831c399e269772661:a:b\n92eb5ffee6ae2fec3ad71c777531578f:b\n")
+    results = pool.route_results()
+    assert results["a"] == [{"hash": "0cc175b9c0f1b6a831c399e269772661", "plain": "a:b"}]
+    assert len(results["b"]) == 2
+
+    restored = HashPool.from_session(pool.to_dict())
+    assert restored.route_results() == results
+
+
+def test_route_wpa_results(tmp_path):
+    """Test le routage des résultats réécrits au format 22000"""
+    hash_file = tmp_path / "wifi.22000"
+    hash_file.write_text("WPA*01*4d4fe7aac3a2cecab195321ceb99a7d0*fc690c158264*f4747f87f9f4*686173686361742d6573736964***\n")
+    pool = HashPool("pool_wpa", tmp_path, ["wifi"])
+    pool.merge_hash_files({"wifi": hash_file})
+    pool.outfile.write_text("4d4fe7aac3a2cecab195321ceb99a7d0:fc690c158264:f4747f87f9f4:hashcat-essid:hashcat!\n")
+    assert pool.route_results()["wifi"] == [{"hash": "4d4fe7aac3a2cecab195321ceb99a7d0", "plain": "hashcat!"}]
+
+
+def test_run_pooled_sessions(tmp_path):
+    """Test le lancement d'un seul processus pour plusieurs sessions"""
+    with patch('subprocess.run') as mock_run:
+        mock_run.return_value.stdout = "v6.2.6 hashcat mock"
+        instance = MyHashcat(work_dir=tmp_path / "work", sessions_dir=tmp_path / "sessions")
+
+    mock_process = Mock(pid=4242, stdout=None)
+    mock_process.poll.return_value = None
+    session_ids = []
+    for name in ("one", "two"):
+        hash_file = tmp_path / f"{name}.txt"
+        hash_file.write_text(f"{'a' * 31}{len(session_ids)}\n")
+        session_ids.append(instance.create_attack_session(
+            name=name, hash_file=hash_file, hash_type=0, charset={'A', 'B'}, pool=True
+        ))
+
+    with patch.object(instance, "_generate_dictionary", return_value=10), \
+            patch('subprocess.Popen', return_value=mock_process) as mock_popen:
+        pool_ids = instance.run_pooled_sessions()
+
+    assert len(pool_ids) == 1
+    mock_popen.assert_called_once()
+    for session_id in session_ids:
+        session = instance.session_manager.load_session(session_id)
+        assert session["status"] == "running"
+        assert session["pool_id"] == pool_ids[0]
+        assert session["process_pid"] == 4242
+
+    # Seule la session propriétaire du hash craqué est marquée comme trouvée
+    outfile = Path(session["pool_outfile"])
+    outfile.write_text(f"{'a' * 31}1:SECRET\n")
+    assert instance.get_session_status(session_ids[1]).get("recovered") == 1
+    assert instance.get_session_status(session_ids[0]).get("recovered") is None
+
+    # La table de routage est stockée une fois pour tout le pool
+    assert "pool_routing" not in session and Path(session["pool_routing_file"]).exists()
+
+    # La suite d'un membre retourne en attente de mutualisation
+    instance.session_manager.update_session(session_ids[0], {"status": "finished"})
+    follow_up = instance.session_manager.load_session(instance.continue_attack(session_ids[0]))
+    assert (follow_up["status"], follow_up["next_word_index"]) == ("pending", 10)
+    assert "pool_id" not in follow_up
@@ -0,0 +1,90 @@
+"""
+Tests du surveillant de fin de processus
+"""
+import hashlib
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.process_watcher import ProcessWatcher, is_same_process, process_start_time
+
+
+def _sleeper(seconds: float) -> subprocess.Popen:
+    """Lance un processus qui se termine après un délai"""
+    return subprocess.Popen([sys.executable, "-c", f"import time; time.sleep({seconds})"])
+
+
+@pytest.mark.parametrize("pidfd", [True, False])
+def test_wait_wakes_on_exit(pidfd):
+    """Test le réveil à la fin du processus, avec pidfd ou par interrogation"""
+    watcher = ProcessWatcher(poll_interval=0.01)
+    watcher.pidfd_supported = watcher.pidfd_supported and pidfd
+    short, long = _sleeper(0.2), _sleeper(30)
+    try:
+        assert watcher.watch("court", short.pid)
+        assert watcher.watch("long", long.pid)
+        started = time.monotonic()
+        assert watcher.wait(timeout=10) == ["court"]
+        assert time.monotonic() - started < 2
+        assert watcher.watched() == ["long"]
+        assert watcher.wait(timeout=0.05) == []
+    finally:
+        long.kill()
+        short.wait()
+        long.wait()
+        watcher.close()
+
+
+def test_process_identity():
+    """Test la vérification d'identité par date de démarrage"""
+    process = _sleeper(30)
+    try:
+        start_time = process_start_time(process.pid)
+        assert is_same_process(process.pid, start_time)
+        # Même PID, date de démarrage différente : processus réattribué
+        assert not is_same_process(process.pid, start_time - 100)
+
+        watcher = ProcessWatcher()
+        assert not watcher.watch("remplace", process.pid, start_time=start_time - 100)
+        assert watcher.wait(timeout=1) == ["remplace"]
+        watcher.close()
+    finally:
+        process.kill()
+        process.wait()
+    assert not is_same_process(process.pid, start_time)
+    assert not is_same_process(None)
+
+
+def test_myhashcat_wait_for_exit(make_myhashcat, tmp_path, monkeypatch):
+    """Test le réveil de l'orchestrateur à la fin d'un lot du faux Hashcat"""
+    monkeypatch.setenv("FAKE_HASHCAT_STARTUP", "0.3")
+    instance = make_myhashcat(batch_size=1000)
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+    session_id = instance.create_attack_session(name="attente", hash_file=hash_file, hash_type=0, charset={"A"})
+
+    assert instance.wait_for_exit(timeout=10) == [session_id]
+    status = instance.get_session_status(session_id)
+    assert status["status"] == "finished"
+    assert instance.list_sessions()[session_id]["pid_alive"] is False
+
+
+def test_status_of_process_started_elsewhere(make_myhashcat, tmp_path):
+    """Test qu'une session lancée par une autre instance reste en cours tant que Hashcat vit"""
+    instance = make_myhashcat()
+    process = _sleeper(30)
+    session_id = instance.session_manager.create_session("ailleurs", {
+        "name": "ailleurs",
+        "hash_file": str(tmp_path / "hash.txt"),
+        "status": "running",
+        "process_pid": process.pid,
+        "process_started": process_start_time(process.pid)
+    })
+    try:
+        assert instance.get_session_status(session_id)["status"] == "running"
+    finally:
+        process.kill()
+        process.wait()
+    assert instance.get_session_status(session_id)["status"] == "finished"
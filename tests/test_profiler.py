@@ -0,0 +1,74 @@
+"""
+Tests unitaires pour le profilage par étape
+"""
+import json
+import pstats
+import tracemalloc
+from src.profiler import StageProfiler
+
+
+def test_disabled_profiler(tmp_path):
+    """Test qu'un profileur désactivé ne mesure rien"""
+    profiler = StageProfiler()
+    with profiler.stage("generate_sequential"):
+        pass
+    assert profiler.stages == {}
+    assert profiler.dump(tmp_path) is None
+
+
+def test_stage_accumulation():
+    """Test le cumul des appels répétés à une même étape"""
+    profiler = StageProfiler(enabled=True)
+    for _ in range(3):
+        with profiler.stage("session_write"):
+            sum(range(1000))
+    with profiler.stage("hashcat_start"):
+        pass
+
+    assert profiler.stages["session_write"]["calls"] == 3
+    assert profiler.stages["session_write"]["wall"] >= 0
+    report = profiler.report()
+    assert report.index("session_write") < report.index("hashcat_start")
+
+
+def test_stage_records_on_exception():
+    """Test qu'une étape interrompue par une exception est mesurée"""
+    profiler = StageProfiler(enabled=True)
+    try:
+        with profiler.stage("hash_detection"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert profiler.stages["hash_detection"]["calls"] == 1
+
+
+def test_report_shares_exclude_nested_stages():
+    """Test que les étapes imbriquées ne gonflent pas les pourcentages"""
+    profiler = StageProfiler(enabled=True)
+    with profiler.stage("generate_sequential"):
+        with profiler.stage("dictionary_write"):
+            sum(range(100000))
+    with profiler.stage("hashcat_start"):
+        sum(range(100000))
+
+    shares = {line.split()[0]: float(line.split()[-1]) for line in profiler.report().splitlines()[1:]}
+    assert all(share <= 100.0 for share in shares.values())
+    assert abs(shares["generate_sequential"] + shares["hashcat_start"] - 100.0) < 0.2
+    assert shares["dictionary_write"] <= shares["generate_sequential"]
+
+
+def test_dump_raw_data(tmp_path):
+    """Test l'écriture des données brutes cProfile et tracemalloc"""
+    profiler = StageProfiler(cpu_profile=True, memory_profile=True)
+    with profiler.stage("generate_sequential"):
+        with profiler.stage("dictionary_write"):
+            data = ["X" * 20 for _ in range(10000)]
+    assert len(data) == 10000
+    assert profiler.stages["generate_sequential"]["allocated"] > 0
+
+    profile_dir = profiler.dump(tmp_path)
+    stages = json.loads((profile_dir / "stages.json").read_text())["stages"]
+    assert [stage["name"] for stage in stages] == ["dictionary_write", "generate_sequential"]
+    assert pstats.Stats(str(profile_dir / "cprofile.prof")).total_calls >= 0
+    assert (profile_dir / "tracemalloc.txt").read_text()
+    tracemalloc.stop()
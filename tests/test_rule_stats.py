@@ -0,0 +1,87 @@
+"""
+Tests unitaires pour les statistiques d'efficacité des règles
+"""
+import pytest
+from unittest.mock import patch
+from src.myhashcat import MyHashcat
+from src.rule_stats import RuleStatistics, read_rules
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    """Fichier de règles de test"""
+    path = tmp_path / "test.rule"
+    path.write_text("# commentaire\n:\nu\n\n$1\nc\n$1\n")
+    return path
+
+
+def test_read_rules(rules_file):
+    """Test la lecture des règles sans commentaires ni doublons"""
+    assert read_rules(rules_file) == [":", "u", "$1", "c"]
+
+
+def test_record_batch_and_persistence(tmp_path, rules_file):
+    """Test le cumul des hits et leur persistance"""
+    debug_file = tmp_path / "debug.rules"
+    debug_file.write_text("$1\n$1\nu\n")
+    stats = RuleStatistics(tmp_path / "stats.yaml")
+    assert stats.record_batch([rules_file], words_tested=1000, debug_file=debug_file) == 3
+
+    reloaded = RuleStatistics(tmp_path / "stats.yaml")
+    assert reloaded.rules["$1"] == {"hits": 2, "candidates": 1000}
+    assert reloaded.cost_per_hit("$1") == 500
+    assert reloaded.cost_per_hit("c") == float("inf")
+
+    # Deux instances chargées avant l'autre écriture : aucun cumul n'est perdu
+    reloaded.record_batch([rules_file], words_tested=10)
+    stats.record_batch([rules_file], words_tested=1)
+    assert RuleStatistics(tmp_path / "stats.yaml").rules["$1"] == {"hits": 2, "candidates": 1011}
+
+
+def test_interrupted_batch_credits_progress(tmp_path, rules_file):
+    """Test qu'un lot arrêté tôt n'est crédité que de la progression annoncée"""
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value.stdout = "v6.2.6 hashcat mock"
+        instance = MyHashcat(work_dir=tmp_path / "work", sessions_dir=tmp_path / "sessions")
+    session = {
+        "active_rules": [str(rules_file)],
+        "batch_words": 1000,
+        "progress": "400",
+        "progress_total": 4000,
+    }
+    instance._record_rule_stats("lot", session)
+    assert instance.rule_stats.rules["u"]["candidates"] == 100
+
+
+def test_rank_and_prune_rules(tmp_path, rules_file):
+    """Test le classement et l'élagage des règles improductives"""
+    debug_file = tmp_path / "debug.rules"
+    debug_file.write_text("$1\n$1\nu\n")
+    stats = RuleStatistics(tmp_path / "stats.yaml", min_candidates=1000)
+    stats.record_batch([rules_file], words_tested=1000, debug_file=debug_file)
+
+    ranked = [rule for rule, _ in stats.rank_rules(read_rules(rules_file))]
+    assert ranked == ["$1", "u", ":", "c"]
+
+    planned_file, dropped = stats.plan_rules(rules_file, tmp_path / "planned")
+    assert dropped == 2
+    assert planned_file.read_text() == "$1\nu\n"
+
+
+def test_plan_rules_without_evidence(tmp_path, rules_file):
+    """Test qu'une règle peu testée n'est pas écartée"""
+    stats = RuleStatistics(tmp_path / "stats.yaml", min_candidates=10_000)
+    stats.record_batch([rules_file], words_tested=1000)
+    assert stats.plan_rules(rules_file, tmp_path / "planned") == (rules_file, 0)
+
+
+def test_costly_rule_dropped(tmp_path):
+    """Test l'écartement d'une règle dont le coût par hit est excessif"""
+    stats = RuleStatistics(tmp_path / "stats.yaml", min_candidates=100, max_cost_ratio=10)
+    stats.rules = {
+        "a": {"hits": 100, "candidates": 1000},
+        "b": {"hits": 90, "candidates": 1000},
+        "c": {"hits": 1, "candidates": 1000},
+    }
+    assert not stats.is_unproductive("a")
+    assert stats.is_unproductive("c")
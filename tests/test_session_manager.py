@@ -0,0 +1,114 @@
+"""
+Tests du gestionnaire de sessions en accès concurrent
+"""
+import hashlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from src.batch_sizer import AdaptiveBatchSizer
+from src.session_manager import SessionManager, atomic_write_yaml
+
+
+def _increment(sessions_dir: str, session_id: str, count: int) -> None:
+    """Incrémente un compteur de session depuis un autre processus"""
+    manager = SessionManager(sessions_dir=Path(sessions_dir))
+    for _ in range(count):
+        manager.modify_session(session_id, lambda data: data.update(counter=data["counter"] + 1))
+
+
+def _record_batches(calibration_file: str, count: int) -> None:
+    """Enregistre des mesures de lot depuis un autre processus"""
+    sizer = AdaptiveBatchSizer(Path(calibration_file))
+    for _ in range(count):
+        sizer.record(0, 1000, 1, 2.0, 1000.0)
+
+
+def test_unique_ids_under_concurrency(tmp_path):
+    """Test que des créations simultanées du même nom obtiennent des IDs distincts"""
+    manager = SessionManager(sessions_dir=tmp_path)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        ids = list(executor.map(
+            lambda i: manager.create_session("meme", {"name": "meme", "hash_file": "h.txt", "index": i}),
+            range(40)
+        ))
+    assert len(set(ids)) == 40
+    sessions = manager.list_sessions()
+    assert sorted(session["index"] for session in sessions.values()) == list(range(40))
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_no_lost_updates_across_processes(tmp_path):
+    """Test qu'aucune mise à jour n'est perdue entre processus et threads"""
+    manager = SessionManager(sessions_dir=tmp_path)
+    session_id = manager.create_session("compteur", {"name": "compteur", "hash_file": "h.txt", "counter": 0})
+
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_increment, args=(str(tmp_path), session_id, 50)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    # Mises à jour de champs différents en parallèle dans ce processus
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: manager.update_session(session_id, {f"champ_{i}": i}), range(20)))
+    for worker in workers:
+        worker.join()
+
+    session = manager.load_session(session_id)
+    assert session["counter"] == 200
+    assert all(session[f"champ_{i}"] == i for i in range(20))
+    assert session["version"] == 1 + 200 + 20
+
+
+def test_compare_and_swap(tmp_path):
+    """Test la mise à jour conditionnelle par numéro de version"""
+    manager = SessionManager(sessions_dir=tmp_path)
+    session_id = manager.create_session("cas", {"name": "cas", "hash_file": "h.txt", "status": "running"})
+    version = manager.load_session(session_id)["version"]
+
+    assert manager.update_session(session_id, {"status": "stopped"}, expected_version=version)
+    # Une écriture fondée sur l'ancienne version est refusée
+    assert not manager.update_session(session_id, {"status": "finished"}, expected_version=version)
+    assert manager.load_session(session_id)["status"] == "stopped"
+    assert manager.modify_session(session_id, lambda data: False) is None
+    assert manager.load_session(session_id)["version"] == version + 1
+
+
+def test_side_store_updates_across_processes(tmp_path):
+    """Test qu'aucune mesure de lot n'est perdue entre processus"""
+    calibration_file = tmp_path / "batch_calibration.yaml"
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_record_batches, args=(str(calibration_file), 25)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert AdaptiveBatchSizer(calibration_file).calibration["0"]["batches"] == 100
+
+
+def test_continuation_files_follow_session_id(make_myhashcat, tmp_path):
+    """Test que les fichiers d'une continuation portent l'identifiant attribué"""
+    instance = make_myhashcat(batch_size=10)
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"introuvable").hexdigest() + "\n")
+    first = instance.create_attack_session(name="suite", hash_file=hash_file, hash_type=0, charset={"A", "B"})
+    instance.wait_for_exit(timeout=10)
+    instance.get_session_status(first)
+
+    # Deux continuations dans la même seconde : la seconde reçoit un suffixe
+    continued = [instance.continue_attack(first), instance.continue_attack(first)]
+    assert len(set(continued)) == 2
+    for session_id in continued:
+        session = instance.session_manager.load_session(session_id)
+        assert Path(session["dictionary_file"]).name == f"{session_id}_initial.txt"
+
+
+def test_atomic_write_yaml(tmp_path):
+    """Test l'écriture atomique d'un fichier d'état et ses permissions"""
+    state_file = tmp_path / "etat" / "state.yaml"
+    atomic_write_yaml(state_file, {"clé": [1, 2]}, mode=0o600)
+    atomic_write_yaml(state_file, {"clé": [3]}, mode=0o600)
+    assert yaml.safe_load(state_file.read_text()) == {"clé": [3]}
+    assert state_file.stat().st_mode & 0o077 == 0
+    assert [p.name for p in state_file.parent.iterdir()] == ["state.yaml"]
@@ -0,0 +1,87 @@
+"""
+Tests de la préparation des listes de mots externes
+"""
+import hashlib
+import multiprocessing
+import random
+from pathlib import Path
+
+from src.wordlist import WordlistPreprocessor
+
+
+def _prepare_lists(cache_dir: str, wordlists: list) -> None:
+    """Prépare des listes depuis un autre processus"""
+    preprocessor = WordlistPreprocessor(Path(cache_dir))
+    for wordlist in wordlists:
+        preprocessor.prepare(Path(wordlist))
+
+
+def test_prepare_filters_and_caches(tmp_path):
+    """Test le filtrage par longueur WPA, la déduplication et le cache"""
+    wordlist = tmp_path / "liste.txt"
+    wordlist.write_bytes(b"motdepasse\r\ncourt\nmotdepasse\n\nazertyuiop\n" + b"x" * 64 + b"\nmotdepasse")
+    preprocessor = WordlistPreprocessor(tmp_path / "cache")
+
+    result = preprocessor.prepare(wordlist, hash_type=22000)
+    assert Path(result["path"]).read_bytes() == b"motdepasse\nazertyuiop\n"
+    assert (result["read"], result["kept"], result["filtered"], result["duplicates"]) == (7, 2, 3, 2)
+    assert not result["cached"]
+
+    again = WordlistPreprocessor(tmp_path / "cache").prepare(wordlist, hash_type=22000)
+    assert again["cached"] and again["path"] == result["path"]
+    # Autres filtres : autre résultat
+    other = preprocessor.prepare(wordlist, charset="abcdefghijklmnopqrstuvwxyz")
+    assert Path(other["path"]).read_bytes() == b"motdepasse\ncourt\nazertyuiop\n" + b"x" * 64 + b"\n"
+
+
+def test_external_dedup_keeps_first_occurrence_order(tmp_path):
+    """Test que le tri fusion externe donne le même résultat qu'en mémoire"""
+    rng = random.Random(42)
+    words = [f"mot{rng.randrange(500)}" for _ in range(3000)]
+    wordlist = tmp_path / "liste.txt"
+    wordlist.write_text("\n".join(words) + "\n")
+
+    result = WordlistPreprocessor(tmp_path / "cache", memory_bytes=2000).prepare(wordlist)
+    expected = list(dict.fromkeys(words))
+    assert Path(result["path"]).read_text().splitlines() == expected
+    assert result["duplicates"] == len(words) - len(expected)
+    assert not list((tmp_path / "cache").glob("dedup_*"))
+
+
+def test_index_shared_across_processes(tmp_path):
+    """Test qu'aucune liste préparée n'est perdue de l'index entre processus"""
+    wordlists = []
+    for i in range(16):
+        wordlist = tmp_path / f"liste{i}.txt"
+        wordlist.write_text(f"mot{i}\nautre{i}\n")
+        wordlists.append(str(wordlist))
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_prepare_lists, args=(str(tmp_path / "cache"), wordlists[i::4])) for i in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    index = WordlistPreprocessor(tmp_path / "cache")._load_index()
+    assert len(index["prepared"]) == 16 and len(index["sources"]) == 16
+
+def test_session_on_external_wordlist(make_myhashcat, tmp_path):
+    """Test une attaque sur une liste externe préparée"""
+    instance = make_myhashcat()
+    hash_file = tmp_path / "hash.txt"
+    hash_file.write_text(hashlib.md5(b"soleil").hexdigest() + "\n")
+    wordlist = tmp_path / "liste.txt"
+    wordlist.write_text("lune\nsoleil\nlune\netoile\n")
+
+    session_id = instance.create_attack_session(
+        name="liste", hash_file=hash_file, hash_type=0, wordlist=wordlist
+    )
+    session = instance.session_manager.load_session(session_id)
+    assert Path(session["dictionary_file"]).read_text() == "lune\nsoleil\netoile\n"
+    assert session["batch_words"] == 3 and session["coverage_key"] is None
+
+    instance._active_processes[session_id].wait(timeout=30)
+    status = instance.get_session_status(session_id)
+    assert status["status"] == "finished"
+    assert status["cracked"] == [{"hash": hashlib.md5(b"soleil").hexdigest(), "plain": "soleil"}]